@@ -0,0 +1,126 @@
+"""Conditional GET (ETag / Last-Modified) for read endpoints.
+
+Routers declare which data sources their responses derive from:
+
+    router = APIRouter(prefix="/api/v1", dependencies=[conditional_get("store")])
+
+Before the handler runs, the dependency builds a weak ETag from the
+sources' ``data_version()`` vectors (stat calls plus, for the store, two
+trivial SQLite reads) and the request URL. A poll whose If-None-Match (or,
+failing that, If-Modified-Since) still matches gets a bodyless 304
+without the handler touching storage or reserializing anything.
+Otherwise ValidatorsMiddleware adds the validators to the 200 response,
+whether the handler returned a model or a prebuilt Response.
+"""
+
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import Depends, Request, Response
+
+from api import deps
+from api.metrics import record_cache
+
+CACHE_CONTROL = "no-cache"
+SCOPE_KEY = "snowtown.validators"
+
+SOURCES = {
+    "store": lambda: deps.get_store(),
+    "academy": lambda: deps.get_academy(),
+    "um": lambda: deps.get_um(),
+}
+
+
+class NotModified(Exception):
+    """Raised by conditional_get when the client's cached copy is current."""
+
+    def __init__(self, headers: dict[str, str]):
+        self.headers = headers
+
+
+def not_modified_handler(request: Request, exc: NotModified) -> Response:
+    return Response(status_code=304, headers=exc.headers)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified_ns: int) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution
+    return last_modified_ns // 1_000_000_000 <= int(since.timestamp())
+
+
+def validators(request: Request, source_names: tuple[str, ...]) -> tuple[dict[str, str], int]:
+    """ETag, Last-Modified and Cache-Control headers for the current data version.
+
+    Also returns the newest source mtime in ns, for If-Modified-Since.
+    """
+    vectors = []
+    last_modified_ns = 0
+    for name in source_names:
+        vector, mtime_ns = SOURCES[name]().data_version()
+        vectors.append(vector)
+        last_modified_ns = max(last_modified_ns, mtime_ns)
+    key = repr((request.url.path, sorted(request.query_params.multi_items()), vectors))
+    digest = hashlib.blake2b(key.encode(), digest_size=12).hexdigest()
+    headers = {"ETag": f'W/"{digest}"', "Cache-Control": CACHE_CONTROL}
+    if last_modified_ns:
+        headers["Last-Modified"] = formatdate(last_modified_ns / 1_000_000_000, usegmt=True)
+    return headers, last_modified_ns
+
+
+def conditional_get(*source_names: str):
+    """Dependency that answers 304 for unchanged data and sets validators otherwise."""
+    unknown = set(source_names) - set(SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown data source(s): {', '.join(sorted(unknown))}")
+
+    def dependency(request: Request) -> None:
+        headers, last_modified_ns = validators(request, source_names)
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            fresh = _etag_matches(if_none_match, headers["ETag"])
+        else:
+            if_modified_since = request.headers.get("if-modified-since")
+            fresh = bool(if_modified_since) and bool(last_modified_ns) and _not_modified_since(
+                if_modified_since, last_modified_ns,
+            )
+        record_cache("http_conditional", hit=fresh)
+        if fresh:
+            raise NotModified(headers)
+        request.scope[SCOPE_KEY] = headers
+
+    return Depends(dependency)
+
+
+class ValidatorsMiddleware:
+    """ASGI middleware adding conditional_get's validators to 200 responses."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = scope.get(SCOPE_KEY)
+                if headers:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (name.lower().encode("latin-1"), value.encode("latin-1"))
+                        for name, value in headers.items()
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -4,13 +4,19 @@ Provides singleton instances of ContractStore, AcademyReader, and UMReader
 configured via environment variables with sensible defaults for the EC2 layout.
 """
 
+import hmac
 import os
 from pathlib import Path
 
-from contracts.store import ContractStore
+from fastapi import Header, HTTPException
 
+from api import metrics
 from api.readers.academy_reader import AcademyReader
 from api.readers.um_reader import UMReader
+from contracts.ingest import shutdown_pool
+from contracts.outcome_columns import COLUMNS_DIR, OutcomeColumns
+from contracts.signal_tfidf import MODEL_FILE, SignalTfidf
+from contracts.store import ContractStore
 
 # Configurable paths with defaults matching EC2 layout
 SNOW_TOWN_DATA_DIR = Path(os.environ.get(
@@ -28,38 +34,97 @@ UM_DB_PATH = Path(os.environ.get(
     str(Path.home() / "incoming" / "caught_ideas.db"),
 ))
 
+# Bearer token for endpoints that write (ingest); unset disables them
+WRITE_TOKEN = os.environ.get("SNOW_TOWN_WRITE_TOKEN", "")
+
 # Singletons — initialized once, shared across request handlers
 _store: ContractStore | None = None
 _academy: AcademyReader | None = None
 _um: UMReader | None = None
+# (store it indexes, model): rebuilt if the store singleton is replaced
+_signal_tfidf: tuple[ContractStore, SignalTfidf] | None = None
+_outcome_columns: tuple[ContractStore, OutcomeColumns] | None = None
 
 
 def get_store() -> ContractStore:
     global _store
     if _store is None:
-        _store = ContractStore(data_dir=SNOW_TOWN_DATA_DIR)
+        _store = metrics.instrument(ContractStore(data_dir=SNOW_TOWN_DATA_DIR), "contract_store")
     return _store
 
 
 def get_academy() -> AcademyReader:
     global _academy
     if _academy is None:
-        _academy = AcademyReader(personas_dir=ACADEMY_PERSONAS_DIR)
+        _academy = metrics.instrument(AcademyReader(personas_dir=ACADEMY_PERSONAS_DIR), "academy")
     return _academy
 
 
 def get_um() -> UMReader:
     global _um
     if _um is None:
-        _um = UMReader(db_path=UM_DB_PATH)
+        _um = metrics.instrument(
+            UMReader(db_path=UM_DB_PATH, on_cache_lookup=metrics.record_cache), "ultra_magnus"
+        )
     return _um
 
 
+def require_write_token(authorization: str | None = Header(default=None)) -> None:
+    """Reject a write request unless it carries ``Authorization: Bearer <WRITE_TOKEN>``.
+
+    Write endpoints are off (403) until SNOW_TOWN_WRITE_TOKEN is set.
+    """
+    if not WRITE_TOKEN:
+        raise HTTPException(status_code=403, detail="Writes are disabled: set SNOW_TOWN_WRITE_TOKEN")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), WRITE_TOKEN.encode()):
+        raise HTTPException(
+            status_code=401, detail="Invalid or missing bearer token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def get_signal_tfidf() -> SignalTfidf:
+    """TF-IDF model over research signals, caught up with the store's JSONL.
+
+    Loaded once from the on-disk cache; each call indexes only signals
+    appended since the last one. The cache is rewritten in batches, in
+    the background, and flushed on shutdown.
+    """
+    global _signal_tfidf
+    store = get_store()
+    if _signal_tfidf is None or _signal_tfidf[0] is not store:
+        _signal_tfidf = (store, SignalTfidf.load(store.data_dir / MODEL_FILE))
+    model = _signal_tfidf[1]
+    model.update(store, cache_path=store.data_dir / MODEL_FILE)
+    return model
+
+
+def get_outcome_columns() -> OutcomeColumns:
+    """Columnar outcome cache, caught up with the store's JSONL.
+
+    Each call appends only outcomes written since the last one.
+    """
+    global _outcome_columns
+    store = get_store()
+    if _outcome_columns is None or _outcome_columns[0] is not store:
+        _outcome_columns = (store, OutcomeColumns(store.data_dir / COLUMNS_DIR))
+    columns = _outcome_columns[1]
+    columns.update(store)
+    return columns
+
+
 def shutdown() -> None:
     """Clean up resources on shutdown."""
-    global _store, _academy, _um
+    global _store, _academy, _um, _signal_tfidf, _outcome_columns
+    if _signal_tfidf is not None:
+        tfidf_store, model = _signal_tfidf
+        model.flush(tfidf_store.data_dir / MODEL_FILE)
     if _store is not None:
         _store.close()
         _store = None
     _academy = None
     _um = None
+    _signal_tfidf = None
+    _outcome_columns = None
+    shutdown_pool()
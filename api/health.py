@@ -0,0 +1,141 @@
+"""Constant-cost health checks for the visualization API.
+
+Probes hit ``HealthChecker.check()``, which only stats files and runs
+``SELECT 1``, and caches the answer for ``SNOW_TOWN_HEALTH_TTL`` seconds.
+Checks that read data (SQLite quick_check, parsing persona YAML, counting
+Ultra Magnus ideas) run in a background task every
+``SNOW_TOWN_HEALTH_DEEP_INTERVAL`` seconds and are folded into the next
+response, so probe cost never grows with the data.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from api import deps
+from api.metrics import record_cache
+from api.models.responses import HealthResponse
+
+logger = logging.getLogger(__name__)
+
+HEALTH_TTL_SECONDS = float(os.environ.get("SNOW_TOWN_HEALTH_TTL", "5"))
+DEEP_CHECK_INTERVAL_SECONDS = float(os.environ.get("SNOW_TOWN_HEALTH_DEEP_INTERVAL", "60"))
+
+
+def _error(e: Exception) -> str:
+    return f"error: {e}"
+
+
+class HealthChecker:
+    """Cached cheap checks plus periodically refreshed deep checks."""
+
+    def __init__(
+        self,
+        ttl: float = HEALTH_TTL_SECONDS,
+        deep_interval: float = DEEP_CHECK_INTERVAL_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.ttl = ttl
+        self.deep_interval = deep_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._cached: HealthResponse | None = None
+        self._cached_at = 0.0
+        self._deep: dict[str, str] = {}
+        self.deep_checked_at: datetime | None = None
+
+    def check(self) -> HealthResponse:
+        """Return the cached health response, refreshing it once per TTL."""
+        with self._lock:
+            now = self._clock()
+            if self._cached is not None and now - self._cached_at < self.ttl:
+                record_cache("health", hit=True)
+                return self._cached
+            record_cache("health", hit=False)
+
+            sources = self.cheap_checks()
+            for name, status in sources.items():
+                # A failing cheap check wins; otherwise show the richer deep result
+                if status == "ok" and name in self._deep:
+                    sources[name] = self._deep[name]
+
+            self._cached = HealthResponse(
+                status="ok" if all(v.startswith("ok") for v in sources.values()) else "degraded",
+                timestamp=datetime.now(),
+                sources=sources,
+                deep_checked_at=self.deep_checked_at,
+            )
+            self._cached_at = now
+            return self._cached
+
+    def cheap_checks(self) -> dict[str, str]:
+        """Stat calls and SELECT 1 only: no contract or persona parsing."""
+        sources: dict[str, str] = {}
+
+        try:
+            deps.get_store().ping()
+            sources["contract_store"] = "ok"
+        except (sqlite3.Error, OSError) as e:
+            sources["contract_store"] = _error(e)
+
+        try:
+            if deps.get_academy().personas_dir.is_dir():
+                sources["academy"] = "ok"
+            else:
+                sources["academy"] = "unavailable (personas dir not found)"
+        except OSError as e:
+            sources["academy"] = _error(e)
+
+        try:
+            if deps.get_um().available():
+                sources["ultra_magnus"] = "ok"
+            else:
+                sources["ultra_magnus"] = "unavailable (db not found)"
+        except (sqlite3.Error, OSError) as e:
+            sources["ultra_magnus"] = _error(e)
+
+        return sources
+
+    def run_deep_checks(self) -> dict[str, str]:
+        """Checks that read data; called from the background task."""
+        deep: dict[str, str] = {}
+
+        try:
+            result = deps.get_store().integrity_check()
+            deep["contract_store"] = "ok" if result == "ok" else f"error: quick_check: {result}"
+        except (sqlite3.Error, OSError) as e:
+            deep["contract_store"] = _error(e)
+
+        try:
+            deep["academy"] = f"ok ({len(deps.get_academy().list_agents())} personas)"
+        except Exception as e:  # noqa: BLE001 - malformed persona YAML fails in many ways; report it
+            deep["academy"] = _error(e)
+
+        try:
+            um = deps.get_um()
+            if um.available():
+                deep["ultra_magnus"] = f"ok ({sum(um.count_by_stage().values())} ideas)"
+        except (sqlite3.Error, OSError) as e:
+            deep["ultra_magnus"] = _error(e)
+
+        with self._lock:
+            self._deep = deep
+            self.deep_checked_at = datetime.now()
+            self._cached = None
+        return deep
+
+    async def run_forever(self) -> None:
+        """Refresh deep checks every ``deep_interval`` seconds until cancelled."""
+        while True:
+            try:
+                await asyncio.to_thread(self.run_deep_checks)
+            except Exception:
+                logger.exception("Deep health check failed")
+            await asyncio.sleep(self.deep_interval)
+
+
+checker = HealthChecker()
@@ -7,15 +7,31 @@ Usage:
     uvicorn api.main:app --reload --port 8000
 """
 
+import asyncio
 from contextlib import asynccontextmanager
-from datetime import datetime
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
-from api import deps
+from api import deps, health
+from api.conditional import NotModified, ValidatorsMiddleware, not_modified_handler
+from api.metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware
 from api.models.responses import HealthResponse
-from api.routers import activity, agents, ecosystem, nodes, pipeline, research
+from api.rendering import GZIP_LEVEL, GZIP_MIN_BYTES, FastJSONResponse
+from api.routers import (
+    activity,
+    agents,
+    claims,
+    ecosystem,
+    export,
+    ingest,
+    loop,
+    nodes,
+    outcomes,
+    pipeline,
+    research,
+)
 
 
 @asynccontextmanager
@@ -24,8 +40,10 @@ async def lifespan(app: FastAPI):
     deps.get_store()
     deps.get_academy()
     deps.get_um()
+    deep_checks = asyncio.create_task(health.checker.run_forever())
     yield
     # Shutdown: clean up
+    deep_checks.cancel()
     deps.shutdown()
 
 
@@ -34,6 +52,7 @@ app = FastAPI(
     description="Data server for the Snow-Town ecosystem dashboard",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # CORS — allow all origins during development
@@ -45,49 +64,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large bodies (list endpoints); small ones aren't worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_BYTES, compresslevel=GZIP_LEVEL)
+
+# 304 Not Modified for polls whose ETag / Last-Modified still match
+app.add_exception_handler(NotModified, not_modified_handler)
+app.add_middleware(ValidatorsMiddleware)
+
+# Per-route latency histograms and in-flight gauge, served at /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Register routers
 app.include_router(activity.router)
+app.include_router(claims.router)
 app.include_router(ecosystem.router)
+app.include_router(export.router)
+app.include_router(ingest.router)
+app.include_router(loop.router)
 app.include_router(nodes.router)
+app.include_router(outcomes.router)
 app.include_router(agents.router)
 app.include_router(pipeline.router)
 app.include_router(research.router)
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Prometheus text exposition of request, query and cache metrics."""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/api/v1/health", response_model=HealthResponse, tags=["health"])
 def health_check() -> HealthResponse:
-    sources: dict[str, str] = {}
-
-    # Check ContractStore
-    try:
-        store = deps.get_store()
-        store.read_outcomes(limit=1)
-        sources["contract_store"] = "ok"
-    except Exception as e:
-        sources["contract_store"] = f"error: {e}"
-
-    # Check Academy
-    try:
-        academy = deps.get_academy()
-        agents_list = academy.list_agents()
-        sources["academy"] = f"ok ({len(agents_list)} personas)"
-    except Exception as e:
-        sources["academy"] = f"error: {e}"
-
-    # Check Ultra Magnus DB
-    try:
-        um = deps.get_um()
-        if um.available():
-            sources["ultra_magnus"] = "ok"
-        else:
-            sources["ultra_magnus"] = "unavailable (db not found)"
-    except Exception as e:
-        sources["ultra_magnus"] = f"error: {e}"
-
-    all_ok = all(v.startswith("ok") for v in sources.values())
-
-    return HealthResponse(
-        status="ok" if all_ok else "degraded",
-        timestamp=datetime.now(),
-        sources=sources,
-    )
+    """Cached stat/SELECT 1 checks; see api/health.py."""
+    return health.checker.check()
@@ -0,0 +1,293 @@
+"""In-process Prometheus metrics for the visualization API.
+
+Minimal counters, gauges and histograms rendered in the Prometheus text
+exposition format at ``GET /metrics``, with no client library needed.
+MetricsMiddleware records per-route latency and in-flight requests;
+``instrument()`` wraps a data source's read methods to record query
+timings and row counts; ``record_cache()`` counts cache hits and misses.
+"""
+
+import functools
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labels)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def label_sets(self) -> list[tuple[str, ...]]:
+        with self._lock:
+            return list(self._values)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label key -> [bucket counts..., sum, count]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def count(self, **labels: str) -> int:
+        row = self._values.get(self._key(labels))
+        return int(row[-1]) if row else 0
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = []
+        for key, row in items:
+            for bound, count in zip(self.buckets, row):
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {_format_value(count)}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(row[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {_format_value(row[-1])}")
+        return lines
+
+
+class Registry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        _update_cache_ratios()
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "snowtown_http_requests_total", "HTTP requests by route and status code.",
+    ("method", "route", "status"),
+))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "snowtown_http_request_duration_seconds", "HTTP request latency by route.",
+    ("method", "route"),
+))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "snowtown_http_requests_in_flight", "HTTP requests currently being served.",
+))
+QUERY_LATENCY = REGISTRY.register(Histogram(
+    "snowtown_query_duration_seconds", "Data source query latency.",
+    ("source", "operation"),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+))
+QUERY_ROWS = REGISTRY.register(Counter(
+    "snowtown_query_rows_total", "Rows (records) returned by data source queries.",
+    ("source", "operation"),
+))
+QUERY_ERRORS = REGISTRY.register(Counter(
+    "snowtown_query_errors_total", "Data source queries that raised.",
+    ("source", "operation"),
+))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "snowtown_cache_requests_total", "Cache lookups by cache and result (hit|miss).",
+    ("cache", "result"),
+))
+CACHE_HIT_RATIO = REGISTRY.register(Gauge(
+    "snowtown_cache_hit_ratio", "Fraction of cache lookups that hit since startup.",
+    ("cache",),
+))
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count one lookup against a named cache."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def _update_cache_ratios() -> None:
+    caches = {key[0] for key in CACHE_REQUESTS.label_sets()}
+    for cache in caches:
+        hits = CACHE_REQUESTS.value(cache=cache, result="hit")
+        total = hits + CACHE_REQUESTS.value(cache=cache, result="miss")
+        CACHE_HIT_RATIO.set(hits / total if total else 0.0, cache=cache)
+
+
+def _row_count(result) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, (list, tuple, dict, set)):
+        return len(result)
+    return 1
+
+
+@contextmanager
+def time_query(source: str, operation: str) -> Iterator[None]:
+    """Time a block as one query (for reads that are not a single method call)."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        QUERY_ERRORS.inc(source=source, operation=operation)
+        raise
+    finally:
+        QUERY_LATENCY.observe(time.perf_counter() - start, source=source, operation=operation)
+
+
+# Read-prefixed methods that are not queries (context managers, ...)
+NOT_QUERIES = frozenset({"read_transaction"})
+
+
+def instrument(obj, source: str, prefixes: tuple[str, ...] = ("query_", "read_", "get_", "list_", "count_", "search_")):
+    """Wrap an object's public read methods to record timings and row counts.
+
+    Methods are replaced on the instance only; the class is untouched.
+    Instrumenting the same instance twice is a no-op. Names in
+    ``NOT_QUERIES`` match the prefixes but are not queries, and are skipped.
+    """
+    if getattr(obj, "_metrics_source", None):
+        return obj
+    for name in dir(type(obj)):
+        if name.startswith("_") or not name.startswith(prefixes) or name in NOT_QUERIES:
+            continue
+        method = getattr(obj, name)
+        if callable(method):
+            setattr(obj, name, _timed(method, source, name))
+    obj._metrics_source = source
+    return obj
+
+
+def _timed(method, source: str, operation: str):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with time_query(source, operation):
+            result = method(*args, **kwargs)
+        QUERY_ROWS.inc(_row_count(result), source=source, operation=operation)
+        return result
+    return wrapper
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template.
+
+    Routes are labelled by their template (``/api/v1/nodes/{node_id}``),
+    not the raw path, so label cardinality stays bounded; requests that
+    match no route are labelled ``unmatched``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope.get("method", "")
+            HTTP_LATENCY.observe(elapsed, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status_code))
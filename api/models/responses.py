@@ -4,6 +4,9 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from contracts.loop_run import LoopRunSummary, StageTimingStats
+from contracts.research_signal import ResearchSignal
+
 
 # --- Ecosystem ---
 
@@ -125,6 +128,110 @@ class NodeDetail(BaseModel):
     recent_records: list[RecentRecord] = Field(default_factory=list)
 
 
+# --- Loop telemetry ---
+
+
+class LoopRunsResponse(BaseModel):
+    """Recent loop runs with per-stage duration percentiles."""
+
+    since: datetime
+    runs: list[LoopRunSummary]
+    stages: list[StageTimingStats]  # across the whole window
+    weekly: list[StageTimingStats]  # one entry per (ISO week, stage)
+
+
+# --- Research ---
+
+
+class SignalSearchHit(BaseModel):
+    """One full-text match: the signal, its BM25 score and a highlighted snippet."""
+
+    signal: ResearchSignal
+    score: float  # higher is better
+    snippet: str
+
+
+class SignalSearchResponse(BaseModel):
+    """A page of research signal search results."""
+
+    query: str
+    total: int
+    limit: int
+    offset: int
+    results: list[SignalSearchHit] = Field(default_factory=list)
+
+
+class RankedSignal(BaseModel):
+    """An unconsumed signal scored against persona and domain vocabulary."""
+
+    signal: ResearchSignal
+    score: float  # cosine similarity, 0-1
+    matched_terms: list[str] = Field(default_factory=list)
+
+
+class RankedSignalsResponse(BaseModel):
+    """Signals ranked by TF-IDF similarity to the query vocabulary."""
+
+    persona: str | None = None
+    domain: str | None = None
+    query_terms: list[str] = Field(default_factory=list)
+    candidates: int
+    results: list[RankedSignal] = Field(default_factory=list)
+
+
+class SignalClaim(BaseModel):
+    """A batch of signals leased to one consumer until expires_at."""
+
+    consumer: str
+    expires_at: datetime
+    signals: list[ResearchSignal] = Field(default_factory=list)
+
+
+class SignalTopic(BaseModel):
+    """A cluster of recent signals; signal_ids are closest to the centroid first."""
+
+    topic_id: int
+    size: int
+    top_terms: list[str] = Field(default_factory=list)
+    cohesion: float  # mean cosine similarity of members to the centroid
+    signal_ids: list[str] = Field(default_factory=list)
+    titles: list[str] = Field(default_factory=list)
+
+
+class TopicsResponse(BaseModel):
+    """Topics among the signals emitted in a recent window."""
+
+    since: datetime
+    signal_count: int
+    topics: list[SignalTopic] = Field(default_factory=list)
+
+
+class OutcomeGroup(BaseModel):
+    """Outcome records sharing one outcome, tag, tech_stack entry or month."""
+
+    key: str
+    count: int
+    share: float  # of the records in the window
+    mean: float | None = None  # of the requested value, skipping missing scores
+
+
+class Histogram(BaseModel):
+    counts: list[int] = Field(default_factory=list)
+    edges: list[float] = Field(default_factory=list)
+
+
+class OutcomeStatsResponse(BaseModel):
+    """Outcome counts, means and a value histogram over a window."""
+
+    since: datetime | None = None
+    outcome: str | None = None
+    total: int
+    group_by: str
+    value: str
+    groups: list[OutcomeGroup] = Field(default_factory=list)
+    histogram: Histogram
+
+
 # --- Health ---
 
 
@@ -146,3 +253,4 @@ class HealthResponse(BaseModel):
     status: str = "ok"
     timestamp: datetime
     sources: dict[str, str] = Field(default_factory=dict)
+    deep_checked_at: datetime | None = None  # last background deep check
@@ -35,6 +35,18 @@ class AcademyReader:
             if d.is_dir() and (d / "persona.yaml").exists()
         )
 
+    def data_version(self) -> tuple[tuple[int, ...], int]:
+        """Change token from stat calls only: (vector, newest mtime in ns)."""
+        if not self.personas_dir.exists():
+            return (), 0
+        newest = self.personas_dir.stat().st_mtime_ns
+        vector = [newest]
+        for path in sorted(self.personas_dir.glob("*/persona.yaml")):
+            st = path.stat()
+            vector.extend((st.st_size, st.st_mtime_ns))
+            newest = max(newest, st.st_mtime_ns)
+        return tuple(vector), newest
+
     def list_agents(self) -> list[AgentSummary]:
         agents = []
         for pid in self._persona_ids():
@@ -6,6 +6,7 @@ columns may not yet exist (schema added on first MCP server run).
 
 import json
 import sqlite3
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 
@@ -17,8 +18,14 @@ DEFAULT_DB_PATH = Path.home() / "incoming" / "caught_ideas.db"
 class UMReader:
     """Reads idea data from Ultra Magnus SQLite database."""
 
-    def __init__(self, db_path: Path | None = None):
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        on_cache_lookup: Callable[[str, bool], None] | None = None,
+    ):
         self.db_path = db_path or DEFAULT_DB_PATH
+        # Called with (cache name, hit) on each cached lookup
+        self._on_cache_lookup = on_cache_lookup
         self._has_pipeline_columns: bool | None = None
 
     def _connect(self) -> sqlite3.Connection:
@@ -28,7 +35,10 @@ class UMReader:
 
     def _check_pipeline_columns(self, conn: sqlite3.Connection) -> bool:
         """Check if pipeline columns exist (added by UM MCP _ensure_schema)."""
-        if self._has_pipeline_columns is not None:
+        hit = self._has_pipeline_columns is not None
+        if self._on_cache_lookup:
+            self._on_cache_lookup("um_pipeline_columns", hit)
+        if hit:
             return self._has_pipeline_columns
         cursor = conn.execute("PRAGMA table_info(caught_ideas)")
         columns = {row["name"] for row in cursor.fetchall()}
@@ -76,6 +86,18 @@ class UMReader:
         """Check if the database file exists and is readable."""
         return self.db_path.exists() and self.db_path.is_file()
 
+    def data_version(self) -> tuple[tuple[int, ...], int]:
+        """Change token from stat calls on the db and its WAL: (vector, newest mtime in ns)."""
+        vector: list[int] = []
+        for path in (self.db_path, self.db_path.with_name(self.db_path.name + "-wal")):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                vector.extend((0, 0))
+                continue
+            vector.extend((st.st_size, st.st_mtime_ns))
+        return tuple(vector), max(vector[1::2])
+
     def list_ideas(
         self,
         stage: str | None = None,
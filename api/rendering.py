@@ -0,0 +1,79 @@
+"""Fast JSON rendering for API responses.
+
+``FastJSONResponse`` is the app's default response class: it encodes with
+orjson when installed and falls back to compact stdlib ``json`` otherwise.
+``model_response`` skips FastAPI's generic encoding for Pydantic results
+entirely: models (or lists of models) are serialized to JSON bytes by
+pydantic-core in one pass, via cached TypeAdapters.
+"""
+
+import json
+import os
+from functools import cache
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+# Responses smaller than this are sent uncompressed (see GZipMiddleware in api/main.py)
+GZIP_MIN_BYTES = int(os.environ.get("SNOW_TOWN_GZIP_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.environ.get("SNOW_TOWN_GZIP_LEVEL", "5"))
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """Encode JSON-compatible content to compact UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (or compact stdlib json)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@cache
+def _adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+def model_response(
+    content: BaseModel | list,
+    annotation: Any = None,
+    include: set[str] | dict | None = None,
+    status_code: int = 200,
+) -> Response:
+    """Serialize a model or list of models straight to a JSON response.
+
+    ``annotation`` is the list type (e.g. ``list[ActivityEvent]``) when
+    ``content`` is a list; ``include`` limits each model to those fields
+    (or, for a single model, is any Pydantic include spec).
+    """
+    if isinstance(content, BaseModel):
+        body = content.model_dump_json(include=include).encode("utf-8")
+    else:
+        if annotation is None:
+            raise ValueError("model_response needs an annotation for list content")
+        body = _adapter(annotation).dump_json(
+            content, include={"__all__": include} if include else None,
+        )
+    return Response(content=body, status_code=status_code, media_type="application/json")
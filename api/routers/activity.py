@@ -6,16 +6,22 @@ chronological feed for the operator dashboard.
 
 from datetime import datetime
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
 
+from api.conditional import conditional_get
 from api.deps import get_store
 from api.models.responses import ActivityEvent
+from api.rendering import model_response
 
-router = APIRouter(prefix="/api/v1", tags=["activity"])
+router = APIRouter(
+    prefix="/api/v1",
+    tags=["activity"],
+    dependencies=[conditional_get("store")],
+)
 
 
 @router.get("/activity", response_model=list[ActivityEvent])
-def get_activity(limit: int = Query(default=50, ge=1, le=200)) -> list[ActivityEvent]:
+def get_activity(limit: int = Query(default=50, ge=1, le=200)) -> Response:
     store = get_store()
 
     events: list[ActivityEvent] = []
@@ -72,4 +78,4 @@ def get_activity(limit: int = Query(default=50, ge=1, le=200)) -> list[ActivityE
 
     # Sort by timestamp descending, then limit
     events.sort(key=lambda e: e.timestamp, reverse=True)
-    return events[:limit]
+    return model_response(events[:limit], list[ActivityEvent])
@@ -3,22 +3,28 @@
 Lists and details for all personas from the Agent Persona Academy.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 
+from api.conditional import conditional_get
 from api.deps import get_academy
 from api.models.responses import AgentDetail, AgentSummary
+from api.rendering import model_response
 
-router = APIRouter(prefix="/api/v1", tags=["agents"])
+router = APIRouter(
+    prefix="/api/v1",
+    tags=["agents"],
+    dependencies=[conditional_get("academy")],
+)
 
 
 @router.get("/agents", response_model=list[AgentSummary])
-def list_agents() -> list[AgentSummary]:
-    return get_academy().list_agents()
+def list_agents() -> Response:
+    return model_response(get_academy().list_agents(), list[AgentSummary])
 
 
 @router.get("/agents/{agent_id}", response_model=AgentDetail)
-def get_agent(agent_id: str) -> AgentDetail:
+def get_agent(agent_id: str) -> Response:
     agent = get_academy().get_agent(agent_id)
     if agent is None:
         raise HTTPException(status_code=404, detail=f"Agent not found: '{agent_id}'")
-    return agent
+    return model_response(agent)
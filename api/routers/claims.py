@@ -0,0 +1,78 @@
+"""Research signal work-queue endpoints.
+
+Remote consumers (IdeaForge, Sky-Lynx) claim batches of unconsumed
+signals under a lease, then ack or release them; see
+``ContractStore.claim_signals``. Not cached: every call changes state.
+Requests need the SNOW_TOWN_WRITE_TOKEN bearer token, like ingest.
+"""
+
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, Response
+from pydantic import BaseModel, Field
+
+from api.deps import get_store, require_write_token
+from api.models.responses import SignalClaim
+from api.rendering import model_response
+from api.routers.research import SIGNAL_LIST_FIELDS
+from contracts.store import CLAIM_LEASE_SECONDS
+
+router = APIRouter(
+    prefix="/api/v1/research/claims", tags=["research"],
+    dependencies=[Depends(require_write_token)],
+)
+
+
+class ClaimRequest(BaseModel):
+    consumer: str = Field(min_length=1)
+    limit: int = Field(default=100, ge=1, le=1000)
+    lease_seconds: float = Field(default=CLAIM_LEASE_SECONDS, gt=0, le=86400)
+    source: str | None = None
+    relevance: str | None = None
+    domain: str | None = None
+    collapse_duplicates: bool = False
+
+
+class AckRequest(BaseModel):
+    consumer: str = Field(min_length=1)
+    signal_ids: list[str] = Field(max_length=10000)
+
+
+class ReleaseRequest(BaseModel):
+    consumer: str = Field(min_length=1)
+    signal_ids: list[str] | None = None  # None releases all of the consumer's claims
+
+
+@router.post("", response_model=SignalClaim)
+def claim_signals(body: ClaimRequest) -> Response:
+    """Lease up to ``limit`` unconsumed signals, oldest first."""
+    # Taken before the claim, so it never overstates the lease
+    expires_at = datetime.now() + timedelta(seconds=body.lease_seconds)
+    signals = get_store().claim_signals(
+        body.consumer,
+        source=body.source,
+        relevance=body.relevance,
+        domain=body.domain,
+        limit=body.limit,
+        lease_seconds=body.lease_seconds,
+        collapse_duplicates=body.collapse_duplicates,
+    )
+    claim = SignalClaim(consumer=body.consumer, expires_at=expires_at, signals=signals)
+    return model_response(
+        claim,
+        include={"consumer": True, "expires_at": True, "signals": {"__all__": SIGNAL_LIST_FIELDS}},
+    )
+
+
+@router.post("/ack")
+def ack_signals(body: AckRequest) -> dict:
+    """Mark claimed signals consumed; lists the IDs the consumer still held."""
+    acked = get_store().ack_signals(body.consumer, body.signal_ids)
+    return {"consumer": body.consumer, "acked": acked}
+
+
+@router.post("/release")
+def release_signals(body: ReleaseRequest) -> dict:
+    """Hand claimed signals back to the queue."""
+    released = get_store().release_signals(body.consumer, body.signal_ids)
+    return {"consumer": body.consumer, "released": released}
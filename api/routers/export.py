@@ -0,0 +1,169 @@
+"""NDJSON export endpoints.
+
+Streams a contract type's JSONL file (the source of truth) with constant
+memory, for Sky-Lynx, Metroplex and notebooks that sync history remotely.
+
+Every export covers the file up to a snapshot offset taken when the
+request starts, returned as ``X-Export-End-Offset``; pass it back as
+``?offset=`` to fetch only records appended since. Unfiltered exports are
+byte-for-byte slices of the (logical, decompressed) file and also honor
+``Range: bytes=...``; time-filtered ones skip sealed segments outside the
+window (see contracts/segments.py).
+Bodies are gzip-compressed by GZipMiddleware when the client accepts it
+(partial 206 responses are sent as-is).
+"""
+
+import json
+import re
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from api.deps import get_store
+from contracts.store import CONTRACT_MODELS, EXPORT_CHUNK_BYTES, ContractStore
+from contracts.timestamps import local_naive
+
+router = APIRouter(prefix="/api/v1/export", tags=["export"])
+
+MEDIA_TYPE = "application/x-ndjson"
+END_OFFSET_HEADER = "X-Export-End-Offset"
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Resolve a single ``bytes=`` range to ``[start, end)``.
+
+    Returns None for headers we ignore (multiple or malformed ranges),
+    in which case the full body is sent. Raises 416 if unsatisfiable.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if match is None or match.group(0) == "bytes=-":
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last) + 1, size) if last else size
+    else:
+        start, end = max(size - int(last), 0), size
+    if start >= size or start >= end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+def _filtered_lines(
+    store: ContractStore,
+    contract_type: str,
+    start: int,
+    end: int,
+    since: datetime | None,
+    until: datetime | None,
+    fields: list[str] | None,
+) -> Iterator[bytes]:
+    """Matching records, batched into roughly chunk-sized writes.
+
+    Sealed segments entirely outside ``[since, until)`` are never opened.
+    """
+    buffer: list[bytes] = []
+    size = 0
+    ranges = store.jsonl_ranges(contract_type, since, until, start, end)
+    lines = (
+        line for lo, hi in ranges for line, _ in store.iter_jsonl_lines(contract_type, lo, hi)
+    )
+    for line in lines:
+        record = json.loads(line)
+        if since is not None or until is not None:
+            emitted_at = local_naive(record["emitted_at"])
+            if since is not None and emitted_at < since:
+                continue
+            if until is not None and emitted_at >= until:
+                continue
+        if fields is not None:
+            out = (json.dumps({f: record[f] for f in fields if f in record}) + "\n").encode()
+        else:
+            out = line
+        buffer.append(out)
+        size += len(out)
+        if size >= EXPORT_CHUNK_BYTES:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+@router.get("/{contract_type}.ndjson")
+def export_contracts(
+    request: Request,
+    contract_type: str,
+    since: Annotated[
+        datetime | None, Query(description="Only records emitted at or after this time")
+    ] = None,
+    until: Annotated[
+        datetime | None, Query(description="Only records emitted before this time")
+    ] = None,
+    fields: Annotated[
+        str | None, Query(description="Comma-separated fields to keep per record")
+    ] = None,
+    offset: Annotated[int, Query(ge=0, description="Resume from this JSONL byte offset")] = 0,
+) -> Response:
+    """Stream one contract type as newline-delimited JSON."""
+    model = CONTRACT_MODELS.get(contract_type)
+    if model is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown contract type: '{contract_type}'. "
+                   f"Valid types: {', '.join(CONTRACT_MODELS)}",
+        )
+
+    field_list = None
+    if fields:
+        field_list = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = sorted(set(field_list) - set(model.model_fields))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown field(s): {', '.join(unknown)}")
+
+    store = get_store()
+    end = store.jsonl_extent(contract_type)
+    headers = {END_OFFSET_HEADER: str(end)}
+    raw = since is None and until is None and field_list is None
+
+    if not raw:
+        headers["Accept-Ranges"] = "none"
+        body = _filtered_lines(
+            store, contract_type, offset, end,
+            local_naive(since), local_naive(until), field_list,
+        )
+        return StreamingResponse(body, media_type=MEDIA_TYPE, headers=headers)
+
+    headers["Accept-Ranges"] = "bytes"
+    byte_range = None
+    if offset == 0 and "range" in request.headers:
+        byte_range = _parse_range(request.headers["range"], end)
+
+    if byte_range is None:
+        start = 0
+        if offset:
+            # Snap a resume offset to the next line boundary
+            lines = store.iter_jsonl_lines(contract_type, offset, end)
+            start = next((pos - len(line) for line, pos in lines), end)
+            lines.close()
+        headers["Content-Length"] = str(end - start)
+        return StreamingResponse(
+            store.iter_jsonl_bytes(contract_type, start, end),
+            media_type=MEDIA_TYPE, headers=headers,
+        )
+
+    start, stop = byte_range
+    headers["Content-Range"] = f"bytes {start}-{stop - 1}/{end}"
+    headers["Content-Length"] = str(stop - start)
+    return StreamingResponse(
+        store.iter_jsonl_bytes(contract_type, start, stop),
+        status_code=206, media_type=MEDIA_TYPE, headers=headers,
+    )
@@ -0,0 +1,49 @@
+"""Bulk ingest endpoints.
+
+Producers on other hosts POST NDJSON batches of one contract type;
+see contracts/ingest.py for validation, dedupe and the batched write.
+Requests need the SNOW_TOWN_WRITE_TOKEN bearer token (see
+api.deps.require_write_token).
+"""
+
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+from api.deps import get_store, require_write_token
+from api.rendering import model_response
+from contracts.ingest import IngestResult, ingest_ndjson
+from contracts.store import CONTRACT_MODELS
+
+router = APIRouter(
+    prefix="/api/v1/ingest", tags=["ingest"], dependencies=[Depends(require_write_token)],
+)
+
+INGEST_MAX_BYTES = int(os.environ.get("SNOW_TOWN_INGEST_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+@router.post("/{contract_type}", response_model=IngestResult)
+async def ingest_contracts(request: Request, contract_type: str) -> Response:
+    """Validate and write an NDJSON batch, reporting errors per line.
+
+    Valid records are written even when other lines fail; records whose
+    natural id is already stored (or repeated in the batch) are skipped.
+    """
+    if contract_type not in CONTRACT_MODELS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown contract type: '{contract_type}'. "
+                   f"Valid types: {', '.join(CONTRACT_MODELS)}",
+        )
+    declared = request.headers.get("content-length")
+    if declared is not None and not declared.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+    if declared is not None and int(declared) > INGEST_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {INGEST_MAX_BYTES} bytes")
+    body = await request.body()
+    if len(body) > INGEST_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {INGEST_MAX_BYTES} bytes")
+
+    result = await run_in_threadpool(ingest_ndjson, get_store(), contract_type, body)
+    return model_response(result)
@@ -0,0 +1,39 @@
+"""Feedback loop telemetry API endpoints.
+
+Serves LoopSpans recorded by the loop orchestrator, persona upgrader,
+review tool and ContractStore (see contracts/telemetry.py).
+"""
+
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Query, Response
+
+from api.conditional import conditional_get
+from api.deps import get_store
+from api.models.responses import LoopRunsResponse
+from api.rendering import model_response
+from contracts.loop_run import stage_timing_stats, summarize_runs
+
+router = APIRouter(
+    prefix="/api/v1/loop",
+    tags=["loop"],
+    dependencies=[conditional_get("store")],
+)
+
+
+@router.get("/runs", response_model=LoopRunsResponse)
+def list_runs(
+    weeks: int = Query(default=12, ge=1, le=104, description="How many weeks of spans to aggregate"),
+    stage: str | None = Query(default=None, description="Only this stage (e.g. persona_upgrader.validate_patch)"),
+    limit: int = Query(default=20, ge=1, le=500, description="Maximum runs to list"),
+) -> Response:
+    """Recent runs plus p50/p95 duration per stage, overall and per week."""
+    store = get_store()
+    since = datetime.now() - timedelta(weeks=weeks)
+    spans = store.query_spans(stage=stage, since=since, limit=100000)
+    return model_response(LoopRunsResponse(
+        since=since,
+        runs=summarize_runs(spans)[:limit],
+        stages=stage_timing_stats(spans),
+        weekly=stage_timing_stats(spans, by_week=True),
+    ))
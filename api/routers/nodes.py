@@ -6,13 +6,19 @@ and per-node metrics breakdown.
 
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 
+from api.conditional import conditional_get
 from api.deps import get_store
 from api.models.responses import NodeDetail, NodeMetrics, RecentRecord
+from api.rendering import model_response
 from api.routers.ecosystem import _health_status
 
-router = APIRouter(prefix="/api/v1", tags=["nodes"])
+router = APIRouter(
+    prefix="/api/v1",
+    tags=["nodes"],
+    dependencies=[conditional_get("store")],
+)
 
 VALID_NODES = {"ultra_magnus", "sky_lynx", "academy"}
 DISPLAY_NAMES = {
@@ -23,7 +29,7 @@ DISPLAY_NAMES = {
 
 
 @router.get("/nodes/{node_id}", response_model=NodeDetail)
-def get_node_detail(node_id: str) -> NodeDetail:
+def get_node_detail(node_id: str) -> Response:
     if node_id not in VALID_NODES:
         raise HTTPException(
             status_code=404,
@@ -33,11 +39,12 @@ def get_node_detail(node_id: str) -> NodeDetail:
     store = get_store()
 
     if node_id == "ultra_magnus":
-        return _build_um_detail(store)
+        detail = _build_um_detail(store)
     elif node_id == "sky_lynx":
-        return _build_sl_detail(store)
+        detail = _build_sl_detail(store)
     else:
-        return _build_academy_detail(store)
+        detail = _build_academy_detail(store)
+    return model_response(detail)
 
 
 def _build_um_detail(store) -> NodeDetail:
@@ -0,0 +1,60 @@
+"""Outcome analytics endpoints.
+
+Aggregates over OutcomeRecord history served from the columnar cache
+(see contracts.outcome_columns), so no record JSON is decoded per request.
+"""
+
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, HTTPException, Query
+
+from api.conditional import conditional_get
+from api.deps import get_outcome_columns
+from api.models.responses import Histogram, OutcomeGroup, OutcomeStatsResponse
+from contracts.outcome_columns import GROUP_KEYS, NUMERIC_COLUMNS
+
+router = APIRouter(
+    prefix="/api/v1/outcomes",
+    tags=["outcomes"],
+    dependencies=[conditional_get("store")],
+)
+
+
+@router.get("/stats", response_model=OutcomeStatsResponse)
+def outcome_stats(
+    days: int | None = Query(default=None, ge=1, le=3650, description="Only the last N days"),
+    outcome: str | None = Query(default=None, description="Filter by terminal outcome"),
+    group_by: str = Query(default="outcome", description=f"One of {', '.join(GROUP_KEYS)}"),
+    value: str = Query(
+        default="overall_score", description=f"One of {', '.join(NUMERIC_COLUMNS)}",
+    ),
+    bins: int = Query(default=10, ge=1, le=100, description="Histogram bins"),
+) -> OutcomeStatsResponse:
+    """Counts and mean ``value`` per group, plus a histogram of ``value``."""
+    if group_by not in GROUP_KEYS:
+        raise HTTPException(status_code=400, detail=f"Unknown group_by: {group_by}")
+    if value not in NUMERIC_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Unknown value: {value}")
+    columns = get_outcome_columns()
+    since = datetime.now() - timedelta(days=days) if days else None
+    mask = columns.mask(since=since, outcome=outcome)
+    total = int(mask.sum())
+    groups = columns.group_by(group_by, value, mask=mask)
+    counts, edges = columns.histogram(value, bins=bins, mask=mask)
+    return OutcomeStatsResponse(
+        since=since,
+        outcome=outcome,
+        total=total,
+        group_by=group_by,
+        value=value,
+        groups=[
+            OutcomeGroup(
+                key=key,
+                count=count,
+                share=round(count / total, 4),
+                mean=None if mean is None else round(mean, 4),
+            )
+            for key, (count, mean) in sorted(groups.items(), key=lambda g: (-g[1][0], g[0]))
+        ],
+        histogram=Histogram(counts=counts.tolist(), edges=edges.tolist()),
+    )
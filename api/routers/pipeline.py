@@ -3,12 +3,18 @@
 Read-only access to the caught_ideas.db via UMReader.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 
+from api.conditional import conditional_get
 from api.deps import get_um
 from api.models.responses import IdeaDetail, IdeaSummary
+from api.rendering import model_response
 
-router = APIRouter(prefix="/api/v1", tags=["pipeline"])
+router = APIRouter(
+    prefix="/api/v1",
+    tags=["pipeline"],
+    dependencies=[conditional_get("um")],
+)
 
 
 @router.get("/pipeline/ideas", response_model=list[IdeaSummary])
@@ -16,16 +22,17 @@ def list_ideas(
     stage: str | None = Query(None, description="Filter by pipeline stage"),
     status: str | None = Query(None, description="Filter by processing status"),
     limit: int = Query(50, ge=1, le=200, description="Max results"),
-) -> list[IdeaSummary]:
-    return get_um().list_ideas(stage=stage, status=status, limit=limit)
+) -> Response:
+    ideas = get_um().list_ideas(stage=stage, status=status, limit=limit)
+    return model_response(ideas, list[IdeaSummary])
 
 
 @router.get("/pipeline/ideas/{idea_id}", response_model=IdeaDetail)
-def get_idea(idea_id: int) -> IdeaDetail:
+def get_idea(idea_id: int) -> Response:
     idea = get_um().get_idea(idea_id)
     if idea is None:
         raise HTTPException(status_code=404, detail=f"Idea not found: {idea_id}")
-    return idea
+    return model_response(idea)
 
 
 @router.get("/pipeline/stages", response_model=dict[str, int])
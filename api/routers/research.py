@@ -1,16 +1,39 @@
 """Research signals API endpoints.
 
 Provides access to research intelligence signals stored
-in the ContractStore.
+in the ContractStore, plus TF-IDF ranking and topic clustering
+(see contracts.signal_tfidf).
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 
-from api.deps import get_store
+from api.conditional import conditional_get
+from api.deps import get_academy, get_signal_tfidf, get_store
+from api.models.responses import (
+    AgentDetail,
+    RankedSignal,
+    RankedSignalsResponse,
+    SignalSearchHit,
+    SignalSearchResponse,
+    SignalTopic,
+    TopicsResponse,
+)
+from api.rendering import model_response
+from contracts.research_signal import ResearchSignal
 
-router = APIRouter(prefix="/api/v1/research", tags=["research"])
+router = APIRouter(
+    prefix="/api/v1/research",
+    tags=["research"],
+    dependencies=[conditional_get("store")],
+)
+
+# Fields returned by /signals (everything but contract_version and raw_data)
+SIGNAL_LIST_FIELDS = {
+    "signal_id", "source", "title", "summary", "url", "relevance",
+    "relevance_rationale", "tags", "domain", "consumed_by", "emitted_at",
+}
 
 
 @router.get("/signals")
@@ -20,7 +43,8 @@ def list_signals(
     domain: str | None = Query(default=None, description="Filter by domain"),
     consumed: bool | None = Query(default=None, description="Filter by consumed status"),
     limit: int = Query(default=50, ge=1, le=500),
-) -> list[dict]:
+    collapse_duplicates: bool = Query(default=False, description="Hide near-duplicates of other signals"),
+) -> Response:
     """List research signals with optional filtering."""
     store = get_store()
     signals = store.query_signals(
@@ -29,30 +53,170 @@ def list_signals(
         domain=domain,
         consumed=consumed,
         limit=limit,
+        collapse_duplicates=collapse_duplicates,
+    )
+    return model_response(signals, list[ResearchSignal], include=SIGNAL_LIST_FIELDS)
+
+
+@router.get("/search", response_model=SignalSearchResponse)
+def search_signals(
+    q: str = Query(min_length=1, description='Words or "quoted phrases" (all must match); word* for prefixes'),
+    source: str | None = Query(default=None, description="Filter by source"),
+    relevance: str | None = Query(default=None, description="Filter by relevance"),
+    domain: str | None = Query(default=None, description="Filter by domain"),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    collapse_duplicates: bool = Query(default=False, description="Hide near-duplicates of other signals"),
+) -> Response:
+    """Full-text search over signal titles, summaries, rationales and tags, best match first."""
+    store = get_store()
+    filters = {
+        "source": source, "relevance": relevance, "domain": domain,
+        "collapse_duplicates": collapse_duplicates,
+    }
+    try:
+        hits = store.search_signals(q, limit=limit, offset=offset, **filters)
+        total = store.count_signal_matches(q, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    response = SignalSearchResponse(
+        query=q, total=total, limit=limit, offset=offset,
+        results=[
+            SignalSearchHit(signal=signal, score=score, snippet=snippet)
+            for signal, score, snippet in hits
+        ],
     )
-    return [
-        {
-            "signal_id": s.signal_id,
-            "source": s.source.value,
-            "title": s.title,
-            "summary": s.summary,
-            "url": s.url,
-            "relevance": s.relevance.value,
-            "relevance_rationale": s.relevance_rationale,
-            "tags": s.tags,
-            "domain": s.domain,
-            "consumed_by": s.consumed_by,
-            "emitted_at": s.emitted_at.isoformat(),
-        }
-        for s in signals
-    ]
+    return model_response(
+        response,
+        include={
+            "query": True, "total": True, "limit": True, "offset": True,
+            "results": {"__all__": {"signal": SIGNAL_LIST_FIELDS, "score": True, "snippet": True}},
+        },
+    )
+
+
+def _persona_text(agent: AgentDetail) -> str:
+    """The vocabulary a persona brings: role, background, works, frameworks, tags."""
+    parts = [agent.role, agent.background, *agent.notable_works, *agent.frameworks,
+             *agent.case_studies, *agent.metadata.get("tags", [])]
+    return " ".join(str(p) for p in parts if p)
+
+
+@router.get(
+    "/ranked",
+    response_model=RankedSignalsResponse,
+    dependencies=[conditional_get("store", "academy")],
+)
+def ranked_signals(
+    persona: str | None = Query(default=None, description="Rank for this persona (default: all personas)"),
+    domain: str | None = Query(default=None, description="Blend in this domain's vocabulary"),
+    q: str | None = Query(default=None, description="Extra free-text terms"),
+    limit: int = Query(default=20, ge=1, le=100),
+    include_consumed: bool = Query(default=False, description="Also rank consumed signals"),
+    collapse_duplicates: bool = Query(default=False, description="Hide near-duplicates of other signals"),
+) -> Response:
+    """Signals ranked by TF-IDF cosine similarity to persona and domain vocabulary."""
+    academy = get_academy()
+    if persona is not None:
+        agent = academy.get_agent(persona)
+        if agent is None:
+            raise HTTPException(status_code=404, detail=f"Persona '{persona}' not found")
+        agents = [agent]
+    else:
+        agents = [a for a in (academy.get_agent(s.id) for s in academy.list_agents()) if a]
+
+    store = get_store()
+    model = get_signal_tfidf()
+    candidates = store.list_signal_ids(
+        consumed=None if include_consumed else False,
+        collapse_duplicates=collapse_duplicates,
+    )
+    texts = [" ".join(_persona_text(a) for a in agents)] + ([q] if q else [])
+    try:
+        query_terms, ranked = model.rank_texts(
+            texts, domain=domain, signal_ids=candidates, limit=limit,
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="No query vocabulary: pass persona, domain or q terms that occur in signals",
+        ) from None
+    signals = {s.signal_id: s for s in store.get_signals([sid for sid, _, _ in ranked])}
+    response = RankedSignalsResponse(
+        persona=persona,
+        domain=domain,
+        query_terms=query_terms,
+        candidates=len(candidates),
+        results=[
+            RankedSignal(signal=signals[sid], score=score, matched_terms=terms)
+            for sid, score, terms in ranked if sid in signals
+        ],
+    )
+    return model_response(
+        response,
+        include={
+            "persona": True, "domain": True, "query_terms": True, "candidates": True,
+            "results": {
+                "__all__": {"signal": SIGNAL_LIST_FIELDS, "score": True, "matched_terms": True},
+            },
+        },
+    )
+
+
+@router.get("/topics", response_model=TopicsResponse)
+def signal_topics(
+    days: int = Query(default=14, ge=1, le=365, description="Cluster signals from the last N days"),
+    k: int = Query(default=8, ge=1, le=20, description="Maximum number of topics"),
+    per_topic: int = Query(default=5, ge=1, le=50, description="Signals listed per topic"),
+    collapse_duplicates: bool = Query(default=False, description="Cluster each near-duplicate group once"),
+) -> TopicsResponse:
+    """Recent signals grouped into topics by spherical k-means over TF-IDF vectors."""
+    store = get_store()
+    model = get_signal_tfidf()
+    since = datetime.now() - timedelta(days=days)
+    signal_ids = store.list_signal_ids(collapse_duplicates=True) if collapse_duplicates else None
+    clusters = model.cluster(since, k=k, signal_ids=signal_ids)
+    shown = [sid for c in clusters for sid in c["signal_ids"][:per_topic]]
+    titles = {s.signal_id: s.title for s in store.get_signals(shown)}
+    return TopicsResponse(
+        since=since,
+        signal_count=sum(c["size"] for c in clusters),
+        topics=[
+            SignalTopic(
+                topic_id=i,
+                size=c["size"],
+                top_terms=c["top_terms"],
+                cohesion=round(c["cohesion"], 4),
+                signal_ids=c["signal_ids"][:per_topic],
+                titles=[titles.get(sid, "") for sid in c["signal_ids"][:per_topic]],
+            )
+            for i, c in enumerate(clusters)
+        ],
+    )
+
+
+@router.get("/signals/{signal_id}/duplicates")
+def list_duplicates(signal_id: str) -> dict:
+    """Near-duplicates of a signal, resolved to its canonical signal first."""
+    store = get_store()
+    canonical = store.canonical_signal_id(signal_id) or signal_id
+    return {
+        "signal_id": signal_id,
+        "canonical_signal_id": canonical,
+        "duplicates": [
+            {"signal_id": dup_id, "similarity": score}
+            for dup_id, score in store.signal_duplicates(canonical)
+        ],
+    }
 
 
 @router.get("/summary")
-def get_summary() -> dict:
+def get_summary(
+    collapse_duplicates: bool = Query(default=False, description="Count each near-duplicate cluster once"),
+) -> dict:
     """Get aggregate research signal statistics."""
     store = get_store()
-    all_signals = store.query_signals(limit=10000)
+    all_signals = store.query_signals(limit=10000, collapse_duplicates=collapse_duplicates)
 
     by_source: dict[str, int] = {}
     by_relevance: dict[str, int] = {}
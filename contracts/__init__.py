@@ -5,6 +5,7 @@ Defines the data contracts that flow between layers:
 - ImprovementRecommendation: Sky-Lynx -> Academy
 - PersonaUpgradePatch: Academy -> Ultra Magnus
 - ResearchSignal: Research Agents -> Sky-Lynx
+- LoopSpan: feedback loop stages -> loop telemetry
 """
 
 from .improvement_recommendation import (
@@ -13,6 +14,8 @@ from .improvement_recommendation import (
     RecommendationType,
     TargetScope,
 )
+from .loop_run import LoopSpan
+from .loop_status import LoopStatus, collect_loop_status
 from .outcome_record import OutcomeRecord, PipelineTrace, TerminalOutcome
 from .persona_upgrade_patch import PersonaFieldPatch, PersonaUpgradePatch
 from .research_signal import ResearchSignal, SignalRelevance, SignalSource
@@ -31,5 +34,8 @@ __all__ = [
     "ResearchSignal",
     "SignalRelevance",
     "SignalSource",
+    "LoopSpan",
     "ContractStore",
+    "LoopStatus",
+    "collect_loop_status",
 ]
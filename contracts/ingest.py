@@ -0,0 +1,146 @@
+"""Batch ingest of NDJSON contract records.
+
+Lets producers on other hosts push many records per request (see
+``POST /api/v1/ingest/{contract_type}``) instead of importing
+ContractStore and writing one record per commit.
+
+Lines are validated in a process pool for large batches (Pydantic
+validation holds the GIL, so threads would not help), deduplicated by
+natural id against each other and the store (replays are skipped; of
+differing records with one id the last wins, as in single writes), and
+written through one ``ContractStore.write_batch`` transaction. Invalid lines are reported by
+line number and do not block the valid ones.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from pydantic import BaseModel, Field, ValidationError
+
+from .store import ContractStore, load_record, record_digest
+
+INGEST_WORKERS = int(os.environ.get("SNOW_TOWN_INGEST_WORKERS", "0")) or (os.cpu_count() or 1)
+# Smaller batches validate faster inline than the pool round trip costs
+PARALLEL_MIN_LINES = int(os.environ.get("SNOW_TOWN_INGEST_PARALLEL_MIN_LINES", "2000"))
+CHUNK_LINES = 500
+
+_pool: ProcessPoolExecutor | None = None
+
+
+class LineError(BaseModel):
+    """A rejected NDJSON line (1-based)."""
+    line: int
+    error: str
+
+
+class IngestResult(BaseModel):
+    """Outcome of one ingest batch."""
+    contract_type: str
+    received: int = 0
+    written: int = 0
+    duplicates: int = 0
+    duplicate_lines: list[int] = Field(default_factory=list)
+    errors: list[LineError] = Field(default_factory=list)
+
+
+def _format_error(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'record'}: {err['msg']}" for err in e.errors()
+    )
+
+
+def validate_chunk(
+    contract_type: str, lines: list[tuple[int, bytes]],
+) -> list[tuple[int, BaseModel | str]]:
+    """Validate numbered lines, upcasting older contract versions.
+
+    Each result is a model or an error message.
+    """
+    results: list[tuple[int, BaseModel | str]] = []
+    for line_no, line in lines:
+        try:
+            results.append((line_no, load_record(contract_type, line)))
+        except ValidationError as e:
+            results.append((line_no, _format_error(e)))
+        except (ValueError, KeyError, TypeError) as e:
+            # Bad JSON (JSONDecodeError is a ValueError), or a migrator
+            # failing on an unexpected old record
+            results.append((line_no, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: the API process runs threads, which fork does not copy safely
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the validation workers, if started."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def validate_lines(
+    contract_type: str,
+    body: bytes,
+    workers: int = INGEST_WORKERS,
+    parallel_min_lines: int = PARALLEL_MIN_LINES,
+) -> list[tuple[int, BaseModel | str]]:
+    """Validate every non-blank NDJSON line of ``body``, in line order."""
+    lines = [(i, line) for i, line in enumerate(body.splitlines(), start=1) if line.strip()]
+    if workers <= 1 or len(lines) < parallel_min_lines:
+        return validate_chunk(contract_type, lines)
+    pool = _get_pool(workers)
+    chunks = [lines[i:i + CHUNK_LINES] for i in range(0, len(lines), CHUNK_LINES)]
+    results: list[tuple[int, BaseModel | str]] = []
+    for chunk_results in pool.map(validate_chunk, [contract_type] * len(chunks), chunks):
+        results.extend(chunk_results)
+    return results
+
+
+def ingest_ndjson(
+    store: ContractStore,
+    contract_type: str,
+    body: bytes,
+    workers: int = INGEST_WORKERS,
+) -> IngestResult:
+    """Validate, dedupe and write one NDJSON batch."""
+    result = IngestResult(contract_type=contract_type)
+    # By natural key: (line number, record, record_digest)
+    candidates: dict[tuple, tuple[int, BaseModel, int]] = {}
+    for line_no, outcome in validate_lines(contract_type, body, workers):
+        result.received += 1
+        if isinstance(outcome, str):
+            result.errors.append(LineError(line=line_no, error=outcome))
+            continue
+        key = store.natural_key(contract_type, outcome)
+        digest = record_digest(outcome)
+        previous = candidates.pop(key, None)
+        if previous is not None and previous[2] == digest:
+            result.duplicate_lines.append(line_no)
+            candidates[key] = previous
+            continue
+        if previous is not None:  # superseded by this rewrite
+            result.duplicate_lines.append(previous[0])
+        candidates[key] = (line_no, outcome, digest)
+
+    # One transaction: no other writer can store these keys between check and write
+    with store.transaction():
+        stored = store.stored_digests(contract_type, list(candidates))
+        records = []
+        for key, (line_no, record, digest) in candidates.items():
+            if stored.get(key) == digest:
+                result.duplicate_lines.append(line_no)
+            else:
+                records.append(record)
+        result.written = store.write_batch(contract_type, records)
+    result.duplicate_lines.sort()
+    # Records write_batch still found stored count as duplicates (lines unknown)
+    result.duplicates = len(result.duplicate_lines) + len(records) - result.written
+    return result
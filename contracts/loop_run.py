@@ -0,0 +1,128 @@
+"""LoopSpan contract: timing and token telemetry for feedback loop stages.
+
+Emitted by the loop orchestrator, persona upgrader, review tool and
+ContractStore (see contracts/telemetry.py) for each timed stage of work.
+Spans from one loop run share a run_id.
+"""
+
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class LoopSpan(BaseModel):
+    """One timed unit of work in a feedback loop run.
+
+    Postcondition: record is append-only, written to JSONL + SQLite.
+    Invariant: span_id is unique; contract_version always present.
+    """
+    contract_version: str = "1.0.0"
+    span_id: str = Field(default_factory=lambda: f"span-{uuid.uuid4().hex[:12]}")
+    run_id: str
+    stage: str
+    parent_span_id: str | None = None
+    started_at: datetime = Field(default_factory=datetime.now)
+    duration_seconds: float = 0.0
+    status: str = "ok"  # ok | error
+    error: str | None = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    attributes: dict = Field(default_factory=dict)
+    emitted_at: datetime = Field(default_factory=datetime.now)
+
+    def add_usage(self, usage) -> None:
+        """Add token counts from an Anthropic ``response.usage`` object."""
+        if usage is None:
+            return
+        self.input_tokens += getattr(usage, "input_tokens", 0) or 0
+        self.output_tokens += getattr(usage, "output_tokens", 0) or 0
+        self.cache_creation_input_tokens += getattr(usage, "cache_creation_input_tokens", 0) or 0
+        self.cache_read_input_tokens += getattr(usage, "cache_read_input_tokens", 0) or 0
+
+
+class StageTimingStats(BaseModel):
+    """Duration percentiles and token totals for one stage (optionally one ISO week)."""
+    stage: str
+    week: str | None = None  # e.g. "2026-W07"
+    count: int
+    errors: int
+    p50_seconds: float
+    p95_seconds: float
+    max_seconds: float
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class LoopRunSummary(BaseModel):
+    """Wall-clock extent and totals for one loop run."""
+    run_id: str
+    started_at: datetime
+    duration_seconds: float
+    span_count: int
+    errors: int
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[min(int(rank), len(sorted_values)) - 1]
+
+
+def iso_week(ts: datetime) -> str:
+    year, week, _ = ts.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def stage_timing_stats(spans: list[LoopSpan], by_week: bool = False) -> list[StageTimingStats]:
+    """Aggregate span durations per stage, or per (week, stage)."""
+    groups: dict[tuple[str | None, str], list[LoopSpan]] = defaultdict(list)
+    for span in spans:
+        week = iso_week(span.started_at) if by_week else None
+        groups[(week, span.stage)].append(span)
+
+    stats = []
+    for (week, stage), group in sorted(groups.items(), key=lambda kv: (kv[0][0] or "", kv[0][1])):
+        durations = sorted(s.duration_seconds for s in group)
+        stats.append(StageTimingStats(
+            stage=stage,
+            week=week,
+            count=len(group),
+            errors=sum(1 for s in group if s.status != "ok"),
+            p50_seconds=percentile(durations, 50),
+            p95_seconds=percentile(durations, 95),
+            max_seconds=durations[-1],
+            input_tokens=sum(s.input_tokens for s in group),
+            output_tokens=sum(s.output_tokens for s in group),
+        ))
+    return stats
+
+
+def summarize_runs(spans: list[LoopSpan]) -> list[LoopRunSummary]:
+    """One summary per run_id, newest first."""
+    runs: dict[str, list[LoopSpan]] = defaultdict(list)
+    for span in spans:
+        runs[span.run_id].append(span)
+
+    summaries = []
+    for run_id, group in runs.items():
+        start = min(s.started_at for s in group)
+        end = max(s.started_at.timestamp() + s.duration_seconds for s in group)
+        summaries.append(LoopRunSummary(
+            run_id=run_id,
+            started_at=start,
+            duration_seconds=round(end - start.timestamp(), 3),
+            span_count=len(group),
+            errors=sum(1 for s in group if s.status != "ok"),
+            input_tokens=sum(s.input_tokens for s in group),
+            output_tokens=sum(s.output_tokens for s in group),
+        ))
+    summaries.sort(key=lambda r: r.started_at, reverse=True)
+    return summaries
@@ -0,0 +1,478 @@
+"""LoopStatus: single-pass aggregate view of the feedback loop.
+
+Computes every count the status reporter and the ecosystem API need with
+a handful of grouped SQL queries in one read transaction, instead of
+deserializing every record. Renders as text, JSON, or Prometheus text
+exposition format.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+from pydantic import BaseModel, Field
+
+from .store import ContractStore
+
+RECENT_DAYS = 7
+
+
+class ContractStats(BaseModel):
+    """Totals for one contract type."""
+    total: int = 0
+    recent_count: int = 0  # emitted within the last RECENT_DAYS
+    last_emitted_at: datetime | None = None
+
+
+class LoopStatus(BaseModel):
+    """Snapshot of the feedback loop state."""
+    generated_at: datetime
+    recent_days: int = RECENT_DAYS
+
+    outcomes: ContractStats = Field(default_factory=ContractStats)
+    outcomes_by_type: dict[str, int] = Field(default_factory=dict)
+
+    recommendations: ContractStats = Field(default_factory=ContractStats)
+    recommendations_by_status: dict[str, int] = Field(default_factory=dict)
+    pending_recommendations_by_target: dict[str, int] = Field(default_factory=dict)
+    oldest_pending_recommendation_at: datetime | None = None
+
+    patches: ContractStats = Field(default_factory=ContractStats)
+    patches_by_status: dict[str, int] = Field(default_factory=dict)
+    oldest_proposed_patch_at: datetime | None = None
+
+    signals: ContractStats = Field(default_factory=ContractStats)
+    signals_by_source: dict[str, int] = Field(default_factory=dict)
+    signals_by_relevance: dict[str, int] = Field(default_factory=dict)
+
+    completed_cycles: int = 0
+
+    @property
+    def pending_recommendations(self) -> int:
+        return self.recommendations_by_status.get("pending", 0)
+
+    @property
+    def proposed_patches(self) -> int:
+        return self.patches_by_status.get("proposed", 0)
+
+    @property
+    def loop_health(self) -> str:
+        """flowing | partial | idle, based on which core contracts have records."""
+        core = (self.outcomes.total, self.recommendations.total, self.patches.total)
+        if not any(core):
+            return "idle"
+        if all(core):
+            return "flowing"
+        return "partial"
+
+    @property
+    def health_message(self) -> str:
+        """Operator-facing next step for the loop."""
+        if not self.outcomes.total:
+            return "[!] No outcome records yet - run ideas through UM pipeline"
+        if not self.recommendations.total:
+            return "[!] No recommendations yet - run Sky-Lynx analyzer"
+        if not self.patches.total and self.pending_recommendations_by_target.get("persona"):
+            return "[!] Persona recommendations waiting - run persona_upgrader"
+        if self.proposed_patches:
+            return f"[!] {self.proposed_patches} patches awaiting human review"
+        if self.completed_cycles > 0:
+            return "[OK] Loop has completed cycles - running end-to-end"
+        return "[OK] Loop is flowing"
+
+    def render_text(self) -> str:
+        """Human-readable report (the loop_status.py default output)."""
+        now = self.generated_at
+        lines = [
+            "=" * 60,
+            "  Snow-Town Feedback Loop Status",
+            f"  Generated: {now.strftime('%Y-%m-%d %H:%M:%S')}",
+            "=" * 60,
+            "",
+            f"  Outcome Records:           {self.outcomes.total}",
+        ]
+        for outcome, count in sorted(self.outcomes_by_type.items()):
+            lines.append(f"    - {outcome}: {count}")
+
+        pending = self.pending_recommendations_by_target
+        lines += [
+            "",
+            f"  Improvement Recommendations: {self.recommendations.total}",
+            f"    - Pending (persona):     {pending.get('persona', 0)}",
+            f"    - Pending (claude_md):   {pending.get('claude_md', 0)}",
+            f"    - Pending (pipeline):    {pending.get('pipeline', 0)}",
+            f"    - Applied:               {self.recommendations_by_status.get('applied', 0)}",
+            "",
+            f"  Persona Patches:           {self.patches.total}",
+            f"    - Proposed (review):     {self.proposed_patches}",
+            f"    - Applied:               {self.patches_by_status.get('applied', 0)}",
+            f"    - Rejected:              {self.patches_by_status.get('rejected', 0)}",
+            "",
+            f"  Completed Feedback Cycles: {self.completed_cycles}",
+        ]
+
+        if self.oldest_pending_recommendation_at:
+            lines.append(f"  Oldest Pending Rec:        {_age(now, self.oldest_pending_recommendation_at)}")
+        if self.oldest_proposed_patch_at:
+            lines.append(f"  Oldest Pending Patch:      {_age(now, self.oldest_proposed_patch_at)}")
+
+        lines += ["", f"  Research Signals:          {self.signals.total}"]
+        for src, cnt in sorted(self.signals_by_source.items()):
+            lines.append(f"    - {src}: {cnt}")
+        if self.signals_by_relevance:
+            lines.append("    By relevance:")
+            for rel, cnt in sorted(self.signals_by_relevance.items()):
+                lines.append(f"      {rel}: {cnt}")
+        if self.signals.last_emitted_at:
+            lines.append(f"  Last Signal Received:      {_age(now, self.signals.last_emitted_at)}")
+
+        lines += ["", "  Health:", f"    {self.health_message}", "=" * 60]
+        return "\n".join(lines)
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (gauges)."""
+        out: list[str] = []
+
+        def gauge(name: str, help_text: str, samples: list[tuple[dict[str, str], float]]) -> None:
+            out.append(f"# HELP snowtown_{name} {help_text}")
+            out.append(f"# TYPE snowtown_{name} gauge")
+            for labels, value in samples:
+                label_str = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+                value_str = _format_sample(value)
+                out.append(f"snowtown_{name}{{{label_str}}} {value_str}" if label_str
+                           else f"snowtown_{name} {value_str}")
+
+        contracts = {
+            "outcome_record": self.outcomes,
+            "improvement_recommendation": self.recommendations,
+            "persona_patch": self.patches,
+            "research_signal": self.signals,
+        }
+        gauge("records", "Total records per contract type.",
+              [({"contract": c}, s.total) for c, s in contracts.items()])
+        gauge("records_recent", f"Records emitted in the last {self.recent_days} days.",
+              [({"contract": c}, s.recent_count) for c, s in contracts.items()])
+        gauge("last_emitted_timestamp_seconds", "Unix time of the newest record.",
+              [({"contract": c}, s.last_emitted_at.timestamp())
+               for c, s in contracts.items() if s.last_emitted_at])
+        gauge("outcomes", "Outcome records by terminal outcome.",
+              [({"outcome": k}, v) for k, v in sorted(self.outcomes_by_type.items())])
+        gauge("recommendations", "Recommendations by status.",
+              [({"status": k}, v) for k, v in sorted(self.recommendations_by_status.items())])
+        gauge("recommendations_pending", "Pending recommendations by target system.",
+              [({"target_system": k}, v)
+               for k, v in sorted(self.pending_recommendations_by_target.items())])
+        gauge("patches", "Persona patches by status.",
+              [({"status": k}, v) for k, v in sorted(self.patches_by_status.items())])
+        gauge("signals", "Research signals by source.",
+              [({"source": k}, v) for k, v in sorted(self.signals_by_source.items())])
+        gauge("signals_by_relevance", "Research signals by relevance.",
+              [({"relevance": k}, v) for k, v in sorted(self.signals_by_relevance.items())])
+        gauge("completed_cycles", "Recommendations closed by an applied patch.",
+              [({}, self.completed_cycles)])
+        oldest = [
+            ("improvement_recommendation", self.oldest_pending_recommendation_at),
+            ("persona_patch", self.oldest_proposed_patch_at),
+        ]
+        gauge("oldest_pending_age_seconds", "Age of the oldest unprocessed record.",
+              [({"contract": c}, (self.generated_at - ts).total_seconds())
+               for c, ts in oldest if ts])
+        return "\n".join(out) + "\n"
+
+
+def _age(now: datetime, then: datetime) -> str:
+    age = now - then
+    return f"{age.days}d {age.seconds // 3600}h ago"
+
+
+def _format_sample(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _ts(raw: str | None) -> datetime | None:
+    return datetime.fromisoformat(raw) if raw else None
+
+
+def _max_ts(*values: datetime | None) -> datetime | None:
+    present = [v for v in values if v is not None]
+    return max(present) if present else None
+
+
+def _min_ts(*values: datetime | None) -> datetime | None:
+    present = [v for v in values if v is not None]
+    return min(present) if present else None
+
+
+def collect_loop_status(store: ContractStore, now: datetime | None = None) -> LoopStatus:
+    """Compute a LoopStatus from SQLite in a single read transaction."""
+    now = now or datetime.now()
+    recent_since = (now - timedelta(days=RECENT_DAYS)).isoformat()
+    status = LoopStatus(generated_at=now)
+
+    with store.read_transaction() as conn:
+        for row in conn.execute(
+            """SELECT outcome, COUNT(*) AS n, SUM(emitted_at >= ?) AS recent,
+                      MAX(emitted_at) AS last
+               FROM outcome_records GROUP BY outcome""",
+            (recent_since,),
+        ):
+            status.outcomes_by_type[row["outcome"]] = row["n"]
+            _accumulate(status.outcomes, row)
+
+        for row in conn.execute(
+            """SELECT target_system, status, COUNT(*) AS n, SUM(emitted_at >= ?) AS recent,
+                      MIN(emitted_at) AS first, MAX(emitted_at) AS last
+               FROM improvement_recommendations GROUP BY target_system, status""",
+            (recent_since,),
+        ):
+            rec_status = row["status"]
+            by_status = status.recommendations_by_status
+            by_status[rec_status] = by_status.get(rec_status, 0) + row["n"]
+            if rec_status == "pending":
+                target = row["target_system"]
+                by_target = status.pending_recommendations_by_target
+                by_target[target] = by_target.get(target, 0) + row["n"]
+                status.oldest_pending_recommendation_at = _min_ts(
+                    status.oldest_pending_recommendation_at, _ts(row["first"]),
+                )
+            _accumulate(status.recommendations, row)
+
+        for row in conn.execute(
+            """SELECT status, COUNT(*) AS n, SUM(emitted_at >= ?) AS recent,
+                      MIN(emitted_at) AS first, MAX(emitted_at) AS last
+               FROM persona_patches GROUP BY status""",
+            (recent_since,),
+        ):
+            status.patches_by_status[row["status"]] = row["n"]
+            if row["status"] == "proposed":
+                status.oldest_proposed_patch_at = _ts(row["first"])
+            _accumulate(status.patches, row)
+
+        for row in conn.execute(
+            """SELECT source, relevance, COUNT(*) AS n, SUM(emitted_at >= ?) AS recent,
+                      MAX(emitted_at) AS last
+               FROM research_signals GROUP BY source, relevance""",
+            (recent_since,),
+        ):
+            by_source, by_rel = status.signals_by_source, status.signals_by_relevance
+            by_source[row["source"]] = by_source.get(row["source"], 0) + row["n"]
+            by_rel[row["relevance"]] = by_rel.get(row["relevance"], 0) + row["n"]
+            _accumulate(status.signals, row)
+
+        # Completed cycles: distinct recommendations closed by an applied patch
+        row = conn.execute(
+            """SELECT COUNT(DISTINCT src.value) AS n
+               FROM persona_patches p,
+                    json_each(json_extract(p.raw_json, '$.source_recommendation_ids')) src
+               WHERE p.status = 'applied'"""
+        ).fetchone()
+        status.completed_cycles = row["n"] or 0
+
+    return status
+
+
+def _accumulate(stats: ContractStats, row) -> None:
+    stats.total += row["n"]
+    stats.recent_count += row["recent"] or 0
+    stats.last_emitted_at = _max_ts(stats.last_emitted_at, _ts(row["last"]))
+
+
+class LoopStatusWatcher:
+    """Incrementally maintained LoopStatus for long-running monitors.
+
+    Loads one snapshot at start, then only reads new JSONL tail lines
+    (new records) and new rows of the status_events log (status
+    transitions). History is never re-queried unless SQLite is rebuilt,
+    a stored record is rewritten or a JSONL file shrinks. Recent-window counts are as of the last
+    snapshot plus new records; they do not age out while watching.
+    """
+
+    CONTRACT_TYPES = (
+        "outcome_record",
+        "improvement_recommendation",
+        "persona_patch",
+        "research_signal",
+    )
+
+    def __init__(self, store: ContractStore):
+        self.store = store
+        self.offsets: dict[str, int] = {}
+        self.last_seq = 0
+        self.status = LoopStatus(generated_at=datetime.now())
+        self._pending_recs: dict[str, datetime] = {}
+        self._proposed_patches: dict[str, datetime] = {}
+        self._cycle_sources: dict[str, int] = {}
+        self.reload()
+
+    def reload(self) -> None:
+        """Take a fresh snapshot and reset tail offsets and event position.
+
+        Offsets, event position and snapshot are all taken inside one read
+        transaction, which holds off this store's writes, so no record or
+        event lands between them.
+        """
+        with self.store.read_transaction() as conn:
+            for contract_type in self.CONTRACT_TYPES:
+                self.offsets[contract_type] = self.store.jsonl_extent(contract_type)
+            self.last_seq = self.store.status_event_seq()
+            self.status = collect_loop_status(self.store)
+            self._pending_recs = {
+                row["recommendation_id"]: datetime.fromisoformat(row["emitted_at"])
+                for row in conn.execute(
+                    "SELECT recommendation_id, emitted_at FROM improvement_recommendations "
+                    "WHERE status = 'pending'"
+                )
+            }
+            self._proposed_patches = {
+                row["patch_id"]: datetime.fromisoformat(row["emitted_at"])
+                for row in conn.execute(
+                    "SELECT patch_id, emitted_at FROM persona_patches WHERE status = 'proposed'"
+                )
+            }
+            self._cycle_sources = {
+                row["rec_id"]: row["n"]
+                for row in conn.execute(
+                    """SELECT src.value AS rec_id, COUNT(*) AS n
+                       FROM persona_patches p,
+                            json_each(json_extract(p.raw_json, '$.source_recommendation_ids')) src
+                       WHERE p.status = 'applied' GROUP BY src.value"""
+                )
+            }
+
+    def poll(self) -> bool:
+        """Apply new JSONL lines and status events. Returns True if anything changed."""
+        changed = False
+        for contract_type in self.CONTRACT_TYPES:
+            for record in self._read_tail(contract_type):
+                self._apply_record(contract_type, record)
+                changed = True
+            if self.offsets[contract_type] < 0:
+                self.reload()
+                return True
+
+        for event in self.store.status_events_since(self.last_seq):
+            self.last_seq = event["seq"]
+            if event["contract_type"] == "*":
+                self.reload()
+                return True
+            self._apply_event(event)
+            changed = True
+
+        self._refresh_derived()
+        return changed
+
+    def _read_tail(self, contract_type: str) -> list[dict]:
+        """Read complete lines appended since the last offset.
+
+        Offsets span all JSONL segments, so sealing old segments does not
+        disturb the tail. Sets the offset to -1 if the JSONL shrank
+        (compacted or replaced).
+        """
+        offset = self.offsets[contract_type]
+        end = self.store.jsonl_extent(contract_type)
+        if end < offset:
+            self.offsets[contract_type] = -1
+            return []
+        if end == offset:
+            return []
+        self.offsets[contract_type] = end
+        return [
+            json.loads(line)
+            for line, _ in self.store.iter_jsonl_lines(contract_type, offset, end)
+        ]
+
+    def _apply_record(self, contract_type: str, record: dict) -> None:
+        s = self.status
+        emitted_at = datetime.fromisoformat(record["emitted_at"])
+        recent = emitted_at >= datetime.now() - timedelta(days=s.recent_days)
+
+        if contract_type == "outcome_record":
+            stats = s.outcomes
+            _bump(s.outcomes_by_type, record["outcome"], 1)
+        elif contract_type == "improvement_recommendation":
+            stats = s.recommendations
+            status = record.get("status", "pending")
+            _bump(s.recommendations_by_status, status, 1)
+            if status == "pending":
+                _bump(s.pending_recommendations_by_target, record.get("target_system", "persona"), 1)
+                self._pending_recs[record["recommendation_id"]] = emitted_at
+        elif contract_type == "persona_patch":
+            stats = s.patches
+            status = record.get("status", "proposed")
+            _bump(s.patches_by_status, status, 1)
+            if status == "proposed":
+                self._proposed_patches[record["patch_id"]] = emitted_at
+            elif status == "applied":
+                for rec_id in record.get("source_recommendation_ids", []):
+                    _bump(self._cycle_sources, rec_id, 1)
+        else:
+            stats = s.signals
+            _bump(s.signals_by_source, record["source"], 1)
+            _bump(s.signals_by_relevance, record["relevance"], 1)
+
+        stats.total += 1
+        stats.recent_count += int(recent)
+        stats.last_emitted_at = _max_ts(stats.last_emitted_at, emitted_at)
+
+    def _apply_event(self, event: dict) -> None:
+        s = self.status
+        old, new, record_id = event["old_status"], event["new_status"], event["record_id"]
+
+        if event["contract_type"] == "improvement_recommendation":
+            _bump(s.recommendations_by_status, old, -1)
+            _bump(s.recommendations_by_status, new, 1)
+            target = event["detail"] or "persona"
+            if old == "pending":
+                _bump(s.pending_recommendations_by_target, target, -1)
+                self._pending_recs.pop(record_id, None)
+            if new == "pending":
+                _bump(s.pending_recommendations_by_target, target, 1)
+                self._pending_recs[record_id] = self._emitted_at(
+                    "improvement_recommendations", "recommendation_id", event,
+                )
+        elif event["contract_type"] == "persona_patch":
+            _bump(s.patches_by_status, old, -1)
+            _bump(s.patches_by_status, new, 1)
+            if old == "proposed":
+                self._proposed_patches.pop(record_id, None)
+            if new == "proposed":
+                self._proposed_patches[record_id] = self._emitted_at(
+                    "persona_patches", "patch_id", event,
+                )
+            sources = json.loads(event["detail"]) if event["detail"] else []
+            for rec_id in sources:
+                if old == "applied":
+                    _bump(self._cycle_sources, rec_id, -1)
+                if new == "applied":
+                    _bump(self._cycle_sources, rec_id, 1)
+
+    def _emitted_at(self, table: str, key_column: str, event: dict) -> datetime:
+        """emitted_at of a record re-entering pending/proposed, as reload() reads it."""
+        with self.store.read_transaction() as conn:
+            row = conn.execute(
+                f"SELECT emitted_at FROM {table} WHERE {key_column} = ?", (event["record_id"],),
+            ).fetchone()
+        # Gone since the event (a rebuild follows): the next reload corrects it
+        return datetime.fromisoformat(row["emitted_at"] if row else event["changed_at"])
+
+    def _refresh_derived(self) -> None:
+        s = self.status
+        s.generated_at = datetime.now()
+        s.oldest_pending_recommendation_at = min(self._pending_recs.values(), default=None)
+        s.oldest_proposed_patch_at = min(self._proposed_patches.values(), default=None)
+        s.completed_cycles = len(self._cycle_sources)
+
+
+def _bump(counts: dict[str, int], key: str | None, delta: int) -> None:
+    """Adjust a counter, dropping keys that reach zero (matches GROUP BY output)."""
+    if key is None:
+        return
+    value = counts.get(key, 0) + delta
+    if value > 0:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
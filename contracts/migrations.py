@@ -0,0 +1,81 @@
+"""Contract version upcasting.
+
+Each contract type has a chain of migrators, one per ``contract_version``
+step, that rewrite a raw record (a dict parsed from JSON) into the next
+version's shape. ``upcast`` runs the chain from a record's version to the
+current one before the record is validated, so old JSONL lines load as
+current models instead of relying on lenient field defaults.
+
+Register a migrator for each version bump of a contract:
+
+    @migrator("outcome_record", "1.1.0", "1.2.0")
+    def _outcome_1_2_0(record: dict) -> dict:
+        record["new_field"] = ...
+        return record
+
+``upcast`` sets ``contract_version`` after each step. Chains are resolved
+once per (type, from, to) and cached.
+"""
+
+from collections.abc import Callable
+from functools import lru_cache
+
+Migrator = Callable[[dict], dict]
+
+# contract type -> from_version -> (to_version, migrator)
+_MIGRATORS: dict[str, dict[str, tuple[str, Migrator]]] = {}
+
+
+def migrator(contract_type: str, from_version: str, to_version: str):
+    """Register a function upcasting ``contract_type`` records one version step."""
+    def register(fn: Migrator) -> Migrator:
+        _MIGRATORS.setdefault(contract_type, {})[from_version] = (to_version, fn)
+        chain.cache_clear()
+        return fn
+    return register
+
+
+@lru_cache(maxsize=256)
+def chain(
+    contract_type: str, from_version: str, to_version: str,
+) -> tuple[tuple[str, Migrator], ...] | None:
+    """The ``(version, migrator)`` steps from one version to another.
+
+    Empty if the versions are equal; None if no registered path leads
+    there (e.g. a record from a newer producer).
+    """
+    steps = []
+    version = from_version
+    seen = {version}
+    while version != to_version:
+        step = _MIGRATORS.get(contract_type, {}).get(version)
+        if step is None or step[0] in seen:
+            return None
+        steps.append(step)
+        version = step[0]
+        seen.add(version)
+    return tuple(steps)
+
+
+def upcast(contract_type: str, record: dict, to_version: str) -> dict:
+    """Migrate a raw record to ``to_version``; records without a path are unchanged."""
+    version = record.get("contract_version")
+    if version is None or version == to_version:
+        return record
+    steps = chain(contract_type, version, to_version)
+    if steps is None:
+        return record
+    for next_version, step in steps:
+        record = step(record)
+        record["contract_version"] = next_version
+    return record
+
+
+# --- Migrators ---
+
+
+@migrator("outcome_record", "1.0.0", "1.1.0")
+def _outcome_1_1_0(record: dict) -> dict:
+    # 1.1.0 added idea_type; earlier producers did not classify ideas
+    record.setdefault("idea_type", None)
+    return record
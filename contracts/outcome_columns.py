@@ -0,0 +1,332 @@
+"""Columnar, memory-mapped cache of OutcomeRecord history for analytics.
+
+Each analysed field is one append-only binary file of fixed-width values
+under ``data/outcome_columns/`` (one row per JSONL line), opened with
+``np.memmap`` so reads cost no decoding and only touch the pages used.
+``outcome``, ``tags`` and ``tech_stack`` are dictionary-encoded; the
+list fields are stored CSR-style as a flat code column plus per-row end
+offsets. ``meta.json`` holds the dictionaries, the row count and the
+JSONL offset indexed so far; replacing it commits an append, so bytes
+past its row count (from an interrupted update) are ignored and then
+truncated.
+
+Under last-write-wins a rewrite of an outcome appends a second JSONL
+line for the same natural key. Each row stores a digest of its key, and
+a row's ``alive`` flag is cleared when a later row replaces it; the
+analytics only count alive rows, as SQLite holds only the last write.
+
+``update()`` reads only JSONL lines past the last indexed offset and
+starts over if the JSONL shrank. ``group_by()`` and ``histogram()`` are
+vectorized over the columns, optionally restricted by ``mask()``.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from .outcome_record import TerminalOutcome
+from .store import ContractStore
+from .timestamps import local_naive
+
+FORMAT_VERSION = 2
+COLUMNS_DIR = "outcome_columns"
+META_FILE = "meta.json"
+
+# Per-row columns; scores are NaN when missing
+COLUMNS = {
+    "idea_id": np.int64,
+    "outcome": np.uint8,
+    "overall_score": np.float64,
+    "total_duration_seconds": np.float64,
+    "emitted_at": np.int64,  # seconds since the epoch, local time (datetime64[s])
+    "artifact_count": np.int32,
+    "tags_end": np.int64,
+    "tech_stack_end": np.int64,
+    "key": np.int64,  # digest of the natural key (idea_id, outcome, emitted_at)
+    "alive": np.uint8,  # 0 once a later row rewrites the same key
+}
+# Flat dictionary codes of the list fields
+LIST_FIELDS = ("tags", "tech_stack")
+NUMERIC_COLUMNS = ("overall_score", "total_duration_seconds", "artifact_count")
+GROUP_KEYS = ("outcome", "tags", "tech_stack", "month")
+
+
+def _key_digest(record: dict) -> int:
+    key = json.dumps([record["idea_id"], record["outcome"], record["emitted_at"]])
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+class OutcomeColumns:
+    """Memory-mapped column store over outcome records, appended to incrementally."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        # Guards appends against concurrent readers (the API serves from threads)
+        self._lock = threading.RLock()
+        self._maps: dict[str, np.ndarray] = {}
+        self._meta = self._load_meta()
+
+    @property
+    def rows(self) -> int:
+        return self._meta["rows"]
+
+    @property
+    def offset(self) -> int:
+        return self._meta["offset"]
+
+    def labels(self, field: str) -> list[str]:
+        """Dictionary of ``outcome``, ``tags`` or ``tech_stack``; codes index it."""
+        return list(self._meta["labels"][field])
+
+    # --- Persistence ---
+
+    def _empty_meta(self) -> dict:
+        return {
+            "format_version": FORMAT_VERSION,
+            "offset": 0,
+            "rows": 0,
+            "codes": {field: 0 for field in LIST_FIELDS},
+            "labels": {
+                "outcome": [o.value for o in TerminalOutcome],
+                **{field: [] for field in LIST_FIELDS},
+            },
+        }
+
+    def _load_meta(self) -> dict:
+        path = self.directory / META_FILE
+        if path.exists():
+            meta = json.loads(path.read_text())
+            if meta.get("format_version") == FORMAT_VERSION:
+                return meta
+        return self._empty_meta()
+
+    def _save_meta(self) -> None:
+        tmp = self.directory / (META_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.directory / META_FILE)
+
+    def _path(self, name: str) -> Path:
+        return self.directory / f"{name}.bin"
+
+    def _length(self, name: str) -> int:
+        if name in LIST_FIELDS:
+            return self._meta["codes"][name]
+        return self.rows
+
+    def _dtype(self, name: str) -> type:
+        return np.int32 if name in LIST_FIELDS else COLUMNS[name]
+
+    def column(self, name: str) -> np.ndarray:
+        """A read-only memory map of one column (or list field's flat codes)."""
+        with self._lock:
+            length = self._length(name)
+            array = self._maps.get(name)
+            if array is None or len(array) != length:
+                if length == 0:
+                    array = np.zeros(0, dtype=self._dtype(name))
+                else:
+                    array = np.memmap(
+                        self._path(name), dtype=self._dtype(name), mode="r", shape=(length,),
+                    )
+                self._maps[name] = array
+            return array
+
+    # --- Incremental update ---
+
+    def update(self, store: ContractStore) -> int:
+        """Append outcome records written to the JSONL since the last update.
+
+        Starts over if the JSONL shrank (compacted or replaced). Holds an
+        exclusive file lock, so several processes may call it. Returns the
+        number of records appended.
+        """
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / ".lock", "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                # Another process may have appended since we last looked
+                self._meta = self._load_meta()
+                end = store.jsonl_extent("outcome_record")
+                if end < self.offset:
+                    self._meta = self._empty_meta()
+                if end == self.offset:
+                    return 0
+                records = [
+                    json.loads(line)
+                    for line, _ in store.iter_jsonl_lines("outcome_record", self.offset, end)
+                ]
+                self._append(records)
+                self._meta["offset"] = end
+                self._save_meta()
+                return len(records)
+
+    def _append(self, records: list[dict]) -> None:
+        labels = self._meta["labels"]
+        index = {field: {label: i for i, label in enumerate(labels[field])} for field in labels}
+
+        def encode(field: str, value: str) -> int:
+            code = index[field].get(value)
+            if code is None:
+                code = index[field][value] = len(labels[field])
+                labels[field].append(value)
+            return code
+
+        new: dict[str, list] = {name: [] for name in (*COLUMNS, *LIST_FIELDS)}
+        ends = dict(self._meta["codes"])
+        # Row (new ones numbered on from self.rows) of the last write of each key in the batch
+        batch_rows: dict[int, int] = {}
+        for i, record in enumerate(records):
+            key = _key_digest(record)
+            previous = batch_rows.get(key)
+            if previous is not None:
+                new["alive"][previous - self.rows] = 0
+            batch_rows[key] = self.rows + i
+            new["key"].append(key)
+            new["alive"].append(1)
+            score = record.get("overall_score")
+            new["idea_id"].append(record["idea_id"])
+            new["outcome"].append(encode("outcome", record["outcome"]))
+            new["overall_score"].append(np.nan if score is None else score)
+            new["total_duration_seconds"].append(record.get("total_duration_seconds") or 0.0)
+            new["emitted_at"].append(local_naive(record["emitted_at"]))
+            new["artifact_count"].append(record.get("artifact_count") or 0)
+            for field in LIST_FIELDS:
+                values = record.get(field) or []
+                new[field].extend(encode(field, value) for value in values)
+                ends[field] += len(values)
+                new[f"{field}_end"].append(ends[field])
+
+        for name, values in new.items():
+            if name == "emitted_at":
+                array = np.array(values, dtype="datetime64[s]").astype(np.int64)
+            else:
+                array = np.array(values, dtype=self._dtype(name))
+            itemsize = np.dtype(self._dtype(name)).itemsize
+            with open(self._path(name), "ab") as f:
+                # Drop bytes an interrupted update wrote past the committed length
+                f.truncate(self._length(name) * itemsize)
+                f.write(array.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        self._kill_replaced(np.fromiter(batch_rows, dtype=np.int64, count=len(batch_rows)))
+        self._meta["rows"] += len(records)
+        self._meta["codes"] = ends
+
+    def _kill_replaced(self, keys: np.ndarray) -> None:
+        """Clear ``alive`` on committed rows whose key a new row rewrites."""
+        if not self.rows:
+            return
+        stored = self.column("key")
+        replaced = np.flatnonzero(np.isin(stored, keys) & (self.column("alive") == 1))
+        if not len(replaced):
+            return
+        with open(self._path("alive"), "r+b") as f:
+            for row in replaced:
+                f.seek(int(row))
+                f.write(b"\x00")
+            f.flush()
+            os.fsync(f.fileno())
+
+    # --- Analytics ---
+
+    def emitted_at(self) -> np.ndarray:
+        return self.column("emitted_at").view("datetime64[s]")
+
+    def alive(self) -> np.ndarray:
+        """Rows not replaced by a later write of the same outcome."""
+        return self.column("alive") == 1
+
+    def mask(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        outcome: str | None = None,
+    ) -> np.ndarray:
+        """Alive rows emitted in ``[since, until)`` with the given outcome."""
+        with self._lock:
+            keep = self.alive()
+            emitted_at = self.emitted_at()
+            if since is not None:
+                keep &= emitted_at >= np.datetime64(since, "s")
+            if until is not None:
+                keep &= emitted_at < np.datetime64(until, "s")
+            if outcome is not None:
+                labels = self._meta["labels"]["outcome"]
+                if outcome not in labels:
+                    return np.zeros(self.rows, dtype=bool)
+                keep &= self.column("outcome") == labels.index(outcome)
+            return keep
+
+    def _fit(self, mask: np.ndarray) -> np.ndarray:
+        """A mask taken before an update, extended to rows appended since."""
+        if len(mask) < self.rows:
+            mask = np.concatenate([mask, np.zeros(self.rows - len(mask), dtype=bool)])
+        return mask
+
+    def _groups(self, key: str) -> tuple[np.ndarray, np.ndarray, list[str]]:
+        """``(rows, codes, labels)``: each row's group codes, list fields expanded."""
+        if key == "outcome":
+            return np.arange(self.rows), self.column("outcome").astype(np.int64), self.labels(key)
+        if key == "month":
+            months, codes = np.unique(
+                self.emitted_at().astype("datetime64[M]"), return_inverse=True,
+            )
+            return np.arange(self.rows), codes, [str(m) for m in months]
+        ends = self.column(f"{key}_end")
+        lengths = np.diff(ends, prepend=0)
+        rows = np.repeat(np.arange(self.rows), lengths)
+        return rows, self.column(key).astype(np.int64), self.labels(key)
+
+    def group_by(
+        self, key: str, value: str | None = None, mask: np.ndarray | None = None,
+    ) -> dict[str, tuple[int, float | None]]:
+        """``{group: (records, mean of value)}`` for groups with records.
+
+        ``key`` is one of GROUP_KEYS; a record counts once toward each of
+        its tags or tech_stack entries. The mean skips missing scores and
+        is None without ``value`` or values.
+        """
+        if key not in GROUP_KEYS:
+            raise ValueError(f"Unknown group key: {key}")
+        if value is not None and value not in NUMERIC_COLUMNS:
+            raise ValueError(f"Unknown numeric column: {value}")
+        with self._lock:
+            rows, codes, labels = self._groups(key)
+            keep = self.alive() if mask is None else self._fit(mask) & self.alive()
+            rows, codes = rows[keep[rows]], codes[keep[rows]]
+            counts = np.bincount(codes, minlength=len(labels))
+            means = np.full(len(labels), np.nan)
+            if value is not None:
+                values = np.asarray(self.column(value), dtype=np.float64)[rows]
+                present = ~np.isnan(values)
+                sums = np.bincount(codes[present], values[present], minlength=len(labels))
+                n = np.bincount(codes[present], minlength=len(labels))
+                np.divide(sums, n, out=means, where=n > 0)
+            return {
+                labels[i]: (int(counts[i]), None if np.isnan(means[i]) else float(means[i]))
+                for i in np.flatnonzero(counts)
+            }
+
+    def histogram(
+        self,
+        value: str,
+        bins: int = 10,
+        value_range: tuple[float, float] | None = None,
+        mask: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """``(counts, edges)`` of a numeric column, skipping missing scores."""
+        if value not in NUMERIC_COLUMNS:
+            raise ValueError(f"Unknown numeric column: {value}")
+        with self._lock:
+            keep = self.alive() if mask is None else self._fit(mask) & self.alive()
+            values = np.asarray(self.column(value), dtype=np.float64)[keep]
+            return np.histogram(values[~np.isnan(values)], bins=bins, range=value_range)
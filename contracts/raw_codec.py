@@ -0,0 +1,73 @@
+"""Compact encoding for the raw_json column: deflate with a trained dictionary.
+
+Records of one contract type repeat the same keys, enum values and
+boilerplate, which per-row compression cannot exploit on its own: a
+single record is too short. ``train_dictionary`` picks the JSON
+fragments (``"key":value`` pairs, keys, strings) shared by the most
+sample records and packs them into a zlib preset dictionary, most
+valuable last (closest to the data, so cheapest to reference).
+
+An encoded value is ``MAGIC``, the dictionary id (2 bytes, big-endian)
+and a raw deflate stream. JSON text never starts with ``MAGIC``, so
+plain and encoded values can share a column.
+"""
+
+import re
+import zlib
+from collections import Counter
+
+MAGIC = b"\x00z"
+HEADER_SIZE = len(MAGIC) + 2
+# zlib uses at most the last 32 KiB of a preset dictionary
+MAX_DICT_SIZE = 32 * 1024
+COMPRESS_LEVEL = 9
+
+# A JSON string, with its scalar value when it is a key; and keys on their own
+_FRAGMENT = re.compile(r'"(?:[^"\\]|\\.)*"(?::(?:"(?:[^"\\]|\\.)*"|[-\w.+]+))?')
+_KEY = re.compile(r'"(?:[^"\\]|\\.)*":')
+
+
+def train_dictionary(samples: list[str], size: int = MAX_DICT_SIZE) -> bytes:
+    """A preset dictionary from the fragments most sample records share.
+
+    Fragments are ``"key":value`` pairs with scalar values, keys and
+    other strings, scored by the number of samples containing them
+    times their length; ones found in a single sample are left out.
+    """
+    counts: Counter[str] = Counter()
+    for sample in samples:
+        counts.update(set(_FRAGMENT.findall(sample)) | set(_KEY.findall(sample)))
+    scored = sorted(
+        ((n * len(fragment), fragment) for fragment, n in counts.items() if n > 1),
+        reverse=True,
+    )
+    chosen: list[bytes] = []
+    total = 0
+    for _, fragment in scored:
+        encoded = fragment.encode()
+        if total + len(encoded) > size:
+            continue
+        chosen.append(encoded)
+        total += len(encoded)
+    return b"".join(reversed(chosen))
+
+
+def is_encoded(value: str | bytes) -> bool:
+    return isinstance(value, bytes) and value.startswith(MAGIC)
+
+
+def dictionary_id(value: bytes) -> int:
+    return int.from_bytes(value[len(MAGIC):HEADER_SIZE], "big")
+
+
+def encode(text: str, dict_id: int, zdict: bytes) -> bytes:
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -15, zdict=zdict)
+    return (
+        MAGIC + dict_id.to_bytes(2, "big")
+        + compressor.compress(text.encode()) + compressor.flush()
+    )
+
+
+def decode(value: bytes, zdict: bytes) -> bytes:
+    decompressor = zlib.decompressobj(-15, zdict=zdict)
+    return decompressor.decompress(value[HEADER_SIZE:]) + decompressor.flush()
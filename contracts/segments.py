@@ -0,0 +1,218 @@
+"""Time-based JSONL segments with gzip-compressed sealed archives.
+
+A segmented contract type lives in a directory named after its legacy
+file (``data/research_signals/`` for ``research_signals.jsonl``). Records
+are appended to a plain monthly segment (``2026-10.jsonl``) picked by the
+append time. ``ContractStore.rotate_jsonl`` seals past months: each is
+split into runs by emitted_at month, gzip-compressed (``2026-09.jsonl.gz``)
+and recorded in ``manifest.json`` with its emitted_at range, record count,
+size and checksum, so readers can skip archives outside a query window.
+
+Segments concatenate, in order, to the same bytes as the original
+append-only file: sealed segments in manifest order, then open plain
+segments by name. Offsets into that logical stream (export resume
+offsets, tailing readers) are therefore unaffected by sealing.
+
+Sealing is crash-safe: archives are written and renamed first, the
+manifest replace is the commit point, and only then is the plain segment
+removed. Readers ignore archives not in the manifest and plain segments
+the manifest says were sealed.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO
+
+from pydantic import BaseModel, Field
+
+from .timestamps import local_naive
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+PLAIN_SUFFIX = ".jsonl"
+SEALED_SUFFIX = ".jsonl.gz"
+# Reproducible archives: fixed level and gzip header mtime
+COMPRESS_LEVEL = 9
+
+
+class SealedSegment(BaseModel):
+    """Manifest entry for one compressed segment."""
+    file: str
+    source: str  # name of the plain segment it was sealed from
+    bytes: int  # uncompressed
+    records: int
+    min_emitted_at: datetime | None = None
+    max_emitted_at: datetime | None = None
+    sha256: str  # of the uncompressed bytes
+
+
+class Manifest(BaseModel):
+    format_version: int = FORMAT_VERSION
+    segments: list[SealedSegment] = Field(default_factory=list)
+
+
+class Segment(BaseModel):
+    """One readable segment and its place in the logical byte stream."""
+    path: Path
+    start: int
+    size: int
+    sealed: bool = False
+    min_emitted_at: datetime | None = None
+    max_emitted_at: datetime | None = None
+
+    @property
+    def end(self) -> int:
+        return self.start + self.size
+
+    def open(self) -> BinaryIO:
+        return gzip.open(self.path, "rb") if self.sealed else open(self.path, "rb")
+
+    def overlaps(self, since: datetime | None, until: datetime | None) -> bool:
+        """Whether records emitted in ``[since, until)`` may be in this segment.
+
+        Open segments have no recorded range and always may.
+        """
+        if self.min_emitted_at is None or self.max_emitted_at is None:
+            return True
+        return (since is None or self.max_emitted_at >= since) and (
+            until is None or self.min_emitted_at < until
+        )
+
+
+def segment_name(ts: datetime) -> str:
+    return ts.strftime("%Y-%m")
+
+
+def load_manifest(directory: Path) -> Manifest:
+    path = directory / MANIFEST_FILE
+    if not path.exists():
+        return Manifest()
+    return Manifest.model_validate_json(path.read_bytes())
+
+
+def save_manifest(directory: Path, manifest: Manifest) -> None:
+    """Replace the manifest atomically; this commits a seal."""
+    tmp = directory / (MANIFEST_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        f.write(manifest.model_dump_json(indent=2) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, directory / MANIFEST_FILE)
+
+
+def list_segments(directory: Path) -> list[Segment]:
+    """Sealed segments in manifest order, then unsealed plain segments by name."""
+    manifest = load_manifest(directory)
+    segments = []
+    start = 0
+    for entry in manifest.segments:
+        segments.append(Segment(
+            path=directory / entry.file, start=start, size=entry.bytes, sealed=True,
+            min_emitted_at=entry.min_emitted_at, max_emitted_at=entry.max_emitted_at,
+        ))
+        start += entry.bytes
+    sealed_sources = {entry.source for entry in manifest.segments}
+    for path in sorted(directory.glob("*" + PLAIN_SUFFIX)):
+        if path.name.removesuffix(PLAIN_SUFFIX) in sealed_sources:
+            continue  # left over from an interrupted seal
+        size = path.stat().st_size
+        segments.append(Segment(path=path, start=start, size=size))
+        start += size
+    return segments
+
+
+def append_path(directory: Path, now: datetime) -> Path:
+    """Plain segment to append to: this month's, or a later one if it exists.
+
+    Never an earlier segment, so the logical stream stays in append order.
+    """
+    names = [segment_name(now)] + [
+        segment.path.name.removesuffix(PLAIN_SUFFIX)
+        for segment in list_segments(directory) if not segment.sealed
+    ]
+    return directory / (max(names) + PLAIN_SUFFIX)
+
+
+def _archive_path(directory: Path, name: str) -> Path:
+    path = directory / (name + SEALED_SUFFIX)
+    n = 1
+    while path.exists():
+        path = directory / f"{name}-{n}{SEALED_SUFFIX}"
+        n += 1
+    return path
+
+
+def _write_archive(path: Path, lines: list[bytes]) -> SealedSegment:
+    data = b"".join(lines)
+    emitted = [local_naive(json.loads(line)["emitted_at"]) for line in lines]
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=COMPRESS_LEVEL, mtime=0) as gz:
+            gz.write(data)
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, path)
+    return SealedSegment(
+        file=path.name,
+        source="",
+        bytes=len(data),
+        records=len(lines),
+        min_emitted_at=min(emitted),
+        max_emitted_at=max(emitted),
+        sha256=hashlib.sha256(data).hexdigest(),
+    )
+
+
+def seal(directory: Path, plain: Path) -> list[SealedSegment]:
+    """Compress a plain segment into archives, one per run of emitted_at month.
+
+    A run ends when a record's month is later than the run's, so late
+    records stay in place and byte order is preserved. Updates the
+    manifest, then removes the plain segment. Returns the new entries.
+    """
+    runs: list[tuple[str, list[bytes]]] = []
+    with open(plain, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if not line.endswith(b"\n"):
+                line += b"\n"
+            month = segment_name(local_naive(json.loads(line)["emitted_at"]))
+            if not runs or month > runs[-1][0]:
+                runs.append((month, []))
+            runs[-1][1].append(line)
+
+    source = plain.name.removesuffix(PLAIN_SUFFIX)
+    entries = []
+    for month, lines in runs:
+        entry = _write_archive(_archive_path(directory, month), lines)
+        entry.source = source
+        entries.append(entry)
+
+    manifest = load_manifest(directory)
+    manifest.segments.extend(entries)
+    save_manifest(directory, manifest)
+    plain.unlink()
+    return entries
+
+
+def rewrite_archive(directory: Path, file: str, lines: list[bytes]) -> None:
+    """Replace a sealed segment's contents (e.g. after dedupe) and its manifest entry.
+
+    The new archive gets a new name, so the old one stays valid until the
+    manifest is replaced.
+    """
+    manifest = load_manifest(directory)
+    i = next(i for i, entry in enumerate(manifest.segments) if entry.file == file)
+    if lines:
+        entry = _write_archive(_archive_path(directory, file.removesuffix(SEALED_SUFFIX)), lines)
+        entry.source = manifest.segments[i].source
+        manifest.segments[i] = entry
+    else:
+        del manifest.segments[i]
+    save_manifest(directory, manifest)
+    (directory / file).unlink()
@@ -0,0 +1,449 @@
+"""Incremental TF-IDF model over research signal text, for ranking and topics.
+
+Signal title, summary and tags are tokenized into a growing vocabulary and
+kept as a CSR term-count matrix in plain NumPy arrays (no SciPy). IDF
+weights and row norms are derived on demand, so appending signals never
+rewrites existing rows. ``update()`` reads only JSONL lines past the last
+indexed offset; the model is cached on disk as one ``.npz`` next to the
+store's data so a restart resumes where it left off. The cache is
+rewritten in batches (``SAVE_EVERY`` signals or ``SAVE_INTERVAL``
+seconds), from a background thread, so a request indexing a few new
+signals never pays for writing the whole model.
+
+``rank()`` scores signals by cosine similarity to a query vector (persona
+and domain vocabulary, see ``vectorize`` and ``domain_centroid``);
+``cluster()`` groups signals into topics with spherical k-means.
+Everything runs offline.
+"""
+
+import json
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from .store import ContractStore
+from .timestamps import local_naive
+
+FORMAT_VERSION = 1
+MODEL_FILE = "signal_tfidf.npz"
+# update() rewrites the cache once this many signals are unsaved, or once
+# the oldest unsaved one has waited this long
+SAVE_EVERY = 500
+SAVE_INTERVAL = 300.0
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9]+")
+STOPWORDS = frozenset({
+    "a", "about", "above", "after", "again", "against", "all", "also", "am", "an", "and", "any",
+    "are", "as", "at", "be", "because", "been", "before", "being", "below", "between", "both",
+    "but", "by", "can", "could", "did", "do", "does", "doing", "down", "during", "each", "few",
+    "for", "from", "further", "had", "has", "have", "having", "he", "her", "here", "hers", "him",
+    "his", "how", "i", "if", "in", "into", "is", "it", "its", "itself", "just", "more", "most",
+    "my", "no", "nor", "not", "now", "of", "off", "on", "once", "only", "or", "other", "our",
+    "ours", "out", "over", "own", "same", "she", "should", "so", "some", "such", "than", "that",
+    "the", "their", "them", "then", "there", "these", "they", "this", "those", "through", "to",
+    "too", "under", "until", "up", "very", "via", "was", "we", "were", "what", "when", "where",
+    "which", "while", "who", "whom", "why", "will", "with", "would", "you", "your", "new", "using",
+    "use", "based", "paper", "show", "model", "models", "approach", "method", "methods", "results",
+})
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens, minus stopwords and single characters."""
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS]
+
+
+def _signal_terms(record: dict) -> list[str]:
+    tags = " ".join(record.get("tags") or [])
+    return tokenize(f"{record.get('title', '')} {record.get('summary', '')} {tags}")
+
+
+class SignalTfidf:
+    """TF-IDF term matrix over research signals, appended to incrementally."""
+
+    def __init__(self) -> None:
+        # Guards appends against concurrent readers (the API serves from threads)
+        self._lock = threading.RLock()
+        # Serializes cache writes; held by the background saver while it runs
+        self._save_lock = threading.Lock()
+        self._saver: threading.Thread | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.terms: list[str] = []
+        self.vocab: dict[str, int] = {}
+        self.df = np.zeros(0, dtype=np.int64)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.counts = np.zeros(0, dtype=np.float32)
+        self.signal_ids: list[str] = []
+        self.domains: list[str] = []
+        self.emitted_at = np.zeros(0, dtype="datetime64[s]")
+        # False for rows superseded by a later write of the same signal_id
+        self.alive = np.zeros(0, dtype=bool)
+        self.row_of: dict[str, int] = {}
+        self.offset = 0
+        self._weighted: tuple[np.ndarray, np.ndarray] | None = None
+        # Signals indexed since the cache was last written, and when the first was
+        self.unsaved = 0
+        self._unsaved_since = 0.0
+
+    @property
+    def size(self) -> int:
+        return len(self.signal_ids)
+
+    # --- Persistence ---
+
+    @classmethod
+    def load(cls, path: Path) -> "SignalTfidf":
+        """Load a cached model, or return an empty one if missing or outdated."""
+        model = cls()
+        if not path.exists():
+            return model
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format_version"]) != FORMAT_VERSION:
+                return model
+            model.terms = data["terms"].tolist()
+            model.df = data["df"]
+            model.indptr = data["indptr"]
+            model.indices = data["indices"]
+            model.counts = data["counts"]
+            model.signal_ids = data["signal_ids"].tolist()
+            model.domains = data["domains"].tolist()
+            model.emitted_at = data["emitted_at"]
+            model.alive = data["alive"]
+            model.offset = int(data["offset"])
+        model.vocab = {term: i for i, term in enumerate(model.terms)}
+        model.row_of = {sid: i for i, sid in enumerate(model.signal_ids) if model.alive[i]}
+        return model
+
+    def save(self, path: Path) -> None:
+        """Write the model atomically (temp file + rename)."""
+        with self._save_lock:
+            with self._lock:
+                # Appends replace the arrays rather than mutate them, so only
+                # the lists need copying; the write itself runs unlocked
+                arrays = {
+                    "format_version": np.int64(FORMAT_VERSION),
+                    "terms": np.array(self.terms, dtype=str),
+                    "df": self.df,
+                    "indptr": self.indptr,
+                    "indices": self.indices,
+                    "counts": self.counts,
+                    "signal_ids": np.array(self.signal_ids, dtype=str),
+                    "domains": np.array(self.domains, dtype=str),
+                    "emitted_at": self.emitted_at,
+                    "alive": self.alive,
+                    "offset": np.int64(self.offset),
+                }
+                saved = self.unsaved
+            tmp = path.with_suffix(".tmp.npz")
+            np.savez(tmp, **arrays)
+            tmp.replace(path)
+            with self._lock:
+                self.unsaved -= min(saved, self.unsaved)
+
+    def flush(self, path: Path) -> None:
+        """Wait for a background save, then write anything still unsaved."""
+        saver = self._saver
+        if saver is not None:
+            saver.join()
+        if self.unsaved:
+            self.save(path)
+
+    def _save_in_background(self, path: Path) -> None:
+        if self._saver is not None and self._saver.is_alive():
+            return
+        self._saver = threading.Thread(target=self.save, args=(path,), daemon=True)
+        self._saver.start()
+
+    # --- Incremental update ---
+
+    def update(self, store: ContractStore, cache_path: Path | None = None) -> int:
+        """Index signals appended to the JSONL since the last update.
+
+        Starts over if the JSONL shrank (compacted or replaced). With a
+        ``cache_path``, the cache is rewritten in the background once a
+        batch of signals is unsaved (see ``SAVE_EVERY``); ``flush()``
+        writes the rest. Returns the number of signals indexed.
+        """
+        with self._lock:
+            end = store.jsonl_extent("research_signal")
+            if end < self.offset:
+                self._reset()
+            if end == self.offset:
+                return 0
+            records = [
+                json.loads(line)
+                for line, _ in store.iter_jsonl_lines("research_signal", self.offset, end)
+            ]
+            self._append(records)
+            self.offset = end
+            if not self.unsaved:
+                self._unsaved_since = time.monotonic()
+            self.unsaved += len(records)
+            if cache_path is not None and (
+                self.unsaved >= SAVE_EVERY
+                or time.monotonic() - self._unsaved_since >= SAVE_INTERVAL
+            ):
+                self._save_in_background(cache_path)
+            return len(records)
+
+    def _append(self, records: list[dict]) -> None:
+        if not records:
+            return
+        row_lengths, new_indices, new_counts = [], [], []
+        for record in records:
+            ids = []
+            for term in _signal_terms(record):
+                col = self.vocab.get(term)
+                if col is None:
+                    col = self.vocab[term] = len(self.terms)
+                    self.terms.append(term)
+                ids.append(col)
+            cols, counts = np.unique(np.array(ids, dtype=np.int32), return_counts=True)
+            row_lengths.append(len(cols))
+            new_indices.append(cols)
+            new_counts.append(counts.astype(np.float32))
+
+        first_row = self.size
+        self.indptr = np.concatenate([self.indptr, self.indptr[-1] + np.cumsum(row_lengths)])
+        self.indices = np.concatenate([self.indices, *new_indices])
+        self.counts = np.concatenate([self.counts, *new_counts])
+        self.signal_ids.extend(r["signal_id"] for r in records)
+        self.domains.extend(r.get("domain") or "" for r in records)
+        self.emitted_at = np.concatenate([
+            self.emitted_at,
+            np.array([local_naive(r["emitted_at"]) for r in records], dtype="datetime64[s]"),
+        ])
+        self.alive = np.concatenate([self.alive, np.ones(len(records), dtype=bool)])
+
+        df = np.zeros(len(self.terms), dtype=np.int64)
+        df[: len(self.df)] = self.df
+        df += np.bincount(self.indices[self.indptr[first_row]:], minlength=len(self.terms))
+        for row in range(first_row, self.size):
+            previous = self.row_of.get(self.signal_ids[row])
+            if previous is not None:
+                # A rewrite of a signal replaces its earlier row
+                self.alive[previous] = False
+                df[self.indices[self.indptr[previous]:self.indptr[previous + 1]]] -= 1
+            self.row_of[self.signal_ids[row]] = row
+        self.df = df
+        self._weighted = None
+
+    # --- Weighting ---
+
+    def idf(self) -> np.ndarray:
+        n = int(self.alive.sum())
+        return np.log((1 + n) / (1 + self.df)) + 1.0
+
+    def weighted(self) -> tuple[np.ndarray, np.ndarray]:
+        """``(row_of_entry, weights)``: L2-normalized sublinear TF-IDF per stored entry."""
+        if self._weighted is None:
+            rows = np.repeat(np.arange(self.size), np.diff(self.indptr))
+            weights = (1.0 + np.log(self.counts)) * self.idf()[self.indices]
+            norms = np.sqrt(np.bincount(rows, weights=weights**2, minlength=self.size))
+            weights = weights / np.where(norms > 0, norms, 1.0)[rows]
+            self._weighted = (rows, weights)
+        return self._weighted
+
+    def vectorize(self, text: str) -> np.ndarray:
+        """Dense, L2-normalized TF-IDF vector of free text over the vocabulary."""
+        with self._lock:
+            return self._vectorize(text)
+
+    def _vectorize(self, text: str) -> np.ndarray:
+        vector = np.zeros(len(self.terms))
+        ids = [self.vocab[t] for t in tokenize(text) if t in self.vocab]
+        if not ids:
+            return vector
+        cols, counts = np.unique(np.array(ids), return_counts=True)
+        vector[cols] = (1.0 + np.log(counts)) * self.idf()[cols]
+        return vector / np.linalg.norm(vector)
+
+    def domain_centroid(self, domain: str) -> np.ndarray:
+        """Normalized mean vector of the signals in a domain (zeros if none)."""
+        with self._lock:
+            return self._domain_centroid(domain)
+
+    def _domain_centroid(self, domain: str) -> np.ndarray:
+        rows, weights = self.weighted()
+        in_domain = np.array([d == domain for d in self.domains], dtype=bool) & self.alive
+        mask = in_domain[rows]
+        vector = np.bincount(self.indices[mask], weights=weights[mask], minlength=len(self.terms))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    # --- Ranking ---
+
+    def rank_texts(
+        self,
+        texts: list[str],
+        domain: str | None = None,
+        signal_ids: set[str] | None = None,
+        limit: int = 20,
+    ) -> tuple[list[str], list[tuple[str, float, list[str]]]]:
+        """Rank signals against the sum of the texts' vectors and a domain centroid.
+
+        The query is built and ranked under one lock hold, so a concurrent
+        ``update()`` cannot grow the vocabulary in between. Returns
+        ``(query_terms, ranked)`` as ``rank()`` does. Raises ValueError if
+        no term of the texts or domain occurs in signals.
+        """
+        with self._lock:
+            query = np.zeros(len(self.terms))
+            for text in texts:
+                query += self._vectorize(text)
+            if domain:
+                query += self._domain_centroid(domain)
+            norm = np.linalg.norm(query)
+            if norm == 0:
+                raise ValueError("no query vocabulary")
+            query = query / norm
+            query_terms = [self.terms[i] for i in np.argsort(-query)[:10] if query[i] > 0]
+            return query_terms, self._rank(query, signal_ids, limit)
+
+    def rank(
+        self, query: np.ndarray, signal_ids: set[str] | None = None, limit: int = 20,
+    ) -> list[tuple[str, float, list[str]]]:
+        """Signals by cosine similarity to ``query``, best first.
+
+        ``signal_ids`` restricts the candidates. Returns ``(signal_id,
+        score, matched_terms)`` for signals with a positive score.
+        """
+        with self._lock:
+            return self._rank(query, signal_ids, limit)
+
+    def _rank(
+        self, query: np.ndarray, signal_ids: set[str] | None, limit: int,
+    ) -> list[tuple[str, float, list[str]]]:
+        rows, weights = self.weighted()
+        contributions = weights * query[self.indices]
+        scores = np.bincount(rows, weights=contributions, minlength=self.size)
+        candidate = self.alive.copy()
+        if signal_ids is not None:
+            candidate &= np.array([sid in signal_ids for sid in self.signal_ids], dtype=bool)
+        scores = np.where(candidate, scores, 0.0)
+        order = np.argsort(-scores, kind="stable")[:limit]
+        results = []
+        for row in order:
+            if scores[row] <= 0:
+                break
+            start, stop = self.indptr[row], self.indptr[row + 1]
+            top = np.argsort(-contributions[start:stop])[:5]
+            matched = [
+                self.terms[self.indices[start + i]] for i in top if contributions[start + i] > 0
+            ]
+            results.append((self.signal_ids[row], float(scores[row]), matched))
+        return results
+
+    # --- Topics ---
+
+    def cluster(
+        self,
+        since: datetime,
+        k: int = 8,
+        signal_ids: set[str] | None = None,
+        iterations: int = 20,
+        seed: int = 0,
+    ) -> list[dict]:
+        """Spherical k-means over signals emitted since ``since``.
+
+        ``signal_ids`` restricts the signals clustered. Returns one dict per
+        non-empty topic, largest first, with ``top_terms`` and
+        ``signal_ids`` ordered by closeness to the centroid.
+        """
+        with self._lock:
+            recent = self.alive & (self.emitted_at >= np.datetime64(since, "s"))
+            if signal_ids is not None:
+                recent &= np.array([sid in signal_ids for sid in self.signal_ids], dtype=bool)
+            return self._cluster(np.flatnonzero(recent), k, iterations, seed)
+
+    def _cluster(self, rows: np.ndarray, k: int, iterations: int, seed: int) -> list[dict]:
+        _, all_weights = self.weighted()
+        lengths = np.diff(self.indptr)[rows]
+        rows = rows[lengths > 0]
+        lengths = lengths[lengths > 0]
+        n = len(rows)
+        if n == 0:
+            return []
+        k = max(1, min(k, n))
+
+        # Gather the selected rows' entries and remap to a local vocabulary
+        starts = self.indptr[rows]
+        entry = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        entry += np.arange(lengths.sum())  # positions of every selected row's entries
+        local_row = np.repeat(np.arange(n), lengths)
+        vocab_ids, local_col = np.unique(self.indices[entry], return_inverse=True)
+        weights = all_weights[entry]
+        v = len(vocab_ids)
+
+        def similarities(centroids: np.ndarray) -> np.ndarray:
+            sims = np.empty((n, len(centroids)))
+            for c, centroid in enumerate(centroids):
+                sims[:, c] = np.bincount(
+                    local_row, weights=weights * centroid[local_col], minlength=n,
+                )
+            return sims
+
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+        def dense(doc: int) -> np.ndarray:
+            out = np.zeros(v)
+            out[local_col[offsets[doc]:offsets[doc + 1]]] = weights[offsets[doc]:offsets[doc + 1]]
+            return out
+
+        # Greedy k-means++ seeding (deterministic): of a few sampled
+        # candidates, keep the one leaving the least total distance
+        rng = np.random.default_rng(seed)
+        trials = 2 + int(np.log(k))
+        centroids = [dense(int(rng.integers(n)))]
+        best = similarities(np.array(centroids))[:, 0]
+        while len(centroids) < k:
+            distance = np.clip(1.0 - best, 0.0, None)
+            if distance.sum() <= 0:
+                break
+            picks = rng.choice(n, size=trials, p=distance / distance.sum())
+            candidates = np.array([dense(int(doc)) for doc in picks])
+            merged = np.maximum(best[:, None], similarities(candidates))
+            choice = int(np.argmax(merged.sum(axis=0)))
+            centroids.append(candidates[choice])
+            best = merged[:, choice]
+        centroids = np.array(centroids)
+
+        assignment = np.full(n, -1)
+        for _ in range(iterations):
+            sims = similarities(centroids)
+            new_assignment = sims.argmax(axis=1)
+            if np.array_equal(new_assignment, assignment):
+                break
+            assignment = new_assignment
+            flat = np.bincount(
+                assignment[local_row] * v + local_col, weights=weights,
+                minlength=len(centroids) * v,
+            )
+            centroids = flat.reshape(len(centroids), v)
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            centroids = centroids / np.where(norms > 0, norms, 1.0)
+
+        sims = similarities(centroids)
+        topics = []
+        for c in range(len(centroids)):
+            members = np.flatnonzero(assignment == c)
+            if len(members) == 0:
+                continue
+            members = members[np.argsort(-sims[members, c], kind="stable")]
+            top_terms = [
+                self.terms[vocab_ids[i]] for i in np.argsort(-centroids[c])[:8] if centroids[c, i] > 0
+            ]
+            topics.append({
+                "size": len(members),
+                "top_terms": top_terms,
+                "signal_ids": [self.signal_ids[rows[m]] for m in members],
+                "cohesion": float(sims[members, c].mean()),
+            })
+        topics.sort(key=lambda t: (-t["size"], t["top_terms"]))
+        return topics
@@ -4,18 +4,29 @@ JSONL files are append-only and git-tracked.
 SQLite is rebuildable from JSONL at any time.
 """
 
+import functools
 import json
+import os
+import re
 import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 from pathlib import Path
 from typing import TypeVar
 
 from pydantic import BaseModel
 
+from . import migrations, near_duplicates, raw_codec, segments
 from .improvement_recommendation import ImprovementRecommendation
+from .loop_run import LoopSpan
 from .outcome_record import OutcomeRecord
 from .persona_upgrade_patch import PersonaUpgradePatch
 from .research_signal import ResearchSignal
+from .telemetry import span, traced
+from .timestamps import local_naive
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -23,6 +34,135 @@ T = TypeVar("T", bound=BaseModel)
 DATA_DIR = Path(__file__).parent.parent / "data"
 DB_PATH = DATA_DIR / "persona_metrics.db"
 
+# Contract type -> JSONL file (source of truth) and model
+JSONL_FILES = {
+    "outcome_record": "outcome_records.jsonl",
+    "improvement_recommendation": "improvement_recommendations.jsonl",
+    "persona_patch": "persona_patches.jsonl",
+    "research_signal": "research_signals.jsonl",
+    "loop_span": "loop_runs.jsonl",
+}
+CONTRACT_MODELS: dict[str, type[BaseModel]] = {
+    "outcome_record": OutcomeRecord,
+    "improvement_recommendation": ImprovementRecommendation,
+    "persona_patch": PersonaUpgradePatch,
+    "research_signal": ResearchSignal,
+    "loop_span": LoopSpan,
+}
+# Contract type -> SQLite table, and the columns identifying a record in it
+SQLITE_TABLES = {
+    "outcome_record": "outcome_records",
+    "improvement_recommendation": "improvement_recommendations",
+    "persona_patch": "persona_patches",
+    "research_signal": "research_signals",
+    "loop_span": "loop_spans",
+}
+NATURAL_KEYS = {
+    # An idea can reach more than one terminal state over time
+    "outcome_record": ("idea_id", "outcome", "emitted_at"),
+    "improvement_recommendation": ("recommendation_id",),
+    "persona_patch": ("patch_id",),
+    "research_signal": ("signal_id",),
+    "loop_span": ("span_id",),
+}
+
+# Full-text index over research_signals (external content: text lives only in the table)
+SIGNAL_FTS_COLUMNS = ("title", "summary", "relevance_rationale", "tags")
+# bm25() column weights, in SIGNAL_FTS_COLUMNS order: title matches count most
+SIGNAL_FTS_WEIGHTS = (5.0, 2.0, 1.0, 3.0)
+
+# Default lease for claim_signals: unacknowledged claims lapse after this
+CLAIM_LEASE_SECONDS = 300.0
+
+# Read size for streaming JSONL exports
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+# How a table may store raw_json (see set_raw_encoding)
+RAW_ENCODINGS = ("json", "zlib")
+# Recent records a raw_json dictionary is trained on
+RAW_DICT_SAMPLES = 1000
+# raw_json is read by SQL (json_extract) for these, so it must stay JSON
+_JSON_ONLY_TYPES = ("persona_patch",)
+
+
+# WHERE condition keeping only signals not linked to a canonical near-duplicate
+_CANONICAL_ONLY = (
+    "{id} NOT IN (SELECT signal_id FROM signal_minhash WHERE canonical_signal_id IS NOT NULL)"
+)
+
+
+def _current_version(model: type[BaseModel]) -> str:
+    return model.model_fields["contract_version"].default
+
+
+# Start of a record's JSON as written by model_dump_json at the current version
+_CURRENT_PREFIXES = {
+    model: f'{{"contract_version":"{_current_version(model)}"'
+    for model in CONTRACT_MODELS.values()
+}
+_CONTRACT_TYPES = {model: contract_type for contract_type, model in CONTRACT_MODELS.items()}
+
+
+def record_digest(record: BaseModel) -> int:
+    """Fingerprint of a record's content, telling replays from rewrites.
+
+    emitted_at is left out: a replay may be the same record emitted again.
+    """
+    return hash(record.model_dump_json(exclude={"emitted_at"}))
+
+
+def load_record(contract_type: str, raw: str | bytes) -> BaseModel:
+    """Validate a record's JSON, upcasting older contract versions first.
+
+    Records written at the current version (recognised by the prefix
+    model_dump_json gives them) take the plain validation path; anything
+    else is parsed and run through the registered migrators (see
+    contracts/migrations.py) before validation.
+    """
+    model = CONTRACT_MODELS[contract_type]
+    prefix = _CURRENT_PREFIXES[model]
+    if raw.startswith(prefix.encode() if isinstance(raw, bytes) else prefix):
+        return model.model_validate_json(raw)
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        return model.model_validate_json(raw)  # raises the usual ValidationError
+    return model.model_validate(
+        migrations.upcast(contract_type, data, _current_version(model))
+    )
+
+
+def _writes(method):
+    """Run a ContractStore method as one transaction, under the write lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._transaction():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into a safe FTS5 query.
+
+    Every word or "quoted phrase" must match (implicit AND); a trailing
+    ``*`` keeps prefix matching. Operators and punctuation are treated as
+    literal text, so input like ``gpt-4`` or ``C++`` never raises.
+    """
+    terms = []
+    for match in re.finditer(r'"([^"]+)"|(\S+)', text):
+        phrase, word = match.groups()
+        term = phrase if phrase is not None else word
+        prefix = phrase is None and term.endswith("*") and len(term) > 1
+        term = term.rstrip("*") if prefix else term
+        if not any(ch.isalnum() for ch in term):
+            continue
+        terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    if not terms:
+        raise ValueError("Search query has no searchable terms")
+    return " ".join(terms)
+
 
 class ContractStore:
     """Dual-write store for Snow-Town contracts.
@@ -36,18 +176,50 @@ class ContractStore:
         self.db_path = db_path or (self.data_dir / "persona_metrics.db")
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self._conn: sqlite3.Connection | None = None
+        # The connection is shared by threads (the API serves from a pool):
+        # writes and read transactions hold this lock from their first
+        # statement to their commit, so nothing interleaves with them
+        self._lock = threading.RLock()
+        self._tx_depth = 0
+        # record_digest of the stored record by natural key, per contract
+        # type, for keys known to be stored (see _write_once)
+        self._known_keys: dict[str, dict[tuple, int]] = {}
+        # raw_json dictionaries by id, and the one each table encodes with
+        self._raw_dicts: dict[int, bytes] = {}
+        self._raw_encoders: dict[str, tuple[int, bytes]] = {}
 
     def _get_conn(self) -> sqlite3.Connection:
         if self._conn is None:
-            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-            self._conn.row_factory = sqlite3.Row
-            self._ensure_tables()
+            with self._lock:
+                if self._conn is None:
+                    conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+                    conn.row_factory = sqlite3.Row
+                    self._conn = conn
+                    self._ensure_tables()
         return self._conn
 
     def _ensure_tables(self) -> None:
         conn = self._conn
         assert conn is not None
-        conn.executescript("""
+        existing = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE name IN ('research_signals_fts', 'signal_minhash')"
+        )}
+        self._create_tables()
+        # New indexes on an existing database: backfill from the table
+        if "research_signals_fts" not in existing:
+            conn.execute("INSERT INTO research_signals_fts (research_signals_fts) VALUES ('rebuild')")
+        if "signal_minhash" not in existing:
+            self._reindex_signal_duplicates()
+        conn.commit()
+        self._load_raw_dictionaries()
+
+    def _create_tables(self) -> None:
+        """Create missing tables, indexes and triggers.
+
+        Statements run one at a time: executescript() would commit a
+        transaction in progress (see rebuild_sqlite).
+        """
+        self._execute_statements("""
             CREATE TABLE IF NOT EXISTS outcome_records (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 idea_id INTEGER NOT NULL,
@@ -65,6 +237,7 @@ class ContractStore:
                 emitted_at TEXT NOT NULL,
                 raw_json TEXT NOT NULL
             );
+            CREATE INDEX IF NOT EXISTS idx_outcome_records_idea ON outcome_records (idea_id);
 
             CREATE TABLE IF NOT EXISTS improvement_recommendations (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -109,25 +282,324 @@ class ContractStore:
                 emitted_at TEXT NOT NULL,
                 raw_json TEXT NOT NULL
             );
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS research_signals_fts USING fts5(
+                title, summary, relevance_rationale, tags,
+                content='research_signals', content_rowid='id',
+                tokenize='porter unicode61'
+            );
+
+            -- Near-duplicate index (see contracts/near_duplicates.py): one MinHash
+            -- signature per signal, its LSH band buckets, and a link to the
+            -- canonical (first-stored) signal when it duplicates one.
+            CREATE TABLE IF NOT EXISTS signal_minhash (
+                signal_id TEXT PRIMARY KEY,
+                signature BLOB NOT NULL,
+                canonical_signal_id TEXT,
+                similarity REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_signal_minhash_canonical
+                ON signal_minhash (canonical_signal_id);
+            CREATE TABLE IF NOT EXISTS signal_lsh_buckets (
+                bucket INTEGER NOT NULL,
+                signal_id TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_signal_lsh_bucket ON signal_lsh_buckets (bucket);
+            CREATE INDEX IF NOT EXISTS idx_signal_lsh_signal ON signal_lsh_buckets (signal_id);
+
+            -- Work-queue leases (see claim_signals). A row is a claim until
+            -- acked or released; once expires_at (epoch seconds) passes, the
+            -- signal can be claimed again.
+            CREATE TABLE IF NOT EXISTS signal_claims (
+                signal_id TEXT PRIMARY KEY,
+                consumer TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_signal_claims_consumer ON signal_claims (consumer);
+            CREATE INDEX IF NOT EXISTS idx_signals_unconsumed
+                ON research_signals (emitted_at) WHERE consumed_by IS NULL;
+
+            CREATE TABLE IF NOT EXISTS loop_spans (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                span_id TEXT NOT NULL UNIQUE,
+                run_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                parent_span_id TEXT,
+                started_at TEXT NOT NULL,
+                duration_seconds REAL NOT NULL,
+                status TEXT DEFAULT 'ok',
+                input_tokens INTEGER DEFAULT 0,
+                output_tokens INTEGER DEFAULT 0,
+                emitted_at TEXT NOT NULL,
+                raw_json TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_loop_spans_stage ON loop_spans (stage, started_at);
+            CREATE INDEX IF NOT EXISTS idx_loop_spans_run ON loop_spans (run_id);
+
+            -- Append-only log of SQLite-only state changes (status, consumed_by),
+            -- so monitors can follow transitions without rescanning tables.
+            CREATE TABLE IF NOT EXISTS status_events (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                contract_type TEXT NOT NULL,
+                record_id TEXT NOT NULL,
+                old_status TEXT,
+                new_status TEXT,
+                detail TEXT,
+                changed_at TEXT NOT NULL
+                    DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'))
+            );
+
+            CREATE TRIGGER IF NOT EXISTS recommendation_status_event
+            AFTER UPDATE OF status ON improvement_recommendations
+            WHEN OLD.status IS NOT NEW.status
+            BEGIN
+                INSERT INTO status_events (contract_type, record_id, old_status, new_status, detail)
+                VALUES ('improvement_recommendation', NEW.recommendation_id,
+                        OLD.status, NEW.status, NEW.target_system);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS patch_status_event
+            AFTER UPDATE OF status ON persona_patches
+            WHEN OLD.status IS NOT NEW.status
+            BEGIN
+                INSERT INTO status_events (contract_type, record_id, old_status, new_status, detail)
+                VALUES ('persona_patch', NEW.patch_id, OLD.status, NEW.status,
+                        json_extract(NEW.raw_json, '$.source_recommendation_ids'));
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS signal_consumed_event
+            AFTER UPDATE OF consumed_by ON research_signals
+            WHEN OLD.consumed_by IS NOT NEW.consumed_by
+            BEGIN
+                INSERT INTO status_events (contract_type, record_id, old_status, new_status)
+                VALUES ('research_signal', NEW.signal_id, OLD.consumed_by, NEW.consumed_by);
+            END;
+
+            -- Preset dictionaries for compact raw_json (see set_raw_encoding).
+            -- Kept across rebuilds; the active one per table encodes new rows.
+            CREATE TABLE IF NOT EXISTS raw_json_dictionaries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT NOT NULL,
+                zdict BLOB NOT NULL,
+                active INTEGER NOT NULL DEFAULT 1,
+                created_at TEXT NOT NULL
+                    DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'))
+            );
         """)
-        conn.commit()
+
+    def _execute_statements(self, script: str) -> None:
+        statement = ""
+        for line in script.splitlines(keepends=True):
+            statement += line
+            if sqlite3.complete_statement(statement):
+                self._conn.execute(statement)
+                statement = ""
+
+    @contextmanager
+    def transaction(self) -> Iterator["ContractStore"]:
+        """Group SQLite writes into a single transaction.
+
+        Writes and status updates inside the block are committed together
+        on exit, or rolled back if the block raises. JSONL appends are not
+        part of the transaction. Nested blocks join the outermost one.
+        Every write runs in one, and other threads' writes wait for it.
+        """
+        with self._transaction(trace_commit=True):
+            yield self
+
+    @contextmanager
+    def _transaction(self, trace_commit: bool = False) -> Iterator["ContractStore"]:
+        # Single writes commit untraced: the span store writes through them
+        with self._lock:
+            conn = self._get_conn()
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._tx_depth -= 1
+                if self._tx_depth == 0:
+                    conn.rollback()
+                raise
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                with span("store.commit") if trace_commit else nullcontext():
+                    conn.commit()
+
+    @contextmanager
+    def read_transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run several reads against one consistent SQLite snapshot.
+
+        Joins an enclosing transaction() if this thread has one open;
+        writes from other threads wait until the block ends.
+        """
+        with self._lock:
+            conn = self._get_conn()
+            if self._tx_depth or conn.in_transaction:
+                yield conn
+                return
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                conn.commit()
 
     def _jsonl_path(self, contract_type: str) -> Path:
-        paths = {
-            "outcome_record": self.data_dir / "outcome_records.jsonl",
-            "improvement_recommendation": self.data_dir / "improvement_recommendations.jsonl",
-            "persona_patch": self.data_dir / "persona_patches.jsonl",
-            "research_signal": self.data_dir / "research_signals.jsonl",
-        }
-        return paths[contract_type]
+        """The single-file JSONL of a contract type that is not segmented."""
+        return self.data_dir / JSONL_FILES[contract_type]
 
-    def _append_jsonl(self, contract_type: str, record: BaseModel) -> None:
+    def _segment_dir(self, contract_type: str) -> Path:
+        return self.data_dir / Path(JSONL_FILES[contract_type]).stem
+
+    def _segments(self, contract_type: str) -> list[segments.Segment]:
+        """The JSONL files of a contract type, in order (see contracts/segments.py).
+
+        A type is segmented once rotate_jsonl has run for it; until then
+        its single file is the only segment.
+        """
+        directory = self._segment_dir(contract_type)
+        if directory.is_dir():
+            return segments.list_segments(directory)
         path = self._jsonl_path(contract_type)
+        if not path.exists():
+            return []
+        return [segments.Segment(path=path, start=0, size=path.stat().st_size)]
+
+    def _append_path(self, contract_type: str) -> Path:
+        directory = self._segment_dir(contract_type)
+        if directory.is_dir():
+            return segments.append_path(directory, datetime.now())
+        return self._jsonl_path(contract_type)
+
+    def high_water_marks(self, contract_types: list[str] | None = None) -> dict[str, int]:
+        """Byte size of each contract type's JSONL, across all its segments.
+
+        JSONL is append-only, so an unchanged size means no new records.
+        Sealing segments does not change it.
+        """
+        types = contract_types or [
+            "outcome_record", "improvement_recommendation", "persona_patch", "research_signal",
+        ]
+        marks = {}
+        for contract_type in types:
+            segs = self._segments(contract_type)
+            marks[contract_type] = segs[-1].end if segs else 0
+        return marks
+
+    def _append_jsonl(self, contract_type: str, record: BaseModel) -> None:
+        path = self._append_path(contract_type)
         with open(path, "a") as f:
             f.write(record.model_dump_json() + "\n")
 
+    def _decode(self, model: type[T], raw: str | bytes) -> T:
+        """Deserialize one stored record, upcast to the current contract version.
+
+        ``raw`` is a JSONL line or a raw_json column value in any encoding.
+        """
+        return load_record(_CONTRACT_TYPES[model], self._raw_text(raw))
+
+    def _read_jsonl(
+        self,
+        contract_type: str,
+        model: type[T],
+        limit: int,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[T]:
+        """The last ``limit`` records, optionally only those emitted in ``[since, until)``.
+
+        Reads segments newest first and stops once ``limit`` records are
+        found; sealed segments outside the window are not opened.
+        """
+        since, until = local_naive(since), local_naive(until)
+        records: list[T] = []
+        for segment in reversed(self._segments(contract_type)):
+            if not segment.overlaps(since, until):
+                continue
+            with segment.open() as f:
+                batch = [self._decode(model, line) for line in f if line.strip()]
+            if since is not None or until is not None:
+                batch = [
+                    r for r in batch
+                    if (since is None or local_naive(r.emitted_at) >= since)
+                    and (until is None or local_naive(r.emitted_at) < until)
+                ]
+            records[:0] = batch
+            if len(records) >= limit:
+                break
+        return records[-limit:]
+
+    def _stored_digest(self, contract_type: str, key: tuple) -> int | None:
+        """record_digest of the record stored under a natural key, or None.
+
+        Keys this store has written or already seen are answered from
+        memory; anything else is one indexed SQLite lookup, which also
+        sees writes from other processes.
+        """
+        known = self._known_keys.setdefault(contract_type, {})
+        if key not in known:
+            known.update(self.stored_digests(contract_type, [key]))
+        return known.get(key)
+
+    def _write_once(self, contract_type: str, record: BaseModel, insert) -> bool:
+        """Append to JSONL and insert into SQLite unless the record is already stored.
+
+        Replays and retries of a stored record are no-ops. A record whose
+        natural key is stored with other content replaces it: the last
+        write wins, as in SQLite and dedupe_jsonl. Returns True if the
+        record was written.
+        """
+        key = self.natural_key(contract_type, record)
+        digest = record_digest(record)
+        with self._transaction():
+            stored = self._stored_digest(contract_type, key)
+            if stored == digest:
+                return False
+            if stored is not None:
+                self._delete_replaced(contract_type, [key])
+            self._append_jsonl(contract_type, record)
+            insert(record)
+            self._known_keys[contract_type][key] = digest
+        return True
+
+    @_writes
+    def _delete_replaced(self, contract_type: str, keys: list[tuple]) -> None:
+        """Delete the outcome rows that rewrites of these keys replace.
+
+        outcome_records is the only table without a unique natural key;
+        the others are replaced by their INSERT OR REPLACE. Either way no
+        status trigger fires, so a resync event is logged for followers
+        that count JSONL lines (see status_events_since).
+        """
+        if not keys:
+            return
+        conn = self._get_conn()
+        if contract_type == "outcome_record":
+            columns = NATURAL_KEYS[contract_type]
+            conn.executemany(
+                "DELETE FROM outcome_records WHERE "
+                + " AND ".join(f"{column} = ?" for column in columns),
+                keys,
+            )
+        conn.execute(
+            "INSERT INTO status_events (contract_type, record_id, new_status) "
+            "VALUES ('*', ?, 'rewrite')",
+            (contract_type,),
+        )
+
+    @_writes
+    def _delete_duplicate_rows(self, contract_type: str) -> None:
+        """Keep only the newest row of each natural key (see _delete_replaced)."""
+        if contract_type != "outcome_record":
+            return
+        fields = NATURAL_KEYS[contract_type]
+        self._get_conn().execute(
+            "DELETE FROM outcome_records WHERE id NOT IN "
+            f"(SELECT MAX(id) FROM outcome_records GROUP BY {', '.join(fields)})"
+        )
+
     # --- OutcomeRecord ---
 
+    @_writes
     def _insert_outcome_sqlite(self, record: OutcomeRecord) -> None:
         """Insert an OutcomeRecord into SQLite only."""
         conn = self._get_conn()
@@ -151,26 +623,24 @@ class ContractStore:
                 json.dumps(record.tags),
                 record.github_url,
                 record.emitted_at.isoformat(),
-                record.model_dump_json(),
+                self._raw_json("outcome_record", record),
             ),
         )
-        conn.commit()
 
-    def write_outcome(self, record: OutcomeRecord) -> None:
-        """Write an OutcomeRecord to JSONL and SQLite."""
-        self._append_jsonl("outcome_record", record)
-        self._insert_outcome_sqlite(record)
+    @traced("store.write_outcome")
+    def write_outcome(self, record: OutcomeRecord) -> bool:
+        """Write an OutcomeRecord to JSONL and SQLite.
 
-    def read_outcomes(self, limit: int = 100) -> list[OutcomeRecord]:
+        Returns False, writing nothing, if the same (idea_id, outcome,
+        emitted_at) is already stored.
+        """
+        return self._write_once("outcome_record", record, self._insert_outcome_sqlite)
+
+    def read_outcomes(
+        self, limit: int = 100, since: datetime | None = None, until: datetime | None = None,
+    ) -> list[OutcomeRecord]:
         """Read OutcomeRecords from JSONL (source of truth)."""
-        path = self._jsonl_path("outcome_record")
-        if not path.exists():
-            return []
-        records = []
-        for line in path.read_text().strip().splitlines():
-            if line:
-                records.append(OutcomeRecord.model_validate_json(line))
-        return records[-limit:]
+        return self._read_jsonl("outcome_record", OutcomeRecord, limit, since, until)
 
     def query_outcomes(
         self,
@@ -194,10 +664,11 @@ class ContractStore:
         query += " ORDER BY emitted_at DESC LIMIT ?"
         params.append(limit)
         rows = conn.execute(query, params).fetchall()
-        return [OutcomeRecord.model_validate_json(row["raw_json"]) for row in rows]
+        return [self._decode(OutcomeRecord, row["raw_json"]) for row in rows]
 
     # --- ImprovementRecommendation ---
 
+    @_writes
     def _insert_recommendation_sqlite(self, rec: ImprovementRecommendation) -> None:
         """Insert an ImprovementRecommendation into SQLite only."""
         conn = self._get_conn()
@@ -217,26 +688,25 @@ class ContractStore:
                 rec.target_department,
                 rec.status,
                 rec.emitted_at.isoformat(),
-                rec.model_dump_json(),
+                self._raw_json("improvement_recommendation", rec),
             ),
         )
-        conn.commit()
 
-    def write_recommendation(self, rec: ImprovementRecommendation) -> None:
-        """Write an ImprovementRecommendation to JSONL and SQLite."""
-        self._append_jsonl("improvement_recommendation", rec)
-        self._insert_recommendation_sqlite(rec)
+    @traced("store.write_recommendation")
+    def write_recommendation(self, rec: ImprovementRecommendation) -> bool:
+        """Write an ImprovementRecommendation to JSONL and SQLite.
+
+        Returns False, writing nothing, if its recommendation_id is already stored.
+        """
+        return self._write_once(
+            "improvement_recommendation", rec, self._insert_recommendation_sqlite,
+        )
 
-    def read_recommendations(self, limit: int = 100) -> list[ImprovementRecommendation]:
+    def read_recommendations(
+        self, limit: int = 100, since: datetime | None = None, until: datetime | None = None,
+    ) -> list[ImprovementRecommendation]:
         """Read ImprovementRecommendations from JSONL."""
-        path = self._jsonl_path("improvement_recommendation")
-        if not path.exists():
-            return []
-        records = []
-        for line in path.read_text().strip().splitlines():
-            if line:
-                records.append(ImprovementRecommendation.model_validate_json(line))
-        return records[-limit:]
+        return self._read_jsonl("improvement_recommendation", ImprovementRecommendation, limit, since, until)
 
     def query_recommendations(
         self,
@@ -270,11 +740,26 @@ class ContractStore:
         rows = conn.execute(query, params).fetchall()
         results = []
         for row in rows:
-            rec = ImprovementRecommendation.model_validate_json(row["raw_json"])
+            rec = self._decode(ImprovementRecommendation, row["raw_json"])
             rec.status = row["current_status"]
             results.append(rec)
         return results
 
+    def get_recommendation(self, recommendation_id: str) -> ImprovementRecommendation | None:
+        """Look up a single ImprovementRecommendation by id from SQLite."""
+        conn = self._get_conn()
+        row = conn.execute(
+            "SELECT raw_json, status AS current_status FROM improvement_recommendations "
+            "WHERE recommendation_id = ?",
+            (recommendation_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        rec = self._decode(ImprovementRecommendation, row["raw_json"])
+        rec.status = row["current_status"]
+        return rec
+
+    @_writes
     def update_recommendation_status(self, recommendation_id: str, status: str) -> None:
         """Update the status of a recommendation in SQLite."""
         conn = self._get_conn()
@@ -282,10 +767,10 @@ class ContractStore:
             "UPDATE improvement_recommendations SET status = ? WHERE recommendation_id = ?",
             (status, recommendation_id),
         )
-        conn.commit()
 
     # --- PersonaUpgradePatch ---
 
+    @_writes
     def _insert_patch_sqlite(self, patch: PersonaUpgradePatch) -> None:
         """Insert a PersonaUpgradePatch into SQLite only."""
         conn = self._get_conn()
@@ -306,37 +791,41 @@ class ContractStore:
                 patch.model_dump_json(),
             ),
         )
-        conn.commit()
 
-    def write_patch(self, patch: PersonaUpgradePatch) -> None:
-        """Write a PersonaUpgradePatch to JSONL and SQLite."""
-        self._append_jsonl("persona_patch", patch)
-        self._insert_patch_sqlite(patch)
+    @traced("store.write_patch")
+    def write_patch(self, patch: PersonaUpgradePatch) -> bool:
+        """Write a PersonaUpgradePatch to JSONL and SQLite.
 
-    def read_patches(self, limit: int = 100) -> list[PersonaUpgradePatch]:
+        Returns False, writing nothing, if its patch_id is already stored.
+        """
+        return self._write_once("persona_patch", patch, self._insert_patch_sqlite)
+
+    def read_patches(
+        self, limit: int = 100, since: datetime | None = None, until: datetime | None = None,
+    ) -> list[PersonaUpgradePatch]:
         """Read PersonaUpgradePatches from JSONL."""
-        path = self._jsonl_path("persona_patch")
-        if not path.exists():
-            return []
-        records = []
-        for line in path.read_text().strip().splitlines():
-            if line:
-                records.append(PersonaUpgradePatch.model_validate_json(line))
-        return records[-limit:]
+        return self._read_jsonl("persona_patch", PersonaUpgradePatch, limit, since, until)
 
     def query_patches(
         self,
         persona_id: str | None = None,
         status: str | None = None,
+        schema_valid: bool | None = None,
+        emitted_before: datetime | None = None,
+        patch_ids: list[str] | None = None,
         limit: int = 100,
     ) -> list[PersonaUpgradePatch]:
         """Query PersonaUpgradePatches from SQLite.
 
-        Overlays current SQLite status onto deserialized objects,
-        since raw_json retains the original write-time status.
+        Overlays current SQLite status and versions onto deserialized objects,
+        since raw_json retains the original write-time state (a patch may
+        have been rebased onto a newer persona version since).
         """
         conn = self._get_conn()
-        query = "SELECT raw_json, status AS current_status FROM persona_patches"
+        query = (
+            "SELECT raw_json, status AS current_status, from_version, to_version "
+            "FROM persona_patches"
+        )
         conditions: list[str] = []
         params: list = []
         if persona_id:
@@ -345,18 +834,44 @@ class ContractStore:
         if status:
             conditions.append("status = ?")
             params.append(status)
+        if schema_valid is not None:
+            conditions.append("schema_valid = ?")
+            params.append(1 if schema_valid else 0)
+        if emitted_before is not None:
+            conditions.append("emitted_at < ?")
+            params.append(emitted_before.isoformat())
+        if patch_ids is not None:
+            if not patch_ids:
+                return []
+            conditions.append(f"patch_id IN ({', '.join('?' * len(patch_ids))})")
+            params.extend(patch_ids)
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
         query += " ORDER BY emitted_at DESC LIMIT ?"
         params.append(limit)
         rows = conn.execute(query, params).fetchall()
-        results = []
-        for row in rows:
-            patch = PersonaUpgradePatch.model_validate_json(row["raw_json"])
-            patch.status = row["current_status"]
-            results.append(patch)
-        return results
+        return [self._patch_from_row(row) for row in rows]
+
+    def _patch_from_row(self, row: sqlite3.Row) -> PersonaUpgradePatch:
+        patch = self._decode(PersonaUpgradePatch, row["raw_json"])
+        patch.status = row["current_status"]
+        if row["from_version"]:
+            patch.from_version = row["from_version"]
+        if row["to_version"]:
+            patch.to_version = row["to_version"]
+        return patch
 
+    def get_patch(self, patch_id: str) -> PersonaUpgradePatch | None:
+        """Look up a single PersonaUpgradePatch by id via the patch_id index."""
+        conn = self._get_conn()
+        row = conn.execute(
+            "SELECT raw_json, status AS current_status, from_version, to_version "
+            "FROM persona_patches WHERE patch_id = ?",
+            (patch_id,),
+        ).fetchone()
+        return self._patch_from_row(row) if row is not None else None
+
+    @_writes
     def update_patch_status(self, patch_id: str, status: str) -> None:
         """Update the status of a patch in SQLite."""
         conn = self._get_conn()
@@ -364,14 +879,39 @@ class ContractStore:
             "UPDATE persona_patches SET status = ? WHERE patch_id = ?",
             (status, patch_id),
         )
-        conn.commit()
+
+    @_writes
+    def update_patch_versions(self, patch_id: str, from_version: str, to_version: str) -> None:
+        """Record a rebase of a patch onto a newer persona version in SQLite."""
+        conn = self._get_conn()
+        conn.execute(
+            "UPDATE persona_patches SET from_version = ?, to_version = ? WHERE patch_id = ?",
+            (from_version, to_version, patch_id),
+        )
 
     # --- ResearchSignal ---
 
+    @_writes
     def _insert_signal_sqlite(self, signal: ResearchSignal) -> None:
-        """Insert a ResearchSignal into SQLite only."""
+        """Insert a ResearchSignal into SQLite only, keeping the FTS index in sync.
+
+        REPLACE deletes the old row without firing triggers, so the old
+        index entry is removed explicitly first.
+        """
         conn = self._get_conn()
-        conn.execute(
+        fts_columns = ", ".join(SIGNAL_FTS_COLUMNS)
+        old = conn.execute(
+            f"SELECT id, {fts_columns} FROM research_signals WHERE signal_id = ?",
+            (signal.signal_id,),
+        ).fetchone()
+        if old is not None:
+            conn.execute(
+                f"INSERT INTO research_signals_fts (research_signals_fts, rowid, {fts_columns}) "
+                "VALUES ('delete', ?, ?, ?, ?, ?)",
+                tuple(old),
+            )
+        tags = json.dumps(signal.tags)
+        cursor = conn.execute(
             """INSERT OR REPLACE INTO research_signals
             (signal_id, source, title, summary, url, relevance,
              relevance_rationale, tags, domain, consumed_by, emitted_at, raw_json)
@@ -384,30 +924,159 @@ class ContractStore:
                 signal.url,
                 signal.relevance.value,
                 signal.relevance_rationale,
-                json.dumps(signal.tags),
+                tags,
                 signal.domain,
                 signal.consumed_by,
                 signal.emitted_at.isoformat(),
-                signal.model_dump_json(),
+                self._raw_json("research_signal", signal),
             ),
         )
-        conn.commit()
+        conn.execute(
+            f"INSERT INTO research_signals_fts (rowid, {fts_columns}) VALUES (?, ?, ?, ?, ?)",
+            (cursor.lastrowid, signal.title, signal.summary, signal.relevance_rationale, tags),
+        )
+        self._index_signal_duplicates(signal.signal_id, signal.title, signal.summary)
 
-    def write_signal(self, signal: ResearchSignal) -> None:
-        """Write a ResearchSignal to JSONL and SQLite."""
-        self._append_jsonl("research_signal", signal)
-        self._insert_signal_sqlite(signal)
+    def _index_signal_duplicates(self, signal_id: str, title: str, summary: str) -> str | None:
+        """Add a signal to the near-duplicate index; returns its canonical id if a duplicate.
 
-    def read_signals(self, limit: int = 100) -> list[ResearchSignal]:
-        """Read ResearchSignals from JSONL (source of truth)."""
-        path = self._jsonl_path("research_signal")
-        if not path.exists():
+        Only signals sharing an LSH bucket are compared, so the cost does
+        not grow with history. A duplicate links to its best match's
+        canonical signal, so clusters stay flat.
+        """
+        conn = self._get_conn()
+        conn.execute("DELETE FROM signal_lsh_buckets WHERE signal_id = ?", (signal_id,))
+        conn.execute("DELETE FROM signal_minhash WHERE signal_id = ?", (signal_id,))
+
+        sig = near_duplicates.signature(near_duplicates.shingles(title, summary))
+        buckets = near_duplicates.band_buckets(sig)
+        candidates = conn.execute(
+            f"""SELECT m.signal_id, m.signature, m.canonical_signal_id FROM signal_minhash m
+                WHERE m.signal_id IN (SELECT signal_id FROM signal_lsh_buckets
+                                      WHERE bucket IN ({', '.join('?' * len(buckets))}))""",
+            buckets,
+        ).fetchall()
+        canonical, best = None, 0.0
+        for row in candidates:
+            target = row["canonical_signal_id"] or row["signal_id"]
+            if target == signal_id:  # re-written canonical matching its own duplicates
+                continue
+            score = near_duplicates.similarity(sig, near_duplicates.unpack(row["signature"]))
+            if score >= near_duplicates.DUPLICATE_THRESHOLD and score > best:
+                canonical, best = target, score
+
+        conn.execute(
+            "INSERT INTO signal_minhash (signal_id, signature, canonical_signal_id, similarity) "
+            "VALUES (?, ?, ?, ?)",
+            (signal_id, near_duplicates.pack(sig), canonical, best if canonical else None),
+        )
+        conn.executemany(
+            "INSERT INTO signal_lsh_buckets (bucket, signal_id) VALUES (?, ?)",
+            [(bucket, signal_id) for bucket in buckets],
+        )
+        return canonical
+
+    def reindex_signal_duplicates(self) -> int:
+        """Rebuild the near-duplicate index over all stored signals, oldest first.
+
+        Returns the number of signals linked to a canonical signal.
+        """
+        with self.transaction():
+            return self._reindex_signal_duplicates()
+
+    def _reindex_signal_duplicates(self) -> int:
+        conn = self._get_conn()
+        conn.execute("DELETE FROM signal_lsh_buckets")
+        conn.execute("DELETE FROM signal_minhash")
+        rows = conn.execute(
+            "SELECT signal_id, title, summary FROM research_signals ORDER BY emitted_at, id"
+        ).fetchall()
+        duplicates = 0
+        for row in rows:
+            if self._index_signal_duplicates(row["signal_id"], row["title"], row["summary"]):
+                duplicates += 1
+        return duplicates
+
+    def canonical_signal_id(self, signal_id: str) -> str | None:
+        """The signal this one duplicates, or None if it is canonical (or unknown)."""
+        row = self._get_conn().execute(
+            "SELECT canonical_signal_id FROM signal_minhash WHERE signal_id = ?", (signal_id,),
+        ).fetchone()
+        return row["canonical_signal_id"] if row else None
+
+    def signal_duplicates(self, signal_id: str) -> list[tuple[str, float]]:
+        """Signals linked to ``signal_id`` as their canonical, with similarity, best first."""
+        rows = self._get_conn().execute(
+            "SELECT signal_id, similarity FROM signal_minhash WHERE canonical_signal_id = ? "
+            "ORDER BY similarity DESC, signal_id",
+            (signal_id,),
+        ).fetchall()
+        return [(row["signal_id"], row["similarity"]) for row in rows]
+
+    def signal_count(self) -> int:
+        """Number of signals in SQLite."""
+        return self._get_conn().execute("SELECT COUNT(*) FROM research_signals").fetchone()[0]
+
+    def duplicate_clusters(self, limit: int) -> list[tuple[str, str, int]]:
+        """The largest near-duplicate clusters as (canonical id, title, duplicate count)."""
+        rows = self._get_conn().execute(
+            """SELECT m.canonical_signal_id AS canonical, s.title, COUNT(*) AS n
+               FROM signal_minhash m JOIN research_signals s ON s.signal_id = m.canonical_signal_id
+               WHERE m.canonical_signal_id IS NOT NULL
+               GROUP BY m.canonical_signal_id ORDER BY n DESC LIMIT ?""",
+            (limit,),
+        ).fetchall()
+        return [(row["canonical"], row["title"], row["n"]) for row in rows]
+
+    def list_signal_ids(
+        self, consumed: bool | None = None, collapse_duplicates: bool = False,
+    ) -> set[str]:
+        """IDs of the signals in SQLite, optionally filtered by consumed status."""
+        conditions: list[str] = []
+        if consumed is True:
+            conditions.append("consumed_by IS NOT NULL")
+        elif consumed is False:
+            conditions.append("consumed_by IS NULL")
+        if collapse_duplicates:
+            conditions.append(_CANONICAL_ONLY.format(id="signal_id"))
+        query = "SELECT signal_id FROM research_signals"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        return {row["signal_id"] for row in self._get_conn().execute(query)}
+
+    def get_signals(self, signal_ids: list[str]) -> list[ResearchSignal]:
+        """Signals by ID, in the given order; unknown IDs are skipped.
+
+        Overlays current SQLite consumed_by, like ``query_signals``.
+        """
+        if not signal_ids:
             return []
-        records = []
-        for line in path.read_text().strip().splitlines():
-            if line:
-                records.append(ResearchSignal.model_validate_json(line))
-        return records[-limit:]
+        placeholders = ",".join("?" * len(signal_ids))
+        rows = self._get_conn().execute(
+            "SELECT signal_id, raw_json, consumed_by FROM research_signals "
+            f"WHERE signal_id IN ({placeholders})",
+            signal_ids,
+        ).fetchall()
+        by_id = {}
+        for row in rows:
+            signal = self._decode(ResearchSignal, row["raw_json"])
+            signal.consumed_by = row["consumed_by"]
+            by_id[row["signal_id"]] = signal
+        return [by_id[sid] for sid in signal_ids if sid in by_id]
+
+    @traced("store.write_signal")
+    def write_signal(self, signal: ResearchSignal) -> bool:
+        """Write a ResearchSignal to JSONL and SQLite.
+
+        Returns False, writing nothing, if its signal_id is already stored.
+        """
+        return self._write_once("research_signal", signal, self._insert_signal_sqlite)
+
+    def read_signals(
+        self, limit: int = 100, since: datetime | None = None, until: datetime | None = None,
+    ) -> list[ResearchSignal]:
+        """Read ResearchSignals from JSONL (source of truth)."""
+        return self._read_jsonl("research_signal", ResearchSignal, limit, since, until)
 
     def query_signals(
         self,
@@ -416,11 +1085,13 @@ class ContractStore:
         domain: str | None = None,
         consumed: bool | None = None,
         limit: int = 100,
+        collapse_duplicates: bool = False,
     ) -> list[ResearchSignal]:
         """Query ResearchSignals from SQLite.
 
         Overlays current SQLite consumed_by onto deserialized objects,
         since raw_json retains the original write-time state.
+        ``collapse_duplicates`` keeps only canonical signals.
         """
         conn = self._get_conn()
         query = "SELECT raw_json, consumed_by AS current_consumed_by FROM research_signals"
@@ -439,6 +1110,8 @@ class ContractStore:
             conditions.append("consumed_by IS NOT NULL")
         elif consumed is False:
             conditions.append("consumed_by IS NULL")
+        if collapse_duplicates:
+            conditions.append(_CANONICAL_ONLY.format(id="signal_id"))
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
         query += " ORDER BY emitted_at DESC LIMIT ?"
@@ -446,11 +1119,101 @@ class ContractStore:
         rows = conn.execute(query, params).fetchall()
         results = []
         for row in rows:
-            signal = ResearchSignal.model_validate_json(row["raw_json"])
+            signal = self._decode(ResearchSignal, row["raw_json"])
             signal.consumed_by = row["current_consumed_by"]
             results.append(signal)
         return results
 
+    def _signal_matches(
+        self,
+        query: str,
+        source: str | None,
+        relevance: str | None,
+        domain: str | None,
+        collapse_duplicates: bool,
+    ) -> tuple[str, list]:
+        """FROM/WHERE clause for matching signals; joins the table only when filtering."""
+        sql = "FROM research_signals_fts"
+        conditions = ["research_signals_fts MATCH ?"]
+        params: list = [fts_query(query)]
+        for column, value in (("source", source), ("relevance", relevance), ("domain", domain)):
+            if value:
+                conditions.append(f"s.{column} = ?")
+                params.append(value)
+        if collapse_duplicates:
+            conditions.append(_CANONICAL_ONLY.format(id="s.signal_id"))
+        if len(conditions) > 1:
+            # CROSS JOIN keeps the index as the outer loop
+            sql += " CROSS JOIN research_signals s ON s.id = research_signals_fts.rowid"
+        return f"{sql} WHERE {' AND '.join(conditions)}", params
+
+    def search_signals(
+        self,
+        query: str,
+        source: str | None = None,
+        relevance: str | None = None,
+        domain: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+        highlight: tuple[str, str] = ("<mark>", "</mark>"),
+        collapse_duplicates: bool = False,
+    ) -> list[tuple[ResearchSignal, float, str]]:
+        """Full-text search over title, summary, rationale and tags.
+
+        Returns ``(signal, score, snippet)`` best match first; score is the
+        negated BM25 rank, so higher is better. ``query`` is free text
+        (see fts_query); filters narrow the matches.
+        """
+        conn = self._get_conn()
+        matches, params = self._signal_matches(
+            query, source, relevance, domain, collapse_duplicates,
+        )
+        weights = ", ".join(str(w) for w in SIGNAL_FTS_WEIGHTS)
+        # Rank on the index alone, then fetch snippets and records for just the
+        # page. Snippets are looked up one rowid at a time: FTS5 only narrows a
+        # MATCH by rowid for equality, so an IN list would re-scan every match.
+        page = conn.execute(
+            f"SELECT research_signals_fts.rowid, bm25(research_signals_fts, {weights}) {matches} "
+            "ORDER BY 2 LIMIT ? OFFSET ?",
+            [*params, limit, offset],
+        ).fetchall()
+        if not page:
+            return []
+        records = {
+            row["id"]: row
+            for row in conn.execute(
+                f"""SELECT id, raw_json, consumed_by FROM research_signals
+                    WHERE id IN ({', '.join('?' * len(page))})""",
+                [rowid for rowid, _ in page],
+            )
+        }
+        hits = []
+        for rowid, rank in page:
+            snippet = conn.execute(
+                "SELECT snippet(research_signals_fts, -1, ?, ?, '…', 16) FROM research_signals_fts "
+                "WHERE research_signals_fts MATCH ? AND rowid = ?",
+                (*highlight, params[0], rowid),
+            ).fetchone()[0]
+            signal = self._decode(ResearchSignal, records[rowid]["raw_json"])
+            signal.consumed_by = records[rowid]["consumed_by"]
+            hits.append((signal, -rank, snippet))
+        return hits
+
+    def count_signal_matches(
+        self,
+        query: str,
+        source: str | None = None,
+        relevance: str | None = None,
+        domain: str | None = None,
+        collapse_duplicates: bool = False,
+    ) -> int:
+        """Total number of search_signals matches, for pagination."""
+        matches, params = self._signal_matches(
+            query, source, relevance, domain, collapse_duplicates,
+        )
+        return self._get_conn().execute(f"SELECT COUNT(*) {matches}", params).fetchone()[0]
+
+    @_writes
     def update_signal_consumed_by(self, signal_id: str, consumed_by: str) -> None:
         """Mark a signal as consumed by a downstream process."""
         conn = self._get_conn()
@@ -458,36 +1221,655 @@ class ContractStore:
             "UPDATE research_signals SET consumed_by = ? WHERE signal_id = ?",
             (consumed_by, signal_id),
         )
-        conn.commit()
+        conn.execute("DELETE FROM signal_claims WHERE signal_id = ?", (signal_id,))
+
+    @traced("store.claim_signals")
+    def claim_signals(
+        self,
+        consumer: str,
+        source: str | None = None,
+        relevance: str | None = None,
+        domain: str | None = None,
+        limit: int = 100,
+        lease_seconds: float = CLAIM_LEASE_SECONDS,
+        collapse_duplicates: bool = False,
+    ) -> list[ResearchSignal]:
+        """Claim up to ``limit`` unconsumed signals for ``consumer``, oldest first.
+
+        Selecting and marking is one upsert ... RETURNING statement, so
+        concurrent consumers (threads or processes) never receive the same
+        signal while its lease holds. Finish with ``ack_signals`` to mark
+        the batch consumed, or ``release_signals`` to hand it back; claims
+        left to expire (e.g. by a crashed consumer) become claimable again.
+        """
+        now = time.time()
+        conditions = [
+            "s.consumed_by IS NULL",
+            "s.signal_id NOT IN (SELECT signal_id FROM signal_claims WHERE expires_at > ?)",
+        ]
+        params: list = [consumer, now + lease_seconds, now]
+        if source:
+            conditions.append("s.source = ?")
+            params.append(source)
+        if relevance:
+            conditions.append("s.relevance = ?")
+            params.append(relevance)
+        if domain:
+            conditions.append("s.domain = ?")
+            params.append(domain)
+        if collapse_duplicates:
+            conditions.append(_CANONICAL_ONLY.format(id="s.signal_id"))
+        params.append(limit)
+        with self.transaction():
+            rows = self._get_conn().execute(
+                f"""INSERT INTO signal_claims (signal_id, consumer, expires_at)
+                SELECT s.signal_id, ?, ? FROM research_signals s
+                WHERE {" AND ".join(conditions)}
+                ORDER BY s.emitted_at, s.id
+                LIMIT ?
+                ON CONFLICT (signal_id) DO UPDATE
+                    SET consumer = excluded.consumer, expires_at = excluded.expires_at
+                RETURNING signal_id""",
+                params,
+            ).fetchall()
+            signals = self.get_signals([row["signal_id"] for row in rows])
+        signals.sort(key=lambda signal: signal.emitted_at)
+        return signals
+
+    def ack_signals(self, consumer: str, signal_ids: list[str]) -> list[str]:
+        """Mark claimed signals consumed by ``consumer``; returns the IDs acked.
+
+        Only signals still claimed by ``consumer`` are acked. An expired
+        lease can still be acked unless another consumer has reclaimed it.
+        """
+        with self.transaction():
+            conn = self._get_conn()
+            acked = [
+                row["signal_id"] for row in conn.execute(
+                    "DELETE FROM signal_claims WHERE consumer = ? "
+                    "AND signal_id IN (SELECT value FROM json_each(?)) RETURNING signal_id",
+                    (consumer, json.dumps(signal_ids)),
+                ).fetchall()
+            ]
+            conn.execute(
+                "UPDATE research_signals SET consumed_by = ? "
+                "WHERE signal_id IN (SELECT value FROM json_each(?)) AND consumed_by IS NULL",
+                (consumer, json.dumps(acked)),
+            )
+        return acked
+
+    @_writes
+    def release_signals(self, consumer: str, signal_ids: list[str] | None = None) -> int:
+        """Give back ``consumer``'s claims (all of them if ``signal_ids`` is None)."""
+        conn = self._get_conn()
+        if signal_ids is None:
+            cursor = conn.execute("DELETE FROM signal_claims WHERE consumer = ?", (consumer,))
+        else:
+            cursor = conn.execute(
+                "DELETE FROM signal_claims WHERE consumer = ? "
+                "AND signal_id IN (SELECT value FROM json_each(?))",
+                (consumer, json.dumps(signal_ids)),
+            )
+        return cursor.rowcount
+
+    # --- LoopSpan ---
+
+    @_writes
+    def _insert_span_sqlite(self, loop_span: LoopSpan) -> None:
+        """Insert a LoopSpan into SQLite only."""
+        conn = self._get_conn()
+        conn.execute(
+            """INSERT OR REPLACE INTO loop_spans
+            (span_id, run_id, stage, parent_span_id, started_at, duration_seconds,
+             status, input_tokens, output_tokens, emitted_at, raw_json)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                loop_span.span_id,
+                loop_span.run_id,
+                loop_span.stage,
+                loop_span.parent_span_id,
+                loop_span.started_at.isoformat(),
+                loop_span.duration_seconds,
+                loop_span.status,
+                loop_span.input_tokens,
+                loop_span.output_tokens,
+                loop_span.emitted_at.isoformat(),
+                self._raw_json("loop_span", loop_span),
+            ),
+        )
+
+    def write_span(self, loop_span: LoopSpan) -> bool:
+        """Write a LoopSpan to JSONL and SQLite, once per span_id. Not itself traced."""
+        return self._write_once("loop_span", loop_span, self._insert_span_sqlite)
+
+    def read_spans(
+        self, limit: int = 100, since: datetime | None = None, until: datetime | None = None,
+    ) -> list[LoopSpan]:
+        """Read LoopSpans from JSONL (source of truth)."""
+        return self._read_jsonl("loop_span", LoopSpan, limit, since, until)
+
+    def query_spans(
+        self,
+        run_id: str | None = None,
+        stage: str | None = None,
+        since: datetime | None = None,
+        limit: int = 1000,
+    ) -> list[LoopSpan]:
+        """Query LoopSpans from SQLite, newest first."""
+        conn = self._get_conn()
+        query = "SELECT raw_json FROM loop_spans"
+        conditions: list[str] = []
+        params: list = []
+        if run_id:
+            conditions.append("run_id = ?")
+            params.append(run_id)
+        if stage:
+            conditions.append("stage = ?")
+            params.append(stage)
+        if since is not None:
+            conditions.append("started_at >= ?")
+            params.append(since.isoformat())
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY started_at DESC LIMIT ?"
+        params.append(limit)
+        rows = conn.execute(query, params).fetchall()
+        return [self._decode(LoopSpan, row["raw_json"]) for row in rows]
+
+    # --- Batch writes ---
+
+    def natural_key(self, contract_type: str, record: BaseModel) -> tuple:
+        """Values identifying a record, as stored in its SQLite columns."""
+        key = []
+        for field in NATURAL_KEYS[contract_type]:
+            value = getattr(record, field)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            elif hasattr(value, "value"):  # enums are stored by value
+                value = value.value
+            key.append(value)
+        return tuple(key)
+
+    def stored_digests(self, contract_type: str, keys: list[tuple]) -> dict[tuple, int]:
+        """record_digest of the records stored in SQLite under any of ``keys``."""
+        model = CONTRACT_MODELS[contract_type]
+        columns = NATURAL_KEYS[contract_type]
+        table = SQLITE_TABLES[contract_type]
+        wanted = set(keys)
+        firsts = sorted({key[0] for key in wanted})
+        found: dict[tuple, int] = {}
+        conn = self._get_conn()
+        for i in range(0, len(firsts), 500):
+            batch = firsts[i:i + 500]
+            rows = conn.execute(
+                f"SELECT {', '.join(columns)}, raw_json FROM {table} "
+                f"WHERE {columns[0]} IN ({', '.join('?' * len(batch))}) ORDER BY id",
+                batch,
+            ).fetchall()
+            for row in rows:
+                key = tuple(row)[:-1]
+                if key in wanted:
+                    found[key] = record_digest(self._decode(model, row["raw_json"]))
+        return found
+
+    def _sqlite_inserts(self) -> dict[str, Callable[[BaseModel], None]]:
+        """Contract type -> its SQLite-only insert."""
+        return {
+            "outcome_record": self._insert_outcome_sqlite,
+            "improvement_recommendation": self._insert_recommendation_sqlite,
+            "persona_patch": self._insert_patch_sqlite,
+            "research_signal": self._insert_signal_sqlite,
+            "loop_span": self._insert_span_sqlite,
+        }
+
+    @traced("store.write_batch")
+    def write_batch(self, contract_type: str, records: list[BaseModel]) -> int:
+        """Write many records of one type in a single SQLite transaction.
+
+        As in the single-record writes, records already stored unchanged
+        are skipped and the last of a key repeated within the batch wins.
+        SQLite inserts run first; the JSONL lines are then appended in one
+        write before the commit, so a failed append rolls SQLite back too.
+        Returns the number written.
+        """
+        keyed: dict[tuple, BaseModel] = {}
+        for record in records:
+            key = self.natural_key(contract_type, record)
+            keyed.pop(key, None)  # keep the order of the last occurrences
+            keyed[key] = record
+        insert = self._sqlite_inserts()[contract_type]
+        # Checked under the write lock, so concurrent batches cannot both insert a key
+        with self.transaction():
+            known = self._known_keys.setdefault(contract_type, {})
+            known.update(self.stored_digests(contract_type, [k for k in keyed if k not in known]))
+            digests = {key: record_digest(record) for key, record in keyed.items()}
+            changed = [key for key, digest in digests.items() if known.get(key) != digest]
+            if not changed:
+                return 0
+            self._delete_replaced(contract_type, [key for key in changed if key in known])
+            for key in changed:
+                insert(keyed[key])
+            with open(self._append_path(contract_type), "a") as f:
+                f.write("".join(keyed[key].model_dump_json() + "\n" for key in changed))
+        known.update((key, digests[key]) for key in changed)
+        return len(changed)
+
+    # --- Segments and compaction ---
+
+    def rotate_jsonl(
+        self, contract_type: str, now: datetime | None = None,
+    ) -> list[segments.SealedSegment]:
+        """Seal past months of a contract type into compressed segments.
+
+        The first call switches the type to segments: its single file is
+        adopted as the oldest segment (hard-linked into the segment
+        directory, which is then renamed into place, so readers never see
+        it missing). Every plain segment older than the current month is
+        then sealed. Logical offsets and record order are unchanged.
+        Returns the manifest entries added.
+        """
+        now = now or datetime.now()
+        directory = self._segment_dir(contract_type)
+        legacy = self._jsonl_path(contract_type)
+        if not directory.is_dir():
+            name = segments.segment_name(now)
+            if legacy.exists():
+                first = next(self.iter_jsonl_lines(contract_type), None)
+                if first is not None:
+                    emitted_at = datetime.fromisoformat(json.loads(first[0])["emitted_at"])
+                    name = segments.segment_name(local_naive(emitted_at))
+            staging = directory.with_name(directory.name + ".tmp")
+            staging.mkdir(exist_ok=True)
+            if legacy.exists():
+                os.link(legacy, staging / (name + segments.PLAIN_SUFFIX))
+            os.rename(staging, directory)
+            legacy.unlink(missing_ok=True)
+
+        current = segments.segment_name(now)
+        sealed = []
+        for segment in segments.list_segments(directory):
+            name = segment.path.name.removesuffix(segments.PLAIN_SUFFIX)
+            if not segment.sealed and name < current:
+                sealed.extend(segments.seal(directory, segment.path))
+        return sealed
+
+    def jsonl_ranges(
+        self,
+        contract_type: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        start: int = 0,
+        end: int | None = None,
+    ) -> list[tuple[int, int]]:
+        """Byte ranges of ``[start, end)`` whose segments may hold records
+        emitted in ``[since, until)``; other sealed segments are skipped.
+        """
+        if end is None:
+            end = self.jsonl_extent(contract_type)
+        since, until = local_naive(since), local_naive(until)
+        ranges: list[tuple[int, int]] = []
+        for segment in self._segments(contract_type):
+            lo, hi = max(segment.start, start), min(segment.end, end)
+            if lo >= hi or not segment.overlaps(since, until):
+                continue
+            if ranges and ranges[-1][1] == lo:
+                ranges[-1] = (ranges[-1][0], hi)
+            else:
+                ranges.append((lo, hi))
+        return ranges
+
+    @_writes
+    def dedupe_jsonl(self, contract_type: str, dry_run: bool = False) -> tuple[int, int]:
+        """Drop repeated natural keys from a type's JSONL; returns ``(kept, dropped)``.
+
+        Keeps the last occurrence of each key, as writes do (see
+        _write_once) and as SQLite already serves it; duplicate outcome
+        rows are removed from SQLite the same way. A read-only scan indexes the last
+        line of each key, then one streaming pass rewrites only the
+        segments that lose lines (sealed ones are recompressed). Lines
+        appended during the pass are carried over, but writers should be
+        stopped while it runs.
+        """
+        fields = NATURAL_KEYS[contract_type]
+
+        def key_of(line: bytes) -> tuple:
+            record = json.loads(line)
+            return tuple(record.get(field) for field in fields)
+
+        end = self.jsonl_extent(contract_type)
+        segs = [segment for segment in self._segments(contract_type) if segment.start < end]
+        last_line: dict[tuple, int] = {}
+        first_line = []
+        total = 0
+        for segment in segs:
+            first_line.append(total)
+            for line, _ in self.iter_jsonl_lines(
+                contract_type, segment.start, min(segment.end, end),
+            ):
+                last_line[key_of(line)] = total
+                total += 1
+        kept = len(last_line)
+        dropped = total - kept
+        if dry_run or not dropped:
+            return kept, dropped
+
+        # Newest first: rewriting a segment shifts the offsets of later ones
+        for segment, n in reversed(list(zip(segs, first_line))):
+            segment_end = min(segment.end, end)
+            lines = []
+            first = n
+            for line, _ in self.iter_jsonl_lines(contract_type, segment.start, segment_end):
+                if last_line[key_of(line)] == n:
+                    lines.append(line)
+                n += 1
+            if len(lines) == n - first:
+                continue
+            if segment.sealed:
+                segments.rewrite_archive(segment.path.parent, segment.path.name, lines)
+                continue
+            tmp = segment.path.with_suffix(".jsonl.tmp")
+            with open(tmp, "wb") as out:
+                out.writelines(lines)
+                with open(segment.path, "rb") as src:
+                    src.seek(segment_end - segment.start)
+                    while chunk := src.read(EXPORT_CHUNK_BYTES):
+                        out.write(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp, segment.path)
+
+        self._delete_duplicate_rows(contract_type)
+        return kept, dropped
+
+    # --- Export ---
+
+    def jsonl_extent(self, contract_type: str) -> int:
+        """Byte offset just past the last complete line of a type's JSONL.
+
+        A record still being appended is excluded until its newline lands,
+        so exports never end mid-record.
+        """
+        segs = self._segments(contract_type)
+        if not segs:
+            return 0
+        last = segs[-1]
+        if last.sealed:
+            return last.end
+        with open(last.path, "rb") as f:
+            pos = f.seek(0, 2)
+            while pos > 0:
+                step = min(EXPORT_CHUNK_BYTES, pos)
+                f.seek(pos - step)
+                newline = f.read(step).rfind(b"\n")
+                if newline != -1:
+                    return last.start + pos - step + newline + 1
+                pos -= step
+        return last.start
+
+    def iter_jsonl_bytes(
+        self, contract_type: str, start: int = 0, end: int | None = None,
+    ) -> Iterator[bytes]:
+        """Raw JSONL bytes in ``[start, end)``, read in fixed-size chunks.
+
+        Offsets are into the concatenation of all segments, decompressed.
+        """
+        if end is None:
+            end = self.jsonl_extent(contract_type)
+        for segment in self._segments(contract_type):
+            if segment.end <= start:
+                continue
+            if segment.start >= end:
+                break
+            with segment.open() as f:
+                f.seek(max(start - segment.start, 0))
+                remaining = min(end, segment.end) - max(start, segment.start)
+                while remaining > 0:
+                    chunk = f.read(min(EXPORT_CHUNK_BYTES, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+
+    def iter_jsonl_lines(
+        self, contract_type: str, start: int = 0, end: int | None = None,
+    ) -> Iterator[tuple[bytes, int]]:
+        """Complete JSONL lines in ``[start, end)`` with the offset just past each.
+
+        If ``start`` falls inside a line, that partial line is skipped.
+        Segments hold whole lines, so only the first one read can start
+        mid-line.
+        """
+        if end is None:
+            end = self.jsonl_extent(contract_type)
+        for segment in self._segments(contract_type):
+            if segment.end <= start:
+                continue
+            if segment.start >= end:
+                break
+            local_start = max(start - segment.start, 0)
+            local_end = min(end, segment.end) - segment.start
+            with segment.open() as f:
+                pos = local_start
+                if local_start > 0:
+                    f.seek(local_start - 1)
+                    if f.read(1) != b"\n":
+                        pos = local_start + len(f.readline())
+                for line in f:
+                    pos += len(line)
+                    if pos > local_end:
+                        break
+                    if line.strip():
+                        yield line, segment.start + pos
 
     # --- Rebuild ---
 
+    @_writes
+    @traced("store.rebuild_sqlite")
     def rebuild_sqlite(self) -> None:
         """Rebuild SQLite from JSONL files. Useful for recovery.
 
-        Drops and recreates tables to handle schema changes,
-        then re-inserts all records from JSONL without re-appending to JSONL.
+        Drops and recreates tables to handle schema changes, then
+        re-inserts every JSONL line (migrated to the current schema)
+        without re-appending to JSONL. Runs as one transaction: if it
+        fails, the previous tables are left in place. signal_claims is
+        SQLite-only state and is kept, so in-flight leases stay held.
         """
         conn = self._get_conn()
-        conn.executescript("""
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        self._execute_statements("""
             DROP TABLE IF EXISTS outcome_records;
             DROP TABLE IF EXISTS improvement_recommendations;
             DROP TABLE IF EXISTS persona_patches;
             DROP TABLE IF EXISTS research_signals;
+            DROP TABLE IF EXISTS research_signals_fts;
+            DROP TABLE IF EXISTS signal_minhash;
+            DROP TABLE IF EXISTS signal_lsh_buckets;
+            DROP TABLE IF EXISTS loop_spans;
         """)
-        self._ensure_tables()
+        self._create_tables()
+
+        insert = self._sqlite_inserts()
+        for contract_type, model in CONTRACT_MODELS.items():
+            for line, _ in self.iter_jsonl_lines(contract_type):
+                if line.strip():
+                    insert[contract_type](self._decode(model, line))
+        # Rewrites not yet compacted by dedupe_jsonl: the last one wins
+        self._delete_duplicate_rows("outcome_record")
+
+        # Statuses were reset to their write-time values; tell followers to resync
+        conn.execute(
+            "INSERT INTO status_events (contract_type, record_id, new_status) "
+            "VALUES ('*', '*', 'rebuild')"
+        )
+
+    # --- raw_json encoding ---
+
+    def _load_raw_dictionaries(self) -> None:
+        rows = self._get_conn().execute(
+            "SELECT id, table_name, zdict, active FROM raw_json_dictionaries ORDER BY id"
+        ).fetchall()
+        self._raw_dicts = {row["id"]: row["zdict"] for row in rows}
+        self._raw_encoders = {
+            row["table_name"]: (row["id"], row["zdict"]) for row in rows if row["active"]
+        }
+
+    def _raw_json(self, contract_type: str, record: BaseModel) -> str | bytes:
+        """The raw_json column value for a record, in its table's encoding."""
+        text = record.model_dump_json()
+        encoder = self._raw_encoders.get(SQLITE_TABLES[contract_type])
+        if encoder is None:
+            return text
+        return raw_codec.encode(text, *encoder)
+
+    def _raw_text(self, value: str | bytes) -> str | bytes:
+        """A raw_json column value as JSON; plain values are returned as they are."""
+        if not raw_codec.is_encoded(value):
+            return value
+        dict_id = raw_codec.dictionary_id(value)
+        if dict_id not in self._raw_dicts:
+            # Trained by another process since we loaded
+            self._load_raw_dictionaries()
+        return raw_codec.decode(value, self._raw_dicts[dict_id])
+
+    def raw_encoding(self, contract_type: str) -> str:
+        """How new rows of a contract type's table store raw_json."""
+        self._get_conn()
+        return "zlib" if SQLITE_TABLES[contract_type] in self._raw_encoders else "json"
+
+    def set_raw_encoding(self, contract_type: str, encoding: str) -> int:
+        """Choose how a table stores raw_json and re-encode its rows.
 
-        for record in self.read_outcomes(limit=10000):
-            self._insert_outcome_sqlite(record)
-        for rec in self.read_recommendations(limit=10000):
-            self._insert_recommendation_sqlite(rec)
-        for patch in self.read_patches(limit=10000):
-            self._insert_patch_sqlite(patch)
-        for signal in self.read_signals(limit=10000):
-            self._insert_signal_sqlite(signal)
+        ``"zlib"`` deflates each record with a preset dictionary trained
+        on the table's most recent RAW_DICT_SAMPLES records (calling it
+        again retrains); ``"json"`` stores plain JSON. Reads decode
+        either transparently. Other open stores keep encoding new rows
+        as before until they reconnect. Returns the rows rewritten; run
+        vacuum() afterwards to shrink the file.
+        """
+        if encoding not in RAW_ENCODINGS:
+            raise ValueError(f"Unknown raw_json encoding: {encoding}")
+        if encoding != "json" and contract_type in _JSON_ONLY_TYPES:
+            raise ValueError(f"raw_json of {contract_type} is queried as JSON and cannot be encoded")
+        table = SQLITE_TABLES[contract_type]
+        conn = self._get_conn()
+        with self.transaction():
+            rows = conn.execute(f"SELECT id, raw_json FROM {table} ORDER BY id").fetchall()
+            texts = [(row["id"], self._raw_text(row["raw_json"])) for row in rows]
+            texts = [(rowid, t.decode() if isinstance(t, bytes) else t) for rowid, t in texts]
+            conn.execute(
+                "UPDATE raw_json_dictionaries SET active = 0 WHERE table_name = ?", (table,)
+            )
+            encoder = None
+            if encoding == "zlib":
+                zdict = raw_codec.train_dictionary([t for _, t in texts[-RAW_DICT_SAMPLES:]])
+                cursor = conn.execute(
+                    "INSERT INTO raw_json_dictionaries (table_name, zdict) VALUES (?, ?)",
+                    (table, zdict),
+                )
+                encoder = (cursor.lastrowid, zdict)
+            conn.executemany(
+                f"UPDATE {table} SET raw_json = ? WHERE id = ?",
+                [
+                    (t if encoder is None else raw_codec.encode(t, *encoder), rowid)
+                    for rowid, t in texts
+                ],
+            )
+        self._load_raw_dictionaries()
+        return len(texts)
+
+    def vacuum(self) -> None:
+        """Rebuild the SQLite file, returning free pages (e.g. after re-encoding)."""
+        with self._lock:
+            self._get_conn().execute("VACUUM")
+
+    # --- Status events ---
+
+    def status_event_seq(self) -> int:
+        """Sequence number of the latest status event (0 if none)."""
+        row = self._get_conn().execute("SELECT MAX(seq) AS seq FROM status_events").fetchone()
+        return row["seq"] or 0
+
+    def status_events_since(self, seq: int, limit: int = 10000) -> list[dict]:
+        """Status/consumed_by transitions after ``seq``, oldest first.
+
+        A ``contract_type`` of ``"*"`` means derived state should be
+        reloaded: ``new_status == "rebuild"`` when SQLite was rebuilt from
+        JSONL, ``"rewrite"`` when a record replaced a stored one of the same
+        natural key (``record_id`` is its contract type).
+        """
+        rows = self._get_conn().execute(
+            """SELECT seq, contract_type, record_id, old_status, new_status, detail, changed_at
+               FROM status_events WHERE seq > ? ORDER BY seq LIMIT ?""",
+            (seq, limit),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    # --- Change detection ---
+
+    def data_version(self) -> tuple[tuple[int, ...], int]:
+        """Cheap change token for everything the store serves.
+
+        Returns ``(vector, mtime_ns)``: the vector changes whenever a
+        type's JSONL (its single file or its newest segment) is appended
+        to or SQLite state changes (another connection committed, or a
+        status transition was logged); ``mtime_ns`` is the newest
+        modification time among the files. Costs a few stat calls, a
+        manifest read per segmented type and two trivial SQLite reads.
+        """
+        vector: list[int] = []
+        mtimes = [0]
+        for contract_type in (
+            "outcome_record", "improvement_recommendation", "persona_patch",
+            "research_signal", "loop_span",
+        ):
+            # Appends land in the newest segment; the stream's logical size
+            # spans all of them and is unchanged by sealing older months
+            segs = self._segments(contract_type)
+            if not segs:
+                vector.extend((0, 0))
+                continue
+            try:
+                mtime = segs[-1].path.stat().st_mtime_ns
+            except FileNotFoundError:  # sealed since it was listed
+                mtime = 0
+            vector.extend((segs[-1].end, mtime))
+            mtimes.append(mtime)
+        try:
+            st = self.db_path.stat()
+            vector.extend((st.st_size, st.st_mtime_ns))
+            mtimes.append(st.st_mtime_ns)
+        except FileNotFoundError:
+            vector.extend((0, 0))
+        conn = self._get_conn()
+        vector.append(conn.execute("PRAGMA data_version").fetchone()[0])
+        vector.append(self.status_event_seq())
+        return tuple(vector), max(mtimes)
+
+    # --- Health ---
+
+    def ping(self) -> None:
+        """Cheap reachability check: the data dir exists and SQLite answers SELECT 1."""
+        if not self.data_dir.is_dir():
+            raise FileNotFoundError(f"Data directory not found: {self.data_dir}")
+        self._get_conn().execute("SELECT 1").fetchone()
+
+    def integrity_check(self) -> str:
+        """Run SQLite's quick_check; returns "ok" or the first problem found.
+
+        Scans the whole database, so it opens its own read-only connection
+        instead of tying up the shared one that serves requests.
+        """
+        uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=30)
+        try:
+            return conn.execute("PRAGMA quick_check").fetchone()[0]
+        finally:
+            conn.close()
 
     def close(self) -> None:
         """Close the SQLite connection."""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
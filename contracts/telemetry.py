@@ -0,0 +1,107 @@
+"""Lightweight span timers for feedback loop telemetry.
+
+Usage:
+    with tracing(store):                      # once per process / loop run
+        with span("persona_upgrader.generate_patches", persona_id=pid) as s:
+            response = client.messages.create(...)
+            s.add_usage(response.usage)
+
+Spans are written through ``ContractStore.write_span`` when they finish.
+Outside a ``tracing()`` block, ``span()`` and ``@traced`` cost next to
+nothing and record nothing, so library code can be instrumented freely.
+Processes started by the loop orchestrator pick up its run id from the
+``SNOW_TOWN_RUN_ID`` environment variable.
+"""
+
+import functools
+import os
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .loop_run import LoopSpan
+
+RUN_ID_ENV = "SNOW_TOWN_RUN_ID"
+
+# (tracer, innermost open span) for the current context
+_active: ContextVar[tuple["Tracer", LoopSpan | None] | None] = ContextVar(
+    "snow_town_tracer", default=None,
+)
+
+
+def new_run_id() -> str:
+    return f"run-{uuid.uuid4().hex[:12]}"
+
+
+class Tracer:
+    """Collects finished spans for one run and persists them to a store."""
+
+    def __init__(self, store, run_id: str | None = None):
+        self.store = store
+        self.run_id = run_id or os.environ.get(RUN_ID_ENV) or new_run_id()
+        self.spans: list[LoopSpan] = []
+
+    def record(self, span: LoopSpan) -> None:
+        span.run_id = self.run_id
+        self.spans.append(span)
+        self.store.write_span(span)
+
+
+@contextmanager
+def tracing(store, run_id: str | None = None) -> Iterator[Tracer]:
+    """Record spans opened in this block to ``store``."""
+    tracer = Tracer(store, run_id)
+    token = _active.set((tracer, None))
+    try:
+        yield tracer
+    finally:
+        _active.reset(token)
+
+
+def active_tracer() -> Tracer | None:
+    active = _active.get()
+    return active[0] if active else None
+
+
+@contextmanager
+def span(stage: str, **attributes) -> Iterator[LoopSpan]:
+    """Time the block as one span; errors are recorded and re-raised."""
+    active = _active.get()
+    if active is None:
+        yield LoopSpan(run_id="", stage=stage, attributes=attributes)
+        return
+
+    tracer, parent = active
+    current = LoopSpan(
+        run_id=tracer.run_id,
+        stage=stage,
+        parent_span_id=parent.span_id if parent else None,
+        attributes=attributes,
+    )
+    token = _active.set((tracer, current))
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.duration_seconds = round(time.perf_counter() - start, 6)
+        _active.reset(token)
+        tracer.record(current)
+
+
+def traced(stage: str):
+    """Decorator form of span(); a no-op check when tracing is off."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active.get() is None:
+                return func(*args, **kwargs)
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,17 @@
+"""Timestamp normalization shared by the store, its caches and the API.
+
+Records carry naive local timestamps (``datetime.now()``). Aware values,
+from callers or ingested JSON, are converted to local time and made
+naive so they compare like with like.
+"""
+
+from datetime import datetime
+
+
+def local_naive(value: datetime | str | None) -> datetime | None:
+    """A naive local datetime from a datetime or ISO 8601 string (None passes through)."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
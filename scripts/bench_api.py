@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Benchmark API response rendering on the large list endpoints.
+
+Seeds a temporary ContractStore, then reports wall-clock p50/p95 and CPU
+time per request for:
+  * rendering only: FastAPI's generic path (jsonable_encoder + stdlib
+    JSONResponse) vs the fast path (pydantic-core dump_json / orjson)
+  * full requests through the app for /research/signals?limit=500 and
+    /activity?limit=200, with and without gzip
+
+Usage:
+    python scripts/bench_api.py
+    python scripts/bench_api.py --records 2000 --iterations 300
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from api.rendering import model_response, orjson
+from api.routers.research import SIGNAL_LIST_FIELDS
+from contracts.improvement_recommendation import (
+    ImprovementRecommendation,
+    RecommendationType,
+    TargetScope,
+)
+from contracts.outcome_record import OutcomeRecord, TerminalOutcome
+from contracts.research_signal import ResearchSignal, SignalRelevance, SignalSource
+from contracts.store import ContractStore
+
+
+def seed(store: ContractStore, n: int) -> None:
+    now = datetime.now()
+    with store.transaction():
+        for i in range(n):
+            store.write_signal(ResearchSignal(
+                signal_id=f"bench-sig-{i}",
+                source=SignalSource.TOOL_MONITOR,
+                title=f"Benchmark signal {i}",
+                summary="Agents, evals and tooling news. " * 8,
+                url=f"https://example.com/{i}",
+                relevance=SignalRelevance.MEDIUM,
+                relevance_rationale="Relevant to the persona upgrade loop. " * 3,
+                tags=["agents", "evals", "tooling"],
+                domain="ai-tooling",
+                emitted_at=now - timedelta(minutes=i),
+            ))
+            store.write_outcome(OutcomeRecord(
+                idea_id=i, idea_title=f"Idea {i}", outcome=TerminalOutcome.PUBLISHED,
+                overall_score=70 + i % 30, emitted_at=now - timedelta(minutes=i),
+            ))
+            store.write_recommendation(ImprovementRecommendation(
+                recommendation_id=f"bench-rec-{i}", session_id="bench",
+                recommendation_type=RecommendationType.VOICE_ADJUSTMENT,
+                title=f"Recommendation {i}", description="Adjust tone.",
+                suggested_change="Be more concise.", scope=TargetScope.ALL_PERSONAS,
+                emitted_at=now - timedelta(minutes=i),
+            ))
+
+
+def measure(fn, iterations: int) -> dict:
+    walls = []
+    cpu_start = time.process_time()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        walls.append(time.perf_counter() - start)
+    cpu = (time.process_time() - cpu_start) / iterations
+    walls.sort()
+    return {
+        "p50_ms": walls[len(walls) // 2] * 1000,
+        "p95_ms": walls[min(len(walls) - 1, int(len(walls) * 0.95))] * 1000,
+        "cpu_ms": cpu * 1000,
+    }
+
+
+def report(name: str, result: dict, size: int | None = None) -> None:
+    size_text = f"  {size / 1024:8.1f} KiB" if size is not None else ""
+    print(
+        f"  {name:<44} p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms"
+        f"  cpu {result['cpu_ms']:7.2f} ms{size_text}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark API response rendering")
+    parser.add_argument("--records", type=int, default=500, help="Records per contract type")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ContractStore(data_dir=Path(tmp))
+        seed(store, args.records)
+
+        from api import deps
+        deps._store = store
+        from api.main import app
+        client = TestClient(app)
+
+        print(f"orjson: {'yes' if orjson is not None else 'no (stdlib fallback)'}")
+        print(f"Records: {args.records} per type, {args.iterations} iterations\n")
+
+        signals = store.query_signals(limit=500)
+        print("Rendering /research/signals payload:")
+
+        def generic():
+            payload = [s.model_dump(include=SIGNAL_LIST_FIELDS) for s in signals]
+            return JSONResponse(jsonable_encoder(payload)).body
+
+        def fast():
+            return model_response(signals, list[ResearchSignal], include=SIGNAL_LIST_FIELDS).body
+
+        report("jsonable_encoder + JSONResponse", measure(generic, args.iterations), len(generic()))
+        report("model_response (pydantic-core)", measure(fast, args.iterations), len(fast()))
+
+        print("\nFull requests:")
+        for path in ("/api/v1/research/signals?limit=500", "/api/v1/activity?limit=200"):
+            for encoding in ("identity", "gzip"):
+                headers = {"Accept-Encoding": encoding}
+                # Bytes on the wire (httpx transparently decompresses .content)
+                size = client.get(path, headers=headers).num_bytes_downloaded
+                result = measure(
+                    lambda path=path, headers=headers: client.get(path, headers=headers),
+                    args.iterations,
+                )
+                report(f"{path} [{encoding}]", result, size)
+
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Benchmark the compact raw_json encoding against plain JSON.
+
+Seeds research signals with arXiv-style raw_data into a temporary store,
+then reports for each encoding:
+  * database and research_signals table size (after VACUUM)
+  * wall-clock p50/p95 of common reads, with a fresh connection so the
+    SQLite page cache starts cold for the first iteration only
+  * the SQLite page cache hit rate and misses per read
+
+Python's sqlite3 module does not expose sqlite3_db_status, so the cache
+counters are read through ctypes from the connection's handle; they
+are reported as n/a where that is not possible.
+
+Usage:
+    python scripts/bench_raw_json.py
+    python scripts/bench_raw_json.py --records 20000 --iterations 20
+"""
+
+import _sqlite3
+import argparse
+import ctypes
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from contracts.research_signal import ResearchSignal, SignalRelevance, SignalSource
+from contracts.store import ContractStore
+
+# sqlite3_db_status() counters
+DBSTATUS_CACHE_HIT = 7
+DBSTATUS_CACHE_MISS = 8
+
+
+def seed(store: ContractStore, n: int) -> None:
+    rng = random.Random(0)
+    words = [f"term{i}" for i in range(5000)]
+    now = datetime.now()
+    with store.transaction():
+        for i in range(n):
+            store.write_signal(ResearchSignal(
+                signal_id=f"arxiv-2602.{i:05d}v1",
+                source=SignalSource.ARXIV_HF,
+                title=" ".join(rng.sample(words, 10)),
+                summary=" ".join(rng.sample(words, 80)),
+                url=f"https://arxiv.org/pdf/2602.{i:05d}v1",
+                relevance=rng.choice(list(SignalRelevance)),
+                relevance_rationale=" ".join(rng.sample(words, 40)),
+                tags=rng.sample(["agents", "evals", "tooling", "multimodal", "rl", "mcp"], 3),
+                domain="ai-tooling",
+                raw_data={
+                    "arxiv_id": f"2602.{i:05d}v1",
+                    "authors": [f"Author {rng.randrange(2000)}" for _ in range(rng.randint(1, 8))],
+                    "published": (now - timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "categories": rng.sample(["cs.AI", "cs.CL", "cs.LG", "cs.CV"], 2),
+                },
+                emitted_at=now - timedelta(minutes=i),
+            ))
+
+
+def _sqlite_handle(conn: sqlite3.Connection, db_path: Path):
+    """``(library, sqlite3 *)`` of a connection, or None if they cannot be found."""
+    try:
+        lib = ctypes.CDLL(_sqlite3.__file__)
+        lib.sqlite3_db_filename.restype = ctypes.c_char_p
+        lib.sqlite3_db_filename.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+        # The handle is the first field after the object header (CPython)
+        db = ctypes.c_void_p.from_address(id(conn) + object.__basicsize__).value
+        if lib.sqlite3_db_filename(db, b"main") != str(db_path.resolve()).encode():
+            return None
+        return lib, ctypes.c_void_p(db)
+    except (OSError, AttributeError):
+        return None
+
+
+def cache_counters(handle, reset: bool = False) -> tuple[int, int] | None:
+    """Page cache ``(hits, misses)`` since the last reset."""
+    if handle is None:
+        return None
+    lib, db = handle
+    counts = []
+    for op in (DBSTATUS_CACHE_HIT, DBSTATUS_CACHE_MISS):
+        current, highwater = ctypes.c_int(), ctypes.c_int()
+        lib.sqlite3_db_status(db, op, ctypes.byref(current), ctypes.byref(highwater), int(reset))
+        counts.append(current.value)
+    return counts[0], counts[1]
+
+
+def measure(fn, iterations: int, handle) -> dict:
+    walls = []
+    cache_counters(handle, reset=True)
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        walls.append(time.perf_counter() - start)
+    counters = cache_counters(handle)
+    walls.sort()
+    return {
+        "p50_ms": walls[len(walls) // 2] * 1000,
+        "p95_ms": walls[min(len(walls) - 1, int(len(walls) * 0.95))] * 1000,
+        "cache": counters,
+    }
+
+
+def run(data_dir: Path, db_path: Path, records: int, iterations: int, encoding: str) -> dict:
+    store = ContractStore(data_dir=data_dir, db_path=db_path)
+    store.set_raw_encoding("research_signal", encoding)
+    store.vacuum()
+    conn = store._get_conn()
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    cache_pages = conn.execute("PRAGMA cache_size").fetchone()[0]
+    if cache_pages < 0:  # KiB
+        cache_pages = -cache_pages * 1024 // page_size
+    table_pages = conn.execute(
+        "SELECT COUNT(*) FROM dbstat WHERE name = 'research_signals'"
+    ).fetchone()[0]
+    store.close()
+
+    # Fresh connection: nothing cached yet
+    store = ContractStore(data_dir=data_dir, db_path=db_path)
+    rng = random.Random(1)
+    ids = [f"arxiv-2602.{i:05d}v1" for i in rng.sample(range(records), min(records, 100))]
+    reads = {
+        f"query_signals(limit={records})": lambda: store.query_signals(limit=records),
+        "query_signals(limit=500)": lambda: store.query_signals(limit=500),
+        "get_signals(100 random ids)": lambda: store.get_signals(ids),
+        "search_signals('agents term42')": lambda: store.search_signals("agents term42"),
+    }
+    handle = _sqlite_handle(store._get_conn(), db_path)
+    results = {name: measure(read, iterations, handle) for name, read in reads.items()}
+    store.close()
+    return {
+        "db_bytes": db_path.stat().st_size,
+        "table_pages": table_pages,
+        "page_size": page_size,
+        "cache_pages": cache_pages,
+        "reads": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark compact raw_json encoding")
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        db_path = data_dir / "bench.db"
+        store = ContractStore(data_dir=data_dir, db_path=db_path)
+        seed(store, args.records)
+        store.close()
+        print(f"Research signals: {args.records}, {args.iterations} iterations per read\n")
+
+        results = {
+            encoding: run(data_dir, db_path, args.records, args.iterations, encoding)
+            for encoding in ("json", "zlib")
+        }
+        for encoding, result in results.items():
+            table_kib = result["table_pages"] * result["page_size"] / 1024
+            print(
+                f"[{encoding}] database {result['db_bytes'] / 1024:.1f} KiB, "
+                f"research_signals {table_kib:.1f} KiB ({result['table_pages']} pages; "
+                f"page cache {result['cache_pages']} pages)"
+            )
+            for name, read in result["reads"].items():
+                line = f"  {name:<44} p50 {read['p50_ms']:8.2f} ms  p95 {read['p95_ms']:8.2f} ms"
+                if read["cache"] is None:
+                    line += "  cache n/a"
+                else:
+                    hits, misses = read["cache"]
+                    line += (
+                        f"  cache hit rate {hits / max(1, hits + misses):6.1%}"
+                        f"  {misses / args.iterations:8.1f} misses/read"
+                    )
+                print(line)
+            print()
+
+        json_size, zlib_size = (results[e]["db_bytes"] for e in ("json", "zlib"))
+        print(f"Database size: {json_size / zlib_size:.2f}x smaller with zlib")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
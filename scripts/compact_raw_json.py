@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Choose how SQLite tables store the raw_json copy of each record.
+
+``zlib`` deflates raw_json with a dictionary trained on the table's
+recent records (run again to retrain as the data drifts); ``json``
+stores it as plain text. Reads decode either. Existing rows are
+re-encoded and the database vacuumed; running API processes keep
+writing their previous encoding until restarted. persona_patch raw_json
+is queried with json_extract and always stays JSON.
+
+Usage:
+    python scripts/compact_raw_json.py                          # show encodings
+    python scripts/compact_raw_json.py research_signal loop_span
+    python scripts/compact_raw_json.py research_signal --encoding json
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from contracts.store import RAW_ENCODINGS, SQLITE_TABLES, ContractStore
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Set the raw_json encoding of SQLite tables")
+    parser.add_argument("contract_types", nargs="*",
+                        help=f"Contract types to re-encode ({', '.join(SQLITE_TABLES)})")
+    parser.add_argument("--encoding", choices=RAW_ENCODINGS, default="zlib")
+    args = parser.parse_args()
+    unknown = sorted(set(args.contract_types) - set(SQLITE_TABLES))
+    if unknown:
+        parser.error(f"unknown contract type(s): {', '.join(unknown)}")
+
+    store = ContractStore()
+    try:
+        if args.contract_types:
+            size = store.db_path.stat().st_size
+            for contract_type in args.contract_types:
+                try:
+                    rows = store.set_raw_encoding(contract_type, args.encoding)
+                except ValueError as e:
+                    print(f"{contract_type}: {e}", file=sys.stderr)
+                    return 1
+                print(f"{contract_type}: {rows} rows re-encoded as {args.encoding}")
+            store.vacuum()
+            print(f"Database: {size / 1024:.1f} KiB -> {store.db_path.stat().st_size / 1024:.1f} KiB")
+        for contract_type in SQLITE_TABLES:
+            print(f"{contract_type:<28} {store.raw_encoding(contract_type)}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Compact JSONL files by dropping records repeated under the same natural key.
+
+Writes are idempotent now, but older files can still hold replays (e.g. the
+doubled Sky-Lynx recommendations from the dual-cron incident). Each file is
+rewritten in one streaming pass, keeping the last copy of every record, and
+duplicate outcome rows are removed from SQLite to match.
+
+Stop the cron and API writers first. Export offsets handed out earlier no
+longer line up after a file shrinks.
+
+Usage:
+    python scripts/dedupe_jsonl.py                    # all contract types
+    python scripts/dedupe_jsonl.py research_signal    # one type
+    python scripts/dedupe_jsonl.py --dry-run          # report only
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from contracts.store import JSONL_FILES, ContractStore
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Drop duplicate records from JSONL files")
+    parser.add_argument("contract_types", nargs="*",
+                        help=f"Contract types to compact (default: all of {', '.join(JSONL_FILES)})")
+    parser.add_argument("--dry-run", action="store_true", help="Count duplicates without rewriting")
+    args = parser.parse_args()
+    unknown = sorted(set(args.contract_types) - set(JSONL_FILES))
+    if unknown:
+        parser.error(f"unknown contract type(s): {', '.join(unknown)}")
+
+    store = ContractStore()
+    try:
+        for contract_type in args.contract_types or JSONL_FILES:
+            start = time.perf_counter()
+            kept, dropped = store.dedupe_jsonl(contract_type, dry_run=args.dry_run)
+            elapsed = time.perf_counter() - start
+            action = "would drop" if args.dry_run else "dropped"
+            print(f"{JSONL_FILES[contract_type]}: kept {kept}, {action} {dropped} "
+                  f"duplicates ({elapsed:.1f}s)")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Rebuild the research signal near-duplicate index over all history.
+
+New signals are checked as they are written; run this after changing the
+MinHash parameters in contracts/near_duplicates.py, or to report the
+current duplicate clusters.
+
+Usage:
+    python scripts/dedupe_signals.py            # reindex and summarize
+    python scripts/dedupe_signals.py --show 20  # also list the largest clusters
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from contracts.store import ContractStore
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the near-duplicate signal index")
+    parser.add_argument("--show", type=int, default=0, help="List the N largest duplicate clusters")
+    args = parser.parse_args()
+
+    store = ContractStore()
+    try:
+        start = time.perf_counter()
+        duplicates = store.reindex_signal_duplicates()
+        elapsed = time.perf_counter() - start
+        total = store.signal_count()
+        print(f"Indexed {total} signals in {elapsed:.1f}s: {duplicates} near-duplicates "
+              f"of {total - duplicates} canonical signals")
+
+        if args.show:
+            for canonical, title, n in store.duplicate_clusters(args.show):
+                print(f"  {n + 1:>3}x  {canonical}  {title[:70]}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,134 +2,92 @@
 """Snow-Town Loop Status Reporter.
 
 Reads from SQLite (status-aware query layer) to report
-the current state of the feedback loop.
+the current state of the feedback loop. All counts come from
+one read transaction of grouped queries (see contracts/loop_status.py),
+the same engine that backs /api/v1/ecosystem.
 
 Usage:
     python scripts/loop_status.py
+    python scripts/loop_status.py --format json
+    python scripts/loop_status.py --format prometheus
+    python scripts/loop_status.py --watch --interval 5
 """
 
+import argparse
 import sys
-from datetime import datetime
+import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from contracts.loop_status import LoopStatus, LoopStatusWatcher, collect_loop_status
 from contracts.store import ContractStore
 
 
-def report_status() -> None:
+def report_status(fmt: str = "text") -> None:
     """Print feedback loop status report."""
     store = ContractStore()
+    try:
+        status = collect_loop_status(store)
+    finally:
+        store.close()
 
-    # Use query_* methods (SQLite) for status-aware data
-    outcomes = store.query_outcomes(limit=10000)
-    all_recs = store.query_recommendations(limit=10000)
-    all_patches = store.query_patches(limit=10000)
-
-    # Categorize recommendations by status and target
-    pending_recs = store.query_recommendations(status="pending", limit=10000)
-    applied_recs = store.query_recommendations(status="applied", limit=10000)
-    persona_recs = [r for r in pending_recs if r.target_system == "persona"]
-    claude_md_recs = [r for r in pending_recs if r.target_system == "claude_md"]
-    pipeline_recs = [r for r in pending_recs if r.target_system == "pipeline"]
-
-    # Categorize patches by status
-    proposed_patches = store.query_patches(status="proposed", limit=10000)
-    applied_patches = store.query_patches(status="applied", limit=10000)
-    rejected_patches = store.query_patches(status="rejected", limit=10000)
-
-    # Outcome distribution
-    outcome_counts: dict[str, int] = {}
-    for o in outcomes:
-        outcome_counts[o.outcome.value] = outcome_counts.get(o.outcome.value, 0) + 1
-
-    # Oldest unprocessed items
-    oldest_rec = None
-    if pending_recs:
-        oldest_rec = min(r.emitted_at for r in pending_recs)
-
-    oldest_patch = None
-    if proposed_patches:
-        oldest_patch = min(p.emitted_at for p in proposed_patches)
-
-    # Count completed cycles (outcome -> recommendation -> patch applied)
-    patch_source_ids = set()
-    for p in applied_patches:
-        patch_source_ids.update(p.source_recommendation_ids)
-    completed_cycles = len(patch_source_ids)
-
-    # Print report
-    print("=" * 60)
-    print("  Snow-Town Feedback Loop Status")
-    print(f"  Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 60)
-
-    print(f"\n  Outcome Records:           {len(outcomes)}")
-    for outcome, count in sorted(outcome_counts.items()):
-        print(f"    - {outcome}: {count}")
-
-    print(f"\n  Improvement Recommendations: {len(all_recs)}")
-    print(f"    - Pending (persona):     {len(persona_recs)}")
-    print(f"    - Pending (claude_md):   {len(claude_md_recs)}")
-    print(f"    - Pending (pipeline):    {len(pipeline_recs)}")
-    print(f"    - Applied:               {len(applied_recs)}")
-
-    print(f"\n  Persona Patches:           {len(all_patches)}")
-    print(f"    - Proposed (review):     {len(proposed_patches)}")
-    print(f"    - Applied:               {len(applied_patches)}")
-    print(f"    - Rejected:              {len(rejected_patches)}")
-
-    print(f"\n  Completed Feedback Cycles: {completed_cycles}")
-
-    if oldest_rec:
-        age = datetime.now() - oldest_rec
-        print(f"  Oldest Pending Rec:        {age.days}d {age.seconds // 3600}h ago")
-
-    if oldest_patch:
-        age = datetime.now() - oldest_patch
-        print(f"  Oldest Pending Patch:      {age.days}d {age.seconds // 3600}h ago")
-
-    # Research signals
-    all_signals = store.query_signals(limit=10000)
-    signal_by_source: dict[str, int] = {}
-    signal_by_relevance: dict[str, int] = {}
-    for s in all_signals:
-        signal_by_source[s.source.value] = signal_by_source.get(s.source.value, 0) + 1
-        signal_by_relevance[s.relevance.value] = signal_by_relevance.get(s.relevance.value, 0) + 1
-
-    print(f"\n  Research Signals:          {len(all_signals)}")
-    for src, cnt in sorted(signal_by_source.items()):
-        print(f"    - {src}: {cnt}")
-    if signal_by_relevance:
-        print("    By relevance:")
-        for rel, cnt in sorted(signal_by_relevance.items()):
-            print(f"      {rel}: {cnt}")
-
-    # Research signal freshness
-    if all_signals:
-        newest_signal = max(s.emitted_at for s in all_signals)
-        age = datetime.now() - newest_signal
-        print(f"  Last Signal Received:      {age.days}d {age.seconds // 3600}h ago")
-
-    # Health check
-    print("\n  Health:")
-    if not outcomes:
-        print("    [!] No outcome records yet - run ideas through UM pipeline")
-    elif not all_recs:
-        print("    [!] No recommendations yet - run Sky-Lynx analyzer")
-    elif not all_patches and persona_recs:
-        print("    [!] Persona recommendations waiting - run persona_upgrader")
-    elif proposed_patches:
-        print(f"    [!] {len(proposed_patches)} patches awaiting human review")
-    elif completed_cycles > 0:
-        print("    [OK] Loop has completed cycles - running end-to-end")
-    else:
-        print("    [OK] Loop is flowing")
+    print(render(status, fmt))
+
+
+def render(status: LoopStatus, fmt: str) -> str:
+    """Render a LoopStatus in the requested output format."""
+    if fmt == "json":
+        return status.model_dump_json(indent=2)
+    if fmt == "prometheus":
+        return status.render_prometheus().rstrip("\n")
+    return status.render_text()
 
-    print("=" * 60)
 
-    store.close()
+def watch_status(fmt: str = "text", interval: float = 5.0) -> None:
+    """Redraw the status every ``interval`` seconds from incremental updates.
+
+    Takes one snapshot at start, then follows new JSONL lines and status
+    transitions only, so each tick costs the size of what changed.
+    """
+    store = ContractStore()
+    watcher = LoopStatusWatcher(store)
+    try:
+        while True:
+            watcher.poll()
+            # Clear screen and home the cursor before redrawing
+            sys.stdout.write("\033[2J\033[H")
+            print(render(watcher.status, fmt))
+            print(f"\n  Watching (every {interval:g}s) - Ctrl-C to exit")
+            sys.stdout.flush()
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Snow-Town Loop Status Reporter")
+    parser.add_argument(
+        "--format",
+        choices=["text", "json", "prometheus"],
+        default="text",
+        help="Output format (default: text)",
+    )
+    parser.add_argument(
+        "--watch", action="store_true", help="Keep running and redraw as the loop changes",
+    )
+    parser.add_argument(
+        "--interval", type=float, default=5.0, help="Redraw interval in seconds for --watch",
+    )
+    args = parser.parse_args()
+    if args.watch:
+        watch_status(args.format, args.interval)
+    else:
+        report_status(args.format)
+    return 0
 
 
 if __name__ == "__main__":
-    report_status()
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""Patch conflict detection and rebase for persona upgrade patches.
+
+A PersonaUpgradePatch is generated against a persona at ``from_version``
+(the persona's ``metadata.version``). If other patches have been applied
+since, the patch is only safe to apply if none of them touched the same
+JSON Pointer paths. This check works purely on recorded patch operations,
+so it runs before any YAML is patched or validated.
+"""
+
+from pydantic import BaseModel, Field
+
+from contracts.persona_upgrade_patch import PatchOperation, PersonaFieldPatch, PersonaUpgradePatch
+
+DEFAULT_VERSION = "0.0.0"
+
+
+class ConflictReport(BaseModel):
+    """Result of checking a patch against the persona's current version."""
+    patch_id: str
+    persona_id: str
+    status: str  # clean | rebase | conflict
+    from_version: str
+    current_version: str
+    conflicting_patch_ids: list[str] = Field(default_factory=list)
+    conflicting_paths: list[str] = Field(default_factory=list)
+
+    @property
+    def applicable(self) -> bool:
+        return self.status in ("clean", "rebase")
+
+
+def parse_version(version: str | None) -> tuple[int, ...]:
+    """Parse a dotted version string into a comparable tuple (non-numeric parts -> 0)."""
+    parts = []
+    for part in str(version or DEFAULT_VERSION).split("."):
+        digits = "".join(ch for ch in part if ch.isdigit())
+        parts.append(int(digits) if digits else 0)
+    while len(parts) < 3:
+        parts.append(0)
+    return tuple(parts)
+
+
+def bump_version(version: str | None) -> str:
+    """Increment the patch component of a version string."""
+    major, minor, patch = parse_version(version)[:3]
+    return f"{major}.{minor}.{patch + 1}"
+
+
+def persona_version(data: dict | None) -> str:
+    """Read metadata.version from persona data."""
+    metadata = (data or {}).get("metadata") or {}
+    version = metadata.get("version")
+    return str(version) if version else DEFAULT_VERSION
+
+
+def set_persona_version(data: dict, version: str) -> None:
+    """Write metadata.version on persona data in place."""
+    metadata = data.setdefault("metadata", {})
+    metadata["version"] = version
+
+
+def _segments(path: str) -> tuple[str, ...]:
+    return tuple(p for p in path.split("/") if p)
+
+
+def touched_paths(patches: list[PersonaFieldPatch]) -> set[tuple[str, ...]]:
+    """Return the JSON Pointer paths a list of operations can affect.
+
+    Appends ("/a/-") are recorded as-is. Removing an array element
+    ("/a/2") shifts later indices, so it touches the whole parent array.
+    """
+    touched = set()
+    for op in patches:
+        parts = _segments(op.path)
+        if not parts:
+            continue
+        if op.operation == PatchOperation.REMOVE and parts[-1].isdigit():
+            parts = parts[:-1]
+        touched.add(parts)
+    return touched
+
+
+def paths_overlap(a: tuple[str, ...], b: tuple[str, ...]) -> bool:
+    """Two paths overlap if one is a prefix of the other.
+
+    Two appends to the same array commute, so they do not overlap.
+    """
+    if a == b:
+        return not (a and a[-1] == "-")
+    shorter, longer = (a, b) if len(a) <= len(b) else (b, a)
+    if shorter and shorter[-1] == "-":
+        # An append only adds a new tail element
+        return False
+    return longer[:len(shorter)] == shorter
+
+
+def _format_path(parts: tuple[str, ...]) -> str:
+    return "/" + "/".join(parts)
+
+
+def check_patch(
+    patch: PersonaUpgradePatch,
+    current_version: str,
+    applied_patches: list[PersonaUpgradePatch],
+) -> ConflictReport:
+    """Check a patch against the patches applied to its persona since from_version.
+
+    ``applied_patches`` are the persona's applied patches; those whose
+    from_version is at or after this patch's from_version are the changes
+    it has not seen.
+    """
+    report = ConflictReport(
+        patch_id=patch.patch_id,
+        persona_id=patch.persona_id,
+        status="clean",
+        from_version=patch.from_version,
+        current_version=current_version,
+    )
+    if parse_version(patch.from_version) == parse_version(current_version):
+        return report
+
+    base = parse_version(patch.from_version)
+    ours = touched_paths(patch.patches)
+    conflicting_paths: set[str] = set()
+    for other in applied_patches:
+        if other.patch_id == patch.patch_id or other.persona_id != patch.persona_id:
+            continue
+        if parse_version(other.from_version) < base:
+            continue
+        hits = {
+            _format_path(p)
+            for p in ours
+            for q in touched_paths(other.patches)
+            if paths_overlap(p, q)
+        }
+        if hits:
+            report.conflicting_patch_ids.append(other.patch_id)
+            conflicting_paths.update(hits)
+
+    report.conflicting_paths = sorted(conflicting_paths)
+    report.status = "conflict" if report.conflicting_patch_ids else "rebase"
+    return report
+
+
+def rebase_patch(patch: PersonaUpgradePatch, current_version: str) -> PersonaUpgradePatch:
+    """Move a non-conflicting patch onto the persona's current version."""
+    patch.from_version = current_version
+    patch.to_version = bump_version(current_version)
+    return patch
@@ -0,0 +1,97 @@
+"""Safe persona YAML writes for the upgrader and review tools.
+
+Writers take a per-persona advisory lock, check that ``metadata.version``
+still matches the version the change was computed against, and replace the
+file via write-temp-then-rename. Readers (AcademyReader, other scripts)
+never take the lock: rename is atomic, so they always see either the old
+or the new file, never a partial one.
+"""
+
+import fcntl
+import os
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import yaml
+
+from scripts.patch_conflicts import persona_version
+
+LOCK_NAME = ".persona.yaml.lock"
+DEFAULT_LOCK_TIMEOUT = 30.0
+
+
+class PersonaVersionConflict(Exception):
+    """Raised when a persona changed between reading it and writing it back."""
+
+    def __init__(self, path: Path, expected: str, actual: str):
+        self.path = path
+        self.expected = expected
+        self.actual = actual
+        super().__init__(
+            f"{path} is at version {actual}, expected {expected}; "
+            "it was modified by another writer"
+        )
+
+
+@contextmanager
+def persona_lock(persona_path: Path, timeout: float = DEFAULT_LOCK_TIMEOUT) -> Iterator[None]:
+    """Hold an exclusive advisory lock on a persona for the duration of the block."""
+    lock_path = persona_path.parent / LOCK_NAME
+    fd = os.open(str(lock_path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for lock on {persona_path}")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write text to a temp file in the same directory, fsync, and rename over path."""
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(tmp_name, path.stat().st_mode & 0o777)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def write_persona_yaml(
+    persona_path: Path,
+    data: dict,
+    expected_version: str,
+    timeout: float = DEFAULT_LOCK_TIMEOUT,
+) -> None:
+    """Compare-and-swap a persona YAML file on metadata.version.
+
+    ``expected_version`` is the version of the persona the new data was
+    derived from. If the file on disk no longer has that version, nothing
+    is written and PersonaVersionConflict is raised.
+    """
+    text = yaml.dump(data, default_flow_style=False, allow_unicode=True)
+    with persona_lock(persona_path, timeout=timeout):
+        if persona_path.exists():
+            current = persona_version(yaml.safe_load(persona_path.read_text()))
+            if current != expected_version:
+                raise PersonaVersionConflict(persona_path, expected_version, current)
+        atomic_write_text(persona_path, text)
@@ -2,7 +2,8 @@
 """Persona Upgrade Engine.
 
 Consumes ImprovementRecommendations where target_system == "persona"
-and generates PersonaUpgradePatches via Claude API.
+and generates PersonaUpgradePatches via Claude API. Pending recommendations
+are grouped by target persona so each persona costs one generation call.
 
 Usage:
     python scripts/persona_upgrader.py
@@ -24,6 +25,7 @@ from pathlib import Path
 import yaml
 from anthropic import Anthropic
 from dotenv import load_dotenv
+from pydantic import BaseModel
 
 # Setup paths
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -35,6 +37,17 @@ from contracts.persona_upgrade_patch import (
     PersonaUpgradePatch,
 )
 from contracts.store import ContractStore
+from contracts.telemetry import span, traced, tracing
+from scripts.patch_conflicts import (
+    bump_version,
+    check_patch,
+    paths_overlap,
+    persona_version,
+    rebase_patch,
+    set_persona_version,
+    touched_paths,
+)
+from scripts.persona_files import write_persona_yaml
 
 # Load environment
 load_dotenv(Path.home() / ".env.shared")
@@ -56,24 +69,20 @@ SCHEMA_PATH = ACADEMY_PATH / "schema" / "persona-schema.json"
 # Claude model for patch generation
 PATCH_MODEL = "claude-sonnet-4-20250514"
 
-PATCH_PROMPT = """You are a persona engineering expert. Given a recommendation for improving
-an AI persona and the current persona YAML, generate a minimal set of changes.
-
-## Recommendation
-Title: {title}
-Type: {recommendation_type}
-Description: {description}
-Suggested Change: {suggested_change}
-Priority: {priority}
-
-## Current Persona YAML
-```yaml
-{persona_yaml}
-```
+# Output budget per recommendation; larger groups are split into several
+# calls (sharing the cached persona prefix) so max_tokens stays bounded
+TOKENS_PER_RECOMMENDATION = 2048
+MAX_RECS_PER_CALL = 4
+MAX_OUTPUT_TOKENS = TOKENS_PER_RECOMMENDATION * MAX_RECS_PER_CALL
 
-## Your Task
+# Patch generation prompt is split so the persona YAML forms a cacheable
+# prefix: instructions + persona go in the system blocks (marked with
+# cache_control), and only the recommendations vary per call.
+PATCH_INSTRUCTIONS = """You are a persona engineering expert. Given one or more recommendations for
+improving an AI persona and the current persona YAML, generate a minimal set of changes
+for each recommendation.
 
-Generate a JSON array of patch operations. Each operation has:
+For each recommendation, generate a JSON array of patch operations. Each operation has:
 - "operation": "add" | "replace" | "remove"
 - "path": JSON Pointer path (e.g., "/voice/phrases/-" to append, "/voice/tone/0" to replace first item)
 - "value": The new value (required for add/replace, omit for remove)
@@ -84,16 +93,119 @@ Rules:
 3. Use JSON Pointer syntax for paths
 4. For arrays, use "/-" to append
 5. Ensure values match the YAML schema types
+6. Each recommendation's operations must apply cleanly to the CURRENT persona YAML
+   on their own, and must not touch a path changed by another recommendation
 
-Output ONLY a JSON object with this structure:
+Output ONLY a JSON object with this structure, one entry per recommendation:
 ```json
-{{
-    "patches": [...],
-    "rationale": "Brief explanation of what changed and why"
-}}
+{
+    "results": [
+        {
+            "recommendation_id": "...",
+            "patches": [...],
+            "rationale": "Brief explanation of what changed and why"
+        }
+    ]
+}
+```
+"""
+
+PERSONA_CONTEXT = """## Current Persona YAML
+```yaml
+{persona_yaml}
 ```
 """
 
+RECOMMENDATION_PROMPT = """## Recommendation {recommendation_id}
+Title: {title}
+Type: {recommendation_type}
+Description: {description}
+Suggested Change: {suggested_change}
+Priority: {priority}
+"""
+
+GENERATION_REQUEST = """{recommendations}
+Generate patches for each of the {count} recommendation(s) above against the persona.
+"""
+
+CLAIMED_PATHS_PROMPT = """## Paths Already Changed
+Other recommendations for this persona already change these paths; do not touch them:
+{paths}
+"""
+
+# Relative input-token pricing for prompt caching (base input = 1.0)
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
+
+class PatchCallUsage(BaseModel):
+    """Token usage for a single patch generation call."""
+    recommendation_ids: list[str]
+    persona_id: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+
+    @property
+    def cache_hit(self) -> bool:
+        return self.cache_read_input_tokens > 0
+
+    @property
+    def total_input_tokens(self) -> int:
+        """Input tokens the call would have been billed for without caching."""
+        return self.input_tokens + self.cache_creation_input_tokens + self.cache_read_input_tokens
+
+    @property
+    def billed_input_tokens(self) -> float:
+        """Input tokens weighted by cache write/read pricing."""
+        return (
+            self.input_tokens
+            + self.cache_creation_input_tokens * CACHE_WRITE_MULTIPLIER
+            + self.cache_read_input_tokens * CACHE_READ_MULTIPLIER
+        )
+
+
+class UsageTracker:
+    """Collects per-call usage and reports prompt cache savings."""
+
+    def __init__(self) -> None:
+        self.calls: list[PatchCallUsage] = []
+
+    def record(self, rec_ids: list[str], persona_id: str, usage) -> PatchCallUsage:
+        """Record the usage block of an Anthropic response."""
+        call = PatchCallUsage(
+            recommendation_ids=rec_ids,
+            persona_id=persona_id,
+            input_tokens=getattr(usage, "input_tokens", 0) or 0,
+            output_tokens=getattr(usage, "output_tokens", 0) or 0,
+            cache_creation_input_tokens=getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            cache_read_input_tokens=getattr(usage, "cache_read_input_tokens", 0) or 0,
+        )
+        self.calls.append(call)
+        logger.info(
+            f"  Usage [{persona_id}]: cache {'hit' if call.cache_hit else 'miss'}, "
+            f"input={call.input_tokens} cache_write={call.cache_creation_input_tokens} "
+            f"cache_read={call.cache_read_input_tokens} output={call.output_tokens}"
+        )
+        return call
+
+    def summary(self) -> dict:
+        """Aggregate hit/miss counts, token totals and estimated savings."""
+        uncached = sum(c.total_input_tokens for c in self.calls)
+        billed = sum(c.billed_input_tokens for c in self.calls)
+        return {
+            "calls": len(self.calls),
+            "cache_hits": sum(1 for c in self.calls if c.cache_hit),
+            "cache_misses": sum(1 for c in self.calls if not c.cache_hit),
+            "input_tokens": sum(c.input_tokens for c in self.calls),
+            "output_tokens": sum(c.output_tokens for c in self.calls),
+            "cache_creation_input_tokens": sum(c.cache_creation_input_tokens for c in self.calls),
+            "cache_read_input_tokens": sum(c.cache_read_input_tokens for c in self.calls),
+            "saved_input_tokens": round(uncached - billed, 1),
+            "savings_ratio": round(1 - billed / uncached, 4) if uncached else 0.0,
+        }
+
 
 def get_persona_ids() -> list[str]:
     """Get list of available persona IDs."""
@@ -127,28 +239,179 @@ def get_pending_recommendations(
     return recs
 
 
-def generate_patch(
-    rec: ImprovementRecommendation,
-    persona_yaml: str,
-    api_key: str,
-) -> PersonaUpgradePatch | None:
-    """Call Claude API to generate a persona patch from a recommendation."""
-    client = Anthropic(api_key=api_key)
+def plan_generations(
+    recs: list[ImprovementRecommendation],
+    available_personas: list[str],
+) -> dict[str, list[ImprovementRecommendation]]:
+    """Group pending recommendations by the persona they target.
+
+    Recommendations without explicit targets apply to every available
+    persona. Each group becomes a single generation call, so several
+    recommendations against the same persona share one request and one
+    view of the persona YAML instead of producing conflicting patches.
+    """
+    plan: dict[str, list[ImprovementRecommendation]] = {}
+    for rec in recs:
+        targets = rec.target_persona_ids if rec.target_persona_ids else available_personas
+        for persona_id in targets:
+            if persona_id not in available_personas:
+                logger.warning(f"Persona '{persona_id}' not found, skipping {rec.recommendation_id}")
+                continue
+            group = plan.setdefault(persona_id, [])
+            if rec not in group:
+                group.append(rec)
+    return plan
 
-    prompt = PATCH_PROMPT.format(
-        title=rec.title,
-        recommendation_type=rec.recommendation_type.value,
-        description=rec.description,
-        suggested_change=rec.suggested_change,
-        priority=rec.priority,
-        persona_yaml=persona_yaml,
-    )
 
-    response = client.messages.create(
-        model=PATCH_MODEL,
-        max_tokens=2048,
-        messages=[{"role": "user", "content": prompt}],
+def build_patch_request(
+    recs: list[ImprovementRecommendation],
+    persona_yaml: str,
+    claimed_paths: set[tuple[str, ...]] | None = None,
+) -> dict:
+    """Build messages.create kwargs with the persona YAML as a cached prefix.
+
+    The system blocks (instructions + persona) are identical for every
+    request against the same persona, so the cache_control marker on
+    the last block lets subsequent calls read them from the prompt cache.
+    ``claimed_paths`` (changed by earlier calls for the persona) are
+    listed in the user message so this call stays clear of them.
+    """
+    rec_blocks = "\n".join(
+        RECOMMENDATION_PROMPT.format(
+            recommendation_id=rec.recommendation_id,
+            title=rec.title,
+            recommendation_type=rec.recommendation_type.value,
+            description=rec.description,
+            suggested_change=rec.suggested_change,
+            priority=rec.priority,
+        )
+        for rec in recs
     )
+    content = GENERATION_REQUEST.format(recommendations=rec_blocks, count=len(recs))
+    if claimed_paths:
+        paths = "\n".join(f"- /{'/'.join(parts)}" for parts in sorted(claimed_paths))
+        content = CLAIMED_PATHS_PROMPT.format(paths=paths) + "\n" + content
+    return {
+        "model": PATCH_MODEL,
+        "max_tokens": min(TOKENS_PER_RECOMMENDATION * len(recs), MAX_OUTPUT_TOKENS),
+        "system": [
+            {"type": "text", "text": PATCH_INSTRUCTIONS},
+            {
+                "type": "text",
+                "text": PERSONA_CONTEXT.format(persona_yaml=persona_yaml),
+                "cache_control": {"type": "ephemeral"},
+            },
+        ],
+        "messages": [{
+            "role": "user",
+            "content": content,
+        }],
+    }
+
+
+def _parse_field_patches(patches_data: list) -> list[PersonaFieldPatch]:
+    """Convert raw patch dicts to PersonaFieldPatch objects, skipping invalid ones."""
+    patches = []
+    for p in patches_data:
+        try:
+            patches.append(PersonaFieldPatch(
+                operation=PatchOperation(p["operation"]),
+                path=p["path"],
+                value=p.get("value"),
+            ))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Invalid patch operation: {e}")
+            continue
+    return patches
+
+
+def split_patch_sets(
+    result: dict,
+    recs: list[ImprovementRecommendation],
+) -> dict[str, tuple[list[PersonaFieldPatch], str]]:
+    """Split a multi-recommendation response into per-recommendation patch sets.
+
+    Returns recommendation_id -> (field patches, rationale), in the order
+    of ``recs``. Entries for unknown recommendation ids are dropped. A bare
+    single-recommendation response ({"patches": ..., "rationale": ...}) is
+    accepted when only one recommendation was requested.
+    """
+    entries = result.get("results")
+    if entries is None and len(recs) == 1 and "patches" in result:
+        entries = [{**result, "recommendation_id": recs[0].recommendation_id}]
+
+    by_id: dict[str, tuple[list[PersonaFieldPatch], str]] = {}
+    known = {rec.recommendation_id for rec in recs}
+    for entry in entries or []:
+        rec_id = entry.get("recommendation_id")
+        if rec_id not in known:
+            logger.warning(f"Response references unknown recommendation '{rec_id}'")
+            continue
+        patches = _parse_field_patches(entry.get("patches", []))
+        if patches:
+            prev_patches, prev_rationale = by_id.get(rec_id, ([], ""))
+            rationale = entry.get("rationale", "")
+            by_id[rec_id] = (
+                prev_patches + patches,
+                f"{prev_rationale} {rationale}".strip() if prev_rationale else rationale,
+            )
+
+    return {rec.recommendation_id: by_id[rec.recommendation_id]
+            for rec in recs if rec.recommendation_id in by_id}
+
+
+def generate_patches(
+    persona_id: str,
+    recs: list[ImprovementRecommendation],
+    persona_yaml: str,
+    client: Anthropic,
+    usage_tracker: UsageTracker | None = None,
+) -> list[PersonaUpgradePatch]:
+    """Call Claude API to generate patches for all recommendations on a persona.
+
+    One call per ``MAX_RECS_PER_CALL`` recommendations. Returns one
+    PersonaUpgradePatch per recommendation that produced valid
+    operations, each carrying its source recommendation id and the
+    persona version it was generated against.
+
+    Paths changed by earlier calls are passed to later ones, and a patch
+    overlapping a path another recommendation already changes is dropped,
+    so the returned patches never touch the same path.
+    """
+    patches: list[PersonaUpgradePatch] = []
+    claimed: set[tuple[str, ...]] = set()
+    for start in range(0, len(recs), MAX_RECS_PER_CALL):
+        batch = recs[start:start + MAX_RECS_PER_CALL]
+        for patch in _generate_batch(
+            persona_id, batch, persona_yaml, client, usage_tracker, claimed,
+        ):
+            paths = touched_paths(patch.patches)
+            if any(paths_overlap(a, b) for a in paths for b in claimed):
+                logger.warning(
+                    f"Dropping patch for {patch.source_recommendation_ids[0]}: "
+                    "touches a path another recommendation changes"
+                )
+                continue
+            claimed |= paths
+            patches.append(patch)
+    return patches
+
+
+def _generate_batch(
+    persona_id: str,
+    recs: list[ImprovementRecommendation],
+    persona_yaml: str,
+    client: Anthropic,
+    usage_tracker: UsageTracker | None,
+    claimed_paths: set[tuple[str, ...]],
+) -> list[PersonaUpgradePatch]:
+    rec_ids = [rec.recommendation_id for rec in recs]
+    with span("persona_upgrader.generate_patches", persona_id=persona_id, recommendations=len(recs)) as call_span:
+        response = client.messages.create(**build_patch_request(recs, persona_yaml, claimed_paths))
+        call_span.add_usage(getattr(response, "usage", None))
+
+    if usage_tracker is not None and getattr(response, "usage", None) is not None:
+        usage_tracker.record(rec_ids, persona_id, response.usage)
 
     content = response.content[0]
     raw_text = content.text if hasattr(content, "text") else str(content)
@@ -159,49 +422,35 @@ def generate_patch(
         json_start = raw_text.find("{")
         json_end = raw_text.rfind("}") + 1
         if json_start == -1 or json_end == 0:
-            logger.error(f"No JSON found in response for rec {rec.recommendation_id}")
-            return None
+            logger.error(f"No JSON found in response for {persona_id} ({', '.join(rec_ids)})")
+            return []
 
         result = json.loads(raw_text[json_start:json_end])
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse JSON from response: {e}")
-        return None
-
-    patches_data = result.get("patches", [])
-    rationale = result.get("rationale", "")
-
-    if not patches_data:
-        logger.warning(f"No patches generated for rec {rec.recommendation_id}")
-        return None
-
-    # Convert to PersonaFieldPatch objects
-    patches = []
-    for p in patches_data:
-        try:
-            patches.append(PersonaFieldPatch(
-                operation=PatchOperation(p["operation"]),
-                path=p["path"],
-                value=p.get("value"),
-            ))
-        except (ValueError, KeyError) as e:
-            logger.warning(f"Invalid patch operation: {e}")
-            continue
-
-    if not patches:
-        return None
+        return []
 
-    # Determine target persona
-    persona_id = rec.target_persona_ids[0] if rec.target_persona_ids else "unknown"
+    patch_sets = split_patch_sets(result, recs)
+    for rec_id in rec_ids:
+        if rec_id not in patch_sets:
+            logger.warning(f"No patches generated for rec {rec_id}")
 
-    return PersonaUpgradePatch(
-        patch_id=f"patch-{uuid.uuid4().hex[:8]}",
-        persona_id=persona_id,
-        patches=patches,
-        rationale=rationale,
-        source_recommendation_ids=[rec.recommendation_id],
-    )
+    from_version = persona_version(yaml.safe_load(persona_yaml))
+    return [
+        PersonaUpgradePatch(
+            patch_id=f"patch-{uuid.uuid4().hex[:8]}",
+            persona_id=persona_id,
+            patches=patches,
+            rationale=rationale,
+            source_recommendation_ids=[rec_id],
+            from_version=from_version,
+            to_version=bump_version(from_version),
+        )
+        for rec_id, (patches, rationale) in patch_sets.items()
+    ]
 
 
+@traced("persona_upgrader.validate_patch")
 def validate_patch(persona_id: str, patch: PersonaUpgradePatch) -> bool:
     """Validate a patch by applying it to a copy of the persona and checking schema.
 
@@ -331,11 +580,15 @@ def main() -> int:
         store.close()
         return 0
 
+    available_personas = get_persona_ids()
+    plan = plan_generations(recs, available_personas)
+
     if args.dry_run:
-        logger.info("DRY RUN - would process:")
-        for rec in recs:
-            targets = ", ".join(rec.target_persona_ids) if rec.target_persona_ids else "all"
-            logger.info(f"  [{rec.priority}] {rec.title} -> {targets}")
+        logger.info(f"DRY RUN - would make {len(plan)} generation call(s):")
+        for persona_id, group in plan.items():
+            logger.info(f"  {persona_id}:")
+            for rec in group:
+                logger.info(f"    [{rec.priority}] {rec.title}")
         store.close()
         return 0
 
@@ -346,56 +599,83 @@ def main() -> int:
         store.close()
         return 1
 
-    available_personas = get_persona_ids()
+    client = Anthropic(api_key=api_key)
+    usage_tracker = UsageTracker()
     processed = 0
     failed = 0
 
-    for rec in recs:
-        targets = rec.target_persona_ids if rec.target_persona_ids else available_personas
-        logger.info(f"\nProcessing: [{rec.priority}] {rec.title}")
-
-        for persona_id in targets:
-            if persona_id not in available_personas:
-                logger.warning(f"  Persona '{persona_id}' not found, skipping")
-                continue
+    with tracing(store):
+        for persona_id, group in plan.items():
+            logger.info(f"\nProcessing {persona_id}: {len(group)} recommendation(s)")
+            for rec in group:
+                logger.info(f"  [{rec.priority}] {rec.title}")
 
             try:
                 persona_yaml = load_persona_yaml(persona_id)
-                patch = generate_patch(rec, persona_yaml, api_key)
+                patches = generate_patches(persona_id, group, persona_yaml, client, usage_tracker)
+            except Exception as e:
+                logger.error(f"  Error generating patches for {persona_id}: {e}")
+                failed += len(group)
+                continue
 
-                if patch is None:
-                    logger.warning(f"  No patch generated for {persona_id}")
+            failed += len(group) - len(patches)
+
+            for patch in patches:
+                try:
+                    # Validate
+                    is_valid = validate_patch(persona_id, patch)
+                    patch.schema_valid = is_valid
+
+                    # Write to store
+                    store.write_patch(patch)
+                    logger.info(f"  Patch {patch.patch_id} written (valid={is_valid})")
+
+                    if args.auto_apply and is_valid:
+                        # Apply the patch directly, rebasing past patches applied earlier in the run
+                        persona_data = yaml.safe_load(load_persona_yaml(persona_id))
+                        current = persona_version(persona_data)
+                        applied = store.query_patches(
+                            persona_id=persona_id, status="applied", limit=10000,
+                        )
+                        report = check_patch(patch, current, applied)
+                        if report.status == "conflict":
+                            logger.warning(
+                                f"  Patch {patch.patch_id} conflicts on "
+                                f"{', '.join(report.conflicting_paths)}, left for review"
+                            )
+                            processed += 1
+                            continue
+                        if report.status == "rebase":
+                            rebase_patch(patch, current)
+                            store.update_patch_versions(
+                                patch.patch_id, patch.from_version, patch.to_version,
+                            )
+                        patched = _apply_patches(persona_data, patch.patches)
+                        if patched:
+                            set_persona_version(patched, patch.to_version)
+                            persona_path = PERSONAS_PATH / persona_id / "persona.yaml"
+                            write_persona_yaml(persona_path, patched, expected_version=current)
+                            store.update_patch_status(patch.patch_id, "applied")
+                            logger.info(f"  Patch {patch.patch_id} auto-applied to {persona_id}")
+
+                    processed += 1
+
+                except Exception as e:
+                    logger.error(f"  Error processing {patch.patch_id} for {persona_id}: {e}")
                     failed += 1
-                    continue
-
-                # Validate
-                is_valid = validate_patch(persona_id, patch)
-                patch.schema_valid = is_valid
-
-                # Write to store
-                store.write_patch(patch)
-                logger.info(f"  Patch {patch.patch_id} written (valid={is_valid})")
 
-                if args.auto_apply and is_valid:
-                    # Apply the patch directly
-                    persona_data = yaml.safe_load(persona_yaml)
-                    patched = _apply_patches(persona_data, patch.patches)
-                    if patched:
-                        persona_path = PERSONAS_PATH / persona_id / "persona.yaml"
-                        persona_path.write_text(yaml.dump(patched, default_flow_style=False))
-                        store.update_patch_status(patch.patch_id, "applied")
-                        logger.info(f"  Patch {patch.patch_id} auto-applied to {persona_id}")
-
-                processed += 1
-
-            except Exception as e:
-                logger.error(f"  Error processing {persona_id}: {e}")
-                failed += 1
-
-        # Mark recommendation as processed
-        store.update_recommendation_status(rec.recommendation_id, "applied")
+        # Mark recommendations as processed
+        for rec in recs:
+            store.update_recommendation_status(rec.recommendation_id, "applied")
 
     logger.info(f"\nResults: {processed} patches generated, {failed} failures")
+    usage = usage_tracker.summary()
+    if usage["calls"]:
+        logger.info(
+            f"Prompt cache: {usage['cache_hits']} hits / {usage['cache_misses']} misses, "
+            f"{usage['cache_read_input_tokens']} tokens read from cache, "
+            f"~{usage['saved_input_tokens']} input tokens saved ({usage['savings_ratio']:.0%})"
+        )
     store.close()
     return 0
 
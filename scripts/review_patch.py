@@ -5,16 +5,18 @@ Review, preview, apply, or reject persona upgrade patches
 before they modify persona YAML files.
 
 Usage:
-    python scripts/review_patch.py list                    # Show all proposed patches
+    python scripts/review_patch.py list                    # Show all patches + conflict status
     python scripts/review_patch.py show <patch_id>         # Show patch details + diff preview
-    python scripts/review_patch.py apply <patch_id>        # Apply patch to persona YAML
-    python scripts/review_patch.py reject <patch_id>       # Reject with optional notes
+    python scripts/review_patch.py apply <patch_id>...     # Apply patch(es) to persona YAML
+    python scripts/review_patch.py apply --persona <id>    # Apply proposed patches by filter
+    python scripts/review_patch.py reject <patch_id>...    # Reject with optional notes
 """
 
 import argparse
 import copy
 import subprocess
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import yaml
@@ -23,6 +25,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from contracts.persona_upgrade_patch import PatchOperation, PersonaFieldPatch, PersonaUpgradePatch
 from contracts.store import ContractStore
+from contracts.telemetry import traced, tracing
+from scripts.patch_conflicts import (
+    ConflictReport,
+    check_patch,
+    persona_version,
+    rebase_patch,
+    set_persona_version,
+)
+from scripts.persona_files import PersonaVersionConflict, write_persona_yaml
 
 ACADEMY_PATH = Path.home() / "projects" / "agent-persona-academy"
 PERSONAS_PATH = ACADEMY_PATH / "personas"
@@ -101,6 +112,7 @@ def _remove_path(data: dict, parts: list[str]) -> None:
         del current[last]
 
 
+@traced("review_patch.validate_persona")
 def validate_persona(persona_id: str, patched_data: dict) -> bool:
     """Validate patched persona against Academy schema."""
     import tempfile
@@ -120,32 +132,74 @@ def validate_persona(persona_id: str, patched_data: dict) -> bool:
         return result.returncode == 0
 
 
+def _current_version(persona_id: str, cache: dict[str, str | None]) -> str | None:
+    """Current metadata.version of a persona, loaded once per persona."""
+    if persona_id not in cache:
+        try:
+            cache[persona_id] = persona_version(load_persona_yaml(persona_id))
+        except FileNotFoundError:
+            cache[persona_id] = None
+    return cache[persona_id]
+
+
+def check_conflicts(
+    store: ContractStore,
+    patch: PersonaUpgradePatch,
+    current_version: str,
+) -> ConflictReport:
+    """Check a patch against the persona's applied patches since its from_version."""
+    applied = store.query_patches(persona_id=patch.persona_id, status="applied", limit=10000)
+    return check_patch(patch, current_version, applied)
+
+
 def cmd_list(store: ContractStore) -> int:
-    """List all patches with their status."""
+    """List all patches with their status and conflict state."""
     patches = store.query_patches(limit=10000)
 
     if not patches:
         print("No patches found.")
         return 0
 
-    print(f"{'Patch ID':<20} {'Persona':<15} {'Status':<12} {'Valid':<8} {'Date'}")
-    print("-" * 75)
+    # Conflict checks only need each persona's version and applied patches
+    versions: dict[str, str | None] = {}
+    applied_by_persona: dict[str, list[PersonaUpgradePatch]] = {}
+    for p in patches:
+        if p.status == "applied":
+            applied_by_persona.setdefault(p.persona_id, []).append(p)
+
+    print(f"{'Patch ID':<20} {'Persona':<15} {'Status':<12} {'Valid':<8} {'Conflict':<10} {'Date'}")
+    print("-" * 86)
+    conflicted = 0
     for p in patches:
         date_str = p.emitted_at.strftime("%Y-%m-%d")
         valid_str = "yes" if p.schema_valid else "NO"
-        print(f"{p.patch_id:<20} {p.persona_id:<15} {p.status:<12} {valid_str:<8} {date_str}")
+        conflict_str = "-"
+        if p.status == "proposed":
+            current = _current_version(p.persona_id, versions)
+            if current is None:
+                conflict_str = "missing"
+            else:
+                report = check_patch(p, current, applied_by_persona.get(p.persona_id, []))
+                conflict_str = report.status
+                if report.status == "conflict":
+                    conflicted += 1
+        print(
+            f"{p.patch_id:<20} {p.persona_id:<15} {p.status:<12} {valid_str:<8} "
+            f"{conflict_str:<10} {date_str}"
+        )
 
     proposed = [p for p in patches if p.status == "proposed"]
     if proposed:
         print(f"\n{len(proposed)} patch(es) awaiting review.")
+    if conflicted:
+        print(f"{conflicted} patch(es) conflict with changes applied since they were generated.")
 
     return 0
 
 
 def cmd_show(store: ContractStore, patch_id: str) -> int:
     """Show patch details and a YAML diff preview."""
-    patches = store.query_patches(limit=10000)
-    patch = next((p for p in patches if p.patch_id == patch_id), None)
+    patch = store.get_patch(patch_id)
 
     if not patch:
         print(f"Patch '{patch_id}' not found.")
@@ -158,6 +212,14 @@ def cmd_show(store: ContractStore, patch_id: str) -> int:
     print(f"From Version: {patch.from_version} -> {patch.to_version}")
     print(f"Emitted: {patch.emitted_at.strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"Source Recommendations: {', '.join(patch.source_recommendation_ids)}")
+    if patch.status == "proposed":
+        versions: dict[str, str | None] = {}
+        current = _current_version(patch.persona_id, versions)
+        if current is not None:
+            report = check_conflicts(store, patch, current)
+            print(f"Conflict Check: {report.status} (persona at {current})")
+            for path in report.conflicting_paths:
+                print(f"  - {path} (changed by {', '.join(report.conflicting_patch_ids)})")
     print()
     print(f"Rationale: {patch.rationale}")
     print()
@@ -213,76 +275,200 @@ def cmd_show(store: ContractStore, patch_id: str) -> int:
     return 0
 
 
-def cmd_apply(store: ContractStore, patch_id: str) -> int:
-    """Apply a patch to the persona YAML file."""
-    patches = store.query_patches(limit=10000)
-    patch = next((p for p in patches if p.patch_id == patch_id), None)
+def select_patches(
+    store: ContractStore,
+    patch_ids: list[str],
+    persona_id: str | None = None,
+    older_than_days: int | None = None,
+    schema_valid: bool | None = None,
+) -> list[PersonaUpgradePatch] | None:
+    """Resolve explicit patch ids and/or filters to patches in one query.
+
+    Explicit ids are returned regardless of status (so callers can report
+    non-proposed ones); filter-only selection returns proposed patches.
+    Returns None (after printing the missing ids) if any id is unknown;
+    explicit ids that exist but do not match the filters are printed and
+    left out.
+    """
+    emitted_before = None
+    if older_than_days is not None:
+        emitted_before = datetime.now() - timedelta(days=older_than_days)
+
+    if patch_ids:
+        patches = store.query_patches(
+            persona_id=persona_id,
+            schema_valid=schema_valid,
+            emitted_before=emitted_before,
+            patch_ids=patch_ids,
+            limit=len(patch_ids),
+        )
+        found = {p.patch_id for p in patches}
+        missing = [pid for pid in patch_ids if pid not in found]
+        if missing:
+            existing = {
+                p.patch_id
+                for p in store.query_patches(patch_ids=missing, limit=len(missing))
+            }
+            unknown = [pid for pid in missing if pid not in existing]
+            for pid in unknown:
+                print(f"Patch '{pid}' not found.")
+            if unknown:
+                return None
+            for pid in missing:
+                print(f"Patch '{pid}' does not match the filters. Skipped.")
+        # Preserve the order given on the command line
+        order = {pid: i for i, pid in enumerate(patch_ids)}
+        return sorted(patches, key=lambda p: order[p.patch_id])
+
+    return store.query_patches(
+        persona_id=persona_id,
+        status="proposed",
+        schema_valid=schema_valid,
+        emitted_before=emitted_before,
+        limit=10000,
+    )
 
-    if not patch:
-        print(f"Patch '{patch_id}' not found.")
-        return 1
 
+@traced("review_patch.apply_patch")
+def _apply_one(store: ContractStore, patch: PersonaUpgradePatch) -> bool:
+    """Apply a single proposed patch to its persona YAML file."""
+    patch_id = patch.patch_id
     if patch.status != "proposed":
-        print(f"Patch is '{patch.status}', not 'proposed'. Cannot apply.")
-        return 1
+        print(f"Patch {patch_id} is '{patch.status}', not 'proposed'. Cannot apply.")
+        return False
 
     # Load and patch
     try:
         original = load_persona_yaml(patch.persona_id)
     except FileNotFoundError as e:
         print(f"ERROR: {e}")
-        return 1
+        return False
+
+    # Conflict check runs on recorded operations, before any validation spawn
+    current = persona_version(original)
+    report = check_conflicts(store, patch, current)
+    if report.status == "conflict":
+        print(
+            f"ERROR: Patch was generated against {patch.from_version}, persona is at {current}."
+        )
+        print(f"Conflicting paths changed by {', '.join(report.conflicting_patch_ids)}:")
+        for path in report.conflicting_paths:
+            print(f"  - {path}")
+        print("Regenerate the patch against the current persona.")
+        return False
+    if report.status == "rebase":
+        rebase_patch(patch, current)
+        print(f"Rebased patch onto persona version {current} (no overlapping changes).")
 
     patched = apply_patches(original, patch.patches)
     if patched is None:
         print("ERROR: Failed to apply patches.")
-        return 1
+        return False
+    set_persona_version(patched, patch.to_version)
 
     # Validate against schema
     print("Validating against Academy schema...")
     if not validate_persona(patch.persona_id, patched):
         print("ERROR: Patched persona fails schema validation. Aborting.")
-        return 1
+        return False
     print("Schema validation passed.")
 
     # Write patched YAML
     persona_path = PERSONAS_PATH / patch.persona_id / "persona.yaml"
-    patched_yaml = yaml.dump(patched, default_flow_style=False, allow_unicode=True)
-    persona_path.write_text(patched_yaml)
+    try:
+        write_persona_yaml(persona_path, patched, expected_version=current)
+    except (PersonaVersionConflict, TimeoutError) as e:
+        print(f"ERROR: {e}. Re-run apply to re-check against the new version.")
+        return False
     print(f"Written patched persona to {persona_path}")
 
-    # Update patch status
-    store.update_patch_status(patch_id, "applied")
+    # Record the result right after the file write, so a later failure in
+    # the batch cannot roll it back and leave the patch to be re-applied
+    with store.transaction():
+        if report.status == "rebase":
+            store.update_patch_versions(patch_id, patch.from_version, patch.to_version)
+        store.update_patch_status(patch_id, "applied")
+        for rec_id in patch.source_recommendation_ids:
+            store.update_recommendation_status(rec_id, "applied")
     print(f"Patch {patch_id} marked as 'applied'.")
-
-    # Mark source recommendations as applied
     for rec_id in patch.source_recommendation_ids:
-        store.update_recommendation_status(rec_id, "applied")
         print(f"Recommendation {rec_id} marked as 'applied'.")
 
-    return 0
+    return True
 
 
-def cmd_reject(store: ContractStore, patch_id: str, notes: str | None = None) -> int:
-    """Reject a patch with optional notes."""
-    patches = store.query_patches(limit=10000)
-    patch = next((p for p in patches if p.patch_id == patch_id), None)
+def cmd_apply(
+    store: ContractStore,
+    patch_ids: list[str],
+    persona_id: str | None = None,
+    older_than_days: int | None = None,
+    schema_valid: bool | None = None,
+) -> int:
+    """Apply one or more patches to their persona YAML files.
 
-    if not patch:
-        print(f"Patch '{patch_id}' not found.")
+    Each patch's status updates are committed as soon as its file is
+    written, so a failure later in the batch keeps earlier ones applied.
+    """
+    patches = select_patches(store, patch_ids, persona_id, older_than_days, schema_valid)
+    if patches is None:
         return 1
+    if not patches:
+        print("No matching patches.")
+        return 1 if patch_ids else 0
 
-    if patch.status != "proposed":
-        print(f"Patch is '{patch.status}', not 'proposed'. Cannot reject.")
+    applied = 0
+    for patch in patches:
+        if len(patches) > 1:
+            print(f"\n--- {patch.patch_id} ({patch.persona_id}) ---")
+        if _apply_one(store, patch):
+            applied += 1
+
+    if len(patches) > 1:
+        print(f"\nApplied {applied}/{len(patches)} patch(es).")
+    return 0 if applied == len(patch_ids or patches) else 1
+
+
+def cmd_reject(
+    store: ContractStore,
+    patch_ids: list[str],
+    notes: str | None = None,
+    persona_id: str | None = None,
+    older_than_days: int | None = None,
+    schema_valid: bool | None = None,
+) -> int:
+    """Reject one or more patches with optional notes, in one transaction."""
+    patches = select_patches(store, patch_ids, persona_id, older_than_days, schema_valid)
+    if patches is None:
         return 1
-
-    store.update_patch_status(patch_id, "rejected")
-    print(f"Patch {patch_id} marked as 'rejected'.")
+    if not patches:
+        print("No matching patches.")
+        return 1 if patch_ids else 0
+
+    rejected = 0
+    with store.transaction():
+        for patch in patches:
+            if patch.status != "proposed":
+                print(f"Patch {patch.patch_id} is '{patch.status}', not 'proposed'. Cannot reject.")
+                continue
+            store.update_patch_status(patch.patch_id, "rejected")
+            print(f"Patch {patch.patch_id} marked as 'rejected'.")
+            rejected += 1
 
     if notes:
         print(f"Notes: {notes}")
 
-    return 0
+    return 0 if rejected == len(patch_ids or patches) else 1
+
+
+def _add_selection_args(subparser: argparse.ArgumentParser, verb: str) -> None:
+    subparser.add_argument("patch_ids", nargs="*", help=f"Patch ID(s) to {verb}")
+    subparser.add_argument("--persona", type=str, help="Only patches for this persona")
+    subparser.add_argument(
+        "--older-than", type=int, metavar="DAYS", help="Only patches emitted more than DAYS ago",
+    )
+    subparser.add_argument(
+        "--schema-valid", choices=["yes", "no"], help="Only patches with this validation result",
+    )
 
 
 def main() -> int:
@@ -294,7 +480,10 @@ Examples:
   python scripts/review_patch.py list
   python scripts/review_patch.py show patch-c6495783
   python scripts/review_patch.py apply patch-c6495783
+  python scripts/review_patch.py apply patch-c6495783 patch-4564f91b
+  python scripts/review_patch.py apply --persona sky-lynx --schema-valid yes
   python scripts/review_patch.py reject patch-c6495783 --notes "Not ready yet"
+  python scripts/review_patch.py reject --schema-valid no --older-than 14
 """,
     )
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -304,15 +493,24 @@ Examples:
     show_parser = subparsers.add_parser("show", help="Show patch details")
     show_parser.add_argument("patch_id", help="Patch ID to show")
 
-    apply_parser = subparsers.add_parser("apply", help="Apply a patch")
-    apply_parser.add_argument("patch_id", help="Patch ID to apply")
+    apply_parser = subparsers.add_parser("apply", help="Apply patches")
+    _add_selection_args(apply_parser, "apply")
 
-    reject_parser = subparsers.add_parser("reject", help="Reject a patch")
-    reject_parser.add_argument("patch_id", help="Patch ID to reject")
+    reject_parser = subparsers.add_parser("reject", help="Reject patches")
+    _add_selection_args(reject_parser, "reject")
     reject_parser.add_argument("--notes", type=str, help="Rejection notes")
 
     args = parser.parse_args()
 
+    if args.command in ("apply", "reject"):
+        if not (args.patch_ids or args.persona or args.older_than is not None or args.schema_valid):
+            parser.error(f"{args.command} needs patch IDs or at least one filter")
+        selection = {
+            "persona_id": args.persona,
+            "older_than_days": args.older_than,
+            "schema_valid": None if args.schema_valid is None else args.schema_valid == "yes",
+        }
+
     store = ContractStore()
 
     try:
@@ -321,9 +519,11 @@ Examples:
         elif args.command == "show":
             return cmd_show(store, args.patch_id)
         elif args.command == "apply":
-            return cmd_apply(store, args.patch_id)
+            with tracing(store):
+                return cmd_apply(store, args.patch_ids, **selection)
         elif args.command == "reject":
-            return cmd_reject(store, args.patch_id, getattr(args, "notes", None))
+            with tracing(store):
+                return cmd_reject(store, args.patch_ids, args.notes, **selection)
         else:
             parser.print_help()
             return 1
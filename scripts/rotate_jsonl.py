@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Seal past months of the contract JSONL into compressed segments.
+
+The first run for a contract type moves its single JSONL file into a
+segment directory (data/research_signals/ etc.); after that, records are
+appended to the current month's segment and every earlier month is
+gzip-compressed and listed in the directory's manifest.json. Run monthly
+from cron; running it again within a month is a no-op.
+
+Usage:
+    python scripts/rotate_jsonl.py                   # all contract types
+    python scripts/rotate_jsonl.py research_signal   # one type
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from contracts.store import JSONL_FILES, ContractStore
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Seal past months of JSONL into segments")
+    parser.add_argument("contract_types", nargs="*",
+                        help=f"Contract types to rotate (default: all of {', '.join(JSONL_FILES)})")
+    args = parser.parse_args()
+    unknown = sorted(set(args.contract_types) - set(JSONL_FILES))
+    if unknown:
+        parser.error(f"unknown contract type(s): {', '.join(unknown)}")
+
+    store = ContractStore()
+    try:
+        for contract_type in args.contract_types or JSONL_FILES:
+            for entry in store.rotate_jsonl(contract_type):
+                print(f"{contract_type}: sealed {entry.file} ({entry.records} records, "
+                      f"{entry.min_emitted_at:%Y-%m-%d} .. {entry.max_emitted_at:%Y-%m-%d})")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
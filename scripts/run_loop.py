@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""Snow-Town Feedback Loop Orchestrator.
+
+Runs the feedback cycle as a DAG of stages:
+1. Sky-Lynx analyzes outcomes + signals + usage data
+2. Persona upgrader processes new recommendations (after 1)
+3. Report loop status (independent: runs alongside 1)
+
+Each stage declares the contract types and external files it consumes.
+After a successful run the stage's input high-water marks (JSONL byte
+sizes, latest file mtimes) are saved to a checkpoint file; a later run
+skips any stage whose inputs have not changed since, so re-running after
+a mid-loop failure resumes at the failed stage. Stages whose
+dependencies are satisfied run concurrently. Each run is
+traced (contracts/telemetry.py): stage spans and the spans emitted by the
+stage processes share one run id in loop_runs.jsonl.
+
+Usage:
+    python scripts/run_loop.py                  # Full loop
+    python scripts/run_loop.py --dry-run        # Dry run (no API calls, no patches)
+    python scripts/run_loop.py --force          # Ignore checkpoints, run every stage
+    python scripts/run_loop.py --force-stage sky_lynx
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+from dotenv import load_dotenv
+from pydantic import BaseModel, Field
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from contracts.loop_run import LoopSpan
+from contracts.store import DATA_DIR, ContractStore
+from contracts.telemetry import RUN_ID_ENV, active_tracer, tracing
+from scripts.persona_files import atomic_write_text
+
+SNOW_TOWN_DIR = Path(__file__).parent.parent
+SKY_LYNX_DIR = Path.home() / "projects" / "sky-lynx"
+# Weekly usage data Sky-Lynx analyzes alongside outcomes and signals
+USAGE_DATA_DIR = Path(os.environ.get(
+    "SKY_LYNX_USAGE_DATA_DIR", str(Path.home() / ".claude" / "usage-data"),
+))
+CHECKPOINT_FILE = DATA_DIR / "loop_checkpoints.json"
+DEFAULT_MAX_WORKERS = 4
+
+
+class Stage(BaseModel):
+    """One step of the feedback loop."""
+    name: str
+    title: str
+    command: list[str]
+    cwd: Path = SNOW_TOWN_DIR
+    depends_on: list[str] = Field(default_factory=list)
+    # Contract types whose new records give this stage work to do.
+    # A stage with no inputs runs every time.
+    inputs: list[str] = Field(default_factory=list)
+    # Files or directories outside the store that also give it work
+    input_paths: list[Path] = Field(default_factory=list)
+    dry_run_args: list[str] = Field(default_factory=lambda: ["--dry-run"])
+
+
+class StageResult(BaseModel):
+    """Outcome of one stage in one loop run."""
+    name: str
+    status: str  # success | failed | skipped | blocked
+    started_at: datetime | None = None
+    duration_seconds: float = 0.0
+    returncode: int | None = None
+    watermarks: dict[str, int] = Field(default_factory=dict)
+    output: str = ""
+    reason: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("success", "skipped")
+
+
+def default_stages() -> list[Stage]:
+    """The stages of the weekly feedback loop."""
+    return [
+        Stage(
+            name="sky_lynx",
+            title="Sky-Lynx Analysis",
+            command=[
+                str(SKY_LYNX_DIR / ".venv" / "bin" / "python"),
+                "-m", "sky_lynx.analyzer", "--no-pr",
+            ],
+            cwd=SKY_LYNX_DIR,
+            inputs=["outcome_record", "research_signal"],
+            input_paths=[USAGE_DATA_DIR],
+        ),
+        Stage(
+            name="persona_upgrader",
+            title="Persona Upgrade Engine",
+            command=[sys.executable, "scripts/persona_upgrader.py"],
+            depends_on=["sky_lynx"],
+            inputs=["improvement_recommendation"],
+        ),
+        Stage(
+            name="loop_status",
+            title="Loop Status",
+            command=[sys.executable, "scripts/loop_status.py"],
+            dry_run_args=[],
+        ),
+    ]
+
+
+def validate_stages(stages: list[Stage]) -> None:
+    """Reject duplicate names, unknown dependencies, and cycles."""
+    names = [s.name for s in stages]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Duplicate stage names: {names}")
+    by_name = {s.name: s for s in stages}
+    for stage in stages:
+        for dep in stage.depends_on:
+            if dep not in by_name:
+                raise ValueError(f"Stage {stage.name} depends on unknown stage {dep}")
+
+    visiting: set[str] = set()
+    done: set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through stage {name}")
+        visiting.add(name)
+        for dep in by_name[name].depends_on:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in names:
+        visit(name)
+
+
+def load_checkpoints(path: Path) -> dict[str, dict]:
+    """Read the last successful run of each stage."""
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except json.JSONDecodeError:
+        print(f"WARNING: Ignoring unreadable checkpoint file {path}")
+        return {}
+
+
+def save_checkpoints(path: Path, checkpoints: dict[str, dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, json.dumps(checkpoints, indent=2, sort_keys=True) + "\n")
+
+
+def path_watermarks(paths: list[Path]) -> dict[str, int]:
+    """Latest mtime (ns) of each path, or of the files under a directory (0 if none)."""
+    marks = {}
+    for path in paths:
+        files = path.rglob("*") if path.is_dir() else [path]
+        marks[str(path)] = max(
+            (f.stat().st_mtime_ns for f in files if f.is_file()), default=0,
+        )
+    return marks
+
+
+def stage_watermarks(stage: Stage, store: ContractStore) -> dict[str, int]:
+    """High-water marks of everything a stage consumes."""
+    watermarks = store.high_water_marks(stage.inputs) if stage.inputs else {}
+    watermarks.update(path_watermarks(stage.input_paths))
+    return watermarks
+
+
+def is_up_to_date(stage: Stage, watermarks: dict[str, int], checkpoints: dict[str, dict]) -> bool:
+    """True if the stage already succeeded against exactly these inputs."""
+    if not stage.inputs and not stage.input_paths:
+        return False
+    checkpoint = checkpoints.get(stage.name)
+    if not checkpoint or checkpoint.get("status") != "success":
+        return False
+    return checkpoint.get("watermarks") == watermarks
+
+
+def run_stage(stage: Stage, dry_run: bool = False, run_id: str | None = None) -> StageResult:
+    """Run one stage's command, capturing its output."""
+    command = stage.command + (stage.dry_run_args if dry_run else [])
+    env = dict(os.environ)
+    if run_id:
+        env[RUN_ID_ENV] = run_id
+    started_at = datetime.now()
+    start = time.monotonic()
+    try:
+        proc = subprocess.run(
+            command,
+            check=False,
+            cwd=str(stage.cwd),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            env=env,
+        )
+        returncode, output = proc.returncode, proc.stdout
+    except OSError as e:
+        returncode, output = None, f"Failed to start {command[0]}: {e}\n"
+    return StageResult(
+        name=stage.name,
+        status="success" if returncode == 0 else "failed",
+        started_at=started_at,
+        duration_seconds=round(time.monotonic() - start, 3),
+        returncode=returncode,
+        output=output,
+    )
+
+
+def run_loop(
+    stages: list[Stage],
+    store: ContractStore,
+    checkpoint_path: Path = CHECKPOINT_FILE,
+    dry_run: bool = False,
+    force: set[str] | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    on_result=None,
+) -> list[StageResult]:
+    """Run the stage DAG and return results in completion order.
+
+    A stage is scheduled once all its dependencies succeeded or were
+    skipped; if a dependency failed it is blocked. Input watermarks are
+    read when a stage becomes ready, so it sees what upstream stages just
+    wrote. Dry runs neither skip stages nor write checkpoints.
+    """
+    validate_stages(stages)
+    force = force or set()
+    checkpoints = load_checkpoints(checkpoint_path)
+    tracer = active_tracer()
+    pending = {s.name: s for s in stages}
+    finished: dict[str, StageResult] = {}
+    results: list[StageResult] = []
+    running: dict[Future, tuple[Stage, dict[str, int]]] = {}
+
+    def finish(result: StageResult) -> None:
+        finished[result.name] = result
+        results.append(result)
+        if on_result:
+            on_result(result)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                deps = [finished.get(d) for d in stage.depends_on]
+                if any(r is None for r in deps):
+                    continue
+                del pending[name]
+                failed = [r.name for r in deps if not r.ok]
+                if failed:
+                    finish(StageResult(
+                        name=name, status="blocked", reason=f"upstream failed: {', '.join(failed)}",
+                    ))
+                    continue
+                watermarks = stage_watermarks(stage, store)
+                if (
+                    not dry_run and name not in force
+                    and is_up_to_date(stage, watermarks, checkpoints)
+                ):
+                    finish(StageResult(
+                        name=name, status="skipped", watermarks=watermarks,
+                        reason="inputs unchanged",
+                    ))
+                    continue
+                run_id = tracer.run_id if tracer else None
+                running[pool.submit(run_stage, stage, dry_run, run_id)] = (stage, watermarks)
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, watermarks = running.pop(future)
+                result = future.result()
+                result.watermarks = watermarks
+                if not dry_run:
+                    checkpoints[stage.name] = {
+                        "status": result.status,
+                        "watermarks": watermarks if result.status == "success"
+                        else checkpoints.get(stage.name, {}).get("watermarks", {}),
+                        "started_at": result.started_at.isoformat() if result.started_at else None,
+                        "duration_seconds": result.duration_seconds,
+                    }
+                    save_checkpoints(checkpoint_path, checkpoints)
+                if tracer is not None:
+                    tracer.record(LoopSpan(
+                        run_id=tracer.run_id,
+                        stage=f"run_loop.{stage.name}",
+                        started_at=result.started_at,
+                        duration_seconds=result.duration_seconds,
+                        status="ok" if result.status == "success" else "error",
+                        error=(
+                            None if result.status == "success"
+                            else f"exit code {result.returncode}"
+                        ),
+                        attributes={"returncode": result.returncode},
+                    ))
+                finish(result)
+
+    return results
+
+
+def print_result(result: StageResult) -> None:
+    print()
+    print(f">>> {result.name}: {result.status.upper()}")
+    print("-" * 60)
+    if result.output:
+        print(result.output.rstrip("\n"))
+    if result.reason:
+        print(f"({result.reason})")
+
+
+def print_summary(results: list[StageResult]) -> None:
+    print()
+    print("Stage timings:")
+    for r in results:
+        print(f"  {r.name:<20} {r.status:<8} {r.duration_seconds:>8.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snow-Town Feedback Loop")
+    parser.add_argument("--dry-run", action="store_true", help="No API calls, no patches")
+    parser.add_argument("--force", action="store_true",
+                        help="Ignore checkpoints and run every stage")
+    parser.add_argument("--force-stage", action="append", default=[], metavar="NAME",
+                        help="Run this stage even if its inputs are unchanged (repeatable)")
+    parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help="Maximum stages to run concurrently")
+    args = parser.parse_args()
+
+    # Shared env for cron context (API keys, PATH, etc.)
+    env_path = Path.home() / ".env.shared"
+    if env_path.exists():
+        load_dotenv(env_path)
+
+    stages = default_stages()
+    force = {s.name for s in stages} if args.force else set(args.force_stage)
+    unknown = force - {s.name for s in stages}
+    if unknown:
+        parser.error(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+
+    print("=" * 60)
+    print("  Snow-Town Feedback Loop")
+    print(f"  {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 60)
+
+    store = ContractStore()
+    try:
+        if args.dry_run:
+            results = run_loop(stages, store, dry_run=True, force=force,
+                               max_workers=args.max_workers, on_result=print_result)
+        else:
+            with tracing(store) as tracer:
+                print(f"  Run: {tracer.run_id}")
+                results = run_loop(stages, store, force=force,
+                                   max_workers=args.max_workers, on_result=print_result)
+    finally:
+        store.close()
+
+    print_summary(results)
+    print()
+    if all(r.ok for r in results):
+        print(f"Snow-Town feedback loop complete at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        return
+    print("Snow-Town feedback loop FAILED; re-run to resume from the failed stage")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
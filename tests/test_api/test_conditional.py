@@ -0,0 +1,104 @@
+"""Tests for ETag / Last-Modified conditional GET."""
+
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.readers.academy_reader import AcademyReader
+from api.readers.um_reader import UMReader
+from contracts.outcome_record import OutcomeRecord, TerminalOutcome
+from contracts.persona_upgrade_patch import PatchOperation, PersonaFieldPatch, PersonaUpgradePatch
+from contracts.store import ContractStore
+
+
+@pytest.fixture()
+def store(tmp_path):
+    return ContractStore(data_dir=tmp_path)
+
+
+@pytest.fixture()
+def personas(tmp_path):
+    path = tmp_path / "personas"
+    (path / "porter").mkdir(parents=True)
+    (path / "porter" / "persona.yaml").write_text("identity:\n  name: Porter\n")
+    return path
+
+
+@pytest.fixture()
+def client(store, personas, tmp_path, monkeypatch):
+    import api.deps as deps_module
+    monkeypatch.setattr(deps_module, "_store", store)
+    monkeypatch.setattr(deps_module, "_academy", AcademyReader(personas_dir=personas))
+    monkeypatch.setattr(deps_module, "_um", UMReader(db_path=tmp_path / "nonexistent.db"))
+    from api.main import app
+    return TestClient(app)
+
+
+def _outcome(idea_id: int) -> OutcomeRecord:
+    return OutcomeRecord(
+        idea_id=idea_id, idea_title=f"Idea {idea_id}",
+        outcome=TerminalOutcome.PUBLISHED, emitted_at=datetime.now(),
+    )
+
+
+def test_unchanged_poll_returns_304_without_running_handler(client, store, monkeypatch):
+    store.write_outcome(_outcome(1))
+    first = client.get("/api/v1/activity")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == "no-cache"
+
+    def boom(*args, **kwargs):
+        raise AssertionError("handler should not run for a fresh ETag")
+
+    monkeypatch.setattr(store, "query_outcomes", boom)
+    second = client.get("/api/v1/activity", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+
+def test_new_record_changes_etag(client, store):
+    etag = client.get("/api/v1/ecosystem").headers["etag"]
+    store.write_outcome(_outcome(2))
+    resp = client.get("/api/v1/ecosystem", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+
+
+def test_status_update_changes_etag(client, store):
+    store.write_patch(PersonaUpgradePatch(
+        patch_id="p1", persona_id="porter",
+        patches=[PersonaFieldPatch(operation=PatchOperation.ADD, path="/t", value="a")],
+        rationale="Test",
+    ))
+    etag = client.get("/api/v1/nodes/academy").headers["etag"]
+    store.update_patch_status("p1", "applied")
+    assert client.get("/api/v1/nodes/academy", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_etag_depends_on_query(client):
+    a = client.get("/api/v1/research/signals?limit=5").headers["etag"]
+    b = client.get("/api/v1/research/signals?limit=6").headers["etag"]
+    assert a != b
+
+
+def test_agents_follow_persona_files(client, personas):
+    first = client.get("/api/v1/agents")
+    etag = first.headers["etag"]
+    assert client.get("/api/v1/agents", headers={"If-None-Match": etag}).status_code == 304
+
+    (personas / "porter" / "persona.yaml").write_text("identity:\n  name: Michael Porter\n")
+    assert client.get("/api/v1/agents", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_if_modified_since(client, store):
+    store.write_outcome(_outcome(3))
+    first = client.get("/api/v1/activity")
+    last_modified = first.headers["last-modified"]
+    resp = client.get("/api/v1/activity", headers={"If-Modified-Since": last_modified})
+    assert resp.status_code == 304
+    resp = client.get("/api/v1/activity", headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"})
+    assert resp.status_code == 200
@@ -128,6 +128,33 @@ def test_ecosystem_edge_counts(client, store):
     assert um_sl_edge["recent_count"] == 3
 
 
+def test_ecosystem_reflects_status_updates(client, store):
+    store.write_recommendation(ImprovementRecommendation(
+        recommendation_id="rec-001",
+        recommendation_type=RecommendationType.VOICE_ADJUSTMENT,
+        title="Voice", description="Test", suggested_change="Test change",
+    ))
+    store.write_patch(PersonaUpgradePatch(
+        patch_id="patch-001",
+        persona_id="christensen",
+        patches=[PersonaFieldPatch(
+            operation=PatchOperation.ADD, path="/voice/phrases/-", value="hi",
+        )],
+        rationale="Test patch",
+        source_recommendation_ids=["rec-001"],
+    ))
+    store.update_patch_status("patch-001", "applied")
+    store.update_recommendation_status("rec-001", "applied")
+
+    data = client.get("/api/v1/ecosystem").json()
+    assert data["cycle_count"] == 1
+    academy = next(n for n in data["nodes"] if n["node_id"] == "academy")
+    assert academy["breakdown"] == {"proposed": 0, "applied": 1, "rejected": 0}
+    assert academy["pending_count"] == 0
+    sky_lynx = next(n for n in data["nodes"] if n["node_id"] == "sky_lynx")
+    assert sky_lynx["breakdown"] == {"applied": 1}
+
+
 def test_health_endpoint(client):
     resp = client.get("/api/v1/health")
     assert resp.status_code == 200
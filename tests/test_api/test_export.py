@@ -0,0 +1,127 @@
+"""Tests for the NDJSON export endpoints."""
+
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.readers.academy_reader import AcademyReader
+from api.readers.um_reader import UMReader
+from contracts.outcome_record import OutcomeRecord, TerminalOutcome
+from contracts.store import ContractStore
+
+
+@pytest.fixture()
+def store(tmp_path):
+    return ContractStore(data_dir=tmp_path)
+
+
+@pytest.fixture()
+def client(store, tmp_path, monkeypatch):
+    import api.deps as deps_module
+    monkeypatch.setattr(deps_module, "_store", store)
+    monkeypatch.setattr(deps_module, "_academy", AcademyReader(personas_dir=tmp_path))
+    monkeypatch.setattr(deps_module, "_um", UMReader(db_path=tmp_path / "nonexistent.db"))
+    from api.main import app
+    return TestClient(app)
+
+
+def _outcomes(store, n, start=0):
+    for i in range(start, start + n):
+        store.write_outcome(OutcomeRecord(
+            idea_id=i, idea_title=f"Idea {i}", outcome=TerminalOutcome.PUBLISHED,
+            overall_score=float(i), emitted_at=datetime(2026, 3, 1 + i, 12, 0),
+        ))
+
+
+def _records(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_export_streams_jsonl_and_resumes_from_offset(client, store):
+    _outcomes(store, 3)
+    path = store._jsonl_path("outcome_record")
+
+    first = client.get("/api/v1/export/outcome_record.ndjson")
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/x-ndjson"
+    assert first.headers["accept-ranges"] == "bytes"
+    assert first.content == path.read_bytes()
+    offset = int(first.headers["x-export-end-offset"])
+    assert offset == path.stat().st_size
+
+    _outcomes(store, 2, start=3)
+    second = client.get(f"/api/v1/export/outcome_record.ndjson?offset={offset}")
+    assert [r["idea_id"] for r in _records(second)] == [3, 4]
+
+    caught_up = client.get(
+        f"/api/v1/export/outcome_record.ndjson?offset={second.headers['x-export-end-offset']}"
+    )
+    assert caught_up.status_code == 200
+    assert caught_up.content == b""
+
+
+def test_export_filters_by_time_and_projects_fields(client, store):
+    _outcomes(store, 5)
+    response = client.get(
+        "/api/v1/export/outcome_record.ndjson",
+        params={"since": "2026-03-02T00:00:00", "until": "2026-03-04T12:00:00",
+                "fields": "idea_id,overall_score"},
+    )
+    assert response.status_code == 200
+    assert response.headers["accept-ranges"] == "none"
+    assert _records(response) == [
+        {"idea_id": 1, "overall_score": 1.0},
+        {"idea_id": 2, "overall_score": 2.0},
+    ]
+
+
+def test_export_reads_through_sealed_segments(client, store):
+    _outcomes(store, 5)
+    data = store._jsonl_path("outcome_record").read_bytes()
+    store.rotate_jsonl("outcome_record", now=datetime(2026, 5, 1))
+
+    full = client.get("/api/v1/export/outcome_record.ndjson")
+    assert full.content == data
+    assert int(full.headers["x-export-end-offset"]) == len(data)
+    filtered = client.get(
+        "/api/v1/export/outcome_record.ndjson",
+        params={"since": "2026-03-03T00:00:00", "fields": "idea_id"},
+    )
+    assert _records(filtered) == [{"idea_id": 2}, {"idea_id": 3}, {"idea_id": 4}]
+
+
+def test_export_byte_ranges(client, store):
+    _outcomes(store, 3)
+    data = store._jsonl_path("outcome_record").read_bytes()
+
+    partial = client.get("/api/v1/export/outcome_record.ndjson", headers={"Range": "bytes=10-"})
+    assert partial.status_code == 206
+    assert partial.content == data[10:]
+    assert partial.headers["content-range"] == f"bytes 10-{len(data) - 1}/{len(data)}"
+
+    tail = client.get("/api/v1/export/outcome_record.ndjson", headers={"Range": "bytes=-20"})
+    assert tail.content == data[-20:]
+
+    done = client.get(
+        "/api/v1/export/outcome_record.ndjson", headers={"Range": f"bytes={len(data)}-"},
+    )
+    assert done.status_code == 416
+    assert done.headers["content-range"] == f"bytes */{len(data)}"
+
+
+def test_export_is_gzipped_when_accepted(client, store):
+    _outcomes(store, 20)
+    response = client.get(
+        "/api/v1/export/outcome_record.ndjson", headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(_records(response)) == 20
+
+
+def test_export_rejects_unknown_type_and_fields(client):
+    assert client.get("/api/v1/export/widgets.ndjson").status_code == 404
+    response = client.get("/api/v1/export/outcome_record.ndjson?fields=idea_id,nope")
+    assert response.status_code == 400
+    assert "nope" in response.json()["detail"]
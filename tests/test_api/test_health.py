@@ -0,0 +1,94 @@
+"""Tests for the cached health check."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.health import HealthChecker
+from api.readers.academy_reader import AcademyReader
+from api.readers.um_reader import UMReader
+from contracts.store import ContractStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def sources(tmp_path, monkeypatch):
+    import api.deps as deps_module
+    personas = tmp_path / "personas"
+    (personas / "porter").mkdir(parents=True)
+    (personas / "porter" / "persona.yaml").write_text("identity:\n  name: Porter\n")
+    store = ContractStore(data_dir=tmp_path / "data")
+    academy = AcademyReader(personas_dir=personas)
+    monkeypatch.setattr(deps_module, "_store", store)
+    monkeypatch.setattr(deps_module, "_academy", academy)
+    monkeypatch.setattr(deps_module, "_um", UMReader(db_path=tmp_path / "nonexistent.db"))
+    return store, academy
+
+
+def test_cheap_checks_do_not_parse_data(sources, monkeypatch):
+    store, academy = sources
+
+    def boom(*args, **kwargs):
+        raise AssertionError("probe must not read contract or persona data")
+
+    monkeypatch.setattr(store, "read_outcomes", boom)
+    monkeypatch.setattr(academy, "list_agents", boom)
+
+    result = HealthChecker().check()
+    assert result.sources["contract_store"] == "ok"
+    assert result.sources["academy"] == "ok"
+    assert result.sources["ultra_magnus"] == "unavailable (db not found)"
+    assert result.status == "degraded"
+
+
+def test_result_cached_for_ttl(sources, monkeypatch):
+    store, _ = sources
+    clock = FakeClock()
+    checker = HealthChecker(ttl=5, clock=clock)
+    calls = []
+    original = store.ping
+    monkeypatch.setattr(store, "ping", lambda: calls.append(1) or original())
+
+    first = checker.check()
+    clock.now = 4.9
+    assert checker.check() is first
+    assert len(calls) == 1
+
+    clock.now = 5.0
+    assert checker.check() is not first
+    assert len(calls) == 2
+
+
+def test_deep_checks_fold_into_response(sources):
+    checker = HealthChecker(ttl=60)
+    assert checker.check().deep_checked_at is None
+
+    deep = checker.run_deep_checks()
+    assert deep["academy"] == "ok (1 personas)"
+    assert deep["contract_store"] == "ok"
+
+    # Deep results invalidate the cache and enrich healthy cheap results
+    result = checker.check()
+    assert result.sources["academy"] == "ok (1 personas)"
+    assert result.deep_checked_at is not None
+
+
+def test_failing_cheap_check_wins_over_deep(sources, tmp_path):
+    _store, academy = sources
+    checker = HealthChecker(ttl=0)
+    checker.run_deep_checks()
+    academy.personas_dir = tmp_path / "gone"
+    assert checker.check().sources["academy"] == "unavailable (personas dir not found)"
+
+
+def test_health_endpoint(sources):
+    from api.main import app
+    resp = TestClient(app).get("/api/v1/health")
+    assert resp.status_code == 200
+    assert resp.json()["sources"]["contract_store"] == "ok"
@@ -0,0 +1,93 @@
+"""Tests for the NDJSON ingest endpoint."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.readers.academy_reader import AcademyReader
+from api.readers.um_reader import UMReader
+from contracts.research_signal import ResearchSignal, SignalRelevance, SignalSource
+from contracts.store import ContractStore
+
+
+@pytest.fixture()
+def store(tmp_path):
+    return ContractStore(data_dir=tmp_path)
+
+
+@pytest.fixture()
+def client(store, tmp_path, monkeypatch):
+    import api.deps as deps_module
+    monkeypatch.setattr(deps_module, "_store", store)
+    monkeypatch.setattr(deps_module, "_academy", AcademyReader(personas_dir=tmp_path))
+    monkeypatch.setattr(deps_module, "_um", UMReader(db_path=tmp_path / "nonexistent.db"))
+    monkeypatch.setattr(deps_module, "WRITE_TOKEN", "secret")
+    from api.main import app
+    return TestClient(app, headers={"Authorization": "Bearer secret"})
+
+
+def _body(n: int) -> bytes:
+    return "".join(
+        ResearchSignal(
+            signal_id=f"sig-{i}", source=SignalSource.ARXIV_HF, title=f"Signal {i}",
+            summary="Summary", relevance=SignalRelevance.MEDIUM,
+        ).model_dump_json() + "\n"
+        for i in range(n)
+    ).encode()
+
+
+def test_ingest_batch(client, store):
+    body = _body(3) + b'{"signal_id": "broken"}\n'
+    response = client.post(
+        "/api/v1/ingest/research_signal", content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["received"], data["written"], data["duplicates"]) == (4, 3, 0)
+    assert data["errors"][0]["line"] == 4
+    assert len(store.query_signals()) == 3
+
+    again = client.post("/api/v1/ingest/research_signal", content=_body(3)).json()
+    assert (again["written"], again["duplicates"]) == (0, 3)
+
+
+def test_ingest_rejects_unknown_type_and_oversized_batches(client, monkeypatch):
+    assert client.post("/api/v1/ingest/widgets", content=b"{}\n").status_code == 404
+
+    import api.routers.ingest as ingest_router
+    monkeypatch.setattr(ingest_router, "INGEST_MAX_BYTES", 10)
+    assert client.post("/api/v1/ingest/research_signal", content=_body(1)).status_code == 413
+
+
+def test_ingest_requires_configured_token(client, monkeypatch):
+    url = "/api/v1/ingest/research_signal"
+    assert client.post(url, content=_body(1), headers={"Authorization": "Bearer nope"}).status_code == 401
+    assert client.post(url, content=_body(1), headers={"Authorization": ""}).status_code == 401
+
+    import api.deps as deps_module
+    monkeypatch.setattr(deps_module, "WRITE_TOKEN", "")
+    assert client.post(url, content=_body(1)).status_code == 403
+
+
+def test_ingest_rejects_malformed_content_length(client):
+    response = client.post(
+        "/api/v1/ingest/research_signal", content=_body(1), headers={"Content-Length": "ten"},
+    )
+    assert response.status_code == 400
+
+
+def test_ingest_counts_records_the_store_skipped_as_duplicates(client, store, monkeypatch):
+    client.post("/api/v1/ingest/research_signal", content=_body(2))
+    # Miss the pre-check, as if another writer stored the records meanwhile
+    real_stored_digests = store.stored_digests
+    calls = []
+
+    def stored_digests(contract_type, keys):
+        calls.append(keys)
+        return {} if len(calls) == 1 else real_stored_digests(contract_type, keys)
+
+    monkeypatch.setattr(store, "stored_digests", stored_digests)
+    store._known_keys.clear()
+
+    data = client.post("/api/v1/ingest/research_signal", content=_body(3)).json()
+    assert (data["written"], data["duplicates"]) == (1, 2)
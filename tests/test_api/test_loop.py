@@ -0,0 +1,54 @@
+"""Tests for the loop telemetry endpoint."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from contracts.loop_run import LoopSpan
+from contracts.store import ContractStore
+
+
+@pytest.fixture()
+def store(tmp_path):
+    return ContractStore(data_dir=tmp_path)
+
+
+@pytest.fixture()
+def client(store, monkeypatch):
+    import api.deps as deps_module
+    monkeypatch.setattr(deps_module, "_store", store)
+    from api.main import app
+    return TestClient(app)
+
+
+def test_runs_empty(client):
+    resp = client.get("/api/v1/loop/runs")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["runs"] == []
+    assert data["stages"] == []
+
+
+def test_runs_percentiles(client, store):
+    now = datetime.now()
+    for i, duration in enumerate([1.0, 2.0, 10.0]):
+        store.write_span(LoopSpan(
+            run_id=f"run-{i}", stage="run_loop.sky_lynx",
+            started_at=now - timedelta(days=7 * i), duration_seconds=duration,
+            input_tokens=100,
+        ))
+    store.write_span(LoopSpan(
+        run_id="ancient", stage="run_loop.sky_lynx",
+        started_at=now - timedelta(weeks=60), duration_seconds=99.0,
+    ))
+
+    data = client.get("/api/v1/loop/runs?weeks=4").json()
+    assert [r["run_id"] for r in data["runs"]] == ["run-0", "run-1", "run-2"]
+    (stage,) = data["stages"]
+    assert stage["stage"] == "run_loop.sky_lynx"
+    assert stage["count"] == 3
+    assert stage["p50_seconds"] == 2.0
+    assert stage["p95_seconds"] == 10.0
+    assert stage["input_tokens"] == 300
+    assert len(data["weekly"]) == 3
@@ -0,0 +1,123 @@
+"""Tests for the /metrics endpoint and metric primitives."""
+
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import metrics
+from api.readers.um_reader import UMReader
+from contracts.store import ContractStore
+
+
+@pytest.fixture()
+def store(tmp_path):
+    return metrics.instrument(ContractStore(data_dir=tmp_path), "contract_store")
+
+
+@pytest.fixture()
+def client(store, tmp_path, monkeypatch):
+    import api.deps as deps_module
+    monkeypatch.setattr(deps_module, "_store", store)
+    from api.readers.academy_reader import AcademyReader
+    monkeypatch.setattr(deps_module, "_academy", AcademyReader(personas_dir=tmp_path))
+    monkeypatch.setattr(deps_module, "_um", UMReader(db_path=tmp_path / "nonexistent.db"))
+    from api.main import app
+    return TestClient(app)
+
+
+def _sample(text: str, prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_route_latency_uses_route_template(client):
+    label = (
+        'snowtown_http_request_duration_seconds_count'
+        '{method="GET",route="/api/v1/nodes/{node_id}"}'
+    )
+    before = _sample(client.get("/metrics").text, label)
+
+    client.get("/api/v1/nodes/ultra_magnus")
+    client.get("/api/v1/nodes/sky_lynx")
+    client.get("/no/such/route")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+    assert _sample(body, label) == before + 2
+    assert "# TYPE snowtown_http_request_duration_seconds histogram" in body
+    assert 'route="unmatched"' in body
+    assert 'status="404"' in body
+    # The scrape itself is in flight while the body is rendered
+    assert _sample(body, "snowtown_http_requests_in_flight") == 1
+
+
+def test_store_queries_are_timed(client):
+    label = (
+        'snowtown_query_duration_seconds_count'
+        '{source="contract_store",operation="collect_loop_status"}'
+    )
+    before = _sample(client.get("/metrics").text, label)
+    client.get("/api/v1/ecosystem")
+    client.get("/api/v1/activity")
+    body = client.get("/metrics").text
+    assert _sample(body, label) == before + 1
+    assert 'snowtown_query_rows_total{source="contract_store",operation="query_outcomes"}' in body
+
+
+def test_instrument_counts_rows_and_is_idempotent(tmp_path):
+    store = ContractStore(data_dir=tmp_path)
+    metrics.instrument(store, "test_source")
+    metrics.instrument(store, "test_source")
+    store.query_patches()
+    assert metrics.QUERY_LATENCY.count(source="test_source", operation="query_patches") == 1
+    assert metrics.QUERY_ROWS.value(source="test_source", operation="query_patches") == 0
+
+
+def test_instrument_leaves_read_transaction_alone(tmp_path):
+    store = metrics.instrument(ContractStore(data_dir=tmp_path), "test_tx")
+    assert "read_transaction" not in vars(store)
+    with store.read_transaction():
+        store.query_patches()
+    assert metrics.QUERY_LATENCY.count(source="test_tx", operation="read_transaction") == 0
+
+
+def test_um_reader_cache_hit_ratio(tmp_path, monkeypatch):
+    import api.deps as deps_module
+    db_path = tmp_path / "caught_ideas.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(
+        "CREATE TABLE caught_ideas "
+        "(id INTEGER PRIMARY KEY, title TEXT, status TEXT, caught_at TEXT, tags TEXT)"
+    )
+    conn.commit()
+    conn.close()
+
+    hits = metrics.CACHE_REQUESTS.value(cache="um_pipeline_columns", result="hit")
+    misses = metrics.CACHE_REQUESTS.value(cache="um_pipeline_columns", result="miss")
+    monkeypatch.setattr(deps_module, "UM_DB_PATH", db_path)
+    monkeypatch.setattr(deps_module, "_um", None)
+    reader = deps_module.get_um()
+    reader.list_ideas()
+    reader.list_ideas()
+    reader.count_by_stage()
+    assert metrics.CACHE_REQUESTS.value(cache="um_pipeline_columns", result="miss") == misses + 1
+    assert metrics.CACHE_REQUESTS.value(cache="um_pipeline_columns", result="hit") == hits + 2
+    assert 'snowtown_cache_hit_ratio{cache="um_pipeline_columns"}' in metrics.REGISTRY.render()
+
+
+def test_histogram_rendering():
+    hist = metrics.Histogram("t_seconds", "Test.", ("op",), buckets=(0.1, 1.0))
+    hist.observe(0.05, op="a")
+    hist.observe(0.5, op="a")
+    hist.observe(5, op="a")
+    lines = hist.render()
+    assert 't_seconds_bucket{op="a",le="0.1"} 1' in lines
+    assert 't_seconds_bucket{op="a",le="1"} 2' in lines
+    assert 't_seconds_bucket{op="a",le="+Inf"} 3' in lines
+    assert 't_seconds_sum{op="a"} 5.55' in lines
+    assert 't_seconds_count{op="a"} 3' in lines
@@ -0,0 +1,71 @@
+"""Tests for the outcome analytics endpoints."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.readers.academy_reader import AcademyReader
+from api.readers.um_reader import UMReader
+from contracts.outcome_record import OutcomeRecord, TerminalOutcome
+from contracts.store import ContractStore
+
+
+@pytest.fixture()
+def store(tmp_path):
+    return ContractStore(data_dir=tmp_path)
+
+
+@pytest.fixture()
+def client(store, tmp_path, monkeypatch):
+    import api.deps as deps_module
+    monkeypatch.setattr(deps_module, "_store", store)
+    monkeypatch.setattr(deps_module, "_academy", AcademyReader(personas_dir=tmp_path))
+    monkeypatch.setattr(deps_module, "_um", UMReader(db_path=tmp_path / "nonexistent.db"))
+    from api.main import app
+    return TestClient(app)
+
+
+def _outcomes(store):
+    now = datetime.now()
+    for i, (outcome, score) in enumerate([
+        (TerminalOutcome.PUBLISHED, 90.0), (TerminalOutcome.PUBLISHED, 70.0),
+        (TerminalOutcome.REJECTED, 30.0), (TerminalOutcome.PUBLISHED, 50.0),
+    ]):
+        store.write_outcome(OutcomeRecord(
+            idea_id=i, idea_title=f"Idea {i}", outcome=outcome, overall_score=score,
+            tags=["agents"] if i % 2 else ["vision"],
+            emitted_at=now - timedelta(days=60 if i == 3 else i),
+        ))
+
+
+def test_stats_groups_and_histogram(client, store):
+    _outcomes(store)
+    body = client.get("/api/v1/outcomes/stats", params={"bins": 2}).json()
+    assert body["total"] == 4
+    assert [(g["key"], g["count"], g["mean"]) for g in body["groups"]] == [
+        ("published", 3, 70.0), ("rejected", 1, 30.0),
+    ]
+    assert body["groups"][0]["share"] == 0.75
+    assert body["histogram"]["counts"] == [2, 2]
+
+
+def test_stats_window_and_filters(client, store):
+    _outcomes(store)
+    body = client.get(
+        "/api/v1/outcomes/stats",
+        params={"days": 30, "outcome": "published", "group_by": "tags"},
+    ).json()
+    assert body["total"] == 2
+    assert {g["key"]: g["count"] for g in body["groups"]} == {"agents": 1, "vision": 1}
+
+    # New outcomes are picked up on the next request
+    store.write_outcome(OutcomeRecord(
+        idea_id=9, idea_title="Late", outcome=TerminalOutcome.PUBLISHED, overall_score=10.0,
+    ))
+    assert client.get("/api/v1/outcomes/stats").json()["total"] == 5
+
+
+def test_stats_rejects_unknown_keys(client):
+    assert client.get("/api/v1/outcomes/stats?group_by=idea_title").status_code == 400
+    assert client.get("/api/v1/outcomes/stats?value=idea_id").status_code == 400
@@ -0,0 +1,83 @@
+"""Tests for the fast JSON rendering path and response compression."""
+
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import rendering
+from api.models.responses import ActivityEvent
+from api.readers.academy_reader import AcademyReader
+from api.readers.um_reader import UMReader
+from contracts.research_signal import ResearchSignal, SignalRelevance, SignalSource
+from contracts.store import ContractStore
+
+
+@pytest.fixture()
+def store(tmp_path):
+    return ContractStore(data_dir=tmp_path)
+
+
+@pytest.fixture()
+def client(store, tmp_path, monkeypatch):
+    import api.deps as deps_module
+    monkeypatch.setattr(deps_module, "_store", store)
+    monkeypatch.setattr(deps_module, "_academy", AcademyReader(personas_dir=tmp_path))
+    monkeypatch.setattr(deps_module, "_um", UMReader(db_path=tmp_path / "nonexistent.db"))
+    from api.main import app
+    return TestClient(app)
+
+
+def _signals(store, n):
+    for i in range(n):
+        store.write_signal(ResearchSignal(
+            signal_id=f"sig-{i:03d}", source=SignalSource.ARXIV_HF,
+            title=f"Signal {i}", summary="A long enough summary " * 4,
+            relevance=SignalRelevance.HIGH, tags=["ai", "agents"],
+            raw_data={"big": "x" * 50}, emitted_at=datetime(2026, 2, 1, 12, 0, i % 60, 123456),
+        ))
+
+
+def test_signals_shape_unchanged(client, store):
+    _signals(store, 3)
+    data = client.get("/api/v1/research/signals").json()
+    assert len(data) == 3
+    assert list(data[0]) == [
+        "signal_id", "source", "title", "summary", "url", "relevance",
+        "relevance_rationale", "tags", "domain", "consumed_by", "emitted_at",
+    ]
+    first = next(d for d in data if d["signal_id"] == "sig-000")
+    assert first["source"] == "arxiv_hf"
+    assert first["emitted_at"] == datetime(2026, 2, 1, 12, 0, 0, 123456).isoformat()
+
+
+def test_large_responses_are_gzipped(client, store):
+    _signals(store, 40)
+    resp = client.get("/api/v1/research/signals", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert len(resp.json()) == 40
+    # Validators survive compression
+    assert resp.headers["etag"]
+
+    small = client.get("/api/v1/pipeline/stages", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+def test_model_response_matches_model_dump():
+    events = [ActivityEvent(
+        event_type="outcome", id="1", title="Idea", status="published",
+        node_id="ultra_magnus", timestamp=datetime(2026, 2, 1), detail={"score": 7.5},
+    )]
+    resp = rendering.model_response(events, list[ActivityEvent])
+    assert json.loads(resp.body) == [events[0].model_dump(mode="json")]
+    with pytest.raises(ValueError):
+        rendering.model_response(events)
+
+
+def test_stdlib_fallback_matches_orjson(monkeypatch):
+    content = {"a": [1, 2.5, None], "when": datetime(2026, 2, 1, 3, 4, 5), 7: "int key", "ü": "é"}
+    fast = rendering.dumps(content)
+    monkeypatch.setattr(rendering, "orjson", None)
+    slow = rendering.dumps(content)
+    assert json.loads(fast) == json.loads(slow)
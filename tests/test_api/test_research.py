@@ -0,0 +1,182 @@
+"""Tests for the research API endpoints."""
+
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.readers.academy_reader import AcademyReader
+from api.readers.um_reader import UMReader
+from contracts.research_signal import ResearchSignal, SignalRelevance, SignalSource
+from contracts.store import ContractStore
+
+
+@pytest.fixture()
+def store(tmp_path):
+    return ContractStore(data_dir=tmp_path)
+
+
+@pytest.fixture()
+def client(store, tmp_path, monkeypatch):
+    import api.deps as deps_module
+    monkeypatch.setattr(deps_module, "_store", store)
+    monkeypatch.setattr(deps_module, "_academy", AcademyReader(personas_dir=tmp_path))
+    monkeypatch.setattr(deps_module, "_um", UMReader(db_path=tmp_path / "nonexistent.db"))
+    monkeypatch.setattr(deps_module, "WRITE_TOKEN", "secret")
+    from api.main import app
+    return TestClient(app, headers={"Authorization": "Bearer secret"})
+
+
+def test_search_paginates_ranked_hits(client, store):
+    for i in range(5):
+        store.write_signal(ResearchSignal(
+            signal_id=f"sig-{i}", source=SignalSource.TOOL_MONITOR,
+            title=f"MCP server {i}" if i < 3 else f"Other {i}",
+            summary="Tooling for MCP " * (i + 1), relevance=SignalRelevance.MEDIUM,
+            raw_data={"html": "..."},
+        ))
+
+    page = client.get("/api/v1/research/search", params={"q": "mcp", "limit": 2}).json()
+    assert page["total"] == 5
+    assert len(page["results"]) == 2
+    hit = page["results"][0]
+    assert "<mark>" in hit["snippet"]
+    assert "raw_data" not in hit["signal"]
+    scores = [r["score"] for r in page["results"]]
+    assert scores == sorted(scores, reverse=True)
+
+    rest = client.get("/api/v1/research/search", params={"q": "mcp", "limit": 2, "offset": 4}).json()
+    assert len(rest["results"]) == 1
+    seen = {r["signal"]["signal_id"] for r in page["results"] + rest["results"]}
+    assert len(seen) == 3
+
+
+def test_search_rejects_unsearchable_query(client):
+    assert client.get("/api/v1/research/search", params={"q": "***"}).status_code == 400
+    assert client.get("/api/v1/research/search").status_code == 422
+
+
+def test_collapse_duplicates_and_duplicates_endpoint(client, store):
+    summary = "Agents that write their own tools, evaluated on forty coding benchmarks. " * 2
+    for signal_id, source in (("a", SignalSource.ARXIV_HF), ("b", SignalSource.DOMAIN_WATCH)):
+        store.write_signal(ResearchSignal(
+            signal_id=signal_id, source=source, title="Self-tooling agents",
+            summary=summary, relevance=SignalRelevance.HIGH,
+        ))
+
+    assert len(client.get("/api/v1/research/signals").json()) == 2
+    collapsed = client.get("/api/v1/research/signals", params={"collapse_duplicates": True}).json()
+    assert [s["signal_id"] for s in collapsed] == ["a"]
+    assert client.get("/api/v1/research/summary?collapse_duplicates=true").json()["total"] == 1
+
+    dupes = client.get("/api/v1/research/signals/b/duplicates").json()
+    assert dupes["canonical_signal_id"] == "a"
+    assert [d["signal_id"] for d in dupes["duplicates"]] == ["b"]
+
+
+def _write_persona(personas_dir, persona_id, role, background, frameworks):
+    import yaml
+    (personas_dir / persona_id).mkdir(parents=True)
+    (personas_dir / persona_id / "persona.yaml").write_text(yaml.safe_dump({
+        "identity": {"name": persona_id, "role": role, "background": background},
+        "frameworks": {name: {"description": ""} for name in frameworks},
+        "metadata": {"category": "test", "tags": []},
+    }))
+
+
+def _write_tfidf_signals(store):
+    texts = {
+        "agents": ("Agent tool orchestration", "Planning agents that call MCP tools"),
+        "pricing": ("Dynamic pricing markets", "Revenue and pricing strategy in markets"),
+    }
+    for topic, (title, summary) in texts.items():
+        for i in range(3):
+            store.write_signal(ResearchSignal(
+                signal_id=f"{topic}-{i}", source=SignalSource.ARXIV_HF, title=title,
+                summary=f"{summary} variant {i}", relevance=SignalRelevance.MEDIUM,
+                domain=topic,
+            ))
+
+
+def test_ranked_signals_for_persona(client, store, tmp_path):
+    _write_persona(tmp_path, "strategist", "Pricing strategist", "Markets and revenue.",
+                   ["pricing_power"])
+    _write_tfidf_signals(store)
+    store.update_signal_consumed_by("pricing-0", "sky-lynx")
+
+    body = client.get("/api/v1/research/ranked", params={"persona": "strategist"}).json()
+    ids = [r["signal"]["signal_id"] for r in body["results"]]
+    assert ids[:2] and all(sid.startswith("pricing-") for sid in ids[:2])
+    assert "pricing-0" not in ids
+    assert "pricing" in body["results"][0]["matched_terms"]
+    assert "raw_data" not in body["results"][0]["signal"]
+    assert body["candidates"] == 5
+
+    with_consumed = client.get(
+        "/api/v1/research/ranked", params={"persona": "strategist", "include_consumed": True},
+    ).json()
+    assert with_consumed["candidates"] == 6
+
+    # No persona: every persona's vocabulary, here blended with the domain's
+    by_domain = client.get("/api/v1/research/ranked", params={"domain": "agents"}).json()
+    assert {r["signal"]["signal_id"] for r in by_domain["results"][:3]} == {
+        "agents-0", "agents-1", "agents-2",
+    }
+    # Too few signals for a batch save: the cache is written on shutdown
+    assert not (tmp_path / "signal_tfidf.npz").exists()
+    import api.deps as deps_module
+    deps_module.shutdown()
+    assert (tmp_path / "signal_tfidf.npz").exists()
+
+
+def test_ranked_signals_errors(client, store):
+    _write_tfidf_signals(store)
+    assert client.get("/api/v1/research/ranked", params={"persona": "nobody"}).status_code == 404
+    assert client.get("/api/v1/research/ranked", params={"q": "zebra"}).status_code == 400
+
+
+def test_topics(client, store):
+    _write_tfidf_signals(store)
+    body = client.get("/api/v1/research/topics", params={"k": 2, "per_topic": 2}).json()
+    assert body["signal_count"] == 6
+    assert sorted(t["size"] for t in body["topics"]) == [3, 3]
+    for topic in body["topics"]:
+        assert len(topic["signal_ids"]) == len(topic["titles"]) == 2
+        assert len({sid.split("-")[0] for sid in topic["signal_ids"]}) == 1
+
+    store.write_signal(ResearchSignal(
+        signal_id="agents-new", source=SignalSource.TOOL_MONITOR, title="Agent tool memory",
+        summary="Agents", relevance=SignalRelevance.LOW,
+    ))
+    assert client.get("/api/v1/research/topics").json()["signal_count"] == 7
+
+
+def test_claim_ack_release(client, store):
+    for i in range(3):
+        store.write_signal(ResearchSignal(
+            signal_id=f"sig-{i}", source=SignalSource.ARXIV_HF, title=f"Paper {i}",
+            summary="...", relevance=SignalRelevance.HIGH, raw_data={"html": "..."},
+            emitted_at=datetime(2026, 2, 1 + i),
+        ))
+
+    claim = client.post("/api/v1/research/claims", json={"consumer": "ideaforge", "limit": 2})
+    assert claim.status_code == 200
+    body = claim.json()
+    assert [s["signal_id"] for s in body["signals"]] == ["sig-0", "sig-1"]
+    assert "raw_data" not in body["signals"][0]
+    assert "etag" not in claim.headers
+
+    ack = client.post(
+        "/api/v1/research/claims/ack", json={"consumer": "ideaforge", "signal_ids": ["sig-0"]},
+    ).json()
+    assert ack["acked"] == ["sig-0"]
+    released = client.post("/api/v1/research/claims/release", json={"consumer": "ideaforge"})
+    assert released.json()["released"] == 1
+
+    other = client.post("/api/v1/research/claims", json={"consumer": "sky-lynx"}).json()
+    assert [s["signal_id"] for s in other["signals"]] == ["sig-1", "sig-2"]
+    assert client.post("/api/v1/research/claims", json={"consumer": ""}).status_code == 422
+    unauthorized = client.post(
+        "/api/v1/research/claims", json={"consumer": "x"}, headers={"Authorization": ""},
+    )
+    assert unauthorized.status_code == 401
@@ -0,0 +1,119 @@
+"""Tests for NDJSON batch ingest."""
+
+from datetime import datetime
+
+import pytest
+
+from contracts.ingest import ingest_ndjson, shutdown_pool, validate_lines
+from contracts.outcome_record import OutcomeRecord, TerminalOutcome
+from contracts.research_signal import ResearchSignal, SignalRelevance, SignalSource
+from contracts.store import ContractStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ContractStore(data_dir=tmp_path)
+    yield s
+    s.close()
+
+
+def _signal(i: int) -> ResearchSignal:
+    return ResearchSignal(
+        signal_id=f"sig-{i:04d}", source=SignalSource.TOOL_MONITOR,
+        title=f"Signal {i}", summary="Summary", relevance=SignalRelevance.LOW,
+    )
+
+
+def _ndjson(*lines) -> bytes:
+    return "".join(
+        (line if isinstance(line, str) else line.model_dump_json()) + "\n" for line in lines
+    ).encode()
+
+
+def test_ingest_writes_valid_lines_and_reports_errors(store):
+    body = _ndjson(_signal(1), '{"signal_id": "bad"}', "", "not json", _signal(2))
+    result = ingest_ndjson(store, "research_signal", body, workers=1)
+
+    assert result.received == 4
+    assert result.written == 2
+    assert [e.line for e in result.errors] == [2, 4]
+    assert "title" in result.errors[0].error
+    assert {s.signal_id for s in store.query_signals()} == {"sig-0001", "sig-0002"}
+    assert len(store.read_signals()) == 2
+
+
+def test_ingest_upcasts_older_contract_versions(store):
+    body = _ndjson(
+        '{"contract_version": "1.0.0", "idea_id": 3, "idea_title": "Old", "outcome": "published"}'
+    )
+    result = ingest_ndjson(store, "outcome_record", body, workers=1)
+
+    assert result.written == 1
+    [record] = store.read_outcomes()
+    assert record.contract_version == "1.1.0"
+    assert '"contract_version":"1.1.0"' in store._jsonl_path("outcome_record").read_text()
+
+
+def test_ingest_reports_migration_failures_per_line(store, monkeypatch):
+    from contracts import migrations
+
+    def broken(record):
+        raise KeyError("idea_type")
+
+    monkeypatch.setitem(
+        migrations._MIGRATORS, "outcome_record", {"1.0.0": ("1.1.0", broken)},
+    )
+    migrations.chain.cache_clear()
+    current = OutcomeRecord(idea_id=4, idea_title="New", outcome=TerminalOutcome.PUBLISHED)
+    body = _ndjson(
+        '{"contract_version": "1.0.0", "idea_id": 3, "idea_title": "Old", "outcome": "published"}',
+        current,
+    )
+    result = ingest_ndjson(store, "outcome_record", body, workers=1)
+    migrations.chain.cache_clear()
+
+    assert result.written == 1
+    assert [(e.line, e.error) for e in result.errors] == [(1, "KeyError: 'idea_type'")]
+
+
+def test_ingest_dedupes_within_batch_and_against_store(store):
+    store.write_signal(_signal(1))
+    result = ingest_ndjson(
+        store, "research_signal", _ndjson(_signal(1), _signal(2), _signal(2)), workers=1,
+    )
+    assert result.written == 1
+    assert result.duplicates == 2
+    assert result.duplicate_lines == [1, 3]
+    assert len(store.read_signals()) == 2
+
+
+def test_ingest_keeps_the_last_rewrite_of_a_record(store):
+    store.write_signal(_signal(1))
+    rewrite = _signal(1).model_copy(update={"title": "Rewritten"})
+    result = ingest_ndjson(
+        store, "research_signal", _ndjson(rewrite.model_copy(update={"title": "Draft"}), rewrite),
+        workers=1,
+    )
+    assert (result.written, result.duplicate_lines) == (1, [1])
+    assert store.get_signals(["sig-0001"])[0].title == "Rewritten"
+
+
+def test_outcome_natural_key_allows_new_terminal_states(store):
+    when = datetime(2026, 3, 1, 12, 0)
+    deferred = OutcomeRecord(idea_id=7, idea_title="X", outcome=TerminalOutcome.DEFERRED, emitted_at=when)
+    store.write_outcome(deferred)
+    published = deferred.model_copy(update={"outcome": TerminalOutcome.PUBLISHED})
+
+    result = ingest_ndjson(store, "outcome_record", _ndjson(deferred, published), workers=1)
+    assert (result.written, result.duplicate_lines) == (1, [1])
+
+
+def test_process_pool_validation_preserves_line_order():
+    body = _ndjson(*[_signal(i) for i in range(1200)], '{"oops": 1}')
+    try:
+        results = validate_lines("research_signal", body, workers=2, parallel_min_lines=1)
+    finally:
+        shutdown_pool()
+    assert [line_no for line_no, _ in results] == list(range(1, 1202))
+    assert results[0][1].signal_id == "sig-0000"
+    assert isinstance(results[-1][1], str)
@@ -0,0 +1,217 @@
+"""Tests for the LoopStatus aggregate engine."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from contracts.improvement_recommendation import (
+    ImprovementRecommendation,
+    RecommendationType,
+)
+from contracts.loop_status import LoopStatusWatcher, collect_loop_status
+from contracts.outcome_record import OutcomeRecord, TerminalOutcome
+from contracts.persona_upgrade_patch import (
+    PatchOperation,
+    PersonaFieldPatch,
+    PersonaUpgradePatch,
+)
+from contracts.research_signal import ResearchSignal, SignalRelevance, SignalSource
+from contracts.store import ContractStore
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ContractStore(data_dir=tmp_path, db_path=tmp_path / "test.db")
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def populated(store):
+    for i, outcome in enumerate([TerminalOutcome.PUBLISHED, TerminalOutcome.PUBLISHED,
+                                 TerminalOutcome.REJECTED]):
+        store.write_outcome(OutcomeRecord(
+            idea_id=i, idea_title=f"Idea {i}", outcome=outcome,
+            emitted_at=NOW - timedelta(days=i * 5),
+        ))
+    for i, target in enumerate(["persona", "persona", "claude_md", "pipeline"]):
+        store.write_recommendation(ImprovementRecommendation(
+            recommendation_id=f"rec-{i}",
+            recommendation_type=RecommendationType.VOICE_ADJUSTMENT,
+            target_system=target, title="A", description="A", suggested_change="A",
+            emitted_at=NOW - timedelta(days=10 - i),
+        ))
+    store.update_recommendation_status("rec-0", "applied")
+    for i in range(3):
+        store.write_patch(PersonaUpgradePatch(
+            patch_id=f"p{i}", persona_id="christensen",
+            patches=[PersonaFieldPatch(operation=PatchOperation.ADD, path="/t", value="a")],
+            rationale="Test", source_recommendation_ids=["rec-0"],
+            emitted_at=NOW - timedelta(days=3 - i),
+        ))
+    store.update_patch_status("p0", "applied")
+    store.update_patch_status("p1", "applied")
+    store.update_patch_status("p2", "rejected")
+    store.write_signal(ResearchSignal(
+        signal_id="s1", source=SignalSource.ARXIV_HF, title="T", summary="S",
+        relevance=SignalRelevance.HIGH, emitted_at=NOW - timedelta(hours=2),
+    ))
+    return store
+
+
+def test_empty_store(store):
+    status = collect_loop_status(store, now=NOW)
+    assert status.outcomes.total == 0
+    assert status.loop_health == "idle"
+    assert status.completed_cycles == 0
+    assert "No outcome records" in status.health_message
+
+
+def test_counts_match_query_layer(populated):
+    status = collect_loop_status(populated, now=NOW)
+
+    assert status.outcomes.total == 3
+    assert status.outcomes.recent_count == 2
+    assert status.outcomes_by_type == {"published": 2, "rejected": 1}
+
+    assert status.recommendations.total == 4
+    assert status.recommendations_by_status == {"applied": 1, "pending": 3}
+    assert status.pending_recommendations_by_target == {
+        "persona": 1, "claude_md": 1, "pipeline": 1,
+    }
+    assert status.oldest_pending_recommendation_at == NOW - timedelta(days=9)
+
+    assert status.patches_by_status == {"applied": 2, "rejected": 1}
+    assert status.oldest_proposed_patch_at is None
+    assert status.patches.last_emitted_at == NOW - timedelta(days=1)
+
+    assert status.signals_by_source == {"arxiv_hf": 1}
+    assert status.signals_by_relevance == {"high": 1}
+
+    # Two applied patches for the same recommendation close one cycle
+    assert status.completed_cycles == 1
+    assert status.loop_health == "flowing"
+
+
+def test_renderers(populated):
+    status = collect_loop_status(populated, now=NOW)
+
+    text = status.render_text()
+    assert "Outcome Records:           3" in text
+    assert "Completed Feedback Cycles: 1" in text
+
+    prom = status.render_prometheus()
+    assert "# TYPE snowtown_records gauge" in prom
+    assert 'snowtown_records{contract="outcome_record"} 3' in prom
+    assert 'snowtown_patches{status="applied"} 2' in prom
+    assert "snowtown_completed_cycles 1" in prom
+    ts = (NOW - timedelta(hours=2)).timestamp()
+    assert f'snowtown_last_emitted_timestamp_seconds{{contract="research_signal"}} {int(ts)}' in prom
+
+    assert '"completed_cycles":1' in status.model_dump_json()
+
+
+def test_single_read_transaction(populated):
+    conn = populated._get_conn()
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    collect_loop_status(populated, now=NOW)
+    conn.set_trace_callback(None)
+
+    assert statements[0] == "BEGIN"
+    assert statements[-1] == "COMMIT"
+    assert sum(1 for s in statements if s.lstrip().startswith("SELECT")) == 5
+
+
+class TestLoopStatusWatcher:
+
+    def _equivalent(self, watched, fresh):
+        fields = {"generated_at", "outcomes", "recommendations", "patches", "signals"}
+        assert watched.model_dump(exclude=fields) == fresh.model_dump(exclude=fields)
+        for name in ("outcomes", "recommendations", "patches", "signals"):
+            assert getattr(watched, name).total == getattr(fresh, name).total
+            assert getattr(watched, name).last_emitted_at == getattr(fresh, name).last_emitted_at
+
+    def test_follows_new_records_and_transitions(self, populated):
+        watcher = LoopStatusWatcher(populated)
+        self._equivalent(watcher.status, collect_loop_status(populated))
+        assert not watcher.poll()
+
+        populated.write_outcome(OutcomeRecord(
+            idea_id=9, idea_title="New", outcome=TerminalOutcome.DEFERRED, emitted_at=NOW,
+        ))
+        populated.write_patch(PersonaUpgradePatch(
+            patch_id="p9", persona_id="porter",
+            patches=[PersonaFieldPatch(operation=PatchOperation.ADD, path="/t", value="a")],
+            rationale="New", source_recommendation_ids=["rec-1"], emitted_at=NOW,
+        ))
+        assert watcher.poll()
+        assert watcher.status.outcomes_by_type["deferred"] == 1
+        assert watcher.status.oldest_proposed_patch_at == NOW
+
+        populated.update_patch_status("p9", "applied")
+        populated.update_recommendation_status("rec-1", "applied")
+        populated.update_patch_status("p0", "rejected")
+        assert watcher.poll()
+
+        status = watcher.status
+        assert status.completed_cycles == 2
+        assert status.oldest_proposed_patch_at is None
+        self._equivalent(status, collect_loop_status(populated))
+
+    def test_does_not_requery_history(self, populated):
+        watcher = LoopStatusWatcher(populated)
+        populated.update_recommendation_status("rec-2", "rejected")
+
+        conn = populated._get_conn()
+        statements: list[str] = []
+        conn.set_trace_callback(statements.append)
+        watcher.poll()
+        conn.set_trace_callback(None)
+
+        assert all("status_events" in s for s in statements)
+        assert watcher.status.pending_recommendations_by_target == {"persona": 1, "pipeline": 1}
+
+    def test_reload_reads_in_one_transaction(self, populated):
+        watcher = LoopStatusWatcher(populated)
+        conn = populated._get_conn()
+        statements: list[str] = []
+        conn.set_trace_callback(statements.append)
+        watcher.reload()
+        conn.set_trace_callback(None)
+
+        assert statements[0] == "BEGIN"
+        assert statements[-1] == "COMMIT"
+        assert statements.count("BEGIN") == 1
+
+    def test_repending_keeps_the_emitted_at(self, populated):
+        watcher = LoopStatusWatcher(populated)
+        oldest = watcher.status.oldest_pending_recommendation_at
+        pending = dict(watcher._pending_recs)
+        rec_id = min(pending, key=pending.get)
+        populated.update_recommendation_status(rec_id, "rejected")
+        populated.update_recommendation_status(rec_id, "pending")
+        assert watcher.poll()
+        assert watcher.status.oldest_pending_recommendation_at == oldest
+        self._equivalent(watcher.status, collect_loop_status(populated))
+
+    def test_rewrite_triggers_reload(self, store):
+        outcome = OutcomeRecord(
+            idea_id=1, idea_title="One", outcome=TerminalOutcome.PUBLISHED, emitted_at=NOW,
+        )
+        store.write_outcome(outcome)
+        watcher = LoopStatusWatcher(store)
+        store.write_outcome(outcome.model_copy(update={"overall_score": 90}))
+        assert watcher.poll()
+        assert watcher.status.outcomes.total == 1
+        assert watcher.status.outcomes_by_type == {"published": 1}
+        self._equivalent(watcher.status, collect_loop_status(store))
+
+    def test_rebuild_triggers_reload(self, populated):
+        watcher = LoopStatusWatcher(populated)
+        populated.rebuild_sqlite()
+        assert watcher.poll()
+        self._equivalent(watcher.status, collect_loop_status(populated))
+        assert watcher.status.patches_by_status == {"proposed": 3}
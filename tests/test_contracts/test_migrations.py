@@ -0,0 +1,58 @@
+"""Tests for contract version upcasting."""
+
+import pytest
+from pydantic import ValidationError
+
+from contracts import migrations
+from contracts.store import load_record
+
+
+@pytest.fixture
+def widget_migrators(monkeypatch):
+    monkeypatch.setattr(migrations, "_MIGRATORS", {})
+    migrations.chain.cache_clear()
+
+    @migrations.migrator("widget", "1.0.0", "1.1.0")
+    def _add_size(record):
+        record["size"] = 1
+        return record
+
+    @migrations.migrator("widget", "1.1.0", "2.0.0")
+    def _rename_name(record):
+        record["title"] = record.pop("name")
+        return record
+
+    yield
+    migrations.chain.cache_clear()
+
+
+class TestUpcast:
+    def test_runs_the_chain_and_sets_versions(self, widget_migrators):
+        record = migrations.upcast(
+            "widget", {"contract_version": "1.0.0", "name": "A"}, "2.0.0",
+        )
+        assert record == {"contract_version": "2.0.0", "title": "A", "size": 1}
+        assert len(migrations.chain("widget", "1.1.0", "2.0.0")) == 1
+        assert migrations.chain("widget", "2.0.0", "2.0.0") == ()
+
+    def test_records_without_a_path_are_unchanged(self, widget_migrators):
+        newer = {"contract_version": "3.0.0", "name": "A"}
+        assert migrations.upcast("widget", dict(newer), "2.0.0") == newer
+        assert migrations.chain("gadget", "1.0.0", "2.0.0") is None
+
+
+class TestLoadRecord:
+    def test_current_and_legacy_outcomes(self):
+        legacy = load_record(
+            "outcome_record",
+            b'{"contract_version":"1.0.0","idea_id":1,"idea_title":"A","outcome":"published"}',
+        )
+        assert legacy.contract_version == "1.1.0"
+        current = load_record("outcome_record", legacy.model_dump_json())
+        assert current == legacy
+
+    def test_invalid_json_raises_validation_error(self):
+        with pytest.raises(ValidationError):
+            load_record("outcome_record", "{not json")
+        with pytest.raises(ValidationError):
+            load_record("outcome_record", "[1, 2]")
@@ -0,0 +1,119 @@
+"""Tests for near-duplicate research signal detection."""
+
+import random
+
+import pytest
+
+from contracts import near_duplicates
+from contracts.research_signal import ResearchSignal, SignalRelevance, SignalSource
+from contracts.store import ContractStore
+
+PAPER_TITLE = "Toolformer 2: Language Models Can Teach Themselves to Use MCP Servers"
+PAPER_SUMMARY = (
+    "We show that language models can learn to call Model Context Protocol servers "
+    "in a self-supervised way, requiring only a handful of demonstrations per tool. "
+    "The resulting agents outperform larger models on tool-use benchmarks."
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ContractStore(data_dir=tmp_path)
+    yield s
+    s.close()
+
+
+def _signal(signal_id, title, summary, source=SignalSource.ARXIV_HF):
+    return ResearchSignal(
+        signal_id=signal_id, source=source, title=title, summary=summary,
+        relevance=SignalRelevance.HIGH,
+    )
+
+
+def _random_text(rng, n):
+    return " ".join(f"w{rng.randrange(50_000)}" for _ in range(n))
+
+
+class TestMinHash:
+
+    def test_similar_texts_share_buckets_and_score_high(self):
+        a = near_duplicates.signature(near_duplicates.shingles(PAPER_TITLE, PAPER_SUMMARY))
+        b = near_duplicates.signature(near_duplicates.shingles(
+            PAPER_TITLE + " (HF daily paper)", PAPER_SUMMARY.replace("handful", "few"),
+        ))
+        c = near_duplicates.signature(near_duplicates.shingles(
+            "Diffusion policies for robot arms", "Robots learn manipulation from video.",
+        ))
+        assert near_duplicates.similarity(a, b) >= near_duplicates.DUPLICATE_THRESHOLD
+        assert near_duplicates.similarity(a, c) < 0.1
+        assert set(near_duplicates.band_buckets(a)) & set(near_duplicates.band_buckets(b))
+        assert not set(near_duplicates.band_buckets(a)) & set(near_duplicates.band_buckets(c))
+
+    def test_signature_round_trips(self):
+        sig = near_duplicates.signature(near_duplicates.shingles("a b c d", ""))
+        assert near_duplicates.unpack(near_duplicates.pack(sig)) == sig
+
+
+class TestStoreNearDuplicates:
+
+    def test_duplicates_link_to_first_stored_signal(self, store):
+        store.write_signal(_signal("arxiv-1", PAPER_TITLE, PAPER_SUMMARY))
+        store.write_signal(_signal(
+            "watch-1", PAPER_TITLE, PAPER_SUMMARY + " Code is available.", SignalSource.DOMAIN_WATCH,
+        ))
+        store.write_signal(_signal(
+            "idea-1", PAPER_TITLE.upper(), PAPER_SUMMARY, SignalSource.IDEA_MACHINE,
+        ))
+        store.write_signal(_signal("other", "Unrelated tool release", "A new CLI for notebooks."))
+
+        assert store.canonical_signal_id("arxiv-1") is None
+        assert store.canonical_signal_id("watch-1") == "arxiv-1"
+        assert store.canonical_signal_id("idea-1") == "arxiv-1"
+        assert store.canonical_signal_id("other") is None
+        assert {d for d, _ in store.signal_duplicates("arxiv-1")} == {"watch-1", "idea-1"}
+        assert store.signal_count() == 4
+        assert store.duplicate_clusters(5) == [("arxiv-1", PAPER_TITLE, 2)]
+
+        assert len(store.query_signals()) == 4
+        assert {s.signal_id for s in store.query_signals(collapse_duplicates=True)} == {
+            "arxiv-1", "other",
+        }
+        assert store.count_signal_matches("toolformer") == 3
+        assert store.count_signal_matches("toolformer", collapse_duplicates=True) == 1
+
+    def test_rewriting_canonical_does_not_link_to_itself(self, store):
+        store.write_signal(_signal("arxiv-1", PAPER_TITLE, PAPER_SUMMARY))
+        store.write_signal(_signal("watch-1", PAPER_TITLE, PAPER_SUMMARY))
+        store.write_signal(_signal("arxiv-1", PAPER_TITLE, PAPER_SUMMARY))
+        assert store.canonical_signal_id("arxiv-1") is None
+        assert store.canonical_signal_id("watch-1") == "arxiv-1"
+
+    def test_rebuild_and_backfill_recompute_links(self, store, tmp_path):
+        store.write_signal(_signal("arxiv-1", PAPER_TITLE, PAPER_SUMMARY))
+        store.write_signal(_signal("watch-1", PAPER_TITLE, PAPER_SUMMARY))
+
+        store.rebuild_sqlite()
+        assert store.canonical_signal_id("watch-1") == "arxiv-1"
+
+        conn = store._get_conn()
+        conn.executescript("DROP TABLE signal_minhash; DROP TABLE signal_lsh_buckets;")
+        store.close()
+        reopened = ContractStore(data_dir=tmp_path)
+        assert reopened.canonical_signal_id("watch-1") == "arxiv-1"
+        assert reopened.reindex_signal_duplicates() == 1
+        reopened.close()
+
+    def test_unrelated_history_yields_no_candidates(self, store):
+        rng = random.Random(7)
+        with store.transaction():
+            for i in range(300):
+                store.write_signal(_signal(f"s{i}", _random_text(rng, 8), _random_text(rng, 40)))
+
+        sig = near_duplicates.signature(near_duplicates.shingles(PAPER_TITLE, PAPER_SUMMARY))
+        buckets = near_duplicates.band_buckets(sig)
+        placeholders = ", ".join("?" * len(buckets))
+        hits = store._get_conn().execute(
+            f"SELECT COUNT(*) FROM signal_lsh_buckets WHERE bucket IN ({placeholders})", buckets,
+        ).fetchone()[0]
+        assert hits == 0
+        assert len(store.query_signals(collapse_duplicates=True, limit=1000)) == 300
@@ -0,0 +1,133 @@
+"""Tests for the columnar outcome cache."""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from contracts.outcome_columns import COLUMNS_DIR, OutcomeColumns
+from contracts.outcome_record import OutcomeRecord, TerminalOutcome
+from contracts.store import ContractStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ContractStore(data_dir=tmp_path)
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def columns(store):
+    return OutcomeColumns(store.data_dir / COLUMNS_DIR)
+
+
+def _outcome(idea_id, outcome, score=None, month=9, tags=(), tech_stack=(), duration=0.0):
+    return OutcomeRecord(
+        idea_id=idea_id, idea_title=f"Idea {idea_id}", outcome=outcome, overall_score=score,
+        tags=list(tags), tech_stack=list(tech_stack), total_duration_seconds=duration,
+        emitted_at=datetime(2026, month, 1 + idea_id, 12, 0),
+    )
+
+
+def _write_sample(store):
+    store.write_outcome(_outcome(0, TerminalOutcome.PUBLISHED, 80.0, 8, ["agents"], ["python"]))
+    store.write_outcome(_outcome(1, TerminalOutcome.PUBLISHED, 90.0, 9, ["agents", "mcp"]))
+    store.write_outcome(_outcome(2, TerminalOutcome.REJECTED, 40.0, 9, ["mcp"], duration=60.0))
+    store.write_outcome(_outcome(3, TerminalOutcome.REJECTED, None, 9, tech_stack=["rust"]))
+
+
+class TestOutcomeColumns:
+    def test_update_is_incremental(self, store, columns):
+        _write_sample(store)
+        assert columns.update(store) == 4
+        assert columns.update(store) == 0
+        store.write_outcome(_outcome(4, TerminalOutcome.DEFERRED, 55.0))
+        assert columns.update(store) == 1
+        assert columns.rows == 5
+        assert columns.column("idea_id").tolist() == [0, 1, 2, 3, 4]
+        assert isinstance(columns.column("overall_score"), np.memmap)
+
+    def test_reopens_from_disk(self, store, columns):
+        _write_sample(store)
+        columns.update(store)
+        reopened = OutcomeColumns(store.data_dir / COLUMNS_DIR)
+        assert reopened.rows == 4
+        assert reopened.offset == columns.offset
+        assert reopened.labels("tags") == ["agents", "mcp"]
+        assert reopened.update(store) == 0
+
+    def test_ignores_bytes_past_committed_rows(self, store, columns):
+        _write_sample(store)
+        columns.update(store)
+        # An update interrupted before its meta.json replace
+        with open(store.data_dir / COLUMNS_DIR / "idea_id.bin", "ab") as f:
+            f.write(np.array([99], dtype=np.int64).tobytes())
+        store.write_outcome(_outcome(4, TerminalOutcome.DEFERRED))
+        columns.update(store)
+        assert columns.column("idea_id").tolist() == [0, 1, 2, 3, 4]
+
+    def test_rewrites_count_once(self, store, columns):
+        store.write_outcome(_outcome(1, TerminalOutcome.PUBLISHED, 50.0))
+        columns.update(store)
+        store.write_outcome(_outcome(1, TerminalOutcome.PUBLISHED, 90.0))
+        store.write_outcome(_outcome(2, TerminalOutcome.PUBLISHED, 70.0))
+        store.write_outcome(_outcome(2, TerminalOutcome.PUBLISHED, 30.0))
+        columns.update(store)
+
+        assert columns.rows == 4
+        assert columns.group_by("outcome", "overall_score") == {"published": (2, 60.0)}
+        assert int(columns.mask().sum()) == 2
+        counts, _ = columns.histogram("overall_score", bins=2, value_range=(0, 100))
+        assert counts.tolist() == [1, 1]
+        reopened = OutcomeColumns(store.data_dir / COLUMNS_DIR)
+        assert reopened.group_by("outcome", "overall_score") == {"published": (2, 60.0)}
+
+    def test_restarts_when_jsonl_shrinks(self, store, columns):
+        _write_sample(store)
+        columns.update(store)
+        path = store._jsonl_path("outcome_record")
+        path.write_text(path.read_text().splitlines(keepends=True)[0])
+        assert columns.update(store) == 1
+        assert columns.column("idea_id").tolist() == [0]
+
+    def test_group_by_outcome_and_lists(self, store, columns):
+        _write_sample(store)
+        columns.update(store)
+
+        assert columns.group_by("outcome", "overall_score") == {
+            "published": (2, 85.0), "rejected": (2, 40.0),
+        }
+        assert columns.group_by("tags", "total_duration_seconds") == {
+            "agents": (2, 0.0), "mcp": (2, 30.0),
+        }
+        assert columns.group_by("tech_stack") == {"python": (1, None), "rust": (1, None)}
+        assert columns.group_by("month") == {"2026-08": (1, None), "2026-09": (3, None)}
+        with pytest.raises(ValueError):
+            columns.group_by("idea_title")
+
+    def test_mask_and_histogram(self, store, columns):
+        _write_sample(store)
+        columns.update(store)
+
+        september = columns.mask(since=datetime(2026, 9, 1))
+        assert september.tolist() == [False, True, True, True]
+        assert columns.group_by("outcome", mask=september) == {
+            "published": (1, None), "rejected": (2, None),
+        }
+        assert not columns.mask(outcome="deferred").any()
+        assert not columns.mask(outcome="unknown").any()
+
+        counts, edges = columns.histogram("overall_score", bins=5, value_range=(0, 100))
+        assert counts.tolist() == [0, 0, 1, 0, 2]
+        assert edges.tolist() == [0, 20, 40, 60, 80, 100]
+        counts, _ = columns.histogram(
+            "overall_score", bins=5, value_range=(0, 100),
+            mask=columns.mask(outcome="rejected"),
+        )
+        assert counts.tolist() == [0, 0, 1, 0, 0]
+
+    def test_empty(self, store, columns):
+        assert columns.update(store) == 0
+        assert columns.group_by("outcome") == {}
+        assert columns.histogram("overall_score")[0].sum() == 0
@@ -0,0 +1,25 @@
+"""Tests for the compact raw_json codec."""
+
+from contracts import raw_codec
+
+
+def test_dictionary_holds_shared_fragments_and_round_trips():
+    samples = [
+        f'{{"contract_version":"1.0.0","signal_id":"s{i}","source":"arxiv_hf","n":{i}}}'
+        for i in range(10)
+    ]
+    zdict = raw_codec.train_dictionary(samples)
+    assert b'"source":"arxiv_hf"' in zdict
+    assert b'"signal_id":"s1"' not in zdict  # only in one sample
+
+    value = raw_codec.encode(samples[3], 7, zdict)
+    assert raw_codec.is_encoded(value)
+    assert not raw_codec.is_encoded(samples[3].encode())
+    assert raw_codec.dictionary_id(value) == 7
+    assert raw_codec.decode(value, zdict) == samples[3].encode()
+    assert len(value) < len(raw_codec.encode(samples[3], 7, b""))
+
+
+def test_dictionary_respects_size_limit():
+    samples = [f'{{"key_{j}":"value {j}"}}' for j in range(500)] * 2
+    assert len(raw_codec.train_dictionary(samples, size=1024)) <= 1024
@@ -232,3 +232,143 @@ class TestContractStoreSignals:
         signals = store.query_signals()
         assert len(signals) >= 1
         assert signals[0].signal_id == "sig-rb"
+
+
+class TestSignalSearch:
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        s = ContractStore(data_dir=tmp_path)
+        yield s
+        s.close()
+
+    def _write(self, store, signal_id, title, summary, tags=()):
+        store.write_signal(ResearchSignal(
+            signal_id=signal_id, source=SignalSource.ARXIV_HF, title=title,
+            summary=summary, relevance=SignalRelevance.HIGH, tags=list(tags),
+        ))
+
+    def test_bm25_ranks_title_matches_first(self, store):
+        self._write(store, "s1", "Scaling laws", "A footnote mentions MCP servers once.")
+        self._write(store, "s2", "MCP servers for agent tools", "Model Context Protocol adoption.")
+        self._write(store, "s3", "Unrelated", "Nothing to see here.")
+
+        hits = store.search_signals("mcp")
+        assert [s.signal_id for s, _, _ in hits] == ["s2", "s1"]
+        assert hits[0][1] > hits[1][1]
+        assert "<mark>MCP</mark>" in hits[0][2]
+        assert store.count_signal_matches("mcp") == 2
+
+    def test_phrases_stemming_and_punctuation(self, store):
+        self._write(store, "s1", "Agent skills", "Packaging agent skills as folders.", tags=["skills"])
+        self._write(store, "s2", "Skills of an agent", "Agent with many skills.")
+        self._write(store, "s3", "GPT-4 evals", "Benchmarks for gpt-4.")
+
+        assert {s.signal_id for s, _, _ in store.search_signals("agent skill")} == {"s1", "s2"}
+        assert [s.signal_id for s, _, _ in store.search_signals('"agent skills"')] == ["s1"]
+        assert [s.signal_id for s, _, _ in store.search_signals("gpt-4")] == ["s3"]
+        with pytest.raises(ValueError):
+            store.search_signals("***")
+
+    def test_index_follows_replace_and_rebuild(self, store):
+        self._write(store, "s1", "Old title", "Old summary")
+        self._write(store, "s1", "New title", "New summary")
+        assert store.search_signals("old") == []
+        assert [s.signal_id for s, _, _ in store.search_signals("new")] == ["s1"]
+
+        store.rebuild_sqlite()
+        assert store.count_signal_matches("new") == 1
+        assert store.count_signal_matches("old") == 0  # replaced again on replay
+
+    def test_existing_database_is_backfilled(self, store, tmp_path):
+        self._write(store, "s1", "Agent memory", "Long-term memory for agents.")
+        store._get_conn().execute("DROP TABLE research_signals_fts")
+        store.close()
+
+        reopened = ContractStore(data_dir=tmp_path)
+        assert [s.signal_id for s, _, _ in reopened.search_signals("memory")] == ["s1"]
+        reopened.close()
+
+
+class TestSignalClaims:
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        s = ContractStore(data_dir=tmp_path)
+        for i in range(6):
+            s.write_signal(ResearchSignal(
+                signal_id=f"s{i}", source=SignalSource.ARXIV_HF, title=f"Signal {i}",
+                summary=f"Summary {i}",
+                relevance=SignalRelevance.HIGH if i % 2 else SignalRelevance.LOW,
+                emitted_at=datetime(2026, 1, 1 + i),
+            ))
+        yield s
+        s.close()
+
+    def test_claim_is_exclusive_and_oldest_first(self, store):
+        first = store.claim_signals("ideaforge", limit=4)
+        assert [s.signal_id for s in first] == ["s0", "s1", "s2", "s3"]
+        second = store.claim_signals("sky-lynx", limit=4)
+        assert [s.signal_id for s in second] == ["s4", "s5"]
+        assert store.claim_signals("sky-lynx") == []
+        # Claimed but not acked: still unconsumed
+        assert len(store.query_signals(consumed=False)) == 6
+
+    def test_claim_filters(self, store):
+        claimed = store.claim_signals("ideaforge", relevance="high")
+        assert [s.signal_id for s in claimed] == ["s1", "s3", "s5"]
+
+    def test_ack_marks_consumed(self, store):
+        claimed = [s.signal_id for s in store.claim_signals("ideaforge", limit=3)]
+        assert store.ack_signals("sky-lynx", claimed) == []
+        assert sorted(store.ack_signals("ideaforge", claimed + ["s5"])) == ["s0", "s1", "s2"]
+        consumed = store.query_signals(consumed=True)
+        assert {s.signal_id for s in consumed} == {"s0", "s1", "s2"}
+        assert {s.consumed_by for s in consumed} == {"ideaforge"}
+        assert [s.signal_id for s in store.claim_signals("sky-lynx")] == ["s3", "s4", "s5"]
+        events = store.status_events_since(0)
+        assert [e["record_id"] for e in events] == ["s0", "s1", "s2"]
+
+    def test_expired_lease_is_reclaimable(self, store):
+        store.claim_signals("crashed", limit=2, lease_seconds=-1)
+        reclaimed = store.claim_signals("ideaforge", limit=2)
+        assert [s.signal_id for s in reclaimed] == ["s0", "s1"]
+        # The original holder lost the claim and cannot ack it
+        assert store.ack_signals("crashed", ["s0", "s1"]) == []
+        assert store.ack_signals("ideaforge", ["s0"]) == ["s0"]
+
+    def test_claims_survive_rebuild(self, store):
+        store.claim_signals("ideaforge", limit=2)
+        store.rebuild_sqlite()
+        assert [s.signal_id for s in store.claim_signals("sky-lynx", limit=2)] == ["s2", "s3"]
+        assert store.ack_signals("ideaforge", ["s0", "s1"]) == ["s0", "s1"]
+
+    def test_release(self, store):
+        store.claim_signals("ideaforge", limit=3)
+        assert store.release_signals("ideaforge", ["s1"]) == 1
+        assert [s.signal_id for s in store.claim_signals("sky-lynx", limit=1)] == ["s1"]
+        assert store.release_signals("ideaforge") == 2
+        assert [s.signal_id for s in store.claim_signals("sky-lynx", limit=2)] == ["s0", "s2"]
+
+    def test_concurrent_claimers_never_share(self, store, tmp_path):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with store.transaction():
+            for i in range(6, 200):
+                store.write_signal(ResearchSignal(
+                    signal_id=f"s{i}", source=SignalSource.TOOL_MONITOR, title=f"Signal {i}",
+                    summary="bulk", relevance=SignalRelevance.MEDIUM,
+                ))
+
+        def drain(consumer):
+            own = ContractStore(data_dir=tmp_path)
+            got = []
+            while batch := own.claim_signals(consumer, limit=7):
+                got.extend(s.signal_id for s in batch)
+            own.close()
+            return got
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(drain, ["a", "b", "c", "d"]))
+        claimed = [sid for result in results for sid in result]
+        assert len(claimed) == len(set(claimed)) == 200
@@ -0,0 +1,186 @@
+"""Tests for the incremental TF-IDF model over research signals."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from contracts.research_signal import ResearchSignal, SignalRelevance, SignalSource
+from contracts.signal_tfidf import MODEL_FILE, SignalTfidf, tokenize
+from contracts.store import ContractStore
+
+TOPICS = {
+    "agents": ["agent", "tool", "planning", "mcp", "orchestration", "memory"],
+    "vision": ["image", "diffusion", "segmentation", "pixel", "video", "camera"],
+    "finance": ["market", "pricing", "revenue", "portfolio", "risk", "trading"],
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ContractStore(data_dir=tmp_path)
+    yield s
+    s.close()
+
+
+def _signal(signal_id, title, summary="", domain=None, emitted_at=None, tags=()):
+    return ResearchSignal(
+        signal_id=signal_id, source=SignalSource.ARXIV_HF, title=title, summary=summary,
+        relevance=SignalRelevance.MEDIUM, domain=domain, tags=list(tags),
+        emitted_at=emitted_at or datetime.now(),
+    )
+
+
+def _write_topics(store, per_topic=6):
+    for topic, words in TOPICS.items():
+        for i in range(per_topic):
+            rotated = words[i % len(words):] + words[:i % len(words)]
+            store.write_signal(_signal(
+                f"{topic}-{i}", " ".join(rotated[:3]), " ".join(rotated), domain=topic,
+            ))
+
+
+class TestTokenize:
+    def test_drops_stopwords_and_single_characters(self):
+        assert tokenize("A survey of the MCP tool-use for agents, v2") == [
+            "survey", "mcp", "tool", "agents", "v2",
+        ]
+
+
+class TestSignalTfidf:
+    def test_update_is_incremental(self, store):
+        model = SignalTfidf()
+        _write_topics(store, per_topic=2)
+        assert model.update(store) == 6
+        assert model.update(store) == 0
+        store.write_signal(_signal("late", "Agent memory planning"))
+        assert model.update(store) == 1
+        assert model.size == 7
+
+    def test_rewrite_replaces_earlier_row(self, store):
+        model = SignalTfidf()
+        store.write_signal(_signal("s1", "diffusion image"))
+        model.update(store)
+        store.write_signal(_signal("s1", "market pricing"))
+        model.update(store)
+        assert model.size == 2
+        assert int(model.alive.sum()) == 1
+        assert model.df[model.vocab["diffusion"]] == 0
+        [(signal_id, _, matched)] = model.rank(model.vectorize("pricing"))
+        assert signal_id == "s1"
+        assert matched == ["pricing"]
+
+    def test_rank_orders_by_similarity_and_respects_candidates(self, store):
+        model = SignalTfidf()
+        _write_topics(store)
+        model.update(store)
+
+        ranked = model.rank(model.vectorize("agent tool planning"), limit=5)
+        assert [sid.split("-")[0] for sid, _, _ in ranked] == ["agents"] * 5
+        scores = [score for _, score, _ in ranked]
+        assert scores == sorted(scores, reverse=True)
+        assert 0 < scores[-1] <= scores[0] <= 1.0 + 1e-9
+
+        only = model.rank(model.vectorize("agent"), signal_ids={"agents-3", "vision-0"})
+        assert [sid for sid, _, _ in only] == ["agents-3"]
+
+    def test_domain_centroid(self, store):
+        model = SignalTfidf()
+        _write_topics(store)
+        model.update(store)
+        ranked = model.rank(model.domain_centroid("finance"), limit=6)
+        assert {sid.split("-")[0] for sid, _, _ in ranked} == {"finance"}
+        assert not model.domain_centroid("unknown").any()
+
+    def test_rank_texts_builds_and_ranks_one_query(self, store):
+        model = SignalTfidf()
+        _write_topics(store)
+        model.update(store)
+
+        query = model.vectorize("agent tool") + model.domain_centroid("agents")
+        query /= np.linalg.norm(query)
+        terms, ranked = model.rank_texts(["agent tool"], domain="agents", limit=5)
+        assert ranked == model.rank(query, limit=5)
+        assert "agent" in terms
+        with pytest.raises(ValueError):
+            model.rank_texts(["zebra"], domain="unknown")
+
+    def test_cluster_recovers_topics(self, store):
+        model = SignalTfidf()
+        _write_topics(store)
+        store.write_signal(_signal(
+            "old", "agent tool", emitted_at=datetime.now() - timedelta(days=60),
+        ))
+        model.update(store)
+
+        topics = model.cluster(datetime.now() - timedelta(days=14), k=3)
+        assert sorted(t["size"] for t in topics) == [6, 6, 6]
+        for topic in topics:
+            assert len({sid.split("-")[0] for sid in topic["signal_ids"]}) == 1
+            assert 0 < topic["cohesion"] <= 1.0 + 1e-9
+        assert all("old" not in t["signal_ids"] for t in topics)
+
+        restricted = model.cluster(
+            datetime.now() - timedelta(days=14), k=3, signal_ids={"vision-0", "vision-1"},
+        )
+        assert sum(t["size"] for t in restricted) == 2
+
+    def test_cluster_empty_window(self, store):
+        model = SignalTfidf()
+        _write_topics(store, per_topic=1)
+        model.update(store)
+        assert model.cluster(datetime.now() + timedelta(days=1)) == []
+
+    def test_save_and_load_round_trip(self, store, tmp_path):
+        path = tmp_path / MODEL_FILE
+        model = SignalTfidf()
+        _write_topics(store, per_topic=2)
+        model.update(store, cache_path=path)
+        model.flush(path)
+
+        loaded = SignalTfidf.load(path)
+        assert loaded.terms == model.terms
+        assert loaded.signal_ids == model.signal_ids
+        assert loaded.offset == model.offset
+        query = model.vectorize("market risk")
+        assert loaded.rank(query) == model.rank(query)
+
+        store.write_signal(_signal("late", "market trading"))
+        assert loaded.update(store) == 1
+        assert loaded.size == 7
+
+    def test_cache_is_saved_in_batches(self, store, tmp_path, monkeypatch):
+        from contracts import signal_tfidf
+        monkeypatch.setattr(signal_tfidf, "SAVE_EVERY", 4)
+        path = tmp_path / MODEL_FILE
+        model = SignalTfidf()
+        store.write_signal(_signal("s-0", "market risk"))
+        model.update(store, cache_path=path)
+        assert not path.exists() and model.unsaved == 1
+
+        for i in range(1, 4):
+            store.write_signal(_signal(f"s-{i}", "market trading"))
+        model.update(store, cache_path=path)
+        model._saver.join()
+        assert SignalTfidf.load(path).size == 4 and model.unsaved == 0
+
+        store.write_signal(_signal("s-4", "pricing"))
+        model.update(store, cache_path=path)
+        assert SignalTfidf.load(path).size == 4
+        model.flush(path)
+        assert SignalTfidf.load(path).size == 5 and model.unsaved == 0
+
+    def test_load_missing_or_outdated_cache(self, tmp_path):
+        assert SignalTfidf.load(tmp_path / MODEL_FILE).size == 0
+        path = tmp_path / MODEL_FILE
+        np.savez(path, format_version=np.int64(0))
+        assert SignalTfidf.load(path).size == 0
+
+    def test_restarts_when_jsonl_shrinks(self, store):
+        model = SignalTfidf()
+        _write_topics(store, per_topic=2)
+        model.update(store)
+        path = store.data_dir / "research_signals.jsonl"
+        path.write_text(path.read_text().splitlines(keepends=True)[0])
+        assert model.update(store) == 1
+        assert model.size == 1
@@ -1,6 +1,9 @@
 """Tests for ContractStore."""
 
 import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
@@ -15,6 +18,7 @@ from contracts.persona_upgrade_patch import (
     PersonaFieldPatch,
     PersonaUpgradePatch,
 )
+from contracts.research_signal import ResearchSignal, SignalRelevance, SignalSource
 from contracts.store import ContractStore
 
 
@@ -164,6 +168,113 @@ class TestContractStorePatches:
         patches = store.query_patches(status="applied")
         assert len(patches) == 1
 
+    def test_update_patch_versions(self, store):
+        store.write_patch(PersonaUpgradePatch(
+            patch_id="p1", persona_id="test",
+            patches=[PersonaFieldPatch(operation=PatchOperation.ADD, path="/test", value="a")],
+            rationale="Test", from_version="1.0.0", to_version="1.0.1",
+        ))
+        store.update_patch_versions("p1", "1.0.3", "1.0.4")
+
+        [patch] = store.query_patches()
+        assert (patch.from_version, patch.to_version) == ("1.0.3", "1.0.4")
+
+
+    def test_get_patch(self, store):
+        store.write_patch(PersonaUpgradePatch(
+            patch_id="p1", persona_id="test",
+            patches=[PersonaFieldPatch(operation=PatchOperation.ADD, path="/test", value="a")],
+            rationale="Test",
+        ))
+        store.update_patch_status("p1", "rejected")
+
+        patch = store.get_patch("p1")
+        assert patch is not None
+        assert patch.status == "rejected"
+        assert store.get_patch("missing") is None
+
+    def test_query_patches_filters(self, store):
+        now = datetime.now()
+        for i, (valid, age) in enumerate([(True, 1), (False, 10), (True, 20)]):
+            store.write_patch(PersonaUpgradePatch(
+                patch_id=f"p{i}", persona_id="test",
+                patches=[PersonaFieldPatch(operation=PatchOperation.ADD, path="/t", value="a")],
+                rationale="Test", schema_valid=valid, emitted_at=now - timedelta(days=age),
+            ))
+
+        assert {p.patch_id for p in store.query_patches(schema_valid=True)} == {"p0", "p2"}
+        old = store.query_patches(emitted_before=now - timedelta(days=5))
+        assert {p.patch_id for p in old} == {"p1", "p2"}
+        by_id = store.query_patches(patch_ids=["p2", "p0", "nope"])
+        assert {p.patch_id for p in by_id} == {"p0", "p2"}
+        assert store.query_patches(patch_ids=[]) == []
+
+
+class TestContractStoreTransactions:
+
+    def test_transaction_commits_once(self, store):
+        for i in range(3):
+            store.write_patch(PersonaUpgradePatch(
+                patch_id=f"p{i}", persona_id="test",
+                patches=[PersonaFieldPatch(operation=PatchOperation.ADD, path="/t", value="a")],
+                rationale="Test",
+            ))
+        with store.transaction():
+            for i in range(3):
+                store.update_patch_status(f"p{i}", "rejected")
+            assert store._get_conn().in_transaction
+
+        assert not store._get_conn().in_transaction
+        assert len(store.query_patches(status="rejected")) == 3
+
+    def test_transaction_rolls_back_on_error(self, store):
+        store.write_recommendation(ImprovementRecommendation(
+            recommendation_id="rec-001",
+            recommendation_type=RecommendationType.VOICE_ADJUSTMENT,
+            title="A", description="A", suggested_change="A",
+        ))
+        with pytest.raises(RuntimeError), store.transaction():
+            store.update_recommendation_status("rec-001", "applied")
+            raise RuntimeError("boom")
+
+        assert store.get_recommendation("rec-001").status == "pending"
+        assert store.get_recommendation("missing") is None
+
+    def test_rollback_keeps_other_threads_writes(self, store):
+        for i in range(2):
+            store.write_signal(ResearchSignal(
+                signal_id=f"s{i}", source=SignalSource.TOOL_MONITOR, title="T", summary="S",
+                relevance=SignalRelevance.LOW,
+            ))
+        started = threading.Event()
+
+        def consume():
+            started.wait()
+            store.update_signal_consumed_by("s1", "B")
+
+        other = threading.Thread(target=consume)
+        other.start()
+        with pytest.raises(RuntimeError), store.transaction():
+            store.update_signal_consumed_by("s0", "A")
+            started.set()
+            time.sleep(0.1)  # B's write is attempted while this transaction is open
+            raise RuntimeError("boom")
+        other.join()
+
+        consumed = {s.signal_id: s.consumed_by for s in store.get_signals(["s0", "s1"])}
+        assert consumed == {"s0": None, "s1": "B"}
+
+
+    def test_integrity_check_uses_its_own_connection(self, store):
+        store.ping()
+        results = []
+        with store.read_transaction():
+            # The shared connection is held; the check must not wait for it
+            checker = threading.Thread(target=lambda: results.append(store.integrity_check()))
+            checker.start()
+            checker.join(timeout=5)
+        assert results == ["ok"]
+
 
 class TestContractStoreRebuild:
 
@@ -189,3 +300,341 @@ class TestContractStoreRebuild:
 
         # SQLite should be restored from JSONL
         assert len(store.query_outcomes()) >= 1
+
+
+    def test_rebuild_reads_every_line(self, store):
+        store.write_batch("outcome_record", [
+            OutcomeRecord(idea_id=i, idea_title="A", outcome=TerminalOutcome.PUBLISHED)
+            for i in range(10050)
+        ])
+        store.rebuild_sqlite()
+        assert len(store.query_outcomes(limit=20000)) == 10050
+
+    def test_failed_rebuild_keeps_the_tables(self, store, monkeypatch):
+        store.write_outcome(OutcomeRecord(
+            idea_id=1, idea_title="A", outcome=TerminalOutcome.PUBLISHED,
+        ))
+        store.write_signal(ResearchSignal(
+            signal_id="s1", source=SignalSource.TOOL_MONITOR, title="T", summary="S",
+            relevance=SignalRelevance.LOW,
+        ))
+
+        def fail(signal):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(store, "_insert_signal_sqlite", fail)
+        with pytest.raises(RuntimeError):
+            store.rebuild_sqlite()
+        assert [o.idea_id for o in store.query_outcomes()] == [1]
+        assert [s.signal_id for s in store.query_signals()] == ["s1"]
+
+
+class TestContractStoreIdempotentWrites:
+
+    def _rec(self, rec_id="rec-001", title="A"):
+        return ImprovementRecommendation(
+            recommendation_id=rec_id,
+            recommendation_type=RecommendationType.VOICE_ADJUSTMENT,
+            title=title, description="A", suggested_change="A",
+        )
+
+    def _lines(self, store, contract_type):
+        return store._jsonl_path(contract_type).read_text().splitlines()
+
+    def test_replayed_writes_are_no_ops(self, store):
+        assert store.write_recommendation(self._rec()) is True
+        # Emitted again later with the same content
+        assert store.write_recommendation(self._rec()) is False
+        assert len(self._lines(store, "improvement_recommendation")) == 1
+
+        record = OutcomeRecord(idea_id=1, idea_title="A", outcome=TerminalOutcome.PUBLISHED)
+        assert store.write_outcome(record) is True
+        assert store.write_outcome(record) is False
+        # Same idea reaching another state later is a new record
+        assert store.write_outcome(OutcomeRecord(
+            idea_id=1, idea_title="A", outcome=TerminalOutcome.REJECTED,
+        )) is True
+        assert len(self._lines(store, "outcome_record")) == 2
+
+    def test_rewrites_replace_the_stored_record(self, store):
+        store.write_recommendation(self._rec())
+        assert store.write_recommendation(self._rec(title="Retry")) is True
+        assert store.get_recommendation("rec-001").title == "Retry"
+        assert len(self._lines(store, "improvement_recommendation")) == 2
+
+        record = OutcomeRecord(idea_id=1, idea_title="A", outcome=TerminalOutcome.PUBLISHED)
+        store.write_outcome(record)
+        assert store.write_outcome(record.model_copy(update={"overall_score": 80.0})) is True
+        assert [r.overall_score for r in store.query_outcomes()] == [80.0]
+
+    def test_sees_writes_from_other_stores(self, store, tmp_path):
+        other = ContractStore(data_dir=tmp_path, db_path=tmp_path / "test.db")
+        other.write_recommendation(self._rec())
+        other.close()
+        assert store.write_recommendation(self._rec()) is False
+        assert len(self._lines(store, "improvement_recommendation")) == 1
+
+    def test_write_batch_skips_stored_and_repeated(self, store):
+        store.write_recommendation(self._rec("rec-001"))
+        written = store.write_batch("improvement_recommendation", [
+            self._rec("rec-001"), self._rec("rec-002"), self._rec("rec-002"),
+        ])
+        assert written == 1
+        assert store.write_batch("improvement_recommendation", [self._rec("rec-002")]) == 0
+        assert len(self._lines(store, "improvement_recommendation")) == 2
+
+
+class TestContractStoreDedupe:
+
+    def test_dedupe_keeps_what_writes_serve(self, store):
+        for title in ("First", "Second"):
+            store.write_signal(ResearchSignal(
+                signal_id="s1", source=SignalSource.ARXIV_HF, title=title,
+                summary="A", relevance=SignalRelevance.HIGH,
+            ))
+        record = OutcomeRecord(idea_id=1, idea_title="A", outcome=TerminalOutcome.PUBLISHED)
+        store.write_outcome(record)
+        store.write_outcome(record.model_copy(update={"overall_score": 80.0}))
+
+        assert store.dedupe_jsonl("research_signal") == (1, 1)
+        assert [s.title for s in store.read_signals()] == ["Second"]
+        assert store.get_signals(["s1"])[0].title == "Second"
+        assert store.dedupe_jsonl("outcome_record") == (1, 1)
+        assert store.read_outcomes() == store.query_outcomes()
+
+    def test_rebuild_keeps_the_last_rewrite(self, store):
+        record = OutcomeRecord(idea_id=1, idea_title="A", outcome=TerminalOutcome.PUBLISHED)
+        store.write_outcome(record)
+        store.write_outcome(record.model_copy(update={"overall_score": 80.0}))
+        store.rebuild_sqlite()
+        assert [r.overall_score for r in store.query_outcomes()] == [80.0]
+
+    def test_dedupe_keeps_last_copy(self, store):
+        for title in ("First", "Second"):
+            rec = ImprovementRecommendation(
+                recommendation_id="rec-001",
+                recommendation_type=RecommendationType.VOICE_ADJUSTMENT,
+                title=title, description="A", suggested_change="A",
+            )
+            # Replays from before writes were idempotent
+            store._append_jsonl("improvement_recommendation", rec)
+            store._insert_recommendation_sqlite(rec)
+        store.write_recommendation(ImprovementRecommendation(
+            recommendation_id="rec-002",
+            recommendation_type=RecommendationType.VOICE_ADJUSTMENT,
+            title="Other", description="A", suggested_change="A",
+        ))
+
+        assert store.dedupe_jsonl("improvement_recommendation", dry_run=True) == (2, 1)
+        assert len(store.read_recommendations()) == 3
+        assert store.dedupe_jsonl("improvement_recommendation") == (2, 1)
+        assert [r.title for r in store.read_recommendations()] == ["Second", "Other"]
+        assert store.get_recommendation("rec-001").title == "Second"
+        assert store.dedupe_jsonl("improvement_recommendation") == (2, 0)
+        assert store.dedupe_jsonl("research_signal") == (0, 0)
+
+    def test_dedupe_removes_duplicate_outcome_rows(self, store):
+        record = OutcomeRecord(idea_id=1, idea_title="A", outcome=TerminalOutcome.PUBLISHED)
+        for _ in range(3):
+            store._append_jsonl("outcome_record", record)
+            store._insert_outcome_sqlite(record)
+        path = store._jsonl_path("outcome_record")
+        with open(path, "a") as f:
+            f.write('{"idea_id": 2')  # a write still in flight is carried over
+
+        assert store.dedupe_jsonl("outcome_record") == (1, 2)
+        assert len(store.query_outcomes()) == 1
+        lines = path.read_text().splitlines()
+        assert lines[1:] == ['{"idea_id": 2']
+        assert OutcomeRecord.model_validate_json(lines[0]).idea_id == 1
+
+
+class TestContractStoreMigrations:
+
+    LEGACY_LINE = (
+        '{"contract_version": "1.0.0", "idea_id": 7, "idea_title": "Old", '
+        '"outcome": "published", "emitted_at": "2026-02-01T12:00:00"}\n'
+    )
+
+    def test_reads_upcast_legacy_lines(self, store):
+        with open(store._jsonl_path("outcome_record"), "w") as f:
+            f.write(self.LEGACY_LINE)
+        [record] = store.read_outcomes()
+        assert record.contract_version == "1.1.0"
+        assert record.idea_type is None
+
+    def test_rebuild_stores_migrated_json(self, store):
+        with open(store._jsonl_path("outcome_record"), "w") as f:
+            f.write(self.LEGACY_LINE)
+        store.rebuild_sqlite()
+        raw = store._get_conn().execute("SELECT raw_json FROM outcome_records").fetchone()[0]
+        assert raw.startswith('{"contract_version":"1.1.0"')
+        assert store.query_outcomes()[0].idea_id == 7
+
+
+class TestContractStoreRawEncoding:
+
+    def _signal(self, i):
+        return ResearchSignal(
+            signal_id=f"sig-{i:03d}", source=SignalSource.ARXIV_HF, title=f"Paper {i}",
+            summary="Agents and evals. " * 5, relevance=SignalRelevance.HIGH,
+            tags=["agents", "evals"], raw_data={"arxiv_id": f"2602.{i:05d}", "authors": ["A"]},
+            emitted_at=datetime(2026, 2, 1, 12, i),
+        )
+
+    def _raw_sizes(self, store):
+        return [len(row[0]) for row in store._get_conn().execute(
+            "SELECT raw_json FROM research_signals ORDER BY id"
+        )]
+
+    def test_zlib_encoding_shrinks_rows_and_reads_transparently(self, store):
+        for i in range(20):
+            store.write_signal(self._signal(i))
+        before = store.query_signals(limit=100)
+        plain = self._raw_sizes(store)
+
+        assert store.set_raw_encoding("research_signal", "zlib") == 20
+        assert store.raw_encoding("research_signal") == "zlib"
+        assert sum(self._raw_sizes(store)) < sum(plain) / 3
+        assert store.query_signals(limit=100) == before
+        assert store.search_signals("agents", limit=100)
+
+        # New writes are encoded too, and decoded by a separate store
+        store.write_signal(self._signal(20))
+        assert self._raw_sizes(store)[-1] < plain[-1] / 3
+        other = ContractStore(data_dir=store.data_dir, db_path=store.db_path)
+        assert other.get_signals(["sig-020"]) == [self._signal(20)]
+        other.close()
+
+    def test_switching_back_to_json_and_rebuild(self, store):
+        for i in range(5):
+            store.write_signal(self._signal(i))
+        store.set_raw_encoding("research_signal", "zlib")
+        store.rebuild_sqlite()
+        assert store.raw_encoding("research_signal") == "zlib"
+        assert len(store.query_signals()) == 5
+
+        store.set_raw_encoding("research_signal", "json")
+        raw = store._get_conn().execute("SELECT raw_json FROM research_signals").fetchone()[0]
+        assert raw == self._signal(0).model_dump_json()
+        assert store.raw_encoding("research_signal") == "json"
+
+    def test_rejects_unknown_encodings_and_json_only_tables(self, store):
+        with pytest.raises(ValueError):
+            store.set_raw_encoding("research_signal", "msgpack")
+        with pytest.raises(ValueError):
+            store.set_raw_encoding("persona_patch", "zlib")
+
+
+class TestContractStoreSegments:
+
+    NOW = datetime(2026, 10, 15, 12, 0)
+
+    def _write_months(self, store):
+        """Two outcomes in each of August, September and October 2026."""
+        for i, month in enumerate([8, 8, 9, 9, 10, 10]):
+            store.write_outcome(OutcomeRecord(
+                idea_id=i, idea_title=f"Idea {i}", outcome=TerminalOutcome.PUBLISHED,
+                emitted_at=datetime(2026, month, 1 + i, 9, 0),
+            ))
+
+    def test_rotate_preserves_logical_stream(self, store):
+        self._write_months(store)
+        legacy = store._jsonl_path("outcome_record")
+        original = legacy.read_bytes()
+        marks = store.high_water_marks(["outcome_record"])
+
+        sealed = store.rotate_jsonl("outcome_record", now=self.NOW)
+
+        assert not legacy.exists()
+        assert [(e.file, e.records) for e in sealed] == [
+            ("2026-08.jsonl.gz", 2), ("2026-09.jsonl.gz", 2), ("2026-10.jsonl.gz", 2),
+        ]
+        assert sum(e.bytes for e in sealed) == len(original)
+        assert b"".join(store.iter_jsonl_bytes("outcome_record")) == original
+        assert store.jsonl_extent("outcome_record") == len(original)
+        assert store.high_water_marks(["outcome_record"]) == marks
+        assert [r.idea_id for r in store.read_outcomes()] == list(range(6))
+        assert store.rotate_jsonl("outcome_record", now=self.NOW) == []
+
+    def test_appends_go_to_current_month(self, store):
+        self._write_months(store)
+        store.rotate_jsonl("outcome_record", now=self.NOW)
+        store.write_outcome(OutcomeRecord(
+            idea_id=6, idea_title="Idea 6", outcome=TerminalOutcome.PUBLISHED,
+        ))
+
+        directory = store._segment_dir("outcome_record")
+        assert (directory / (datetime.now().strftime("%Y-%m") + ".jsonl")).exists()
+        assert [r.idea_id for r in store.read_outcomes()] == list(range(7))
+        assert [r.idea_id for r in store.read_outcomes(limit=2)] == [5, 6]
+
+    def test_data_version_sees_appends_to_segments(self, store):
+        self._write_months(store)
+        store.rotate_jsonl("outcome_record", now=self.NOW)
+        before, _ = store.data_version()
+        # JSONL only: SQLite is untouched, so only the segment can tell
+        store._append_jsonl("outcome_record", OutcomeRecord(
+            idea_id=6, idea_title="Idea 6", outcome=TerminalOutcome.PUBLISHED,
+        ))
+        assert store.data_version()[0] != before
+
+    def test_window_skips_sealed_segments(self, store):
+        self._write_months(store)
+        store.rotate_jsonl("outcome_record", now=self.NOW)
+        since, until = datetime(2026, 9, 1), datetime(2026, 10, 1)
+
+        assert [r.idea_id for r in store.read_outcomes(since=since, until=until)] == [2, 3]
+        ranges = store.jsonl_ranges("outcome_record", since=since, until=until)
+        assert len(ranges) == 1
+        lines = [line for line, _ in store.iter_jsonl_lines("outcome_record", *ranges[0])]
+        assert [OutcomeRecord.model_validate_json(line).idea_id for line in lines] == [2, 3]
+
+    def test_dedupe_rewrites_sealed_segment(self, store):
+        self._write_months(store)
+        replay = OutcomeRecord(
+            idea_id=0, idea_title="Idea 0", outcome=TerminalOutcome.PUBLISHED,
+            emitted_at=datetime(2026, 8, 1, 9, 0),
+        )
+        store._append_jsonl("outcome_record", replay)
+        store._insert_outcome_sqlite(replay)
+        store.rotate_jsonl("outcome_record", now=self.NOW)
+
+        assert store.dedupe_jsonl("outcome_record") == (6, 1)
+        assert [r.idea_id for r in store.read_outcomes()] == [1, 2, 3, 4, 5, 0]
+        manifest = (store._segment_dir("outcome_record") / "manifest.json").read_text()
+        assert "2026-08.jsonl.gz" not in manifest
+        assert len(store.query_outcomes()) == 6
+
+
+class TestContractStoreExport:
+
+    def test_extent_excludes_partial_line(self, store):
+        store.write_outcome(OutcomeRecord(
+            idea_id=1, idea_title="A", outcome=TerminalOutcome.PUBLISHED,
+        ))
+        path = store._jsonl_path("outcome_record")
+        complete = path.stat().st_size
+        with open(path, "a") as f:
+            f.write('{"idea_id": 2')
+
+        assert store.jsonl_extent("outcome_record") == complete
+        assert b"".join(store.iter_jsonl_bytes("outcome_record")) == path.read_bytes()[:complete]
+        assert store.jsonl_extent("research_signal") == 0
+
+    def test_iter_lines_skips_partial_start(self, store):
+        for i in range(3):
+            store.write_outcome(OutcomeRecord(
+                idea_id=i, idea_title=f"Idea {i}", outcome=TerminalOutcome.PUBLISHED,
+            ))
+        lines = list(store.iter_jsonl_lines("outcome_record"))
+        assert len(lines) == 3
+        first_end = lines[0][1]
+
+        assert [pos for _, pos in store.iter_jsonl_lines("outcome_record", first_end)] == [
+            lines[1][1], lines[2][1],
+        ]
+        # Mid-line start resumes at the next record
+        assert [pos for _, pos in store.iter_jsonl_lines("outcome_record", first_end - 5)] == [
+            lines[1][1], lines[2][1],
+        ]
@@ -0,0 +1,96 @@
+"""Tests for loop telemetry spans and stage timing stats."""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from contracts.loop_run import LoopSpan, percentile, stage_timing_stats, summarize_runs
+from contracts.store import ContractStore
+from contracts.telemetry import span, traced, tracing
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ContractStore(data_dir=tmp_path)
+    yield s
+    s.close()
+
+
+def test_span_outside_tracing_records_nothing(store):
+    with span("noop") as s:
+        s.add_usage(SimpleNamespace(input_tokens=5, output_tokens=1))
+    assert store.query_spans() == []
+
+
+def test_nested_spans_share_run_and_link_parent(store):
+    with (
+        tracing(store, run_id="run-1") as tracer,
+        span("outer", persona_id="porter") as outer,
+        span("inner") as inner,
+    ):
+        inner.add_usage(SimpleNamespace(
+            input_tokens=100, output_tokens=20, cache_read_input_tokens=80,
+        ))
+
+    assert [s.stage for s in tracer.spans] == ["inner", "outer"]
+    assert inner.parent_span_id == outer.span_id
+    assert outer.attributes == {"persona_id": "porter"}
+
+    stored = {s.stage: s for s in store.query_spans(run_id="run-1")}
+    assert stored["inner"].input_tokens == 100
+    assert stored["inner"].cache_read_input_tokens == 80
+    assert len(store.read_spans()) == 2
+
+
+def test_span_records_errors(store):
+    with tracing(store), pytest.raises(ValueError), span("boom"):
+        raise ValueError("bad yaml")
+    (recorded,) = store.query_spans(stage="boom")
+    assert recorded.status == "error"
+    assert recorded.error == "ValueError: bad yaml"
+
+
+def test_store_writes_are_traced(store, tmp_path):
+    @traced("work")
+    def work():
+        return 42
+
+    with tracing(store):
+        assert work() == 42
+        store.rebuild_sqlite()
+    stages = {s.stage for s in store.query_spans()}
+    assert {"work", "store.rebuild_sqlite"} <= stages
+
+    # Spans survive a rebuild from JSONL
+    store.rebuild_sqlite()
+    assert {s.stage for s in store.query_spans()} >= {"work", "store.rebuild_sqlite"}
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_stage_stats_by_week_and_runs():
+    monday = datetime(2026, 2, 16, 2, 0)
+    spans = [
+        LoopSpan(run_id="a", stage="validate", started_at=monday, duration_seconds=1.0),
+        LoopSpan(run_id="a", stage="validate", started_at=monday + timedelta(seconds=2),
+                 duration_seconds=3.0, status="error"),
+        LoopSpan(run_id="b", stage="validate", started_at=monday + timedelta(weeks=1),
+                 duration_seconds=9.0),
+    ]
+    (overall,) = stage_timing_stats(spans)
+    assert (overall.count, overall.errors) == (3, 1)
+    assert (overall.p50_seconds, overall.max_seconds) == (3.0, 9.0)
+
+    weekly = stage_timing_stats(spans, by_week=True)
+    assert [(w.week, w.count) for w in weekly] == [("2026-W08", 2), ("2026-W09", 1)]
+
+    runs = summarize_runs(spans)
+    assert [r.run_id for r in runs] == ["b", "a"]
+    assert runs[1].duration_seconds == 5.0
@@ -0,0 +1,16 @@
+"""Tests for timestamp normalization."""
+
+from datetime import datetime, timedelta, timezone
+
+from contracts.timestamps import local_naive
+
+
+def test_local_naive():
+    naive = datetime(2026, 3, 1, 12, 0, 0)
+    aware = naive.astimezone()
+    assert local_naive(None) is None
+    assert local_naive(naive) is naive
+    assert local_naive(aware) == naive
+    assert local_naive(aware.isoformat()) == naive
+    assert local_naive(naive.isoformat()) == naive
+    assert local_naive(aware.astimezone(timezone(timedelta(hours=5)))) == naive
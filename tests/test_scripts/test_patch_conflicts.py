@@ -0,0 +1,98 @@
+"""Tests for patch conflict detection and rebase."""
+
+from contracts.persona_upgrade_patch import (
+    PatchOperation,
+    PersonaFieldPatch,
+    PersonaUpgradePatch,
+)
+from scripts.patch_conflicts import (
+    bump_version,
+    check_patch,
+    paths_overlap,
+    persona_version,
+    rebase_patch,
+    touched_paths,
+)
+
+
+def _patch(patch_id: str, from_version: str, *ops: tuple[str, str]) -> PersonaUpgradePatch:
+    return PersonaUpgradePatch(
+        patch_id=patch_id,
+        persona_id="christensen",
+        patches=[
+            PersonaFieldPatch(
+                operation=PatchOperation(op),
+                path=path,
+                value=None if op == "remove" else "x",
+            )
+            for op, path in ops
+        ],
+        rationale="test",
+        from_version=from_version,
+        to_version=bump_version(from_version),
+    )
+
+
+class TestVersions:
+
+    def test_bump_version(self):
+        assert bump_version("1.2.3") == "1.2.4"
+        assert bump_version("1.0") == "1.0.1"
+        assert bump_version(None) == "0.0.1"
+
+    def test_persona_version(self):
+        assert persona_version({"metadata": {"version": "2.1.0"}}) == "2.1.0"
+        assert persona_version({"identity": {}}) == "0.0.0"
+
+
+class TestPathOverlap:
+
+    def test_prefix_overlaps(self):
+        assert paths_overlap(("voice",), ("voice", "tone", "0"))
+        assert paths_overlap(("voice", "tone", "0"), ("voice", "tone", "0"))
+
+    def test_siblings_do_not_overlap(self):
+        assert not paths_overlap(("voice", "tone"), ("voice", "phrases"))
+        assert not paths_overlap(("voice", "tone", "0"), ("voice", "tone", "1"))
+
+    def test_appends_commute(self):
+        assert not paths_overlap(("voice", "phrases", "-"), ("voice", "phrases", "-"))
+        assert not paths_overlap(("voice", "phrases", "-"), ("voice", "phrases", "0"))
+        assert paths_overlap(("voice", "phrases"), ("voice", "phrases", "-"))
+
+    def test_array_remove_touches_parent(self):
+        patch = _patch("p", "1.0.0", ("remove", "/voice/tone/1"))
+        assert touched_paths(patch.patches) == {("voice", "tone")}
+
+
+class TestCheckPatch:
+
+    def test_clean_when_versions_match(self):
+        patch = _patch("p1", "1.0.0", ("add", "/voice/phrases/-"))
+        report = check_patch(patch, "1.0.0", [])
+        assert report.status == "clean"
+        assert report.applicable
+
+    def test_rebase_when_changes_do_not_overlap(self):
+        applied = _patch("p0", "1.0.0", ("replace", "/voice/tone/0"))
+        patch = _patch("p1", "1.0.0", ("add", "/frameworks/new"))
+        report = check_patch(patch, "1.0.1", [applied])
+        assert report.status == "rebase"
+
+        rebase_patch(patch, report.current_version)
+        assert (patch.from_version, patch.to_version) == ("1.0.1", "1.0.2")
+
+    def test_conflict_when_changes_overlap(self):
+        applied = _patch("p0", "1.0.0", ("replace", "/frameworks/jtbd"))
+        patch = _patch("p1", "1.0.0", ("replace", "/frameworks/jtbd/description"))
+        report = check_patch(patch, "1.0.1", [applied])
+        assert report.status == "conflict"
+        assert not report.applicable
+        assert report.conflicting_patch_ids == ["p0"]
+        assert report.conflicting_paths == ["/frameworks/jtbd/description"]
+
+    def test_ignores_patches_applied_before_base(self):
+        older = _patch("p0", "0.9.0", ("replace", "/frameworks/jtbd"))
+        patch = _patch("p1", "1.0.0", ("replace", "/frameworks/jtbd"))
+        report = check_patch(patch, "1.0.1", [older])
+        assert report.status == "rebase"
@@ -0,0 +1,71 @@
+"""Tests for locked, atomic persona YAML writes."""
+
+import multiprocessing
+import time
+
+import pytest
+import yaml
+
+from scripts.persona_files import (
+    LOCK_NAME,
+    PersonaVersionConflict,
+    persona_lock,
+    write_persona_yaml,
+)
+
+
+@pytest.fixture
+def persona_path(tmp_path):
+    path = tmp_path / "christensen" / "persona.yaml"
+    path.parent.mkdir()
+    path.write_text(yaml.dump({"identity": {"name": "C"}, "metadata": {"version": "1.0.0"}}))
+    return path
+
+
+def _hold_lock(path, ready, seconds):
+    with persona_lock(path):
+        ready.set()
+        time.sleep(seconds)
+
+
+def test_write_when_version_matches(persona_path):
+    write_persona_yaml(
+        persona_path,
+        {"identity": {"name": "Clay"}, "metadata": {"version": "1.0.1"}},
+        expected_version="1.0.0",
+    )
+    data = yaml.safe_load(persona_path.read_text())
+    assert data["identity"]["name"] == "Clay"
+    assert data["metadata"]["version"] == "1.0.1"
+    # No temp files left behind
+    assert sorted(p.name for p in persona_path.parent.iterdir()) == [LOCK_NAME, "persona.yaml"]
+
+
+def test_compare_and_swap_rejects_stale_version(persona_path):
+    before = persona_path.read_text()
+    with pytest.raises(PersonaVersionConflict) as exc:
+        write_persona_yaml(persona_path, {"metadata": {"version": "0.9.1"}}, expected_version="0.9.0")
+    assert exc.value.actual == "1.0.0"
+    assert persona_path.read_text() == before
+
+
+def test_preserves_file_mode(persona_path):
+    persona_path.chmod(0o640)
+    write_persona_yaml(persona_path, {"metadata": {"version": "1.0.1"}}, expected_version="1.0.0")
+    assert persona_path.stat().st_mode & 0o777 == 0o640
+
+
+def test_lock_excludes_other_process(persona_path):
+    ready = multiprocessing.Event()
+    holder = multiprocessing.Process(target=_hold_lock, args=(persona_path, ready, 1.0))
+    holder.start()
+    try:
+        assert ready.wait(5)
+        with pytest.raises(TimeoutError):
+            write_persona_yaml(
+                persona_path, {"metadata": {"version": "1.0.1"}},
+                expected_version="1.0.0", timeout=0.2,
+            )
+    finally:
+        holder.join()
+    write_persona_yaml(persona_path, {"metadata": {"version": "1.0.1"}}, expected_version="1.0.0")
@@ -0,0 +1,211 @@
+"""Tests for persona_upgrader patch generation."""
+
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from contracts.improvement_recommendation import (
+    ImprovementRecommendation,
+    RecommendationType,
+)
+from scripts.persona_upgrader import (
+    MAX_OUTPUT_TOKENS,
+    MAX_RECS_PER_CALL,
+    PATCH_INSTRUCTIONS,
+    UsageTracker,
+    generate_patches,
+    plan_generations,
+    split_patch_sets,
+)
+
+PERSONA_YAML = "identity:\n  name: Test\nvoice:\n  phrases:\n    - hello\n" * 50
+
+
+class EchoUsageClient:
+    """Fake Anthropic client emulating prompt caching in its usage fields.
+
+    The first call with a given system prefix is a cache write; repeats
+    of the same prefix are cache reads. Token counts are word counts.
+    """
+
+    def __init__(self):
+        self.requests: list[dict] = []
+        self._cached: set[str] = set()
+        self.messages = SimpleNamespace(create=self._create)
+
+    def _create(self, **kwargs):
+        self.requests.append(kwargs)
+        prefix = "".join(block["text"] for block in kwargs["system"])
+        prefix_tokens = len(prefix.split())
+        user_tokens = len(kwargs["messages"][0]["content"].split())
+        if prefix in self._cached:
+            usage = SimpleNamespace(
+                input_tokens=user_tokens, output_tokens=20,
+                cache_creation_input_tokens=0, cache_read_input_tokens=prefix_tokens,
+            )
+        else:
+            self._cached.add(prefix)
+            usage = SimpleNamespace(
+                input_tokens=user_tokens, output_tokens=20,
+                cache_creation_input_tokens=prefix_tokens, cache_read_input_tokens=0,
+            )
+        rec_ids = re.findall(r"## Recommendation (\S+)", kwargs["messages"][0]["content"])
+        body = {"results": [
+            {
+                "recommendation_id": rec_id,
+                "patches": [{"operation": "add", "path": "/voice/phrases/-", "value": rec_id}],
+                "rationale": f"Add phrase for {rec_id}",
+            }
+            for rec_id in rec_ids
+        ]}
+        return SimpleNamespace(content=[SimpleNamespace(text=json.dumps(body))], usage=usage)
+
+
+def _rec(rec_id: str, targets: list[str] | None = None) -> ImprovementRecommendation:
+    return ImprovementRecommendation(
+        recommendation_id=rec_id,
+        target_persona_ids=targets or [],
+        recommendation_type=RecommendationType.VOICE_ADJUSTMENT,
+        title=f"Adjust voice {rec_id}",
+        description="More concise",
+        suggested_change="Add a phrase",
+    )
+
+
+def test_persona_yaml_is_cached_prefix():
+    client = EchoUsageClient()
+    [patch] = generate_patches("christensen", [_rec("rec-1")], PERSONA_YAML, client)
+
+    assert patch.persona_id == "christensen"
+    assert patch.source_recommendation_ids == ["rec-1"]
+
+    request = client.requests[0]
+    assert request["system"][0]["text"] == PATCH_INSTRUCTIONS
+    assert PERSONA_YAML in request["system"][-1]["text"]
+    assert request["system"][-1]["cache_control"] == {"type": "ephemeral"}
+    # Recommendation text stays out of the cached prefix
+    assert "rec-1" in request["messages"][0]["content"]
+    assert PERSONA_YAML not in request["messages"][0]["content"]
+
+
+def test_usage_tracker_reports_cache_savings():
+    client = EchoUsageClient()
+    tracker = UsageTracker()
+    for i in range(3):
+        generate_patches("christensen", [_rec(f"rec-{i}")], PERSONA_YAML, client, tracker)
+
+    summary = tracker.summary()
+    assert summary["calls"] == 3
+    assert summary["cache_misses"] == 1
+    assert summary["cache_hits"] == 2
+
+    first = tracker.calls[0]
+    assert first.cache_creation_input_tokens > 0
+    assert all(c.cache_read_input_tokens == first.cache_creation_input_tokens for c in tracker.calls[1:])
+
+    prefix = first.cache_creation_input_tokens
+    expected_saved = sum(
+        c.total_input_tokens - c.billed_input_tokens for c in tracker.calls
+    )
+    assert summary["saved_input_tokens"] == pytest.approx(expected_saved, abs=0.1)
+    # One write at 1.25x plus two reads at 0.1x beats three full prefixes
+    assert summary["saved_input_tokens"] == pytest.approx(prefix * (2 * 0.9 - 0.25), abs=0.1)
+    assert 0 < summary["savings_ratio"] < 1
+
+
+def test_usage_tracker_separates_personas():
+    client = EchoUsageClient()
+    tracker = UsageTracker()
+    generate_patches("christensen", [_rec("rec-1")], PERSONA_YAML, client, tracker)
+    generate_patches("porter", [_rec("rec-1")], PERSONA_YAML + "extra: true\n", client, tracker)
+
+    assert [c.cache_hit for c in tracker.calls] == [False, False]
+    assert tracker.summary()["saved_input_tokens"] < 0
+
+
+def test_plan_groups_recommendations_by_persona():
+    recs = [
+        _rec("rec-1", ["christensen"]),
+        _rec("rec-2"),
+        _rec("rec-3", ["christensen", "ghost"]),
+    ]
+    plan = plan_generations(recs, ["christensen", "porter"])
+
+    assert [r.recommendation_id for r in plan["christensen"]] == ["rec-1", "rec-2", "rec-3"]
+    assert [r.recommendation_id for r in plan["porter"]] == ["rec-2"]
+    assert "ghost" not in plan
+
+
+def test_one_call_per_persona_splits_per_recommendation():
+    client = EchoUsageClient()
+    tracker = UsageTracker()
+    recs = [_rec(f"rec-{i}", ["christensen"]) for i in range(3)]
+
+    patches = generate_patches("christensen", recs, PERSONA_YAML, client, tracker)
+
+    assert len(client.requests) == 1
+    assert tracker.calls[0].recommendation_ids == ["rec-0", "rec-1", "rec-2"]
+    assert [p.source_recommendation_ids for p in patches] == [["rec-0"], ["rec-1"], ["rec-2"]]
+    assert [p.patches[0].value for p in patches] == ["rec-0", "rec-1", "rec-2"]
+    assert len({p.patch_id for p in patches}) == 3
+
+
+def test_large_groups_are_split_into_bounded_calls():
+    client = EchoUsageClient()
+    recs = [_rec(f"rec-{i}", ["christensen"]) for i in range(MAX_RECS_PER_CALL * 2 + 1)]
+
+    patches = generate_patches("christensen", recs, PERSONA_YAML, client)
+
+    assert len(client.requests) == 3
+    assert all(r["max_tokens"] <= MAX_OUTPUT_TOKENS for r in client.requests)
+    assert [p.source_recommendation_ids[0] for p in patches] == [r.recommendation_id for r in recs]
+
+
+class ReplaceToneClient(EchoUsageClient):
+    """Fake client whose every recommendation replaces the same path."""
+
+    def _create(self, **kwargs):
+        response = super()._create(**kwargs)
+        body = json.loads(response.content[0].text)
+        for entry in body["results"]:
+            entry["patches"] = [{"operation": "replace", "path": "/voice/tone/0", "value": "calm"}]
+        response.content[0].text = json.dumps(body)
+        return response
+
+
+def test_later_calls_avoid_paths_changed_by_earlier_ones():
+    client = ReplaceToneClient()
+    recs = [_rec(f"rec-{i}", ["christensen"]) for i in range(MAX_RECS_PER_CALL + 1)]
+
+    patches = generate_patches("christensen", recs, PERSONA_YAML, client)
+
+    assert [p.source_recommendation_ids for p in patches] == [["rec-0"]]
+    assert "/voice/tone/0" not in client.requests[0]["messages"][0]["content"]
+    assert "- /voice/tone/0" in client.requests[1]["messages"][0]["content"]
+
+
+def test_split_patch_sets_drops_unknown_and_empty():
+    recs = [_rec("rec-1"), _rec("rec-2")]
+    result = {"results": [
+        {"recommendation_id": "rec-2", "patches": [
+            {"operation": "replace", "path": "/voice/tone/0", "value": "calm"},
+        ], "rationale": "Tone"},
+        {"recommendation_id": "rec-9", "patches": [
+            {"operation": "add", "path": "/x", "value": "y"},
+        ]},
+        {"recommendation_id": "rec-1", "patches": [{"operation": "bogus", "path": "/x"}]},
+    ]}
+
+    sets = split_patch_sets(result, recs)
+    assert list(sets) == ["rec-2"]
+    assert sets["rec-2"][1] == "Tone"
+
+
+def test_split_patch_sets_accepts_single_form():
+    sets = split_patch_sets(
+        {"patches": [{"operation": "add", "path": "/a/-", "value": "b"}], "rationale": "r"},
+        [_rec("rec-1")],
+    )
+    assert list(sets) == ["rec-1"]
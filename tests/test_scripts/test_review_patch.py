@@ -0,0 +1,90 @@
+"""Tests for review_patch batch selection, application and rejection."""
+
+from datetime import datetime, timedelta
+
+import pytest
+import yaml
+
+from contracts.persona_upgrade_patch import (
+    PatchOperation,
+    PersonaFieldPatch,
+    PersonaUpgradePatch,
+)
+from contracts.store import ContractStore
+from scripts import review_patch
+from scripts.review_patch import cmd_apply, cmd_reject, select_patches
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ContractStore(data_dir=tmp_path)
+    now = datetime.now()
+    for i, (persona, valid, age) in enumerate([
+        ("christensen", True, 1),
+        ("christensen", False, 30),
+        ("porter", True, 30),
+    ]):
+        s.write_patch(PersonaUpgradePatch(
+            patch_id=f"p{i}", persona_id=persona,
+            patches=[PersonaFieldPatch(operation=PatchOperation.ADD, path="/t", value="a")],
+            rationale="Test", schema_valid=valid, emitted_at=now - timedelta(days=age),
+        ))
+    yield s
+    s.close()
+
+
+def test_select_by_ids_keeps_order(store):
+    patches = select_patches(store, ["p2", "p0"])
+    assert [p.patch_id for p in patches] == ["p2", "p0"]
+
+
+def test_select_unknown_id(store, capsys):
+    assert select_patches(store, ["p0", "nope"]) is None
+    assert "Patch 'nope' not found." in capsys.readouterr().out
+
+
+def test_select_ids_not_matching_filters(store, capsys):
+    assert [p.patch_id for p in select_patches(store, ["p0", "p2"], persona_id="porter")] == ["p2"]
+    assert "Patch 'p0' does not match the filters. Skipped." in capsys.readouterr().out
+
+
+def test_select_by_filters(store):
+    store.update_patch_status("p0", "applied")
+    assert [p.patch_id for p in select_patches(store, [], persona_id="christensen")] == ["p1"]
+    assert {p.patch_id for p in select_patches(store, [], older_than_days=7)} == {"p1", "p2"}
+    assert [p.patch_id for p in select_patches(store, [], schema_valid=False)] == ["p1"]
+
+
+def test_reject_many(store):
+    assert cmd_reject(store, [], persona_id="christensen", older_than_days=7) == 0
+    assert store.get_patch("p1").status == "rejected"
+    assert store.get_patch("p0").status == "proposed"
+
+    assert cmd_reject(store, ["p0", "p1"]) == 1  # p1 is no longer proposed
+    assert store.get_patch("p0").status == "rejected"
+
+
+def test_apply_keeps_earlier_patches_when_a_later_one_fails(store, tmp_path, monkeypatch):
+    personas = tmp_path / "personas"
+    for persona in ("christensen", "porter"):
+        (personas / persona).mkdir(parents=True)
+        (personas / persona / "persona.yaml").write_text(
+            yaml.dump({"metadata": {"version": "0.0.0"}, "t": []})
+        )
+    monkeypatch.setattr(review_patch, "PERSONAS_PATH", personas)
+    results = iter([True, FileNotFoundError("npm")])
+
+    def validate(persona_id, data):
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(review_patch, "validate_persona", validate)
+
+    with pytest.raises(FileNotFoundError):
+        cmd_apply(store, ["p0", "p2"])
+    assert store.get_patch("p0").status == "applied"
+    assert store.get_patch("p2").status == "proposed"
+    written = yaml.safe_load((personas / "christensen" / "persona.yaml").read_text())
+    assert written["t"] == "a"
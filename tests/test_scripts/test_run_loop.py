@@ -0,0 +1,138 @@
+"""Tests for the feedback loop orchestrator DAG and checkpoints."""
+
+import json
+import os
+import sys
+
+import pytest
+
+from contracts.store import ContractStore
+from contracts.telemetry import tracing
+from scripts.run_loop import Stage, default_stages, run_loop, validate_stages
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ContractStore(data_dir=tmp_path / "data")
+    yield s
+    s.close()
+
+
+def _stage(name, code="pass", **kwargs):
+    return Stage(name=name, title=name, command=[sys.executable, "-c", code], **kwargs)
+
+
+def _append_outcome(store):
+    path = store.data_dir / "outcome_records.jsonl"
+    with open(path, "a") as f:
+        f.write('{"idea_id": 1}\n')
+
+
+def test_validate_rejects_cycles_and_unknown_deps():
+    with pytest.raises(ValueError, match="cycle"):
+        validate_stages([_stage("a", depends_on=["b"]), _stage("b", depends_on=["a"])])
+    with pytest.raises(ValueError, match="unknown"):
+        validate_stages([_stage("a", depends_on=["missing"])])
+
+
+def test_skips_stage_with_unchanged_inputs(store, tmp_path):
+    checkpoint = tmp_path / "checkpoints.json"
+    stages = [_stage("analyze", inputs=["outcome_record"]), _stage("report", depends_on=["analyze"])]
+    _append_outcome(store)
+
+    first = run_loop(stages, store, checkpoint_path=checkpoint)
+    assert [r.status for r in first] == ["success", "success"]
+    saved = json.loads(checkpoint.read_text())
+    assert saved["analyze"]["watermarks"]["outcome_record"] > 0
+
+    second = run_loop(stages, store, checkpoint_path=checkpoint)
+    # Stages without declared inputs always run
+    assert [(r.name, r.status) for r in second] == [("analyze", "skipped"), ("report", "success")]
+
+    _append_outcome(store)
+    third = run_loop(stages, store, checkpoint_path=checkpoint)
+    assert third[0].status == "success"
+
+    forced = run_loop(stages, store, checkpoint_path=checkpoint, force={"analyze"})
+    assert forced[0].status == "success"
+
+
+def test_resumes_at_failed_stage(store, tmp_path):
+    checkpoint = tmp_path / "checkpoints.json"
+    marker = tmp_path / "fixed"
+    _append_outcome(store)
+    stages = [
+        _stage("analyze", inputs=["outcome_record"]),
+        _stage("upgrade", f"import os, sys; sys.exit(0 if os.path.exists({str(marker)!r}) else 1)",
+               depends_on=["analyze"], inputs=["outcome_record"]),
+        _stage("report", depends_on=["upgrade"]),
+    ]
+
+    first = run_loop(stages, store, checkpoint_path=checkpoint)
+    assert [r.status for r in first] == ["success", "failed", "blocked"]
+
+    marker.touch()
+    second = run_loop(stages, store, checkpoint_path=checkpoint)
+    assert [r.status for r in second] == ["skipped", "success", "success"]
+
+
+def test_independent_stages_run_concurrently(store, tmp_path):
+    sleep = "import time; time.sleep(0.5)"
+    stages = [_stage("a", sleep), _stage("b", sleep), _stage("c", depends_on=["a", "b"])]
+    results = run_loop(stages, store, checkpoint_path=tmp_path / "checkpoints.json")
+
+    by_name = {r.name: r for r in results}
+    assert results[-1].name == "c"
+    # Both sleepers started before either could have finished
+    gap = abs((by_name["a"].started_at - by_name["b"].started_at).total_seconds())
+    assert gap < 0.4
+    assert all(r.duration_seconds >= 0.5 for r in (by_name["a"], by_name["b"]))
+
+
+def test_default_stages_overlap_status_with_analysis(store, tmp_path):
+    sleep = [sys.executable, "-c", "import time; time.sleep(0.5)"]
+    stages = [
+        stage.model_copy(update={"command": sleep, "cwd": tmp_path, "input_paths": []})
+        for stage in default_stages()
+    ]
+    results = run_loop(stages, store, checkpoint_path=tmp_path / "checkpoints.json", force={"sky_lynx"})
+
+    by_name = {r.name: r for r in results}
+    assert [r.status for r in results] == ["success"] * 3
+    gap = abs((by_name["sky_lynx"].started_at - by_name["loop_status"].started_at).total_seconds())
+    assert gap < 0.4
+
+
+def test_input_path_changes_rerun_stage(store, tmp_path):
+    checkpoint = tmp_path / "checkpoints.json"
+    usage = tmp_path / "usage"
+    usage.mkdir()
+    (usage / "week1.json").write_text("{}")
+    stages = [_stage("analyze", inputs=["outcome_record"], input_paths=[usage])]
+
+    assert run_loop(stages, store, checkpoint_path=checkpoint)[0].status == "success"
+    assert run_loop(stages, store, checkpoint_path=checkpoint)[0].status == "skipped"
+    new = usage / "week2.json"
+    new.write_text("{}")
+    os.utime(new, ns=(new.stat().st_atime_ns, new.stat().st_mtime_ns + 10**9))
+    assert run_loop(stages, store, checkpoint_path=checkpoint)[0].status == "success"
+
+
+def test_dry_run_ignores_and_keeps_checkpoints(store, tmp_path):
+    checkpoint = tmp_path / "checkpoints.json"
+    stages = [_stage("analyze", "import sys; assert sys.argv[1:] == ['--dry-run']", inputs=["outcome_record"])]
+    results = run_loop(stages, store, checkpoint_path=checkpoint, dry_run=True)
+    assert results[0].status == "success"
+    assert not checkpoint.exists()
+
+
+def test_traced_run_shares_run_id_with_stages(store, tmp_path):
+    out = tmp_path / "run_id"
+    code = f"import os; open({str(out)!r}, 'w').write(os.environ['SNOW_TOWN_RUN_ID'])"
+    with tracing(store, run_id="run-test"):
+        run_loop([_stage("child", code)], store, checkpoint_path=tmp_path / "checkpoints.json")
+
+    assert out.read_text() == "run-test"
+    (recorded,) = store.query_spans(run_id="run-test")
+    assert recorded.stage == "run_loop.child"
+    assert recorded.status == "ok"